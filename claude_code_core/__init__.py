@@ -67,7 +67,7 @@ from .frontend import (
 from .memory_surface import MemorySurface
 
 # Parser
-from .parser import parse_line
+from .parser import parse_line, parse_line_bytes
 
 # Rendering
 from .rendering import chunk_message, render_for, render_table, wrap_tables_in_fences
@@ -93,6 +93,7 @@ from .types import (
     TodoItem,
     ToolCategory,
     ToolUseEvent,
+    set_keep_raw,
 )
 
 __all__ = [
@@ -110,8 +111,10 @@ __all__ = [
     "TodoItem",
     "ToolCategory",
     "ToolUseEvent",
+    "set_keep_raw",
     # Parser
     "parse_line",
+    "parse_line_bytes",
     # Rendering
     "chunk_message",
     "render_for",
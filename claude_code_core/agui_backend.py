@@ -8,6 +8,7 @@ surface.
 
 from __future__ import annotations
 
+import contextlib
 import json
 import logging
 from collections.abc import AsyncGenerator, AsyncIterator
@@ -15,6 +16,15 @@ from typing import TYPE_CHECKING, Any
 from urllib.parse import urlsplit
 from uuid import uuid4
 
+from .http_pool import SharedHttpSession
+from .stream_decode import (
+    DecodeStats,
+    FrameTooLargeError,
+    MalformedFrameError,
+    NotAnObjectError,
+    SseDecoder,
+    decode_json_object,
+)
 from .types import (
     TOOL_CATEGORIES,
     ImageData,
@@ -30,6 +40,8 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 _MAX_SSE_EVENT_BYTES = 1_048_576
+# Upper bound per read; iter_chunked hands over whatever has arrived, up to this.
+_READ_CHUNK = 65_536
 _MAX_ERROR_CHARS = 1_000
 
 
@@ -279,6 +291,7 @@ class AgUiBackend:
         allowed_tools: list[str] | None = None,
         images: list[ImageData] | None = None,
         api_port: int | None = None,
+        http_session: SharedHttpSession | None = None,
         **_ignored: object,
     ) -> None:
         self.endpoint_url = _validate_endpoint_url(endpoint_url)
@@ -293,11 +306,19 @@ class AgUiBackend:
         self.allowed_tools = allowed_tools
         self.images = images
         self.api_port = api_port
+        # Shared keep-alive connections across turns and clones; without one,
+        # each turn opens (and closes) a session of its own.
+        self.http_session = http_session
         self._response: ClientResponse | None = None
         self._interrupted = False
+        self.decode_stats: DecodeStats | None = None
 
     def clone(self, **kwargs: object) -> AgUiBackend:
-        """Clone configuration without sharing request/cancellation state."""
+        """Clone configuration without sharing request/cancellation state.
+
+        The HTTP session is shared, not copied: reusing its warm connections is
+        the point of having one.
+        """
         config: dict[str, object] = {
             "endpoint_url": self.endpoint_url,
             "auth_token": self.auth_token,
@@ -311,6 +332,7 @@ class AgUiBackend:
             "allowed_tools": self.allowed_tools,
             "images": self.images,
             "api_port": self.api_port,
+            "http_session": self.http_session,
         }
         config.update(kwargs)
         return AgUiBackend(**config)  # type: ignore[arg-type]
@@ -344,15 +366,21 @@ class AgUiBackend:
 
         timeout = aiohttp.ClientTimeout(total=self.timeout_seconds)
         mapper = AgUiEventMapper()
+        stats = self.decode_stats = DecodeStats()
         terminal_seen = False
         try:
             async with (
-                aiohttp.ClientSession(timeout=timeout) as client,
+                (
+                    contextlib.nullcontext(self.http_session.session())
+                    if self.http_session is not None
+                    else aiohttp.ClientSession()
+                ) as client,
                 client.post(
                     self.endpoint_url,
                     json=body,
                     headers=headers,
                     allow_redirects=False,
+                    timeout=timeout,
                 ) as response,
             ):
                 self._response = response
@@ -363,7 +391,7 @@ class AgUiBackend:
                 if "text/event-stream" not in content_type:
                     yield _terminal_error("AG-UI endpoint did not return text/event-stream")
                     return
-                async for wire_event in _iter_sse_events(response.content):
+                async for wire_event in _iter_sse_events(response.content, stats):
                     if self._interrupted:
                         return
                     for mapped in mapper.feed(wire_event):
@@ -385,6 +413,7 @@ class AgUiBackend:
             return
         finally:
             self._response = None
+            logger.debug("AG-UI stream: %s", stats)
 
         if not terminal_seen and not self._interrupted:
             yield _terminal_error("AG-UI stream ended without a terminal event")
@@ -447,62 +476,29 @@ def _build_run_input(
     }
 
 
-async def _iter_sse_events(content: Any) -> AsyncIterator[dict[str, Any]]:
+async def _iter_sse_events(
+    content: Any, stats: DecodeStats | None = None
+) -> AsyncIterator[dict[str, Any]]:
     """Parse bounded UTF-8 JSON SSE frames from an aiohttp response body."""
-    buffer = bytearray()
-    data_lines: list[bytes] = []
-    frame_bytes = 0
-
-    async for chunk in content.iter_chunked(8192):
-        buffer.extend(chunk)
-        while True:
-            newline = buffer.find(b"\n")
-            if newline < 0:
-                if frame_bytes + len(buffer) > _MAX_SSE_EVENT_BYTES:
-                    raise AgUiProtocolError("AG-UI SSE event exceeded the size limit")
-                break
-            line = bytes(buffer[:newline]).rstrip(b"\r")
-            del buffer[: newline + 1]
-            frame_bytes += len(line) + 1
-            if frame_bytes > _MAX_SSE_EVENT_BYTES:
-                raise AgUiProtocolError("AG-UI SSE event exceeded the size limit")
-            if not line:
-                if data_lines:
-                    yield _decode_sse_json(data_lines)
-                data_lines = []
-                frame_bytes = 0
-                continue
-            if line.startswith(b":"):
-                continue
-            if line == b"data":
-                data_lines.append(b"")
-            elif line.startswith(b"data:"):
-                value = line[5:]
-                if value.startswith(b" "):
-                    value = value[1:]
-                data_lines.append(value)
-
-    if buffer:
-        frame_bytes += len(buffer)
-        if frame_bytes > _MAX_SSE_EVENT_BYTES:
-            raise AgUiProtocolError("AG-UI SSE event exceeded the size limit")
-        line = bytes(buffer).rstrip(b"\r")
-        if line.startswith(b"data:"):
-            value = line[5:]
-            data_lines.append(value[1:] if value.startswith(b" ") else value)
-    if data_lines:
-        yield _decode_sse_json(data_lines)
-
-
-def _decode_sse_json(data_lines: list[bytes]) -> dict[str, Any]:
-    payload = b"\n".join(data_lines)
+    decoder = SseDecoder(max_event_bytes=_MAX_SSE_EVENT_BYTES, stats=stats)
+    try:
+        async for chunk in content.iter_chunked(_READ_CHUNK):
+            for payload in decoder.feed(chunk):
+                yield _decode_sse_json(payload, stats)
+        payload = decoder.finish()
+    except FrameTooLargeError as exc:
+        raise AgUiProtocolError("AG-UI SSE event exceeded the size limit") from exc
+    if payload is not None:
+        yield _decode_sse_json(payload, stats)
+
+
+def _decode_sse_json(payload: bytes, stats: DecodeStats | None = None) -> dict[str, Any]:
     try:
-        decoded = json.loads(payload)
-    except (UnicodeDecodeError, json.JSONDecodeError) as exc:
+        return decode_json_object(payload, stats)
+    except NotAnObjectError as exc:
+        raise AgUiProtocolError("AG-UI SSE data must be a JSON object") from exc
+    except MalformedFrameError as exc:
         raise AgUiProtocolError("AG-UI endpoint returned invalid JSON SSE data") from exc
-    if not isinstance(decoded, dict):
-        raise AgUiProtocolError("AG-UI SSE data must be a JSON object")
-    return decoded
 
 
 def _parse_tool_input(raw: str) -> dict[str, Any]:
@@ -50,6 +50,7 @@ def create_backend(
     *,
     backend: str = "claude",
     model: str | None = None,
+    anonymize: bool = True,
     **kwargs: object,
 ) -> SessionBackend:
     """Create a backend runner by name.
@@ -59,6 +60,8 @@ def create_backend(
         model: Model identifier (e.g. "sonnet", "o4-mini"). ``None`` lets the
             backend pick its own default — Codex omits ``--model`` and defers
             to its CLI config.
+        anonymize: Apply the privacy gateway if one is configured. ``False``
+            when the caller applies it itself, around a hop to another host.
         **kwargs: Forwarded to the runner constructor.
     """
     if backend == "claude":
@@ -80,10 +83,12 @@ def create_backend(
     else:
         raise ValueError(f"Unknown backend: {backend!r}")
 
-    return _apply_privacy_gateway(runner, backend=backend, thread_id=kwargs.get("thread_id"))
+    if not anonymize:
+        return runner
+    return apply_privacy_gateway(runner, backend=backend, thread_id=kwargs.get("thread_id"))
 
 
-def _apply_privacy_gateway(
+def apply_privacy_gateway(
     runner: SessionBackend,
     *,
     backend: str,
@@ -12,16 +12,27 @@ import logging
 import os
 import re
 import signal
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Callable
 from pathlib import Path
+from typing import Any
 from urllib.parse import urlparse
 
+from .stderr_tail import StderrTail
+from .stream_decode import (
+    DEFAULT_MAX_LINE_BYTES,
+    DecodeStats,
+    Dispatcher,
+    MalformedFrameError,
+    decode_json_object,
+    read_line,
+)
 from .types import (
     ImageData,
     MessageType,
     StreamEvent,
     ToolCategory,
     ToolUseEvent,
+    keep_raw,
 )
 
 logger = logging.getLogger(__name__)
@@ -77,95 +88,136 @@ def _resolve_codex_sandbox_override() -> str | None:
     return value
 
 
-def parse_codex_line(line: str) -> StreamEvent | None:
-    """Parse a single Codex JSONL line into a StreamEvent."""
+def parse_codex_line(line: str | bytes, stats: DecodeStats | None = None) -> StreamEvent | None:
+    """Parse a single Codex JSONL line into a StreamEvent.
+
+    Malformed lines and unknown event types are counted in ``stats`` when given.
+    """
     line = line.strip()
     if not line:
         return None
 
     try:
-        data = json.loads(line)
-    except json.JSONDecodeError:
+        data = decode_json_object(line, stats, errors="replace")
+    except MalformedFrameError:
         return None
 
-    event_type = data.get("type", "")
+    return _DISPATCH(data, stats)
 
-    if event_type == "thread.started":
-        return StreamEvent(
-            raw=data,
-            message_type=MessageType.SYSTEM,
-            session_id=data.get("thread_id"),
-        )
 
-    if event_type == "turn.started":
-        return StreamEvent(raw=data, message_type=MessageType.SYSTEM)
-
-    if event_type == "turn.completed":
-        usage = data.get("usage", {})
-        return StreamEvent(
-            raw=data,
-            message_type=MessageType.SYSTEM,
-            is_complete=True,
-            input_tokens=usage.get("input_tokens"),
-            output_tokens=usage.get("output_tokens"),
-            cache_read_tokens=usage.get("cached_input_tokens"),
-        )
+def _thread_started(data: dict[str, Any]) -> StreamEvent:
+    return StreamEvent(
+        raw=keep_raw(data),
+        message_type=MessageType.SYSTEM,
+        session_id=data.get("thread_id"),
+    )
+
+
+def _turn_started(data: dict[str, Any]) -> StreamEvent:
+    return StreamEvent(raw=keep_raw(data), message_type=MessageType.SYSTEM)
+
+
+def _turn_completed(data: dict[str, Any]) -> StreamEvent:
+    usage = data.get("usage", {})
+    return StreamEvent(
+        raw=keep_raw(data),
+        message_type=MessageType.SYSTEM,
+        is_complete=True,
+        input_tokens=usage.get("input_tokens"),
+        output_tokens=usage.get("output_tokens"),
+        cache_read_tokens=usage.get("cached_input_tokens"),
+    )
+
+
+def _error(data: dict[str, Any]) -> StreamEvent:
+    return StreamEvent(
+        raw=keep_raw(data),
+        message_type=MessageType.RESULT,
+        is_complete=True,
+        error=data.get("message", "Unknown error"),
+    )
 
-    if event_type == "error":
-        return StreamEvent(
-            raw=data,
-            message_type=MessageType.RESULT,
-            is_complete=True,
-            error=data.get("message", "Unknown error"),
-        )
 
+def _item(data: dict[str, Any]) -> dict[str, Any]:
     item = data.get("item", {})
-    item_type = item.get("type", "")
-
-    if event_type == "item.started" and item_type == "command_execution":
-        return StreamEvent(
-            raw=data,
-            message_type=MessageType.ASSISTANT,
-            tool_use=ToolUseEvent(
-                tool_id=item.get("id", ""),
-                tool_name="Bash",
-                tool_input={"command": item.get("command", "")},
-                category=ToolCategory.COMMAND,
-            ),
-        )
+    return item if isinstance(item, dict) else {}
 
-    if event_type == "item.completed":
-        if item_type == "agent_message":
-            return StreamEvent(
-                raw=data,
-                message_type=MessageType.ASSISTANT,
-                text=item.get("text", ""),
-            )
 
-        if item_type == "command_execution":
-            # USER (not ASSISTANT): EventProcessor only cancels the live elapsed
-            # timer and finalizes the tool embed on USER events (_on_tool_result).
-            # Tagging this ASSISTANT leaves the timer running forever.
-            return StreamEvent(
-                raw=data,
-                message_type=MessageType.USER,
-                tool_result_id=item.get("id", ""),
-                tool_result_content=item.get("output", ""),
-            )
+def _item_started(data: dict[str, Any]) -> StreamEvent | None:
+    item = _item(data)
+    if item.get("type") != "command_execution":
+        return None
+    return StreamEvent(
+        raw=keep_raw(data),
+        message_type=MessageType.ASSISTANT,
+        tool_use=ToolUseEvent(
+            tool_id=item.get("id", ""),
+            tool_name="Bash",
+            tool_input={"command": item.get("command", "")},
+            category=ToolCategory.COMMAND,
+        ),
+    )
 
-        if item_type == "file_changes":
-            return StreamEvent(
-                raw=data,
-                message_type=MessageType.ASSISTANT,
-                tool_use=ToolUseEvent(
-                    tool_id=item.get("id", ""),
-                    tool_name="Edit",
-                    tool_input={"description": item.get("text", "")},
-                    category=ToolCategory.EDIT,
-                ),
-            )
 
-    return None
+def _agent_message(data: dict[str, Any]) -> StreamEvent:
+    return StreamEvent(
+        raw=keep_raw(data),
+        message_type=MessageType.ASSISTANT,
+        text=_item(data).get("text", ""),
+    )
+
+
+def _command_finished(data: dict[str, Any]) -> StreamEvent:
+    item = _item(data)
+    # USER (not ASSISTANT): EventProcessor only cancels the live elapsed
+    # timer and finalizes the tool embed on USER events (_on_tool_result).
+    # Tagging this ASSISTANT leaves the timer running forever.
+    return StreamEvent(
+        raw=keep_raw(data),
+        message_type=MessageType.USER,
+        tool_result_id=item.get("id", ""),
+        tool_result_content=item.get("output", ""),
+    )
+
+
+def _file_changes(data: dict[str, Any]) -> StreamEvent:
+    item = _item(data)
+    return StreamEvent(
+        raw=keep_raw(data),
+        message_type=MessageType.ASSISTANT,
+        tool_use=ToolUseEvent(
+            tool_id=item.get("id", ""),
+            tool_name="Edit",
+            tool_input={"description": item.get("text", "")},
+            category=ToolCategory.EDIT,
+        ),
+    )
+
+
+# Keyed on the item's own type; Codex has more item types than ccdb renders,
+# and those are not "unknown events" — the event type itself was handled.
+_ITEM_COMPLETED: dict[str, Callable[[dict[str, Any]], StreamEvent]] = {
+    "agent_message": _agent_message,
+    "command_execution": _command_finished,
+    "file_changes": _file_changes,
+}
+
+
+def _item_completed(data: dict[str, Any]) -> StreamEvent | None:
+    handler = _ITEM_COMPLETED.get(str(_item(data).get("type", "")))
+    return handler(data) if handler is not None else None
+
+
+_DISPATCH: Dispatcher[StreamEvent] = Dispatcher(
+    {
+        "thread.started": _thread_started,
+        "turn.started": _turn_started,
+        "turn.completed": _turn_completed,
+        "error": _error,
+        "item.started": _item_started,
+        "item.completed": _item_completed,
+    }
+)
 
 
 # Codex item types that arrive as a single ``item.completed`` with no preceding
@@ -173,7 +225,9 @@ def parse_codex_line(line: str) -> StreamEvent | None:
 # live elapsed timer for every tool_use, and only stops it when a matching tool
 # result arrives. For atomic tools no result would ever come, so the timer would
 # accumulate forever — we synthesize a completion to close it immediately.
-_ATOMIC_ITEM_TYPES: frozenset[str] = frozenset({"file_changes"})
+# Matched on the tool name parse_codex_line gives those items, since ``raw``
+# is not retained outside debug mode.
+_ATOMIC_TOOL_NAMES: frozenset[str] = frozenset({"Edit"})
 _MISSING_ROLLOUT_PATTERN = re.compile(r"no rollout found for thread id", re.IGNORECASE)
 _RESUME_STREAM_DISCONNECT_PATTERN = re.compile(
     r"stream disconnected before completion:.*"
@@ -193,8 +247,7 @@ def _atomic_tool_completion(event: StreamEvent) -> StreamEvent | None:
     """
     if event.tool_use is None:
         return None
-    item_type = event.raw.get("item", {}).get("type", "")
-    if item_type not in _ATOMIC_ITEM_TYPES:
+    if event.tool_use.tool_name not in _ATOMIC_TOOL_NAMES:
         return None
     return StreamEvent(
         raw=event.raw,
@@ -325,6 +378,9 @@ class CodexRunner:
         self.append_system_prompt = append_system_prompt
         self.images = images
         self._process: asyncio.subprocess.Process | None = None
+        # Drained concurrently for the life of each attempt; see stderr_tail.
+        self._stderr_tail: StderrTail | None = None
+        self._decode_stats: DecodeStats | None = None
         self._interrupt_requested = False
 
     async def run(
@@ -354,11 +410,15 @@ class CodexRunner:
                 stderr=asyncio.subprocess.PIPE,
                 cwd=cwd,
                 env=env,
-                limit=10 * 1024 * 1024,
+                limit=DEFAULT_MAX_LINE_BYTES,
             )
 
             logger.info("Codex CLI started: pid=%s", self._process.pid)
 
+            self._stderr_tail = StderrTail()
+            if self._process.stderr is not None:
+                self._stderr_tail.start(self._process.stderr)
+
             if self._process.stdin is not None:
                 await self._send_prompt(attempt_prompt)
 
@@ -400,7 +460,6 @@ class CodexRunner:
             except TimeoutError:
                 logger.warning("Codex CLI timed out after %ds", self.timeout_seconds)
                 yield StreamEvent(
-                    raw={},
                     message_type=MessageType.RESULT,
                     is_complete=True,
                     error=f"Timed out after {self.timeout_seconds} seconds",
@@ -585,6 +644,16 @@ class CodexRunner:
             env["DISCORD_THREAD_ID"] = str(self.thread_id)
         return env
 
+    @property
+    def stderr_tail(self) -> StderrTail | None:
+        """The current attempt's stderr tail and counters (None before the first run)."""
+        return self._stderr_tail
+
+    @property
+    def decode_stats(self) -> DecodeStats | None:
+        """The current attempt's stdout decoding counters (None before the first run)."""
+        return self._decode_stats
+
     def describe_api(self) -> str:
         """Return a short label for the API endpoint this runner targets."""
         env = self._build_env()
@@ -599,13 +668,16 @@ class CodexRunner:
         if self._process is None or self._process.stdout is None:
             raise RuntimeError("Process not started")
 
+        stats = self._decode_stats = DecodeStats()
         while True:
-            line = await self._process.stdout.readline()
-            if not line:
+            line = await read_line(self._process.stdout, stats)
+            if line is None:
+                logger.debug("Codex CLI stdout EOF: %s", stats)
                 break
-            decoded = line.decode("utf-8", errors="replace")
-            event = parse_codex_line(decoded)
+            event = parse_codex_line(line, stats)
             if event:
+                if event.is_complete:
+                    logger.debug("Codex CLI stdout: %s", stats)
                 yield event
                 if event.is_complete:
                     return
@@ -626,20 +698,19 @@ class CodexRunner:
                     self._process.returncode,
                 )
                 return
-            stderr_data = b""
-            if self._process.stderr:
-                stderr_data = await self._process.stderr.read()
-            stderr_text = stderr_data.decode("utf-8", errors="replace").strip()
+            stderr_text = ""
+            if self._stderr_tail is not None:
+                await self._stderr_tail.wait()
+                stderr_text = self._stderr_tail.text(max_chars=1000)
             logger.error(
                 "Codex CLI exited with code %d: %s",
                 self._process.returncode,
-                stderr_text[:200],
+                stderr_text,
             )
             error = f"CLI exited with code {self._process.returncode}"
             if stderr_text:
-                error = f"{error}: {stderr_text[:1000]}"
+                error = f"{error}: {stderr_text}"
             yield StreamEvent(
-                raw={},
                 message_type=MessageType.RESULT,
                 is_complete=True,
                 error=error,
@@ -648,3 +719,5 @@ class CodexRunner:
     async def _cleanup(self) -> None:
         """Ensure the subprocess is properly terminated."""
         await self.kill()
+        if self._stderr_tail is not None:
+            await self._stderr_tail.close()
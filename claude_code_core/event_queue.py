@@ -0,0 +1,127 @@
+"""Bounded, coalescing hand-off between a backend's stream and its renderer.
+
+Rendering an event can take a long time: a chat-platform edit, a reaction, or
+sitting out a 429 backoff. While the renderer was awaited inline, nothing read
+the CLI's stdout, so a throttled frontend slowed the CLI itself down — and
+once the pipe filled, stalled it outright.
+
+:class:`CoalescingEventQueue` lets a reader task pull events at full speed
+while the renderer consumes them at its own pace. It is bounded, and when the
+renderer falls behind, *superseded* state collapses instead of piling up:
+
+- status flips (``progress``) — only the latest status is shown anyway;
+- usage-only ``stream_event`` updates — each overwrites the last;
+- rate-limit snapshots of the same window;
+- cumulative partial-text snapshots (AG-UI) — the next one contains the last.
+
+Everything else — text blocks, tool calls and results, approvals, system
+events and the terminal ``result`` — is always delivered, in order. A
+coalesced event only ever replaces a pending one that no kept event follows,
+so the renderer sees the same sequence it would have, minus states it would
+have overwritten straight away.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Hashable
+
+from .types import MessageType, StreamEvent
+
+__all__ = ["CoalescingEventQueue", "coalesce_key"]
+
+DEFAULT_MAXSIZE = 256
+
+
+def coalesce_key(event: StreamEvent) -> Hashable | None:
+    """What a later event must share to supersede this one, or None to always keep it."""
+    if event.is_complete or event.error:
+        return None
+    if event.message_type == MessageType.PROGRESS:
+        return "progress"
+    if event.message_type == MessageType.STREAM_EVENT:
+        return "usage"
+    if event.message_type == MessageType.RATE_LIMIT_EVENT and event.rate_limit_info is not None:
+        return ("rate_limit", event.rate_limit_info.rate_limit_type)
+    if (
+        event.message_type == MessageType.ASSISTANT
+        and event.is_partial
+        and event.text
+        and event.tool_use is None
+        and not event.thinking
+        and not event.has_redacted_thinking
+        and event.todo_list is None
+        and not event.ask_questions
+        and not event.is_plan_approval
+    ):
+        return "partial_text"
+    return None
+
+
+class CoalescingEventQueue:
+    """Single-producer, single-consumer event queue with superseded-state coalescing.
+
+    ``put`` waits only when ``maxsize`` events that must all be kept are
+    already pending; ``get`` returns ``None`` once the queue is closed and
+    drained.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE) -> None:
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.coalesced = 0
+        self.high_water = 0
+        self._items: deque[tuple[Hashable | None, StreamEvent]] = deque()
+        self._closed = False
+        self._readable = asyncio.Event()
+        self._writable = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    async def put(self, event: StreamEvent) -> None:
+        """Enqueue ``event``, replacing a pending state it supersedes."""
+        if self._closed:
+            raise RuntimeError("put() on a closed CoalescingEventQueue")
+        key = coalesce_key(event)
+        if key is not None and self._replace(key, event):
+            return
+        while len(self._items) >= self.maxsize and not self._closed:
+            self._writable.clear()
+            await self._writable.wait()
+        self._items.append((key, event))
+        self.high_water = max(self.high_water, len(self._items))
+        self._readable.set()
+
+    async def get(self) -> StreamEvent | None:
+        """Next event in order, or ``None`` once closed and empty."""
+        while not self._items:
+            if self._closed:
+                return None
+            self._readable.clear()
+            await self._readable.wait()
+        _, event = self._items.popleft()
+        self._writable.set()
+        return event
+
+    def close(self) -> None:
+        """No more events; ``get`` drains what is pending, then returns ``None``."""
+        self._closed = True
+        self._readable.set()
+        self._writable.set()
+
+    def _replace(self, key: Hashable, event: StreamEvent) -> bool:
+        # Only the trailing run of coalescible events is searched: jumping an
+        # event past a kept one would change what the renderer sees.
+        for index in range(len(self._items) - 1, -1, -1):
+            pending_key = self._items[index][0]
+            if pending_key is None:
+                return False
+            if pending_key == key:
+                del self._items[index]
+                self._items.append((key, event))
+                self.coalesced += 1
+                return True
+        return False
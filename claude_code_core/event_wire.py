@@ -0,0 +1,104 @@
+"""JSON wire form of :class:`~claude_code_core.types.StreamEvent`.
+
+A worker process (see :mod:`claude_code_core.session_worker`) parses the CLI's
+stream itself and ships the *parsed* events to the process that owns the
+conversation, so the owner only decodes one compact JSON object per event
+instead of re-parsing the CLI's much larger output. This module is that
+encoding: :func:`encode_event` turns an event into a JSON-able dict and
+:func:`decode_event` turns it back.
+
+Only fields that differ from their defaults are written, which keeps a typical
+text or status event to a few dozen bytes. ``raw`` travels only when it was
+kept (``CCDB_KEEP_RAW_EVENTS``) and is re-filtered through
+:func:`~claude_code_core.types.keep_raw` on the receiving side.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+from typing import Any
+
+from .types import (
+    AskOption,
+    AskQuestion,
+    ElicitationRequest,
+    HookEvent,
+    ImageData,
+    MessageType,
+    PermissionRequest,
+    RateLimitInfo,
+    StreamEvent,
+    TodoItem,
+    ToolCategory,
+    ToolUseEvent,
+    keep_raw,
+)
+
+__all__ = ["decode_event", "decode_images", "encode_event", "encode_images"]
+
+_DEFAULTS = {
+    f.name: f.default
+    for f in dataclasses.fields(StreamEvent)
+    if f.default is not dataclasses.MISSING
+}
+
+
+def encode_event(event: StreamEvent) -> dict[str, Any]:
+    """The fields of ``event`` that differ from their defaults, as plain JSON types."""
+    data: dict[str, Any] = {"message_type": event.message_type.value}
+    for name, default in _DEFAULTS.items():
+        value = getattr(event, name)
+        if value == default:
+            continue
+        if name == "tool_use":
+            value = {**dataclasses.asdict(value), "category": value.category.value}
+        elif dataclasses.is_dataclass(value):
+            value = dataclasses.asdict(value)
+        elif name in ("ask_questions", "todo_list"):
+            value = [dataclasses.asdict(item) for item in value]
+        data[name] = value
+    if event.raw:
+        data["raw"] = dict(event.raw)
+    return data
+
+
+def decode_event(data: dict[str, Any]) -> StreamEvent:
+    """Rebuild the event :func:`encode_event` produced ``data`` from."""
+    fields = dict(data)
+    fields["message_type"] = MessageType(fields["message_type"])
+    if (tool_use := fields.get("tool_use")) is not None:
+        fields["tool_use"] = ToolUseEvent(
+            **{**tool_use, "category": ToolCategory(tool_use["category"])}
+        )
+    if (questions := fields.get("ask_questions")) is not None:
+        fields["ask_questions"] = [
+            AskQuestion(**{**q, "options": [AskOption(**o) for o in q.get("options", [])]})
+            for q in questions
+        ]
+    if (todos := fields.get("todo_list")) is not None:
+        fields["todo_list"] = [TodoItem(**item) for item in todos]
+    for name, cls in (
+        ("permission_request", PermissionRequest),
+        ("elicitation", ElicitationRequest),
+        ("rate_limit_info", RateLimitInfo),
+        ("hook_event", HookEvent),
+    ):
+        if (value := fields.get(name)) is not None:
+            fields[name] = cls(**value)
+    if "raw" in fields:
+        fields["raw"] = keep_raw(fields["raw"])
+    return StreamEvent(**fields)
+
+
+def encode_images(images: list[ImageData] | None) -> list[dict[str, str]] | None:
+    """Image attachments as JSON, for a turn handed to another process."""
+    if images is None:
+        return None
+    return [dataclasses.asdict(image) for image in images]
+
+
+def decode_images(data: list[dict[str, str]] | None) -> list[ImageData] | None:
+    """Inverse of :func:`encode_images`."""
+    if data is None:
+        return None
+    return [ImageData(**image) for image in data]
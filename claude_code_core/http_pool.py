@@ -0,0 +1,99 @@
+"""A long-lived HTTP client session shared by every AG-UI turn and clone.
+
+``AgUiBackend.run`` used to open an ``aiohttp.ClientSession`` for each turn
+and close it afterwards, so every message to a remote agent paid DNS, TCP and
+(for ``https``) TLS setup again — on a busy AG-UI thread, before a single
+event could stream back.
+
+:class:`SharedHttpSession` owns one session and its keep-alive connection
+pool. Backends built by the same factory, and their clones, all borrow it, so
+consecutive turns reuse a warm connection. The session is created lazily on
+first use (``aiohttp`` stays an optional dependency) and again if the event
+loop it was bound to has gone away; whoever created the shared session closes
+it on shutdown.
+
+Only the connections are shared. The session keeps no cookies, or a
+``Set-Cookie`` from one thread's endpoint would be sent on every other
+thread's — and every other user's — requests.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from aiohttp import ClientSession
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["HttpPoolStats", "SharedHttpSession"]
+
+DEFAULT_MAX_CONNECTIONS = 32
+DEFAULT_KEEPALIVE_SECONDS = 60.0
+
+
+@dataclass
+class HttpPoolStats:
+    """How often the shared session was borrowed, and how often it had to be (re)built."""
+
+    borrowed: int = 0
+    sessions_opened: int = 0
+
+
+class SharedHttpSession:
+    """One lazily created ``aiohttp.ClientSession``, borrowed by many backends.
+
+    Borrowers must not close the session; per-request settings such as the
+    turn's timeout go on the request itself.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        keepalive_seconds: float = DEFAULT_KEEPALIVE_SECONDS,
+    ) -> None:
+        if max_connections < 1:
+            raise ValueError("max_connections must be at least 1")
+        if keepalive_seconds <= 0:
+            raise ValueError("keepalive_seconds must be positive")
+        self.max_connections = max_connections
+        self.keepalive_seconds = keepalive_seconds
+        self.stats = HttpPoolStats()
+        self._session: ClientSession | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def session(self) -> ClientSession:
+        """The shared session, opened on first use. Call from a running event loop."""
+        import aiohttp
+
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            # A session is bound to the loop it was created on; one left
+            # behind by a finished loop cannot be closed from this one.
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                keepalive_timeout=self.keepalive_seconds,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector, cookie_jar=aiohttp.DummyCookieJar()
+            )
+            self._loop = loop
+            self.stats.sessions_opened += 1
+        self.stats.borrowed += 1
+        return self._session
+
+    async def close(self) -> None:
+        """Close the session and every pooled connection."""
+        session, self._session = self._session, None
+        if session is not None and not session.closed:
+            await session.close()
+        if self.stats.borrowed:
+            logger.info(
+                "Shared HTTP session: borrowed %d time(s), opened %d session(s)",
+                self.stats.borrowed,
+                self.stats.sessions_opened,
+            )
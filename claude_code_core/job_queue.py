@@ -0,0 +1,178 @@
+"""Durable queue of turns handed from the bridge process to worker processes.
+
+In worker mode (``CCDB_WORKER_PROCESSES``) the process that talks to Discord
+does not run the CLI. It records each turn here — the backend, the runner's
+configuration, the prompt and the session to resume — and a worker process
+claims the row, runs the turn and streams the events back (see
+:mod:`claude_code_core.worker_pool` and :mod:`claude_code_core.session_worker`).
+
+The table is the hand-off, not a log. Claiming is one ``UPDATE … RETURNING``,
+so two workers polling at once can never take the same turn. Rows stay after a
+turn finishes, with the worker that ran it and the outcome, so a turn lost to a
+crashed worker can be traced; :meth:`JobQueue.abandon` marks every unfinished
+row when the bridge restarts, because a turn whose conversation is gone must
+not be run by the next worker that starts.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any
+
+import aiosqlite
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["Job", "JobQueue"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS worker_jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    owner TEXT NOT NULL,
+    backend TEXT NOT NULL,
+    spec TEXT NOT NULL,
+    prompt TEXT NOT NULL,
+    session_id TEXT,
+    status TEXT NOT NULL DEFAULT 'queued',
+    worker TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    claimed_at REAL,
+    finished_at REAL
+);
+
+CREATE INDEX IF NOT EXISTS idx_worker_jobs_status ON worker_jobs(status, id);
+"""
+
+#: Statuses a row can no longer leave.
+FINISHED = ("done", "failed", "cancelled", "abandoned")
+
+
+@dataclass
+class Job:
+    """One turn waiting for, or claimed by, a worker process."""
+
+    id: int
+    owner: str
+    backend: str
+    spec: dict[str, Any]
+    prompt: str
+    session_id: str | None
+    status: str
+    worker: str | None = None
+    error: str | None = None
+    created_at: float = 0.0
+    claimed_at: float | None = None
+    finished_at: float | None = None
+
+    @classmethod
+    def from_row(cls, row: aiosqlite.Row) -> Job:
+        data = dict(row)
+        data["spec"] = json.loads(data["spec"])
+        return cls(**data)
+
+
+class JobQueue:
+    """The ``worker_jobs`` table, shared by the bridge and every worker process."""
+
+    def __init__(self, db_path: str) -> None:
+        self.db_path = db_path
+
+    async def init_db(self) -> None:
+        """Create the table. WAL lets workers claim while the bridge enqueues."""
+        async with aiosqlite.connect(self.db_path) as db:
+            await db.execute("PRAGMA journal_mode=WAL")
+            await db.executescript(SCHEMA)
+            await db.commit()
+
+    async def enqueue(
+        self,
+        *,
+        owner: str,
+        backend: str,
+        spec: dict[str, Any],
+        prompt: str,
+        session_id: str | None = None,
+    ) -> int:
+        """Record a turn for a worker to claim and return its job ID."""
+        async with aiosqlite.connect(self.db_path) as db:
+            cursor = await db.execute(
+                """INSERT INTO worker_jobs (owner, backend, spec, prompt, session_id, created_at)
+                   VALUES (?, ?, ?, ?, ?, ?)""",
+                (owner, backend, json.dumps(spec), prompt, session_id, time.time()),
+            )
+            await db.commit()
+            job_id = cursor.lastrowid
+        if job_id is None:
+            raise RuntimeError("Failed to enqueue worker job")
+        return job_id
+
+    async def claim(self, worker: str) -> Job | None:
+        """Take the oldest queued turn for ``worker``, or ``None`` when there is none."""
+        async with aiosqlite.connect(self.db_path) as db:
+            db.row_factory = aiosqlite.Row
+            cursor = await db.execute(
+                """UPDATE worker_jobs SET status = 'running', worker = ?, claimed_at = ?
+                   WHERE id = (
+                       SELECT id FROM worker_jobs WHERE status = 'queued' ORDER BY id LIMIT 1
+                   )
+                   RETURNING *""",
+                (worker, time.time()),
+            )
+            row = await cursor.fetchone()
+            await db.commit()
+        return Job.from_row(row) if row is not None else None
+
+    async def finish(self, job_id: int, *, error: str | None = None) -> None:
+        """Close a claimed turn as done, or failed with ``error``."""
+        async with aiosqlite.connect(self.db_path) as db:
+            await db.execute(
+                """UPDATE worker_jobs SET status = ?, error = ?, finished_at = ?
+                   WHERE id = ? AND status = 'running'""",
+                ("failed" if error else "done", error, time.time(), job_id),
+            )
+            await db.commit()
+
+    async def cancel(self, job_id: int) -> bool:
+        """Withdraw a turn no worker has claimed yet. False once one has."""
+        async with aiosqlite.connect(self.db_path) as db:
+            cursor = await db.execute(
+                """UPDATE worker_jobs SET status = 'cancelled', finished_at = ?
+                   WHERE id = ? AND status = 'queued'""",
+                (time.time(), job_id),
+            )
+            await db.commit()
+            return cursor.rowcount > 0
+
+    async def abandon(self, *, error: str = "bridge restarted") -> int:
+        """Mark every unfinished turn abandoned; returns how many there were."""
+        async with aiosqlite.connect(self.db_path) as db:
+            cursor = await db.execute(
+                """UPDATE worker_jobs SET status = 'abandoned', error = ?, finished_at = ?
+                   WHERE status IN ('queued', 'running')""",
+                (error, time.time()),
+            )
+            await db.commit()
+            return cursor.rowcount
+
+    async def get(self, job_id: int) -> Job | None:
+        """Look a turn up by ID."""
+        async with aiosqlite.connect(self.db_path) as db:
+            db.row_factory = aiosqlite.Row
+            cursor = await db.execute("SELECT * FROM worker_jobs WHERE id = ?", (job_id,))
+            row = await cursor.fetchone()
+        return Job.from_row(row) if row is not None else None
+
+    async def cleanup(self, *, older_than_seconds: float = 7 * 86400) -> int:
+        """Delete finished rows older than ``older_than_seconds``."""
+        async with aiosqlite.connect(self.db_path) as db:
+            cursor = await db.execute(
+                f"""DELETE FROM worker_jobs
+                    WHERE status IN ({",".join("?" * len(FINISHED))}) AND finished_at < ?""",
+                (*FINISHED, time.time() - older_than_seconds),
+            )
+            await db.commit()
+            return cursor.rowcount
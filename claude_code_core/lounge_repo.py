@@ -15,6 +15,8 @@ from dataclasses import dataclass, field
 
 import aiosqlite
 
+from .sqlite_pool import SqlitePool, connect
+
 logger = logging.getLogger(__name__)
 
 # Keep at most this many recent messages to prevent unbounded growth.
@@ -39,8 +41,9 @@ class LoungeRepository:
     The table is created by models.init_db() via the migrations list.
     """
 
-    def __init__(self, db_path: str) -> None:
+    def __init__(self, db_path: str, *, pool: SqlitePool | None = None) -> None:
         self._db_path = db_path
+        self._pool = pool
 
     async def post(
         self, message: str, label: str = "AI", *, thread_id: int | None = None
@@ -52,7 +55,7 @@ class LoungeRepository:
         label = (label or "AI")[:50]  # safety cap
         message = (message or "")[:1000]  # safety cap
 
-        async with aiosqlite.connect(self._db_path) as db:
+        async with connect(self._db_path, self._pool) as db:
             db.row_factory = aiosqlite.Row
             cursor = await db.execute(
                 "INSERT INTO lounge_messages (label, message, thread_id) VALUES (?, ?, ?)",
@@ -95,7 +98,7 @@ class LoungeRepository:
         Args:
             limit: Maximum number of messages to return (default 10).
         """
-        async with aiosqlite.connect(self._db_path) as db:
+        async with connect(self._db_path, self._pool, readonly=True) as db:
             db.row_factory = aiosqlite.Row
             # Pick the N newest via subquery, then sort ascending for display
             rows = await db.execute_fetchall(
@@ -119,7 +122,7 @@ class LoungeRepository:
 
     async def count(self) -> int:
         """Return the total number of stored lounge messages."""
-        async with aiosqlite.connect(self._db_path) as db:
+        async with connect(self._db_path, self._pool, readonly=True) as db:
             cur = await db.execute("SELECT COUNT(*) FROM lounge_messages")
             row = await cur.fetchone()
         return row[0] if row else 0
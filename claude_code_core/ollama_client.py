@@ -13,9 +13,12 @@ operator only ever configures one address. Every call is read-only except
 
 Design notes:
 
-* ``urllib`` in a worker thread rather than ``aiohttp``. The bot already
-  depends on aiohttp, but these calls are rare, one-shot, and easier to reason
-  about (and to test) as blocking functions wrapped in ``asyncio.to_thread``.
+* Native ``aiohttp`` (already a dependency of discord.py) through one shared
+  :class:`OllamaClient`. These calls used to be blocking ``urllib`` requests
+  in ``asyncio.to_thread`` — a worker thread and a fresh TCP connection for
+  every ``/ollama`` command and every privacy-guard question. The shared client
+  keeps connections alive, bounds in-flight requests per endpoint, and can
+  stream NDJSON replies (pull progress, chat).
 * Nothing here is ever interpolated into a shell command. Model names are still
   validated with a strict grammar because a bad name should fail before a
   multi-gigabyte download starts, not after.
@@ -25,18 +28,30 @@ from __future__ import annotations
 
 import asyncio
 import contextlib
+import inspect
 import json
 import logging
 import re
+from collections.abc import AsyncIterator, Callable, Iterator
 from dataclasses import dataclass, field
-from typing import Any
-from urllib import error as urllib_error
-from urllib import request as urllib_request
+from typing import TYPE_CHECKING, Any
 from urllib.parse import urlsplit, urlunsplit
 
+from .http_pool import SharedHttpSession
+from .stream_decode import (
+    DEFAULT_MAX_LINE_BYTES,
+    LineFramer,
+    MalformedFrameError,
+    decode_json_object,
+)
+
+if TYPE_CHECKING:
+    from aiohttp import ClientResponse
+
 logger = logging.getLogger(__name__)
 
 __all__ = [
+    "OllamaClient",
     "OllamaError",
     "OllamaModel",
     "RunningModel",
@@ -48,10 +63,16 @@ __all__ = [
     "delete_model",
     "server_version",
     "pull_model",
+    "PullProgress",
+    "shared_client",
+    "close_shared_client",
 ]
 
 DEFAULT_TIMEOUT_SECONDS = 20.0
 DEFAULT_PULL_TIMEOUT_SECONDS = 6 * 60 * 60
+# Ollama runs a handful of requests per model in parallel by default
+# (OLLAMA_NUM_PARALLEL); queueing here keeps the rest from timing out there.
+DEFAULT_MAX_PER_ENDPOINT = 4
 
 OLLAMA_MODEL_NAME_PATTERN = re.compile(
     r"^[A-Za-z0-9][A-Za-z0-9._-]*(?:/[A-Za-z0-9][A-Za-z0-9._-]*)*"
@@ -234,35 +255,178 @@ def _extract_max_context(model_info: dict[str, Any]) -> int:
 # ── transport ──────────────────────────────────────────────────────
 
 
-def _request_sync(
+class OllamaClient:
+    """Keep-alive, concurrency-bounded transport for Ollama's native API.
+
+    One instance is shared process-wide (:func:`shared_client`), so the
+    ``/ollama`` command, the privacy inspector and the answerability judge
+    reuse the same pooled connections. At most ``max_per_endpoint`` requests
+    are in flight against one origin at a time; the rest wait their turn
+    instead of piling more parallel generations onto a single GPU.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_per_endpoint: int = DEFAULT_MAX_PER_ENDPOINT,
+        http: SharedHttpSession | None = None,
+    ) -> None:
+        if max_per_endpoint < 1:
+            raise ValueError("max_per_endpoint must be at least 1")
+        self.max_per_endpoint = max_per_endpoint
+        self.http = http or SharedHttpSession(max_connections=4 * max_per_endpoint)
+        self._limits: dict[str, asyncio.Semaphore] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def _limit(self, url: str) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Semaphores bind to the loop that first waits on them.
+            self._limits.clear()
+            self._loop = loop
+        parsed = urlsplit(url)
+        origin = f"{parsed.scheme}://{parsed.netloc}"
+        limit = self._limits.get(origin)
+        if limit is None:
+            limit = self._limits[origin] = asyncio.Semaphore(self.max_per_endpoint)
+        return limit
+
+    @contextlib.asynccontextmanager
+    async def _open(
+        self,
+        url: str,
+        *,
+        method: str,
+        payload: dict[str, Any] | None,
+        timeout_seconds: float,
+    ) -> AsyncIterator[ClientResponse]:
+        import aiohttp
+
+        async with self._limit(url), contextlib.AsyncExitStack() as stack:
+            # Only the request itself is guarded: an error raised by the caller's
+            # block is the caller's, not an unreachable server.
+            with _transport_errors():
+                response = await stack.enter_async_context(
+                    self.http.session().request(
+                        method,
+                        url,
+                        json=payload,
+                        timeout=aiohttp.ClientTimeout(total=timeout_seconds),
+                    )
+                )
+                if response.status >= 400:
+                    detail = ""
+                    with contextlib.suppress(Exception):  # body is diagnostics only
+                        detail = (await response.text(errors="replace"))[:300]
+                    suffix = f": {detail}" if detail else ""
+                    raise OllamaError(f"Ollama returned HTTP {response.status}{suffix}")
+            yield response
+
+    async def request(
+        self,
+        url: str,
+        *,
+        method: str = "GET",
+        payload: dict[str, Any] | None = None,
+        timeout_seconds: float = DEFAULT_TIMEOUT_SECONDS,
+    ) -> Any:
+        """Perform one JSON request; an empty body is ``{}``."""
+        async with self._open(
+            url, method=method, payload=payload, timeout_seconds=timeout_seconds
+        ) as response:
+            with _transport_errors():
+                body = await response.read()
+        if not body:
+            return {}
+        try:
+            return json.loads(body.decode("utf-8"))
+        except (UnicodeDecodeError, json.JSONDecodeError) as exc:
+            raise OllamaError("Ollama returned a response that is not valid JSON") from exc
+
+    async def stream(
+        self,
+        url: str,
+        *,
+        payload: dict[str, Any],
+        timeout_seconds: float = DEFAULT_TIMEOUT_SECONDS,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """POST ``payload`` and yield each object of the NDJSON reply as it arrives.
+
+        Ollama reports a failure part-way through a stream as an ``error``
+        object rather than an HTTP status; that becomes :class:`OllamaError`.
+        """
+        framer = LineFramer(max_line_bytes=DEFAULT_MAX_LINE_BYTES)
+        async with self._open(
+            url, method="POST", payload=payload, timeout_seconds=timeout_seconds
+        ) as response:
+            chunks = response.content.iter_any()
+            while True:
+                with _transport_errors():
+                    chunk = await anext(chunks, None)
+                if chunk is None:
+                    break
+                for line in framer.feed(chunk):
+                    if line.strip():
+                        yield _stream_object(line)
+            tail = framer.finish()
+            if tail is not None and tail.strip():
+                yield _stream_object(tail)
+
+    async def close(self) -> None:
+        await self.http.close()
+
+
+@contextlib.contextmanager
+def _transport_errors() -> Iterator[None]:
+    """Report a connection failure or timeout as :class:`OllamaError`."""
+    import aiohttp
+
+    try:
+        yield
+    except (aiohttp.ClientError, TimeoutError, OSError) as exc:
+        reason = str(exc) or type(exc).__name__
+        raise OllamaError(f"Could not reach the Ollama server: {reason}") from exc
+
+
+def _stream_object(line: bytes) -> dict[str, Any]:
+    try:
+        data = decode_json_object(line)
+    except MalformedFrameError as exc:
+        raise OllamaError("Ollama streamed a line that is not a JSON object") from exc
+    if data.get("error"):
+        raise OllamaError(str(data["error"])[:500])
+    return data
+
+
+_shared: OllamaClient | None = None
+
+
+def shared_client() -> OllamaClient:
+    """The process-wide client every Ollama caller borrows."""
+    global _shared
+    if _shared is None:
+        _shared = OllamaClient()
+    return _shared
+
+
+async def close_shared_client() -> None:
+    """Close the shared client's pooled connections (on shutdown)."""
+    global _shared
+    client, _shared = _shared, None
+    if client is not None:
+        await client.close()
+
+
+async def _send(
     url: str,
     *,
     method: str = "GET",
     payload: dict[str, Any] | None = None,
     timeout_seconds: float = DEFAULT_TIMEOUT_SECONDS,
 ) -> Any:
-    """Perform one blocking JSON request against the Ollama native API."""
-    data = json.dumps(payload).encode("utf-8") if payload is not None else None
-    headers = {"Content-Type": "application/json"} if data is not None else {}
-    request = urllib_request.Request(url, data=data, headers=headers, method=method)
-    try:
-        with urllib_request.urlopen(request, timeout=timeout_seconds) as response:
-            body = response.read()
-    except urllib_error.HTTPError as exc:
-        detail = ""
-        with contextlib.suppress(Exception):  # body is diagnostics only
-            detail = exc.read().decode("utf-8", "replace")[:300]
-        suffix = f": {detail}" if detail else ""
-        raise OllamaError(f"Ollama returned HTTP {exc.code}{suffix}") from exc
-    except (urllib_error.URLError, TimeoutError, OSError) as exc:
-        raise OllamaError(f"Could not reach the Ollama server: {exc}") from exc
-
-    if not body:
-        return {}
-    try:
-        return json.loads(body.decode("utf-8"))
-    except (UnicodeDecodeError, json.JSONDecodeError) as exc:
-        raise OllamaError("Ollama returned a response that is not valid JSON") from exc
+    return await shared_client().request(
+        url, method=method, payload=payload, timeout_seconds=timeout_seconds
+    )
 
 
 async def _request(
@@ -273,8 +437,7 @@ async def _request(
     payload: dict[str, Any] | None = None,
     timeout_seconds: float = DEFAULT_TIMEOUT_SECONDS,
 ) -> Any:
-    return await asyncio.to_thread(
-        _request_sync,
+    return await _send(
         ollama_api_url(base_url, path),
         method=method,
         payload=payload,
@@ -363,27 +526,61 @@ async def delete_model(
     )
 
 
+@dataclass(frozen=True)
+class PullProgress:
+    """One status line of a streamed pull (``downloading``, ``verifying``, …)."""
+
+    status: str
+    completed: int = 0
+    total: int = 0
+
+    @property
+    def percent(self) -> int | None:
+        """Progress of the current layer, or ``None`` for a step with no size."""
+        if self.total <= 0:
+            return None
+        return min(100, round(100 * self.completed / self.total))
+
+
 async def pull_model(
     base_url: str,
     model: str,
     *,
     timeout_seconds: float = DEFAULT_PULL_TIMEOUT_SECONDS,
+    on_progress: Callable[[PullProgress], Any] | None = None,
 ) -> None:
     """Pull a model, blocking until the download completes.
 
-    Non-streaming on purpose: the caller is a Discord command that posts once
-    when the pull finishes, and a streamed progress feed would mean either
-    editing a message thousands of times or holding a partial line buffer for
-    hours.
+    Without ``on_progress`` this is one non-streaming request that answers
+    when the pull is done. With it, the pull is streamed and every status line
+    is handed to the callback as it arrives (awaited if it returns an
+    awaitable); throttling how often that reaches a user is the caller's job.
     """
     normalized = validate_ollama_model_name(model)
-    result = await _request(
-        base_url,
-        "/api/pull",
-        method="POST",
-        payload={"model": normalized, "stream": False},
-        timeout_seconds=timeout_seconds,
-    )
+    if on_progress is None:
+        result = await _request(
+            base_url,
+            "/api/pull",
+            method="POST",
+            payload={"model": normalized, "stream": False},
+            timeout_seconds=timeout_seconds,
+        )
+    else:
+        result = {}
+        async for result in shared_client().stream(
+            ollama_api_url(base_url, "/api/pull"),
+            payload={"model": normalized, "stream": True},
+            timeout_seconds=timeout_seconds,
+        ):
+            update = on_progress(
+                PullProgress(
+                    status=str(result.get("status") or ""),
+                    completed=int(result.get("completed") or 0),
+                    total=int(result.get("total") or 0),
+                )
+            )
+            if inspect.isawaitable(update):
+                await update
     if not isinstance(result, dict) or result.get("status") != "success":
         detail = result.get("error") or result.get("status") if isinstance(result, dict) else None
         suffix = f": {detail}" if detail else ""
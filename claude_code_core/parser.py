@@ -7,8 +7,10 @@ from __future__ import annotations
 
 import json
 import logging
+from collections.abc import Callable
 from typing import Any
 
+from .stream_decode import DecodeStats, Dispatcher, MalformedFrameError, decode_json_object
 from .types import (
     TOOL_CATEGORIES,
     AskOption,
@@ -28,6 +30,14 @@ from .types import (
 logger = logging.getLogger(__name__)
 
 
+# A top-level ``stream_event`` line as the CLI writes it. Key order is what
+# the CLI emits today; if it ever changes, lines simply stop matching and take
+# the full-parse path, so the prefix is an optimisation, never a requirement.
+_STREAM_EVENT_PREFIX = b'{"type":"stream_event"'
+# The only stream_event anything consumes (see _parse_stream_event).
+_MESSAGE_DELTA_MARKER = b'"message_delta"'
+
+
 def parse_line(line: str) -> StreamEvent | None:
     """Parse a single line of stream-json output into a StreamEvent.
 
@@ -38,36 +48,61 @@ def parse_line(line: str) -> StreamEvent | None:
         return None
 
     try:
-        data: dict[str, Any] = json.loads(line)
-    except json.JSONDecodeError:
+        data = decode_json_object(line)
+    except MalformedFrameError:
         logger.warning("Failed to parse stream-json line: %s", line[:200])
         return None
 
-    msg_type_str = data.get("type", "")
+    return _DISPATCH(data)
+
+
+def parse_line_bytes(line: bytes, stats: DecodeStats | None = None) -> StreamEvent | None:
+    """Parse a raw stdout line, skipping ``stream_event`` partials nobody reads.
+
+    With ``--include-partial-messages`` most of a turn's stdout is
+    ``stream_event`` lines — one per text, thinking or tool-input delta — and
+    a thinking-heavy turn produces thousands of them. The only one consumed
+    downstream is ``message_delta`` (for the turn's final usage); the rest
+    used to be decoded, stripped, fully ``json.loads``-ed and wrapped in an
+    empty StreamEvent that every consumer then ignored.
+
+    Here such lines are recognised from their raw bytes and dropped before any
+    decoding. A line that merely *might* be a ``message_delta`` (the marker
+    appears anywhere in it unescaped) is parsed in full, so the shortcut can
+    only ever skip work, never an event that matters.
+    Everything else goes straight to ``json.loads`` on the bytes, without an
+    intermediate ``str``.
+
+    Skipped, malformed and unknown lines are counted in ``stats`` when given.
+    Returns None for skipped, empty or unparseable lines.
+    """
+    line = line.strip()
+    if not line:
+        return None
+    if line.startswith(_STREAM_EVENT_PREFIX) and _MESSAGE_DELTA_MARKER not in line:
+        if stats is not None:
+            stats.skipped += 1
+        return None
+
     try:
-        msg_type = MessageType(msg_type_str)
-    except ValueError:
-        logger.debug("Unknown message type: %s", msg_type_str)
+        # "replace" matches parse_line's tolerance for the odd invalid byte.
+        data = decode_json_object(line, stats, errors="replace")
+    except MalformedFrameError:
+        logger.warning("Failed to parse stream-json line: %r", line[:200])
         return None
 
-    event = StreamEvent(message_type=msg_type)
+    return _DISPATCH(data, stats)
 
-    if msg_type == MessageType.SYSTEM:
-        _parse_system(data, event)
-    elif msg_type == MessageType.ASSISTANT:
-        _parse_assistant(data, event)
-    elif msg_type == MessageType.USER:
-        _parse_user(data, event)
-    elif msg_type == MessageType.RESULT:
-        _parse_result(data, event)
-    elif msg_type == MessageType.PROGRESS:
-        _parse_progress(data, event)
-    elif msg_type == MessageType.RATE_LIMIT_EVENT:
-        _parse_rate_limit_event(data, event)
-    elif msg_type == MessageType.STREAM_EVENT:
-        _parse_stream_event(data, event)
 
-    return event
+def _typed(
+    msg_type: MessageType, parse: Callable[[dict[str, Any], StreamEvent], None]
+) -> Callable[[dict[str, Any]], StreamEvent]:
+    def handler(data: dict[str, Any]) -> StreamEvent:
+        event = StreamEvent(message_type=msg_type)
+        parse(data, event)
+        return event
+
+    return handler
 
 
 def _parse_system(data: dict[str, Any], event: StreamEvent) -> None:
@@ -344,6 +379,21 @@ def _parse_stream_event(data: dict[str, Any], event: StreamEvent) -> None:
     event.cache_creation_tokens = usage.get("cache_creation_input_tokens")
 
 
+_DISPATCH: Dispatcher[StreamEvent] = Dispatcher(
+    {
+        MessageType.SYSTEM.value: _typed(MessageType.SYSTEM, _parse_system),
+        MessageType.ASSISTANT.value: _typed(MessageType.ASSISTANT, _parse_assistant),
+        MessageType.USER.value: _typed(MessageType.USER, _parse_user),
+        MessageType.RESULT.value: _typed(MessageType.RESULT, _parse_result),
+        MessageType.PROGRESS.value: _typed(MessageType.PROGRESS, _parse_progress),
+        MessageType.RATE_LIMIT_EVENT.value: _typed(
+            MessageType.RATE_LIMIT_EVENT, _parse_rate_limit_event
+        ),
+        MessageType.STREAM_EVENT.value: _typed(MessageType.STREAM_EVENT, _parse_stream_event),
+    }
+)
+
+
 def _parse_ask_questions(tool_input: dict[str, Any]) -> list[AskQuestion]:
     """Parse AskUserQuestion input, including JSON-encoded nested values."""
 
@@ -0,0 +1,227 @@
+"""Per-thread CLI processes kept alive between turns.
+
+With ``--input-format stream-json`` the CLI does not exit after answering: it
+emits the turn's ``result`` and waits on stdin for the next user message. The
+runner used to kill it at that point anyway, so every reply on a thread started
+a fresh process that ran ``--resume`` and re-read the whole transcript before
+doing anything else — a cost that grows with exactly the threads that are used
+most.
+
+This registry lets a runner *park* the process after a clean turn instead, and
+the thread's next runner *claim* it and write the new message to its stdin. The
+conversation is already loaded in that process, so the turn starts immediately.
+
+A parked process is only reused when nothing about it could be stale:
+
+- the same thread, continuing the same session ID (a ``/clear``, a fork or a
+  cross-backend handoff all change the session ID);
+- the same launch parameters apart from ``--resume`` — model, permission mode,
+  tools, system prompt, working directory and environment.
+
+Anything else terminates the parked process and the turn spawns normally. The
+one change the session ID cannot reveal — ``/rewind`` truncating the transcript
+in place — is handled by the caller releasing the thread explicitly.
+
+Idle processes are reaped after ``idle_seconds`` and capped at ``max_processes``
+(the longest-idle one is evicted first), so a quiet thread gives its process
+back rather than holding it indefinitely.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from .process_pool import _terminate
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["PersistentProcessRegistry", "PersistentProcessStats"]
+
+DEFAULT_IDLE_SECONDS = 600.0
+DEFAULT_MAX_PROCESSES = 8
+
+# (argv without --resume, cwd, sorted env items)
+_Signature = tuple[tuple[str, ...], str, tuple[tuple[str, str], ...]]
+
+
+def process_signature(args: list[str], cwd: str, env: dict[str, str]) -> _Signature:
+    """Everything about a launch that must match for a parked process to be reused."""
+    return (tuple(args), cwd, tuple(sorted(env.items())))
+
+
+@dataclass
+class PersistentProcessStats:
+    """Counters for how often turns reuse a parked process."""
+
+    reused: int = 0
+    parked: int = 0
+    mismatched: int = 0
+    reaped: int = 0
+    evicted: int = 0
+    released: int = 0
+
+
+@dataclass
+class _Parked:
+    process: asyncio.subprocess.Process
+    session_id: str
+    signature: _Signature
+    parked_at: float
+    reaper: asyncio.TimerHandle | None = None
+
+
+class PersistentProcessRegistry:
+    """Parked CLI processes, at most one per thread."""
+
+    def __init__(
+        self,
+        *,
+        idle_seconds: float = DEFAULT_IDLE_SECONDS,
+        max_processes: int = DEFAULT_MAX_PROCESSES,
+    ) -> None:
+        if idle_seconds <= 0:
+            raise ValueError("idle_seconds must be positive")
+        if max_processes < 1:
+            raise ValueError("max_processes must be at least 1")
+        self.idle_seconds = idle_seconds
+        self.max_processes = max_processes
+        self.stats = PersistentProcessStats()
+        self._parked: OrderedDict[int, _Parked] = OrderedDict()
+        self._tasks: set[asyncio.Task[None]] = set()
+        self._closed = False
+
+    @property
+    def parked_count(self) -> int:
+        """Number of threads with a process waiting for their next message."""
+        return len(self._parked)
+
+    def is_parked(self, thread_id: int) -> bool:
+        return thread_id in self._parked
+
+    def claim(
+        self,
+        thread_id: int,
+        *,
+        session_id: str,
+        signature: _Signature,
+    ) -> asyncio.subprocess.Process | None:
+        """Take the thread's parked process if it can serve this turn, else ``None``.
+
+        A parked process that cannot be reused is terminated in the background:
+        the thread is about to spawn a replacement, and two live processes for
+        one thread is exactly what the cog's run slot exists to prevent.
+        """
+        parked = self._parked.pop(thread_id, None)
+        if parked is None:
+            return None
+        if parked.reaper is not None:
+            parked.reaper.cancel()
+        if (
+            parked.process.returncode is None
+            and parked.session_id == session_id
+            and parked.signature == signature
+        ):
+            self.stats.reused += 1
+            logger.info(
+                "Reusing kept-alive CLI process for thread %d: pid=%s (idle %.0fs)",
+                thread_id,
+                parked.process.pid,
+                time.monotonic() - parked.parked_at,
+            )
+            return parked.process
+        self.stats.mismatched += 1
+        logger.debug("Kept-alive process for thread %d no longer matches; stopping it", thread_id)
+        self._terminate_later(parked.process)
+        return None
+
+    def park(
+        self,
+        thread_id: int,
+        process: asyncio.subprocess.Process,
+        *,
+        session_id: str,
+        signature: _Signature,
+    ) -> bool:
+        """Keep ``process`` for the thread's next turn. Returns False if refused.
+
+        The caller still owns the process when this returns False and must stop
+        it itself.
+        """
+        if self._closed or process.returncode is not None:
+            return False
+        previous = self._parked.pop(thread_id, None)
+        if previous is not None:
+            self._drop(previous)
+        while len(self._parked) >= self.max_processes:
+            _, oldest = self._parked.popitem(last=False)
+            self.stats.evicted += 1
+            self._drop(oldest)
+        parked = _Parked(
+            process=process,
+            session_id=session_id,
+            signature=signature,
+            parked_at=time.monotonic(),
+        )
+        parked.reaper = asyncio.get_running_loop().call_later(
+            self.idle_seconds, self._reap, thread_id, parked
+        )
+        self._parked[thread_id] = parked
+        self.stats.parked += 1
+        logger.debug("Parked CLI process for thread %d: pid=%s", thread_id, process.pid)
+        return True
+
+    async def release(self, thread_id: int) -> None:
+        """Stop the thread's parked process, if any (e.g. after /clear or /rewind)."""
+        parked = self._parked.pop(thread_id, None)
+        if parked is None:
+            return
+        if parked.reaper is not None:
+            parked.reaper.cancel()
+        self.stats.released += 1
+        await _terminate(parked.process)
+
+    async def close(self) -> None:
+        """Stop every parked process; later ``park`` calls are refused."""
+        self._closed = True
+        parked = list(self._parked.values())
+        self._parked.clear()
+        for entry in parked:
+            if entry.reaper is not None:
+                entry.reaper.cancel()
+            await _terminate(entry.process)
+        for task in list(self._tasks):
+            with contextlib.suppress(Exception):
+                await task
+        logger.info(
+            "Kept-alive CLI processes closed: %d reused, %d parked, %d reaped",
+            self.stats.reused,
+            self.stats.parked,
+            self.stats.reaped,
+        )
+
+    def _reap(self, thread_id: int, parked: _Parked) -> None:
+        if self._parked.get(thread_id) is not parked:
+            return
+        del self._parked[thread_id]
+        self.stats.reaped += 1
+        logger.info(
+            "Reaping kept-alive CLI process for thread %d after %.0fs idle",
+            thread_id,
+            self.idle_seconds,
+        )
+        self._terminate_later(parked.process)
+
+    def _drop(self, parked: _Parked) -> None:
+        if parked.reaper is not None:
+            parked.reaper.cancel()
+        self._terminate_later(parked.process)
+
+    def _terminate_later(self, process: asyncio.subprocess.Process) -> None:
+        task = asyncio.create_task(_terminate(process))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
@@ -86,7 +86,6 @@ class AnonymizingBackend:
         outcome = await gateway.guard(prompt, **context)
         if not outcome.allowed:
             yield StreamEvent(
-                raw={},
                 message_type=MessageType.RESULT,
                 is_complete=True,
                 error=outcome.reason,
@@ -95,7 +94,6 @@ class AnonymizingBackend:
 
         if outcome.warning:
             yield StreamEvent(
-                raw={},
                 message_type=MessageType.SYSTEM,
                 text=f"⚠️ {outcome.warning}",
             )
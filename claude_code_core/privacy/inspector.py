@@ -5,9 +5,9 @@ at proper nouns the rules did not cover. It never rewrites anything — if it
 did, the substitution would stop being deterministic and the answer could no
 longer be restored.
 
-Transport is plain ``urllib`` against an Ollama-compatible endpoint, run in a
-worker thread (see ``local_llm.py``). No new dependency, and no network call
-that isn't the local one the operator configured.
+Transport is the shared async Ollama client against an Ollama-compatible
+endpoint (see ``local_llm.py``). No new dependency, and no network call that
+isn't the local one the operator configured.
 
 Contrast with ``answerability.py``, which shares the transport and reverses the
 failure direction: an unreachable inspector must block, because the harm it
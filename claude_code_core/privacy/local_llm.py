@@ -12,24 +12,28 @@ part worth sharing is not the prompt — it is the pile of gotchas around it:
   runs cannot be reasoned about.
 
 A second hand-rolled copy of this is where those come back one at a time.
+
+Requests go through the shared, pooled client in :mod:`..ollama_client`, so a
+guard question reuses the connection the last one left open instead of taking
+a worker thread and a fresh TCP handshake.
 """
 
 from __future__ import annotations
 
-import asyncio
 import json
 import logging
-import urllib.error
-import urllib.request
 from typing import Any
 
+from ..ollama_client import OllamaError, shared_client
+
 logger = logging.getLogger(__name__)
 
 __all__ = ["chat_json", "extract_json_object", "TRANSPORT_ERRORS"]
 
 # The errors a caller is expected to translate into "unavailable" rather than
 # let propagate. Named once so the inspector and the judge agree on the set.
-TRANSPORT_ERRORS = (urllib.error.URLError, OSError, TimeoutError)
+# The shared Ollama client reports every transport failure as OllamaError.
+TRANSPORT_ERRORS = (OllamaError, OSError, TimeoutError)
 
 
 async def chat_json(
@@ -46,22 +50,11 @@ async def chat_json(
     Raises on transport failure — the caller decides what an unreachable model
     means, and the two callers here deliberately decide differently.
     """
-    return await asyncio.to_thread(
-        _request,
-        base_url=base_url.rstrip("/"),
-        model=model,
-        system=system,
-        user=user[:max_chars],
-        timeout_seconds=timeout_seconds,
-    )
-
-
-def _request(*, base_url: str, model: str, system: str, user: str, timeout_seconds: float) -> str:
     payload = {
         "model": model,
         "messages": [
             {"role": "system", "content": system},
-            {"role": "user", "content": user},
+            {"role": "user", "content": user[:max_chars]},
         ],
         "stream": False,
         "format": "json",
@@ -69,16 +62,14 @@ def _request(*, base_url: str, model: str, system: str, user: str, timeout_secon
         "think": False,
         "options": {"temperature": 0},
     }
-    request = urllib.request.Request(  # noqa: S310 - operator-configured local URL
-        f"{base_url}/api/chat",
-        data=json.dumps(payload).encode("utf-8"),
-        headers={"Content-Type": "application/json"},
+    parsed = await shared_client().request(
+        f"{base_url.rstrip('/')}/api/chat",
         method="POST",
+        payload=payload,
+        timeout_seconds=timeout_seconds,
     )
-    with urllib.request.urlopen(request, timeout=timeout_seconds) as response:  # noqa: S310
-        body = response.read().decode("utf-8", errors="replace")
-    parsed = json.loads(body)
-    return str(parsed.get("message", {}).get("content", ""))
+    message = parsed.get("message") if isinstance(parsed, dict) else None
+    return str(message.get("content", "")) if isinstance(message, dict) else ""
 
 
 def extract_json_object(raw: str) -> dict[str, Any] | None:
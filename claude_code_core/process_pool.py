@@ -0,0 +1,257 @@
+"""Warm pool of pre-spawned CLI subprocesses.
+
+Every turn used to pay the CLI's full cold start — Node startup, CLI init and
+MCP server boot — before the first token, because ``ClaudeRunner.run()``
+spawned a fresh ``claude -p`` process per message. The prompt reaches the CLI
+on stdin (``--input-format stream-json``), not in argv, so a process can be
+started *before* the message exists and simply wait for it. This module keeps a
+small number of such idle processes ready and hands one to a turn whose launch
+parameters match exactly.
+
+A match means the same argv, working directory and environment. That is
+deliberately strict: argv carries the model, permission mode, ``--resume`` ID
+and system prompt, and the environment carries the thread ID and API secret. A
+process started for a different thread or with a different system prompt is not
+"close enough" — it is the wrong session — so anything short of an exact match
+is a miss and the turn spawns normally.
+
+The pool is opt-in and bounded: ``max_size`` caps how many idle processes exist
+at once (the oldest is evicted to make room), and every idle process is reaped
+after ``ttl_seconds`` so an abandoned warm-up never outlives its usefulness.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from .stream_decode import DEFAULT_MAX_LINE_BYTES
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["PoolStats", "WarmProcessPool"]
+
+DEFAULT_MAX_SIZE = 2
+DEFAULT_TTL_SECONDS = 120.0
+
+_PoolKey = tuple[tuple[str, ...], str, tuple[tuple[str, str], ...]]
+
+
+def _pool_key(args: list[str], cwd: str, env: dict[str, str]) -> _PoolKey:
+    return (tuple(args), cwd, tuple(sorted(env.items())))
+
+
+@dataclass
+class PoolStats:
+    """Counters describing how well the pool is doing its job."""
+
+    hits: int = 0
+    misses: int = 0
+    spawned: int = 0
+    expired: int = 0
+    evicted: int = 0
+    spawn_failures: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of acquisitions served from the pool (0.0 when unused)."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+@dataclass
+class _Entry:
+    process: asyncio.subprocess.Process
+    created_at: float
+    ttl_seconds: float
+    reaper: asyncio.TimerHandle | None = None
+
+
+class WarmProcessPool:
+    """Idle CLI processes, keyed by their exact launch parameters.
+
+    Usage from a runner::
+
+        process = await pool.acquire(args, cwd=cwd, env=env)
+        if process is None:
+            process = await asyncio.create_subprocess_exec(...)
+        ...
+        pool.replenish(next_args, cwd=cwd, env=env)  # after the turn ends
+
+    ``replenish`` is called once the turn's own process has exited rather than
+    when it is claimed. A ``--resume`` process reads the transcript as it
+    starts, and one started while the previous turn was still writing to it
+    would begin from a conversation missing that turn.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_size: int = DEFAULT_MAX_SIZE,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+    ) -> None:
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        if ttl_seconds <= 0:
+            raise ValueError("ttl_seconds must be positive")
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.stats = PoolStats()
+        self._idle: OrderedDict[_PoolKey, _Entry] = OrderedDict()
+        self._pending: set[_PoolKey] = set()
+        self._tasks: set[asyncio.Task[None]] = set()
+        self._closed = False
+
+    @property
+    def idle_count(self) -> int:
+        """Number of warm processes currently waiting to be claimed."""
+        return len(self._idle)
+
+    async def acquire(
+        self,
+        args: list[str],
+        *,
+        cwd: str,
+        env: dict[str, str],
+    ) -> asyncio.subprocess.Process | None:
+        """Claim a ready process for these launch parameters, or ``None`` on a miss.
+
+        A process that died while idle, or that outlived its TTL, counts as a
+        miss: handing it out would fail the turn instead of just not speeding
+        it up.
+        """
+        entry = self._idle.pop(_pool_key(args, cwd, env), None)
+        if entry is not None:
+            if entry.reaper is not None:
+                entry.reaper.cancel()
+            alive = entry.process.returncode is None
+            fresh = time.monotonic() - entry.created_at < entry.ttl_seconds
+            if alive and fresh:
+                self.stats.hits += 1
+                logger.info("Warm pool hit: pid=%s (%d idle)", entry.process.pid, self.idle_count)
+                return entry.process
+            self.stats.expired += 1
+            await _terminate(entry.process)
+        self.stats.misses += 1
+        return None
+
+    def replenish(
+        self,
+        args: list[str],
+        *,
+        cwd: str,
+        env: dict[str, str],
+        ttl_seconds: float | None = None,
+    ) -> bool:
+        """Start a warm process for these launch parameters in the background.
+
+        No-op when one is already idle or being spawned for the same key, so a
+        burst of turns for one thread never stacks up duplicate processes.
+        ``ttl_seconds`` shortens (or lengthens) the pool's TTL for this one
+        process — a speculative warm-up should not hold memory as long as one
+        started for a turn that just ended. Returns whether a spawn was started.
+        """
+        if self._closed:
+            return False
+        key = _pool_key(args, cwd, env)
+        if key in self._idle or key in self._pending:
+            return False
+        self._pending.add(key)
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        task = asyncio.create_task(self._spawn(key, list(args), cwd, dict(env), ttl))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return True
+
+    async def close(self) -> None:
+        """Cancel pending spawns and terminate every idle process."""
+        self._closed = True
+        for task in list(self._tasks):
+            task.cancel()
+        for task in list(self._tasks):
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                await task
+        entries = list(self._idle.values())
+        self._idle.clear()
+        for entry in entries:
+            if entry.reaper is not None:
+                entry.reaper.cancel()
+            await _terminate(entry.process)
+        logger.info(
+            "Warm pool closed: %d hit(s), %d miss(es), %d spawned, %d expired, %d evicted",
+            self.stats.hits,
+            self.stats.misses,
+            self.stats.spawned,
+            self.stats.expired,
+            self.stats.evicted,
+        )
+
+    async def _spawn(
+        self, key: _PoolKey, args: list[str], cwd: str, env: dict[str, str], ttl_seconds: float
+    ) -> None:
+        # Same StreamReader limit ClaudeRunner gives a process it spawns itself;
+        # a warm process must be indistinguishable from a cold one.
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *args,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=cwd,
+                env=env,
+                limit=DEFAULT_MAX_LINE_BYTES,
+            )
+        except Exception:
+            self._pending.discard(key)
+            self.stats.spawn_failures += 1
+            logger.warning("Warm pool could not pre-spawn %s", args[0], exc_info=True)
+            return
+
+        if self._closed:
+            self._pending.discard(key)
+            await _terminate(process)
+            return
+
+        while len(self._idle) >= self.max_size:
+            _, oldest = self._idle.popitem(last=False)
+            if oldest.reaper is not None:
+                oldest.reaper.cancel()
+            self.stats.evicted += 1
+            await _terminate(oldest.process)
+
+        entry = _Entry(process=process, created_at=time.monotonic(), ttl_seconds=ttl_seconds)
+        entry.reaper = asyncio.get_running_loop().call_later(ttl_seconds, self._expire, key)
+        self._idle[key] = entry
+        self._pending.discard(key)
+        self.stats.spawned += 1
+        logger.debug("Warm pool pre-spawned pid=%s (%d idle)", process.pid, self.idle_count)
+
+    def _expire(self, key: _PoolKey) -> None:
+        entry = self._idle.pop(key, None)
+        if entry is None:
+            return
+        self.stats.expired += 1
+        logger.debug(
+            "Warm pool reaping idle pid=%s after %.0fs", entry.process.pid, entry.ttl_seconds
+        )
+        task = asyncio.create_task(_terminate(entry.process))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+
+async def _terminate(process: asyncio.subprocess.Process) -> None:
+    """Stop an idle process, force-killing it if it ignores SIGTERM."""
+    if process.returncode is not None:
+        return
+    with contextlib.suppress(ProcessLookupError):
+        process.terminate()
+    try:
+        await asyncio.wait_for(process.wait(), timeout=5)
+    except TimeoutError:
+        with contextlib.suppress(ProcessLookupError):
+            process.kill()
+        await process.wait()
@@ -0,0 +1,174 @@
+"""Adaptive session concurrency driven by the CLI's rate-limit events.
+
+The CLI reports the account's quota as ``rate_limit_event`` messages — per
+window (five-hour, seven-day, …) a status, a utilization and the time the
+window resets — and the parser turns them into :class:`RateLimitInfo`. Those
+were only stored for ``/usage``; the scheduler kept admitting as many runs as
+it had slots right up to the quota, so the last few turns of a window failed
+with a hard 429 halfway through, and a scheduled job could spend the quota a
+person was about to need.
+
+:class:`RateLimitPacer` watches the same events and narrows
+:class:`~claude_code_core.session_scheduler.SessionScheduler` as a window
+fills, using the most-used window that has not reset yet:
+
+- below ``slow_at`` (or with no live window) the full limit applies;
+- from ``slow_at``, or on an ``allowed_warning`` status, half the slots;
+- from ``hold_at``, or once a window is ``rejected``, a single slot, and every
+  non-interactive class (scheduled tasks, webhook triggers, spawned and
+  ingested sessions) waits in the queue.
+
+Only the account-wide windows (:data:`ACCOUNT_WINDOWS`) pace. A
+model-specific window such as ``seven_day_sonnet`` caps one model, not the
+account, and a window reported with ``is_using_overage`` is being billed as
+overage, so requests against it still succeed. Holding is for a window that
+resets soon: one that resets more than ``max_hold_seconds`` out — the
+seven-day window near its cap can be days away — only slows, so background
+work is never parked for longer than that. Runs on another backend do not
+spend this quota at all; the caller enqueues them with ``paced=False``.
+
+Nothing running is stopped. When the window behind the throttle resets, the
+pacer re-evaluates on a timer and restores capacity, so held work starts at
+the top of the next window instead of failing at the end of this one.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .session_scheduler import SessionScheduler
+    from .types import RateLimitInfo
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["ACCOUNT_WINDOWS", "PacerStats", "RateLimitPacer"]
+
+DEFAULT_SLOW_AT = 0.75
+DEFAULT_HOLD_AT = 0.9
+DEFAULT_MAX_HOLD_SECONDS = 6 * 3600
+
+#: Windows that cap every request on the account.
+ACCOUNT_WINDOWS = frozenset({"five_hour", "seven_day"})
+
+
+@dataclass
+class PacerStats:
+    """How many events were observed, and how often they changed the pace."""
+
+    observed: int = 0
+    slowed: int = 0
+    held: int = 0
+    restored: int = 0
+
+
+class RateLimitPacer:
+    """Turns :class:`RateLimitInfo` events into :meth:`SessionScheduler.throttle` calls."""
+
+    def __init__(
+        self,
+        scheduler: SessionScheduler,
+        *,
+        slow_at: float = DEFAULT_SLOW_AT,
+        hold_at: float = DEFAULT_HOLD_AT,
+        max_hold_seconds: float = DEFAULT_MAX_HOLD_SECONDS,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if not 0 < slow_at <= hold_at <= 1:
+            raise ValueError("need 0 < slow_at <= hold_at <= 1")
+        if max_hold_seconds < 0:
+            raise ValueError("max_hold_seconds must not be negative")
+        self.scheduler = scheduler
+        self.slow_at = slow_at
+        self.hold_at = hold_at
+        self.max_hold_seconds = max_hold_seconds
+        self.stats = PacerStats()
+        self._clock = clock
+        self._latest: dict[str, RateLimitInfo] = {}
+        self._state = "normal"
+        self._held_until: int | None = None
+        self._timer: asyncio.TimerHandle | None = None
+
+    @property
+    def held_until(self) -> int | None:
+        """Unix time background work is held until, or ``None`` when it is not held."""
+        return self._held_until
+
+    def observe(self, info: RateLimitInfo) -> None:
+        """Record the latest state of one rate-limit window and re-pace."""
+        if not info.rate_limit_type:
+            return
+        self.stats.observed += 1
+        self._latest[info.rate_limit_type] = info
+        self.refresh()
+
+    def close(self) -> None:
+        """Cancel the pending re-evaluation timer."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def refresh(self) -> None:
+        """Re-pace from the windows seen so far; runs on a timer when one resets."""
+        now = self._clock()
+        # A window that has reset says nothing about the new one; one without
+        # a reset time cannot be waited out, so neither may throttle.
+        live = [
+            i
+            for i in self._latest.values()
+            if i.resets_at > now and i.rate_limit_type in ACCOUNT_WINDOWS and not i.is_using_overage
+        ]
+        exhausted = [i for i in live if i.status == "rejected" or i.utilization >= self.hold_at]
+        holding = [i for i in exhausted if i.resets_at - now <= self.max_hold_seconds]
+        slowing = [
+            i
+            for i in live
+            if i in exhausted or i.status == "allowed_warning" or i.utilization >= self.slow_at
+        ]
+
+        if holding:
+            state, pacing = "held", holding
+            self._held_until = max(i.resets_at for i in holding)
+            self.scheduler.throttle(1, hold_background=True)
+        elif slowing:
+            state, pacing = "slowed", slowing
+            self._held_until = None
+            self.scheduler.throttle(max(1, math.ceil(self.scheduler.max_concurrent / 2)))
+        else:
+            state, pacing = "normal", []
+            self._held_until = None
+            self.scheduler.throttle(None)
+
+        if state != self._state:
+            if state == "held":
+                self.stats.held += 1
+            elif state == "slowed":
+                self.stats.slowed += 1
+            else:
+                self.stats.restored += 1
+            logger.info(
+                "Rate-limit pacing %s -> %s (limit %d%s)",
+                self._state,
+                state,
+                self.scheduler.limit,
+                ", background held" if state == "held" else "",
+            )
+            self._state = state
+        self._reevaluate_at(min((i.resets_at for i in pacing), default=None), now)
+
+    def _reevaluate_at(self, resets_at: int | None, now: float) -> None:
+        self.close()
+        if resets_at is None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        # A second late rather than early, so the window has really reset.
+        self._timer = loop.call_later(max(0.0, resets_at - now) + 1.0, self.refresh)
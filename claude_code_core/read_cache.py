@@ -0,0 +1,138 @@
+"""Bounded read-through cache for rows a repository owns.
+
+Setting up a turn reads the same few rows every time: the thread's
+``SessionRecord`` and, through ``BackendSettings``, a thread override, a
+global value and sometimes an effort or worker key — each one a query, and
+almost always the same answer as last turn. Those rows change only when this
+process writes them, through the very repository that reads them, so the
+repository can keep what it read and forget it when it writes.
+
+:class:`ReadCache` is that memory: a least-recently-used map with a size
+bound and hit/miss counters. A repository handed one looks there first and
+goes to SQLite only on a miss, and every write the repository makes updates
+or drops the cached entry. Absence is cached as well — "no thread override"
+is the most common answer of all — so a caller must tell a cached ``None``
+from a miss; :meth:`ReadCache.get` returns :data:`MISSING` for the latter.
+
+A read that was in flight while a write landed must not cache what it read
+before the write. :meth:`ReadCache.fill` takes the :attr:`ReadCache.version`
+seen before the query and ignores the value if any write has happened since.
+
+Coherence holds only for writes through the caching repository. The session
+database belongs to one bot process, and every writer in that process uses
+the repositories from ``build_session_stores``; anything else that edits the
+file directly must call :meth:`ReadCache.clear`.
+"""
+
+from __future__ import annotations
+
+import enum
+from collections import OrderedDict
+from collections.abc import Hashable
+from dataclasses import dataclass
+from typing import Final, Literal
+
+__all__ = ["MISSING", "CacheStats", "ReadCache"]
+
+DEFAULT_MAX_ENTRIES = 1024
+
+
+class _Missing(enum.Enum):
+    MISSING = enum.auto()
+
+
+#: Returned by :meth:`ReadCache.get` when the key is not cached.
+MISSING: Final = _Missing.MISSING
+
+
+@dataclass
+class CacheStats:
+    """How well the cache is doing."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of lookups answered from memory, 0.0 before the first one."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class ReadCache[K: Hashable, V]:
+    """At most ``max_entries`` values, least recently used evicted first.
+
+    Usage in a repository::
+
+        cached = self._cache.get(key)
+        if cached is not MISSING:
+            return cached
+        version = self._cache.version
+        value = ...  # read from SQLite
+        self._cache.fill(key, value, version)
+        return value
+
+    and, after every write, :meth:`put` the new value or :meth:`invalidate`.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.stats = CacheStats()
+        self._entries: OrderedDict[K, V] = OrderedDict()
+        self._version = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def version(self) -> int:
+        """Bumped by every write; see :meth:`fill`."""
+        return self._version
+
+    def get(self, key: K) -> V | Literal[_Missing.MISSING]:
+        """The cached value for ``key``, or :data:`MISSING`."""
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self.stats.misses += 1
+            return MISSING
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return value
+
+    def peek(self, key: K) -> V | Literal[_Missing.MISSING]:
+        """Like :meth:`get`, without counting a lookup or refreshing recency."""
+        return self._entries.get(key, MISSING)
+
+    def fill(self, key: K, value: V, version: int) -> None:
+        """Cache a value read from the database, unless a write happened since ``version``."""
+        if version == self._version:
+            self._store(key, value)
+
+    def put(self, key: K, value: V) -> None:
+        """Record a value the repository has just written."""
+        self._version += 1
+        self._store(key, value)
+
+    def invalidate(self, key: K) -> None:
+        """Forget ``key``; the next read goes to the database."""
+        self._version += 1
+        if self._entries.pop(key, MISSING) is not MISSING:
+            self.stats.invalidations += 1
+
+    def clear(self) -> None:
+        """Forget everything, e.g. after a bulk write."""
+        self._version += 1
+        self.stats.invalidations += len(self._entries)
+        self._entries.clear()
+
+    def _store(self, key: K, value: V) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
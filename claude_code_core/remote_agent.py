@@ -0,0 +1,439 @@
+"""Run a thread's backend on another machine.
+
+Every session ran as a subprocess of the bot, so the number of concurrent
+sessions — and the CPU, memory and checkouts they need — was capped by the one
+machine the bot lives on. :class:`RemoteAgent` is a small daemon to run on a
+build host (``python -m claude_code_core.remote_agent --listen …``). It hosts
+``ClaudeRunner``/``CodexRunner`` there and speaks the same line protocol as
+the local worker processes (:mod:`claude_code_core.session_worker`): parsed
+:class:`~claude_code_core.types.StreamEvent` objects flow back, and
+``interrupt``, ``kill`` and ``tool_result`` requests flow out.
+
+On the bot's side :class:`RemoteBackend` wraps the backend a thread would
+otherwise run locally, so nothing above the backend changes. Which worker a
+thread runs on is a backend setting (``/worker``); the workers themselves are
+listed in ``CCDB_REMOTE_WORKERS`` (see :func:`parse_endpoints`).
+
+Authentication is a shared token (``CCDB_REMOTE_AGENT_TOKEN``) proved by
+HMAC over a per-connection nonce, so the token itself never crosses the wire.
+The token does not encrypt or sign anything after the handshake, so the agent
+refuses plain ``tcp://`` on anything but a loopback address: across machines,
+listen on ``tls://`` (``--tls-cert``/``--tls-key``) or tunnel the port.
+
+The bot only says which backend to run and how the thread is configured. What
+runs on the agent's host is the agent's to decide: the CLI commands
+(``--claude-command``/``--codex-command``), the permission mode and whether
+permission prompts are skipped are its own settings, and the same fields in a
+``run`` request are ignored — a command path on the bot's host means nothing
+here, and honouring one would let whoever speaks for the bot run any binary.
+
+A remote turn runs with the worker's filesystem and credentials: the thread's
+working directory must exist at the same path there, and the bot's REST API
+(loopback-only on the bot's host) is not passed on. Anonymization is the bot's
+too: when its privacy gateway wraps backends, :class:`RemoteBackend` sits
+inside it, so the prompt is anonymized before it leaves the bot, and the agent
+builds its runners without a gateway of its own.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import hashlib
+import hmac
+import ipaddress
+import logging
+import os
+import secrets
+import ssl
+from collections.abc import AsyncGenerator, Callable, Mapping
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from .backend import create_backend
+from .event_wire import decode_event
+from .session_worker import build_runner, read_message, send_message, stream_turn
+from .stream_decode import DEFAULT_MAX_LINE_BYTES
+from .types import MessageType, StreamEvent
+from .worker_pool import SPEC_ATTRS, ProxyBackend
+
+if TYPE_CHECKING:
+    from .backend import SessionBackend
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "AgentStats",
+    "RemoteAgent",
+    "RemoteBackend",
+    "RemoteEndpoint",
+    "main",
+    "parse_endpoints",
+]
+
+TOKEN_ENV = "CCDB_REMOTE_AGENT_TOKEN"
+DEFAULT_MAX_TURNS = 8
+HANDSHAKE_TIMEOUT_SECONDS = 10.0
+
+# ``api_port`` points at the bot's loopback API, which a remote host cannot reach;
+# the rest are the agent's own settings (see the module docstring).
+_NOT_SENT = ("api_port", "command", "permission_mode", "dangerously_skip_permissions")
+REMOTE_SPEC_ATTRS = tuple(attr for attr in SPEC_ATTRS if attr not in _NOT_SENT)
+DEFAULT_COMMANDS: Mapping[str, str] = {"claude": "claude", "codex": "codex", "local": "codex"}
+
+
+def _mac(token: str, nonce: str) -> str:
+    return hmac.new(token.encode(), nonce.encode(), hashlib.sha256).hexdigest()
+
+
+def _split_address(address: str) -> tuple[str, str]:
+    scheme, sep, rest = address.partition("://")
+    if not sep or scheme not in ("tcp", "tls", "unix") or not rest:
+        raise ValueError(f"expected tcp://, tls:// or unix:// address, got {address!r}")
+    return scheme, rest
+
+
+def _host_port(rest: str) -> tuple[str, int]:
+    host, _, port = rest.rpartition(":")
+    if not host or not port.isdigit():
+        raise ValueError(f"expected host:port, got {rest!r}")
+    return host.strip("[]"), int(port)
+
+
+def _is_loopback(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+@dataclass(frozen=True)
+class RemoteEndpoint:
+    """Where a named worker listens, and the token it expects."""
+
+    name: str
+    address: str
+    token: str
+    ca_file: str | None = None
+
+    async def connect(self) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        """Open a connection to the worker (not yet authenticated)."""
+        scheme, rest = _split_address(self.address)
+        if scheme == "unix":
+            return await asyncio.open_unix_connection(rest, limit=DEFAULT_MAX_LINE_BYTES)
+        host, port = _host_port(rest)
+        context = ssl.create_default_context(cafile=self.ca_file) if scheme == "tls" else None
+        return await asyncio.open_connection(host, port, ssl=context, limit=DEFAULT_MAX_LINE_BYTES)
+
+
+def parse_endpoints(
+    raw: str, *, token: str, ca_file: str | None = None
+) -> dict[str, RemoteEndpoint]:
+    """Parse ``CCDB_REMOTE_WORKERS``: ``name=tls://host:port,name2=unix:///path``."""
+    endpoints: dict[str, RemoteEndpoint] = {}
+    for item in raw.split(","):
+        if not item.strip():
+            continue
+        name, sep, address = item.partition("=")
+        name, address = name.strip(), address.strip()
+        if not sep or not name:
+            raise ValueError(f"expected name=address, got {item.strip()!r}")
+        scheme, rest = _split_address(address)
+        if scheme == "tcp" and not _is_loopback(_host_port(rest)[0]):
+            logger.warning(
+                "Remote worker %s is reached over unencrypted tcp:// (%s); "
+                "anyone on the path can read and alter its turns. Use tls://.",
+                name,
+                address,
+            )
+        endpoints[name] = RemoteEndpoint(name, address, token, ca_file)
+    return endpoints
+
+
+async def authenticate(
+    reader: asyncio.StreamReader, writer: asyncio.StreamWriter, token: str
+) -> str | None:
+    """Answer the agent's challenge. Returns ``None`` when accepted, else the reason."""
+    challenge = await asyncio.wait_for(read_message(reader), HANDSHAKE_TIMEOUT_SECONDS)
+    if challenge is None or challenge.get("type") != "challenge":
+        return "the worker did not send a challenge"
+    await send_message(writer, {"type": "hello", "mac": _mac(token, str(challenge["nonce"]))})
+    reply = await asyncio.wait_for(read_message(reader), HANDSHAKE_TIMEOUT_SECONDS)
+    if reply is None or reply.get("type") != "ready":
+        return (reply or {}).get("error") or "the worker closed the connection"
+    return None
+
+
+@dataclass
+class AgentStats:
+    """Connections accepted and refused, and turns run."""
+
+    accepted: int = 0
+    rejected: int = 0
+    busy: int = 0
+    turns: int = 0
+
+
+class RemoteAgent:
+    """The daemon side: authenticates the bot and runs the turns it sends.
+
+    ``commands`` maps each backend the agent offers to the CLI it runs;
+    ``permission_mode`` (``None`` keeps each runner's default) and
+    ``dangerously_skip_permissions`` apply to every turn.
+    """
+
+    def __init__(
+        self,
+        token: str,
+        *,
+        max_turns: int = DEFAULT_MAX_TURNS,
+        commands: Mapping[str, str] = DEFAULT_COMMANDS,
+        permission_mode: str | None = None,
+        dangerously_skip_permissions: bool = False,
+        build: Callable[..., SessionBackend] = create_backend,
+    ) -> None:
+        if not token:
+            raise ValueError("a remote agent needs a token")
+        if max_turns < 1:
+            raise ValueError("max_turns must be >= 1")
+        self.max_turns = max_turns
+        self.commands = dict(commands)
+        self.permission_mode = permission_mode
+        self.dangerously_skip_permissions = dangerously_skip_permissions
+        self.stats = AgentStats()
+        self._token = token
+        self._build = build
+        self._running = 0
+
+    async def serve(
+        self, address: str, *, ssl_context: ssl.SSLContext | None = None
+    ) -> asyncio.Server:
+        """Listen on ``address`` (``tcp://``, ``tls://`` or ``unix://``)."""
+        scheme, rest = _split_address(address)
+        if scheme == "unix":
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(rest)
+            server = await asyncio.start_unix_server(
+                self.handle, rest, limit=DEFAULT_MAX_LINE_BYTES
+            )
+            os.chmod(rest, 0o600)
+            return server
+        if scheme == "tls" and ssl_context is None:
+            raise ValueError("tls:// needs a certificate and key")
+        host, port = _host_port(rest)
+        if scheme == "tcp" and not _is_loopback(host):
+            raise ValueError(
+                f"refusing unencrypted tcp:// on {host}: only the handshake is "
+                "authenticated, so listen on tls:// or tunnel a loopback port"
+            )
+        return await asyncio.start_server(
+            self.handle,
+            host,
+            port,
+            ssl=ssl_context if scheme == "tls" else None,
+            limit=DEFAULT_MAX_LINE_BYTES,
+        )
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve one connection: handshake, then one turn."""
+        try:
+            if not await self._handshake(reader, writer):
+                return
+            request = await read_message(reader)
+            if request is None or request.get("type") != "run":
+                return
+            if self._running >= self.max_turns:
+                self.stats.busy += 1
+                await send_message(writer, {"type": "done", "error": "worker is at capacity"})
+                return
+            self._running += 1
+            self.stats.turns += 1
+            try:
+                runner = self._runner_for(request["backend"], request.get("spec") or {})
+                await stream_turn(
+                    runner, request["prompt"], request.get("session_id"), reader, writer
+                )
+            except (ConnectionError, OSError):
+                raise
+            except Exception as exc:
+                logger.exception("Remote turn failed")
+                await send_message(
+                    writer, {"type": "done", "error": str(exc) or type(exc).__name__}
+                )
+            finally:
+                self._running -= 1
+        except (ConnectionError, OSError, TimeoutError, ValueError) as exc:
+            logger.debug("Remote agent connection dropped: %s", exc)
+        finally:
+            writer.close()
+
+    def _runner_for(self, backend: str, spec: dict[str, Any]) -> SessionBackend:
+        command = self.commands.get(backend)
+        if command is None:
+            raise ValueError(f"this worker does not offer the {backend!r} backend")
+        # Only the thread's configuration comes from the wire; see the module docstring.
+        settings: dict[str, Any] = {
+            attr: spec[attr] for attr in (*REMOTE_SPEC_ATTRS, "images") if attr in spec
+        }
+        settings["command"] = command
+        # The bot anonymized the prompt already; this host's rules do not apply.
+        settings["anonymize"] = False
+        settings["dangerously_skip_permissions"] = self.dangerously_skip_permissions
+        if self.permission_mode is not None:
+            settings["permission_mode"] = self.permission_mode
+        return build_runner(backend, settings, self._build)
+
+    async def _handshake(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> bool:
+        nonce = secrets.token_hex(16)
+        await send_message(writer, {"type": "challenge", "nonce": nonce})
+        hello = await asyncio.wait_for(read_message(reader), HANDSHAKE_TIMEOUT_SECONDS)
+        mac = str((hello or {}).get("mac", ""))
+        if not hmac.compare_digest(mac, _mac(self._token, nonce)):
+            self.stats.rejected += 1
+            logger.warning("Remote agent: rejected a connection with a bad token")
+            await send_message(writer, {"type": "error", "error": "unauthorized"})
+            return False
+        self.stats.accepted += 1
+        await send_message(writer, {"type": "ready"})
+        return True
+
+
+def _error_event(message: str) -> StreamEvent:
+    return StreamEvent(message_type=MessageType.RESULT, is_complete=True, error=message)
+
+
+class RemoteBackend(ProxyBackend):
+    """Runs the wrapped backend's turns on a :class:`RemoteAgent`."""
+
+    _own = ("_inner", "_endpoint", "_backend", "_writer")
+
+    def __init__(self, inner: SessionBackend, endpoint: RemoteEndpoint, *, backend: str) -> None:
+        super().__init__(inner)
+        object.__setattr__(self, "_endpoint", endpoint)
+        object.__setattr__(self, "_backend", backend)
+        object.__setattr__(self, "_writer", None)
+
+    @property
+    def endpoint(self) -> RemoteEndpoint:
+        return object.__getattribute__(self, "_endpoint")
+
+    async def run(
+        self,
+        prompt: str,
+        session_id: str | None = None,
+    ) -> AsyncGenerator[StreamEvent, None]:
+        endpoint = self.endpoint
+        try:
+            reader, writer = await endpoint.connect()
+        except (OSError, ValueError) as exc:
+            yield _error_event(f"Could not reach worker `{endpoint.name}`: {exc}")
+            return
+        self._writer = writer
+        try:
+            refused = await authenticate(reader, writer, endpoint.token)
+            if refused is not None:
+                yield _error_event(f"Worker `{endpoint.name}` refused the turn: {refused}")
+                return
+            await send_message(
+                writer,
+                {
+                    "type": "run",
+                    "backend": object.__getattribute__(self, "_backend"),
+                    "spec": self.spec(REMOTE_SPEC_ATTRS),
+                    "prompt": prompt,
+                    "session_id": session_id,
+                },
+            )
+            while (message := await read_message(reader)) is not None:
+                if message.get("type") == "event":
+                    yield decode_event(message["event"])
+                elif message.get("type") == "done":
+                    if message.get("error"):
+                        yield _error_event(message["error"])
+                    return
+            yield _error_event(f"Lost the connection to worker `{endpoint.name}` mid-turn.")
+        except (ConnectionError, OSError, TimeoutError) as exc:
+            yield _error_event(f"Lost the connection to worker `{endpoint.name}`: {exc}")
+        finally:
+            self._writer = None
+            writer.close()
+
+    async def _send(self, message: dict[str, Any]) -> None:
+        writer: asyncio.StreamWriter | None = object.__getattribute__(self, "_writer")
+        if writer is not None and not writer.is_closing():
+            with contextlib.suppress(ConnectionError, OSError):
+                await send_message(writer, message)
+
+    async def interrupt(self) -> None:
+        await self._send({"type": "interrupt"})
+
+    async def kill(self) -> None:
+        await self._send({"type": "kill"})
+
+    async def inject_tool_result(self, request_id: str, data: dict) -> None:
+        await self._send({"type": "tool_result", "request_id": request_id, "data": data})
+
+    def clone(self, **kwargs: object) -> RemoteBackend:
+        """Clone the wrapped backend and keep it on the same worker."""
+        return RemoteBackend(
+            self.inner.clone(**kwargs),
+            self.endpoint,
+            backend=object.__getattribute__(self, "_backend"),
+        )
+
+
+async def _serve_forever(agent: RemoteAgent, address: str, context: ssl.SSLContext | None) -> None:
+    server = await agent.serve(address, ssl_context=context)
+    logger.info("Remote agent listening on %s (max %d turns)", address, agent.max_turns)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Entry point for ``python -m claude_code_core.remote_agent``."""
+    parser = argparse.ArgumentParser(description="ccdb remote execution agent")
+    parser.add_argument(
+        "--listen", required=True, help="tcp://host:port, tls://host:port or unix:///path"
+    )
+    parser.add_argument("--tls-cert", help="certificate for tls://")
+    parser.add_argument("--tls-key", help="private key for tls://")
+    parser.add_argument("--max-turns", type=int, default=DEFAULT_MAX_TURNS)
+    parser.add_argument("--claude-command", default=DEFAULT_COMMANDS["claude"])
+    parser.add_argument("--codex-command", default=DEFAULT_COMMANDS["codex"])
+    parser.add_argument("--permission-mode", help="default: each CLI's own default")
+    parser.add_argument("--dangerously-skip-permissions", action="store_true")
+    args = parser.parse_args(argv)
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+    )
+
+    # From the environment, not argv: argv is visible to every local user.
+    token = os.environ.get(TOKEN_ENV, "")
+    if not token:
+        parser.error(f"{TOKEN_ENV} must be set")
+    context = None
+    if args.tls_cert:
+        context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+        context.load_cert_chain(args.tls_cert, args.tls_key)
+    agent = RemoteAgent(
+        token,
+        max_turns=args.max_turns,
+        commands={
+            "claude": args.claude_command,
+            "codex": args.codex_command,
+            "local": args.codex_command,
+        },
+        permission_mode=args.permission_mode,
+        dangerously_skip_permissions=args.dangerously_skip_permissions,
+    )
+    try:
+        asyncio.run(_serve_forever(agent, args.listen, context))
+    except ValueError as exc:
+        parser.error(str(exc))
+
+
+if __name__ == "__main__":
+    main()
@@ -19,11 +19,18 @@ import signal
 import sys
 from collections.abc import AsyncGenerator
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from .api_provider import detect_api_provider
-from .parser import parse_line
+from .parser import parse_line_bytes
+from .stderr_tail import StderrTail
+from .stream_decode import DEFAULT_MAX_LINE_BYTES, DecodeStats, read_line
 from .types import ImageData, MessageType, StreamEvent
 
+if TYPE_CHECKING:
+    from .persistent_process import PersistentProcessRegistry
+    from .process_pool import WarmProcessPool
+
 # Re-export for backward compatibility
 __all__ = ["ClaudeRunner", "ImageData"]
 
@@ -89,6 +96,8 @@ class ClaudeRunner:
         images: list[ImageData] | None = None,
         fork_session: bool = False,
         effort: str | None = None,
+        process_pool: WarmProcessPool | None = None,
+        persistent_processes: PersistentProcessRegistry | None = None,
     ) -> None:
         self.command = command
         self.model = model
@@ -105,7 +114,18 @@ class ClaudeRunner:
         self.images = images
         self.fork_session = fork_session
         self.effort = effort
+        # Opt-in: when set, a turn claims a pre-spawned process whose launch
+        # parameters match exactly instead of paying the CLI's cold start.
+        self.process_pool = process_pool
+        # Opt-in: when set, a clean turn parks its process for the thread's
+        # next message instead of killing it, so that turn skips --resume.
+        self.persistent_processes = persistent_processes
         self._process: asyncio.subprocess.Process | None = None
+        # Drained concurrently for the life of the turn; see stderr_tail.
+        self._stderr_tail: StderrTail | None = None
+        self._decode_stats: DecodeStats | None = None
+        # Session the running turn reported, used to pre-spawn the next turn.
+        self._seen_session_id: str | None = None
 
     async def run(
         self,
@@ -135,35 +155,68 @@ class ClaudeRunner:
         )
 
         stdin_mode = asyncio.subprocess.PIPE
+        self._seen_session_id = session_id
+
+        process = None
+        signature = None
+        if self.persistent_processes is not None and self.thread_id is not None:
+            from .persistent_process import process_signature
+
+            # --resume is left out: a parked process already has the session
+            # loaded, and claim() checks the session ID separately.
+            signature = process_signature(self._build_args("", None), cwd, env)
+            if session_id and not self.fork_session:
+                process = self.persistent_processes.claim(
+                    self.thread_id, session_id=session_id, signature=signature
+                )
+        reused = process is not None
+        if process is None and self.process_pool is not None:
+            process = await self.process_pool.acquire(args, cwd=cwd, env=env)
+        if process is None:
+            process = await asyncio.create_subprocess_exec(
+                *args,
+                stdin=stdin_mode,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=cwd,
+                env=env,
+                limit=DEFAULT_MAX_LINE_BYTES,
+            )
+        self._process = process
 
-        self._process = await asyncio.create_subprocess_exec(
-            *args,
-            stdin=stdin_mode,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-            cwd=cwd,
-            env=env,
-            limit=10 * 1024 * 1024,
-        )
+        if reused:
+            logger.info("Claude CLI continuing in kept-alive pid=%s", self._process.pid)
+        else:
+            logger.info("Claude CLI started: pid=%s", self._process.pid)
 
-        logger.info("Claude CLI started: pid=%s", self._process.pid)
+        self._stderr_tail = StderrTail()
+        if self._process.stderr is not None:
+            self._stderr_tail.start(self._process.stderr)
 
         if self._process.stdin is not None:
             await self._send_stream_json_message(prompt)
 
+        finished_cleanly = False
         try:
             async for event in self._read_stream():
+                if event.session_id:
+                    self._seen_session_id = event.session_id
+                # Decided before yielding: a consumer that stops iterating on
+                # the result never resumes this generator past the yield.
+                if event.is_complete and not event.error:
+                    finished_cleanly = True
                 yield event
         except TimeoutError:
             logger.warning("Claude CLI timed out after %ds", self.timeout_seconds)
             yield StreamEvent(
-                raw={},
                 message_type=MessageType.RESULT,
                 is_complete=True,
                 error=f"Timed out after {self.timeout_seconds} seconds",
             )
         finally:
-            await self._cleanup()
+            if not (finished_cleanly and self._park_process(signature)):
+                await self._cleanup()
+                self._replenish_pool(cwd, env)
 
     def clone(
         self,
@@ -175,7 +228,12 @@ class ClaudeRunner:
         working_dir: str | None | object = _UNSET,
         effort: str | None | object = _UNSET,
     ) -> ClaudeRunner:
-        """Create a fresh runner with the same configuration but no active process."""
+        """Create a fresh runner with the same configuration but no active process.
+
+        The warm process pool and the kept-alive registry are shared, not
+        copied: they are per-deployment resources, and a clone that started its
+        own would never get a hit.
+        """
         return ClaudeRunner(
             command=self.command,
             model=model if model is not None else self.model,
@@ -201,6 +259,92 @@ class ClaudeRunner:
             effort=(
                 self.effort if effort is _UNSET else effort  # type: ignore[arg-type]
             ),
+            process_pool=self.process_pool,
+            persistent_processes=self.persistent_processes,
+        )
+
+    def _park_process(self, signature: tuple | None) -> bool:
+        """Hand the live process to the thread's next turn instead of killing it.
+
+        The runner lets go of the process once it is parked, so a late
+        ``interrupt()`` or ``kill()`` on this (finished) runner cannot reach a
+        process that now belongs to the next turn.
+        """
+        if (
+            self.persistent_processes is None
+            or signature is None
+            or self.thread_id is None
+            or not self._seen_session_id
+            or self._process is None
+        ):
+            return False
+        parked = self.persistent_processes.park(
+            self.thread_id,
+            self._process,
+            session_id=self._seen_session_id,
+            signature=signature,
+        )
+        if parked:
+            # The next turn drains this stderr with its own tail.
+            if self._stderr_tail is not None:
+                self._stderr_tail.cancel()
+            self._process = None
+        return parked
+
+    @property
+    def stderr_tail(self) -> StderrTail | None:
+        """The current turn's stderr tail and counters (None before the first run)."""
+        return self._stderr_tail
+
+    @property
+    def decode_stats(self) -> DecodeStats | None:
+        """The current turn's stdout decoding counters (None before the first run)."""
+        return self._decode_stats
+
+    def _replenish_pool(self, cwd: str, env: dict[str, str]) -> None:
+        """Pre-spawn the process this thread's next turn will most likely ask for.
+
+        The next turn resumes the session this one just ran in, never forks it
+        again, and has no way to know about images yet — so the warm process is
+        built for exactly that. Anything the next turn changes (a different
+        system prompt, a /model switch) makes it a miss and the process is
+        reaped by the pool's TTL.
+        """
+        if self.process_pool is None or not self._seen_session_id:
+            return
+        try:
+            next_args = self._build_args("", self._seen_session_id, fork_session=False)
+        except ValueError:
+            return
+        self.process_pool.replenish(next_args, cwd=cwd, env=env)
+
+    def prewarm(self, session_id: str, *, ttl_seconds: float | None = None) -> bool:
+        """Pre-spawn the process a turn resuming ``session_id`` would claim.
+
+        For a caller that knows a message is coming (the user is typing) but
+        not what it says: the prompt travels on stdin, so everything that
+        decides the launch parameters is already known. Returns whether a
+        process is now being started — ``False`` without a warm pool, when the
+        thread's kept-alive process will serve the turn instead, or when one is
+        already idle for the same parameters.
+        """
+        if self.process_pool is None:
+            return False
+        if (
+            self.persistent_processes is not None
+            and self.thread_id is not None
+            and self.persistent_processes.is_parked(self.thread_id)
+        ):
+            return False
+        try:
+            args = self._build_args("", session_id, fork_session=False)
+        except ValueError:
+            return False
+        return self.process_pool.replenish(
+            args,
+            cwd=self.working_dir or os.getcwd(),
+            env=self._build_env(),
+            ttl_seconds=ttl_seconds,
         )
 
     async def inject_tool_result(self, request_id: str, data: dict) -> None:
@@ -272,12 +416,23 @@ class ClaudeRunner:
                 self._process.kill()
                 await self._process.wait()
 
-    def _build_args(self, prompt: str, session_id: str | None) -> list[str]:
+    def _build_args(
+        self,
+        prompt: str,
+        session_id: str | None,
+        *,
+        fork_session: bool | None = None,
+    ) -> list[str]:
         """Build command-line arguments for claude CLI.
 
         All arguments are passed as a list to create_subprocess_exec,
         which does NOT invoke a shell, preventing injection.
+
+        ``fork_session`` overrides the runner's own flag; the warm pool uses it
+        to describe a follow-up turn, which resumes rather than forks.
         """
+        if fork_session is None:
+            fork_session = self.fork_session
         args = [
             self.command,
             "-p",
@@ -308,7 +463,7 @@ class ClaudeRunner:
             if not re.match(r"^[a-f0-9\-]+$", session_id):
                 raise ValueError(f"Invalid session_id format: {session_id!r}")
             args.extend(["--resume", session_id])
-            if self.fork_session:
+            if fork_session:
                 args.append("--fork-session")
 
         if self.effort:
@@ -380,18 +535,19 @@ class ClaudeRunner:
         if self._process is None or self._process.stdout is None:
             raise RuntimeError("Process not started")
 
-        line_count = 0
+        stats = self._decode_stats = DecodeStats()
         while True:
-            line = await self._process.stdout.readline()
-            if not line:
-                logger.info("Claude CLI stdout EOF after %d lines", line_count)
+            line = await read_line(self._process.stdout, stats)
+            if line is None:
+                logger.info("Claude CLI stdout EOF: %s", stats)
                 break
-            line_count += 1
-            decoded = line.decode("utf-8", errors="replace")
-            if line_count <= 3:
-                logger.info("Claude CLI stdout line %d: %.100s", line_count, decoded.strip())
-            event = parse_line(decoded)
+            if stats.lines <= 3:
+                decoded = line.decode("utf-8", errors="replace")
+                logger.info("Claude CLI stdout line %d: %.100s", stats.lines, decoded.strip())
+            event = parse_line_bytes(line, stats)
             if event:
+                if event.is_complete:
+                    logger.debug("Claude CLI stdout: %s", stats)
                 yield event
                 if event.is_complete:
                     return
@@ -400,22 +556,26 @@ class ClaudeRunner:
             await asyncio.wait_for(self._process.wait(), timeout=10)
 
         if self._process.returncode is not None and self._process.returncode > 0:
-            stderr_data = b""
-            if self._process.stderr:
-                stderr_data = await self._process.stderr.read()
-            stderr_text = stderr_data.decode("utf-8", errors="replace").strip()
+            stderr_text = ""
+            if self._stderr_tail is not None:
+                await self._stderr_tail.wait()
+                stderr_text = self._stderr_tail.text(max_chars=1000)
             logger.error(
                 "Claude CLI exited with code %d: %s",
                 self._process.returncode,
-                stderr_text[:200],
+                stderr_text,
             )
+            error = f"CLI exited with code {self._process.returncode}"
+            if stderr_text:
+                error = f"{error}: {stderr_text}"
             yield StreamEvent(
-                raw={},
                 message_type=MessageType.RESULT,
                 is_complete=True,
-                error=f"CLI exited with code {self._process.returncode}",
+                error=error,
             )
 
     async def _cleanup(self) -> None:
         """Ensure the subprocess is properly terminated after run() exits."""
         await self.kill()
+        if self._stderr_tail is not None:
+            await self._stderr_tail.close()
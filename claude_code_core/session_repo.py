@@ -7,16 +7,37 @@ Teams conversation ID, etc.).
 from __future__ import annotations
 
 import logging
-from dataclasses import dataclass
-from typing import TYPE_CHECKING
+import sqlite3
+from collections.abc import Iterable
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING, Any
 
 import aiosqlite
 
+from .read_cache import MISSING, ReadCache
+from .sqlite_pool import SqlitePool, connect
+
 if TYPE_CHECKING:
     from .types import RateLimitInfo
+    from .write_behind import WriteBehindBuffer
 
 logger = logging.getLogger(__name__)
 
+# ``INSERT ... RETURNING`` needs SQLite 3.35; older builds read the row back.
+_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+# Keys per ``IN (...)`` lookup, well under SQLite's bound-parameter limit.
+_MAX_IN_PARAMS = 500
+
+# The trigram tokenizer behind ``sessions_fts`` cannot match anything shorter.
+_FTS_MIN_TERM = 3
+# bm25() column weights for (summary, working_dir).
+_FTS_WEIGHTS = "2.0, 1.0"
+
+
+def _fts_phrase(term: str) -> str:
+    """Quote ``term`` so FTS5 reads it as a literal string, not query syntax."""
+    return '"' + term.replace('"', '""') + '"'
+
 
 @dataclass
 class SessionRecord:
@@ -38,21 +59,46 @@ class SessionRecord:
 class SessionRepository:
     """CRUD operations for session records."""
 
-    def __init__(self, db_path: str) -> None:
+    def __init__(
+        self,
+        db_path: str,
+        *,
+        pool: SqlitePool | None = None,
+        write_behind: WriteBehindBuffer | None = None,
+        cache: ReadCache[int, SessionRecord | None] | None = None,
+    ) -> None:
         self.db_path = db_path
+        self._pool = pool
+        self._write_behind = write_behind
+        #: Records read by :meth:`get`, kept in step by this repository's writes.
+        self.cache = cache
+        self._fts: bool | None = None
+
+    async def _settle(self) -> None:
+        # Deferred writes go first, so reads see them and later writes land after them.
+        if self._write_behind is not None and self._write_behind.pending:
+            await self._write_behind.flush()
 
     async def get(self, thread_id: int) -> SessionRecord | None:
         """Get session by thread/channel ID."""
-        async with aiosqlite.connect(self.db_path) as db:
+        version = 0
+        if self.cache is not None:
+            cached = self.cache.get(thread_id)
+            if cached is not MISSING:
+                return cached
+            version = self.cache.version
+        await self._settle()
+        async with connect(self.db_path, self._pool, readonly=True) as db:
             db.row_factory = aiosqlite.Row
             cursor = await db.execute(
                 "SELECT * FROM sessions WHERE thread_id = ?",
                 (thread_id,),
             )
             row = await cursor.fetchone()
-            if row is None:
-                return None
-            return SessionRecord(**dict(row))
+        record = SessionRecord(**dict(row)) if row is not None else None
+        if self.cache is not None:
+            self.cache.fill(thread_id, record, version)
+        return record
 
     async def save(
         self,
@@ -70,9 +116,8 @@ class SessionRepository:
         not interoperable across backends, so callers must know who owns an ID
         before passing it to ``--resume`` / ``codex exec resume``.
         """
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute(
-                """INSERT INTO sessions
+        await self._settle()
+        sql = """INSERT INTO sessions
                      (thread_id, session_id, working_dir, model, origin, summary, backend)
                    VALUES (?, ?, ?, ?, ?, ?, ?)
                    ON CONFLICT(thread_id) DO UPDATE SET
@@ -82,19 +127,68 @@ class SessionRepository:
                      origin = COALESCE(excluded.origin, sessions.origin),
                      summary = COALESCE(excluded.summary, sessions.summary),
                      backend = COALESCE(excluded.backend, sessions.backend),
-                     last_used_at = datetime('now', 'localtime')""",
-                (thread_id, session_id, working_dir, model, origin, summary, backend),
-            )
+                     last_used_at = datetime('now', 'localtime')"""
+        params = (thread_id, session_id, working_dir, model, origin, summary, backend)
+        row = None
+        async with connect(self.db_path, self._pool) as db:
+            if _HAS_RETURNING:
+                db.row_factory = aiosqlite.Row
+                cursor = await db.execute(f"{sql} RETURNING *", params)
+                row = await cursor.fetchone()
+            else:
+                await db.execute(sql, params)
             await db.commit()
 
-        record = await self.get(thread_id)
+        if self.cache is not None:
+            self.cache.invalidate(thread_id)
+        record = SessionRecord(**dict(row)) if row is not None else await self.get(thread_id)
         if record is None:
             raise RuntimeError(f"Failed to retrieve session after save for thread {thread_id}")
+        if self.cache is not None:
+            self.cache.put(thread_id, record)
         return record
 
+    async def get_many(self, thread_ids: Iterable[int]) -> dict[int, SessionRecord]:
+        """Get the sessions for several threads at once, keyed by thread ID.
+
+        Threads without a session are absent from the result.
+        """
+        rows = await self._select_in("thread_id", list(dict.fromkeys(thread_ids)))
+        return {row["thread_id"]: SessionRecord(**dict(row)) for row in rows}
+
+    async def get_by_session_ids(self, session_ids: Iterable[str]) -> dict[str, SessionRecord]:
+        """Reverse lookup for several session IDs at once, keyed by session ID.
+
+        Like :meth:`get_by_session_id`, a session ID shared by several threads
+        maps to the one with the lowest thread ID.
+        """
+        records: dict[str, SessionRecord] = {}
+        for row in await self._select_in("session_id", list(dict.fromkeys(session_ids))):
+            records.setdefault(row["session_id"], SessionRecord(**dict(row)))
+        return records
+
+    async def _select_in(self, column: str, keys: list[Any]) -> list[aiosqlite.Row]:
+        if not keys:
+            return []
+        await self._settle()
+        rows: list[aiosqlite.Row] = []
+        async with connect(self.db_path, self._pool, readonly=True) as db:
+            db.row_factory = aiosqlite.Row
+            for start in range(0, len(keys), _MAX_IN_PARAMS):
+                chunk = keys[start : start + _MAX_IN_PARAMS]
+                placeholders = ",".join("?" for _ in chunk)
+                cursor = await db.execute(
+                    f"SELECT * FROM sessions WHERE {column} IN ({placeholders})"  # noqa: S608
+                    " ORDER BY thread_id",
+                    chunk,
+                )
+                rows.extend(await cursor.fetchall())
+        return rows
+
     async def get_by_session_id(self, session_id: str) -> SessionRecord | None:
         """Reverse lookup: get session by Claude Code session ID."""
-        async with aiosqlite.connect(self.db_path) as db:
+        await self._settle()
+        async with connect(self.db_path, self._pool, readonly=True) as db:
             db.row_factory = aiosqlite.Row
             cursor = await db.execute(
                 "SELECT * FROM sessions WHERE session_id = ?",
@@ -112,7 +206,8 @@ class SessionRepository:
             limit: Maximum number of records to return.
             origin: Optional filter by origin ('discord', 'cli'). None returns all.
         """
-        async with aiosqlite.connect(self.db_path) as db:
+        await self._settle()
+        async with connect(self.db_path, self._pool, readonly=True) as db:
             db.row_factory = aiosqlite.Row
             if origin:
                 cursor = await db.execute(
@@ -138,66 +233,104 @@ class SessionRepository:
     ) -> list[SessionRecord]:
         """Search sessions by keyword with optional filters.
 
+        Every whitespace-separated term of ``query`` must appear in the summary
+        or the working directory, as a case-insensitive substring; a trailing
+        ``*`` is accepted and changes nothing, since a substring already
+        covers its prefixes. Keyword results come best match first (BM25, a
+        summary hit weighing more than a path hit), then most recently used.
+
+        The ``sessions_fts`` index answers queries whose terms are all at
+        least three characters long; shorter terms, or a database without
+        the index, fall back to scanning with LIKE.
+
         Args:
-            query: Search term matched against summary and working_dir (LIKE).
-                   Empty string or None returns all sessions.
+            query: Search terms. Empty string or None returns all sessions,
+                   most recently used first.
             origin: Filter by origin ('discord', 'cli'). None returns all.
             limit: Maximum number of records to return.
             thread_ids: If set, only return sessions with these thread IDs.
             exclude_thread_ids: If set, exclude sessions with these thread IDs.
         """
+        terms = [term.rstrip("*") for term in (query or "").split()]
+        terms = [term for term in terms if term]
         conditions: list[str] = []
         params: list[object] = []
-
-        if query:
-            conditions.append("(summary LIKE ? OR working_dir LIKE ?)")
-            like = f"%{query}%"
-            params.extend([like, like])
+        ranked = False
+        source = "sessions s"
+        order = "s.last_used_at DESC"
+
+        await self._settle()
+        if terms and min(len(term) for term in terms) >= _FTS_MIN_TERM and await self._has_fts():
+            source = "sessions_fts JOIN sessions s ON s.thread_id = sessions_fts.rowid"
+            conditions.append("sessions_fts MATCH ?")
+            params.append(" AND ".join(_fts_phrase(term) for term in terms))
+            ranked = True
+        else:
+            for term in terms:
+                conditions.append("(s.summary LIKE ? OR s.working_dir LIKE ?)")
+                like = f"%{term}%"
+                params.extend([like, like])
 
         if origin:
-            conditions.append("origin = ?")
+            conditions.append("s.origin = ?")
             params.append(origin)
 
         if thread_ids is not None:
             placeholders = ",".join("?" for _ in thread_ids)
-            conditions.append(f"thread_id IN ({placeholders})")
+            conditions.append(f"s.thread_id IN ({placeholders})")
             params.extend(thread_ids)
 
         if exclude_thread_ids:
             placeholders = ",".join("?" for _ in exclude_thread_ids)
-            conditions.append(f"thread_id NOT IN ({placeholders})")
+            conditions.append(f"s.thread_id NOT IN ({placeholders})")
             params.extend(exclude_thread_ids)
 
+        if ranked:
+            order = f"bm25(sessions_fts, {_FTS_WEIGHTS}), {order}"
         where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
-        sql = f"SELECT * FROM sessions{where} ORDER BY last_used_at DESC LIMIT ?"  # noqa: S608
+        sql = f"SELECT s.* FROM {source}{where} ORDER BY {order} LIMIT ?"  # noqa: S608
         params.append(limit)
 
-        async with aiosqlite.connect(self.db_path) as db:
+        async with connect(self.db_path, self._pool, readonly=True) as db:
             db.row_factory = aiosqlite.Row
             cursor = await db.execute(sql, params)
             rows = await cursor.fetchall()
             return [SessionRecord(**dict(row)) for row in rows]
 
+    async def _has_fts(self) -> bool:
+        if self._fts is None:
+            async with connect(self.db_path, self._pool, readonly=True) as db:
+                cursor = await db.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sessions_fts'"
+                )
+                self._fts = await cursor.fetchone() is not None
+        return self._fts
+
     async def delete(self, thread_id: int) -> bool:
         """Delete a session mapping. Returns True if a row was deleted."""
-        async with aiosqlite.connect(self.db_path) as db:
+        await self._settle()
+        async with connect(self.db_path, self._pool) as db:
             cursor = await db.execute(
                 "DELETE FROM sessions WHERE thread_id = ?",
                 (thread_id,),
             )
             await db.commit()
-            return cursor.rowcount > 0
+        if self.cache is not None:
+            self.cache.put(thread_id, None)
+        return cursor.rowcount > 0
 
     async def cleanup_old(self, days: int = 30) -> int:
         """Delete sessions older than N days. Returns count deleted."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with connect(self.db_path, self._pool) as db:
             query = (
                 "DELETE FROM sessions"
                 " WHERE julianday('now', 'localtime') - julianday(last_used_at) >= ?"
             )
             cursor = await db.execute(query, (days,))
             await db.commit()
-            return cursor.rowcount
+        if self.cache is not None and cursor.rowcount:
+            self.cache.clear()
+        return cursor.rowcount
 
     async def update_context_stats(
         self,
@@ -205,26 +338,56 @@ class SessionRepository:
         context_window: int,
         context_used: int,
     ) -> None:
-        """Persist context window stats for a session."""
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute(
-                "UPDATE sessions SET context_window = ?, context_used = ? WHERE thread_id = ?",
-                (context_window, context_used, thread_id),
-            )
-            await db.commit()
+        """Persist context window stats for a session.
+
+        With a write-behind buffer the write is deferred and coalesced with
+        the session's next update; the repository's own reads flush it first.
+        """
+        sql = "UPDATE sessions SET context_window = ?, context_used = ? WHERE thread_id = ?"
+        params = (context_window, context_used, thread_id)
+        if self._write_behind is not None and not self._write_behind.closed:
+            self._write_behind.defer(("context", thread_id), sql, params)
+        else:
+            async with connect(self.db_path, self._pool) as db:
+                await db.execute(sql, params)
+                await db.commit()
+        if self.cache is not None:
+            cached = self.cache.peek(thread_id)
+            if cached is MISSING:
+                self.cache.invalidate(thread_id)  # a read in flight must not cache old stats
+            elif cached is not None:
+                self.cache.put(
+                    thread_id,
+                    replace(cached, context_window=context_window, context_used=context_used),
+                )
 
 
 class UsageStatsRepository:
     """CRUD for rate limit usage stats (one row per rate_limit_type, upserted)."""
 
-    def __init__(self, db_path: str) -> None:
+    def __init__(
+        self,
+        db_path: str,
+        *,
+        pool: SqlitePool | None = None,
+        write_behind: WriteBehindBuffer | None = None,
+    ) -> None:
         self.db_path = db_path
+        self._pool = pool
+        self._write_behind = write_behind
+
+    async def _settle(self) -> None:
+        # Deferred writes go first, so reads see them and later writes land after them.
+        if self._write_behind is not None and self._write_behind.pending:
+            await self._write_behind.flush()
 
     async def upsert(self, info: RateLimitInfo) -> None:
-        """Insert or replace the latest rate limit info for the given type."""
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute(
-                """INSERT INTO usage_stats
+        """Insert or replace the latest rate limit info for the given type.
+
+        With a write-behind buffer the write is deferred, and a burst of
+        events for one type collapses into the last one.
+        """
+        sql = """INSERT INTO usage_stats
                      (rate_limit_type, status, utilization, resets_at, is_using_overage)
                    VALUES (?, ?, ?, ?, ?)
                    ON CONFLICT(rate_limit_type) DO UPDATE SET
@@ -232,22 +395,27 @@ class UsageStatsRepository:
                      utilization = excluded.utilization,
                      resets_at = excluded.resets_at,
                      is_using_overage = excluded.is_using_overage,
-                     recorded_at = datetime('now', 'localtime')""",
-                (
-                    info.rate_limit_type,
-                    info.status,
-                    info.utilization,
-                    info.resets_at,
-                    int(info.is_using_overage),
-                ),
-            )
+                     recorded_at = datetime('now', 'localtime')"""
+        params = (
+            info.rate_limit_type,
+            info.status,
+            info.utilization,
+            info.resets_at,
+            int(info.is_using_overage),
+        )
+        if self._write_behind is not None and not self._write_behind.closed:
+            self._write_behind.defer(("usage", info.rate_limit_type), sql, params)
+            return
+        async with connect(self.db_path, self._pool) as db:
+            await db.execute(sql, params)
             await db.commit()
 
     async def get_latest(self) -> list[RateLimitInfo]:
         """Return all stored rate limit entries (one per type)."""
         from .types import RateLimitInfo as _RateLimitInfo
 
-        async with aiosqlite.connect(self.db_path) as db:
+        await self._settle()
+        async with connect(self.db_path, self._pool, readonly=True) as db:
             db.row_factory = aiosqlite.Row
             cursor = await db.execute("SELECT * FROM usage_stats ORDER BY rate_limit_type")
             rows = await cursor.fetchall()
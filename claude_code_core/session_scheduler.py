@@ -0,0 +1,491 @@
+"""Admission control for CLI sessions: priority classes with per-user fairness.
+
+Every run — a human's reply, a scheduled task, a webhook trigger, an
+``/api/spawn`` — used to wait on one ``asyncio.Semaphore``, which wakes
+waiters in whatever order they happened to queue. A burst of scheduled tasks
+queued a moment before a human replied therefore ran first, and the human
+watched a "waiting for a free slot" notice for as long as the whole burst took.
+
+:class:`SessionScheduler` keeps the same global limit but decides who gets a
+freed slot:
+
+1. the most urgent :class:`SessionPriority` class first — a person waiting on
+   a reply before automation nobody is watching;
+2. within a class, the waiter whose user, then channel, holds the fewest
+   running sessions, so one busy user or channel cannot take every slot;
+3. then arrival order.
+
+A waiter is promoted one class for every ``aging_seconds`` it has waited, so a
+steady stream of interactive work delays background jobs but never starves
+them. :meth:`SessionScheduler.position` reports where a waiter currently
+stands, for the waiting notice.
+
+A global count treats five sessions in one huge monorepo like five in small
+repos, though the first five share one working tree, one build cache and one
+test suite. Two optional limits sit on top of it:
+
+- ``max_per_resource`` caps admitted runs per resource — the git repository a
+  run works in (:func:`repository_key`; a linked worktree counts as its main
+  repository). A run held back by its repository waits in that repository's
+  line and does not hold up unrelated work behind it.
+- ``headroom`` is a probe such as :class:`HostHeadroom` asked before any run
+  beyond the first is admitted; while it says the host is short of CPU or
+  memory, waiters stay queued and it is asked again every
+  ``recheck_seconds``.
+
+:meth:`SessionScheduler.throttle` lets a caller lower the limit below
+``max_concurrent`` for a while and hold every class but
+:attr:`SessionPriority.INTERACTIVE` — how
+:mod:`claude_code_core.rate_limit_pacer` paces work as the account's quota
+runs low. Runs enqueued with ``paced=False`` (a backend that does not draw on
+that quota) are exempt and only wait for a slot under ``max_concurrent``.
+
+A slot already held stays held, so a person can still wait behind a full
+house of long scheduled or triggered runs. With ``preempt_from`` set, admitted
+runs of that class or less urgent that the caller has marked resumable
+(:meth:`SessionScheduler.mark_preemptible`) can be asked to give their slot
+back: while an :attr:`SessionPriority.INTERACTIVE` waiter is short of a slot,
+the least urgent, most recently admitted of them has
+:meth:`SessionTicket.wait_for_yield` return — one per such waiter. The
+scheduler only asks; the holder interrupts its run, releases the ticket and
+queues again to resume.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import os
+import time
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from enum import IntEnum
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "HostHeadroom",
+    "SchedulerStats",
+    "SessionPriority",
+    "SessionScheduler",
+    "SessionTicket",
+    "repository_key",
+]
+
+DEFAULT_AGING_SECONDS = 300.0
+DEFAULT_RECHECK_SECONDS = 5.0
+
+
+class SessionPriority(IntEnum):
+    """Admission classes, most urgent first."""
+
+    INTERACTIVE = 0
+    """A person in the thread waiting on this reply."""
+    SPAWNED = 1
+    """Started programmatically (``/api/spawn``, a relayed message)."""
+    TRIGGERED = 2
+    """Fired by an external event (a webhook)."""
+    SCHEDULED = 3
+    """A scheduled task nobody is watching start."""
+
+
+@dataclass(eq=False)
+class SessionTicket:
+    """One run's place in the scheduler — waiting, then admitted, then released."""
+
+    priority: SessionPriority
+    user_key: int | None
+    channel_key: int | None
+    resource: str | None
+    seq: int
+    enqueued_at: float
+    admitted: bool = False
+    released: bool = False
+    admitted_at: float | None = None
+    preemptible: bool = False
+    #: Whether :meth:`SessionScheduler.throttle` applies; runs that do not
+    #: spend the paced quota (another backend's) pass it by.
+    paced: bool = True
+    _ready: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+    _yield: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    async def wait(self) -> None:
+        """Return once the ticket is admitted."""
+        await self._ready.wait()
+
+    @property
+    def yield_requested(self) -> bool:
+        """Whether the scheduler has asked this run to give its slot back."""
+        return self._yield.is_set()
+
+    async def wait_for_yield(self) -> None:
+        """Return once the scheduler asks this run to give its slot back."""
+        await self._yield.wait()
+
+
+@dataclass
+class SchedulerStats:
+    """Counters for how often runs had to queue, and for how long at worst."""
+
+    admitted: int = 0
+    queued: int = 0
+    longest_wait_seconds: float = 0.0
+    held_by_resource: int = 0
+    held_by_headroom: int = 0
+    preempted: int = 0
+
+
+def repository_key(working_dir: str) -> str:
+    """The resource a run in ``working_dir`` competes for.
+
+    The root of the git repository containing it, with a linked worktree
+    resolved to its main repository (they share objects, caches and usually
+    a build); outside git, the directory itself.
+    """
+    path = Path(working_dir).resolve()
+    for candidate in (path, *path.parents):
+        marker = candidate / ".git"
+        if marker.is_dir():
+            return str(candidate)
+        if marker.is_file():
+            try:
+                gitdir = marker.read_text(encoding="utf-8").strip().removeprefix("gitdir:")
+            except OSError:
+                return str(candidate)
+            common = (candidate / gitdir.strip()).resolve()
+            # <main>/.git/worktrees/<name> for a linked worktree.
+            if common.parent.name == "worktrees" and common.parent.parent.name == ".git":
+                return str(common.parent.parent.parent)
+            return str(candidate)
+    return str(path)
+
+
+@dataclass
+class HostHeadroom:
+    """Whether the host can take another session right now.
+
+    ``max_load_per_cpu`` compares the one-minute load average to the CPU
+    count; ``min_free_memory_mb`` reads ``MemAvailable`` from
+    ``/proc/meminfo``. A check that cannot be read on this platform passes —
+    this guards against thrashing, it must not stop a host it cannot see.
+    """
+
+    max_load_per_cpu: float | None = None
+    min_free_memory_mb: int | None = None
+
+    def __call__(self) -> bool:
+        if self.max_load_per_cpu is not None:
+            try:
+                load = os.getloadavg()[0] / (os.cpu_count() or 1)
+            except OSError:
+                load = 0.0
+            if load > self.max_load_per_cpu:
+                logger.debug("Host headroom: load %.2f per CPU", load)
+                return False
+        if self.min_free_memory_mb is not None:
+            free = _available_memory_mb()
+            if free is not None and free < self.min_free_memory_mb:
+                logger.debug("Host headroom: %d MB available", free)
+                return False
+        return True
+
+
+def _available_memory_mb() -> int | None:
+    try:
+        with open("/proc/meminfo", encoding="ascii") as meminfo:
+            for line in meminfo:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) // 1024
+    except (OSError, ValueError, IndexError):
+        return None
+    return None
+
+
+class SessionScheduler:
+    """At most ``max_concurrent`` admitted tickets, handed out by priority and fairness.
+
+    Usage::
+
+        ticket = scheduler.enqueue(priority=SessionPriority.SCHEDULED)
+        try:
+            if not ticket.admitted:
+                await ticket.wait()
+            ...  # run the session
+        finally:
+            scheduler.release(ticket)
+
+    ``release`` is also how a waiter that gives up (is cancelled) leaves the
+    queue, so it belongs in the same ``finally``.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int,
+        *,
+        aging_seconds: float = DEFAULT_AGING_SECONDS,
+        max_per_resource: int | None = None,
+        headroom: Callable[[], bool] | None = None,
+        recheck_seconds: float = DEFAULT_RECHECK_SECONDS,
+        preempt_from: SessionPriority | None = None,
+    ) -> None:
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent must be at least 1")
+        if aging_seconds <= 0:
+            raise ValueError("aging_seconds must be positive")
+        if max_per_resource is not None and max_per_resource < 1:
+            raise ValueError("max_per_resource must be at least 1")
+        if recheck_seconds <= 0:
+            raise ValueError("recheck_seconds must be positive")
+        if preempt_from is not None and preempt_from <= SessionPriority.INTERACTIVE:
+            raise ValueError("preempt_from must be less urgent than INTERACTIVE")
+        self.max_concurrent = max_concurrent
+        self.aging_seconds = aging_seconds
+        self.max_per_resource = max_per_resource
+        self.headroom = headroom
+        self.recheck_seconds = recheck_seconds
+        self.preempt_from = preempt_from
+        self.stats = SchedulerStats()
+        self._running = 0
+        self._by_user: Counter[int] = Counter()
+        self._by_channel: Counter[int] = Counter()
+        self._by_resource: Counter[str] = Counter()
+        self._waiting: list[SessionTicket] = []
+        self._admitted: list[SessionTicket] = []
+        self._seq = itertools.count()
+        self._recheck: asyncio.TimerHandle | None = None
+        self._ceiling: int | None = None
+        self._hold_background = False
+
+    @property
+    def limit(self) -> int:
+        """The concurrency limit in force: ``max_concurrent``, or lower while throttled."""
+        if self._ceiling is None:
+            return self.max_concurrent
+        return min(self.max_concurrent, self._ceiling)
+
+    @property
+    def background_held(self) -> bool:
+        """Whether non-interactive classes are currently held back."""
+        return self._hold_background
+
+    @property
+    def running(self) -> int:
+        """Admitted tickets not yet released."""
+        return self._running
+
+    @property
+    def waiting(self) -> int:
+        """Tickets queued for a slot."""
+        return len(self._waiting)
+
+    def enqueue(
+        self,
+        *,
+        priority: SessionPriority = SessionPriority.INTERACTIVE,
+        user_id: int | None = None,
+        channel_id: int | None = None,
+        resource: str | None = None,
+        paced: bool = True,
+    ) -> SessionTicket:
+        """Take a slot now if one is free for this run, else join the queue.
+
+        ``paced=False`` exempts the run from :meth:`throttle`: it only needs a
+        slot under ``max_concurrent``.
+        """
+        ticket = SessionTicket(
+            priority=priority,
+            user_key=user_id,
+            channel_key=channel_id,
+            resource=resource,
+            seq=next(self._seq),
+            enqueued_at=time.monotonic(),
+            paced=paced,
+        )
+        self._waiting.append(ticket)
+        self._dispatch()
+        if not ticket.admitted:
+            self.stats.queued += 1
+            logger.info(
+                "Session queued (%s, position %d of %d, %d running)",
+                priority.name.lower(),
+                self.position(ticket),
+                self.waiting,
+                self._running,
+            )
+        return ticket
+
+    def throttle(self, ceiling: int | None = None, *, hold_background: bool = False) -> None:
+        """Lower the limit to ``ceiling`` (``None`` restores it); optionally hold background work.
+
+        Runs already admitted are never stopped; a lower ceiling only delays
+        the next admissions. Raising it again admits waiters at once. Tickets
+        enqueued with ``paced=False`` are exempt from both.
+        """
+        if ceiling is not None and ceiling < 1:
+            raise ValueError("ceiling must be at least 1")
+        self._ceiling = ceiling
+        self._hold_background = hold_background
+        self._dispatch()
+
+    def mark_preemptible(self, ticket: SessionTicket) -> None:
+        """Let an admitted run be asked to yield, once it could be resumed.
+
+        A no-op without ``preempt_from`` or for a run more urgent than it.
+        """
+        if (
+            self.preempt_from is None
+            or ticket.priority < self.preempt_from
+            or not ticket.admitted
+            or ticket.released
+            or ticket.preemptible
+        ):
+            return
+        ticket.preemptible = True
+        self._preempt()
+
+    def wait_reason(self, ticket: SessionTicket) -> str | None:
+        """Why a queued ticket is not running.
+
+        One of ``"rate_limit"``, ``"slots"``, ``"resource"`` or ``"headroom"``.
+        """
+        if ticket not in self._waiting:
+            return None
+        if self._held(ticket):
+            return "rate_limit"
+        if self._running >= self._limit_for(ticket):
+            return "slots"
+        if self._resource_full(ticket):
+            return "resource"
+        return "headroom"
+
+    def position(self, ticket: SessionTicket) -> int:
+        """1-based place in the queue as things stand now; 0 once admitted."""
+        if ticket not in self._waiting:
+            return 0
+        now = time.monotonic()
+        return sorted(self._waiting, key=lambda t: self._rank(t, now)).index(ticket) + 1
+
+    def release(self, ticket: SessionTicket) -> None:
+        """Free an admitted ticket's slot, or withdraw a waiting one. Idempotent."""
+        if ticket.released:
+            return
+        ticket.released = True
+        if not ticket.admitted:
+            self._waiting.remove(ticket)
+            return
+        self._running -= 1
+        self._admitted.remove(ticket)
+        if ticket.user_key is not None:
+            self._by_user[ticket.user_key] -= 1
+        if ticket.channel_key is not None:
+            self._by_channel[ticket.channel_key] -= 1
+        if ticket.resource is not None:
+            self._by_resource[ticket.resource] -= 1
+        self._dispatch()
+
+    def _rank(self, ticket: SessionTicket, now: float) -> tuple[int, int, int, int]:
+        promoted = int((now - ticket.enqueued_at) // self.aging_seconds)
+        return (
+            max(0, ticket.priority - promoted),
+            self._by_user[ticket.user_key] if ticket.user_key is not None else 0,
+            self._by_channel[ticket.channel_key] if ticket.channel_key is not None else 0,
+            ticket.seq,
+        )
+
+    def _held(self, ticket: SessionTicket) -> bool:
+        # By class, not aged rank: waiting longer does not buy past a quota.
+        return (
+            ticket.paced and self._hold_background and ticket.priority > SessionPriority.INTERACTIVE
+        )
+
+    def _limit_for(self, ticket: SessionTicket) -> int:
+        return self.limit if ticket.paced else self.max_concurrent
+
+    def _resource_full(self, ticket: SessionTicket) -> bool:
+        return (
+            self.max_per_resource is not None
+            and ticket.resource is not None
+            and self._by_resource[ticket.resource] >= self.max_per_resource
+        )
+
+    def _dispatch(self) -> None:
+        self._fill()
+        self._preempt()
+
+    def _fill(self) -> None:
+        now = time.monotonic()
+        while self._running < self.max_concurrent and self._waiting:
+            eligible = [
+                t
+                for t in self._waiting
+                if self._running < self._limit_for(t)
+                and not self._held(t)
+                and not self._resource_full(t)
+            ]
+            if not eligible:
+                if any(self._resource_full(t) for t in self._waiting):
+                    self.stats.held_by_resource += 1
+                return
+            # The first run always goes, or a host that stays busy for reasons
+            # of its own would never run anything.
+            if self._running and self.headroom is not None and not self.headroom():
+                self.stats.held_by_headroom += 1
+                self._recheck_later()
+                return
+            ticket = min(eligible, key=lambda t: self._rank(t, now))
+            self._waiting.remove(ticket)
+            self._admit(ticket, now)
+
+    def _preempt(self) -> None:
+        if self.preempt_from is None or self._running < self.limit:
+            return
+        # A person held back by their repository's limit gains nothing from a
+        # slot freed elsewhere.
+        short = sum(
+            1
+            for t in self._waiting
+            if t.priority == SessionPriority.INTERACTIVE and not self._resource_full(t)
+        )
+        short -= sum(1 for t in self._admitted if t.yield_requested)
+        candidates = [t for t in self._admitted if t.preemptible and not t.yield_requested]
+        candidates.sort(key=lambda t: (t.priority, t.admitted_at or 0.0), reverse=True)
+        for ticket in candidates[: max(0, short)]:
+            ticket._yield.set()
+            self.stats.preempted += 1
+            logger.info(
+                "Asking a %s session to yield its slot to an interactive one",
+                ticket.priority.name.lower(),
+            )
+
+    def _recheck_later(self) -> None:
+        if self._recheck is not None and not self._recheck.cancelled():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._recheck = loop.call_later(self.recheck_seconds, self._recheck_now)
+
+    def _recheck_now(self) -> None:
+        self._recheck = None
+        self._dispatch()
+
+    def _admit(self, ticket: SessionTicket, now: float) -> None:
+        ticket.admitted = True
+        ticket.admitted_at = now
+        self._running += 1
+        self._admitted.append(ticket)
+        if ticket.user_key is not None:
+            self._by_user[ticket.user_key] += 1
+        if ticket.channel_key is not None:
+            self._by_channel[ticket.channel_key] += 1
+        if ticket.resource is not None:
+            self._by_resource[ticket.resource] += 1
+        self.stats.admitted += 1
+        self.stats.longest_wait_seconds = max(
+            self.stats.longest_wait_seconds, now - ticket.enqueued_at
+        )
+        ticket._ready.set()
@@ -0,0 +1,195 @@
+"""Worker process: claims turns from the job table and runs them.
+
+Started by :class:`~claude_code_core.worker_pool.WorkerPool` as
+``python -m claude_code_core.session_worker --db … --socket …``. The worker
+keeps one control connection to the bridge's socket, on which the bridge says
+``wake`` whenever it enqueues a turn; between wakes it re-checks the table every
+``poll_seconds`` in case one was missed. For each claimed turn it opens a
+second connection, receives the secrets the table does not store, builds the
+backend with :func:`~claude_code_core.backend.create_backend` and writes every
+parsed event back as one JSON line. The same connection carries the bridge's
+``interrupt``, ``kill`` and ``tool_result`` requests the other way.
+
+The CLI subprocess, its stream parsing and the privacy gateway all run here,
+so a heavy turn costs this process's CPU, not the bridge's event loop. When the
+control connection closes the bridge is gone, and the worker kills its turns
+and exits rather than run work nobody will read.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import os
+from collections.abc import Callable
+from typing import Any
+
+from .backend import SessionBackend, create_backend
+from .event_wire import decode_images, encode_event
+from .job_queue import Job, JobQueue
+from .stream_decode import DEFAULT_MAX_LINE_BYTES
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["main", "run_worker"]
+
+DEFAULT_MAX_JOBS = 4
+DEFAULT_POLL_SECONDS = 5.0
+
+
+async def send_message(writer: asyncio.StreamWriter, message: dict[str, Any]) -> None:
+    """Write one JSON line and wait for the transport to drain."""
+    writer.write(json.dumps(message, separators=(",", ":")).encode() + b"\n")
+    await writer.drain()
+
+
+async def read_message(reader: asyncio.StreamReader) -> dict[str, Any] | None:
+    """Read one JSON line, or ``None`` at end of stream."""
+    line = await reader.readline()
+    return json.loads(line) if line else None
+
+
+def build_runner(
+    backend: str,
+    spec: dict[str, Any],
+    build: Callable[..., SessionBackend] = create_backend,
+) -> SessionBackend:
+    """The backend a turn asks for, from its wire-form configuration."""
+    spec = {**spec, "images": decode_images(spec.get("images"))}
+    return build(backend=backend, **spec)
+
+
+async def _pump_controls(reader: asyncio.StreamReader, runner: SessionBackend) -> None:
+    while (message := await read_message(reader)) is not None:
+        kind = message.get("type")
+        if kind == "interrupt":
+            await runner.interrupt()
+        elif kind == "kill":
+            await runner.kill()
+        elif kind == "tool_result":
+            await runner.inject_tool_result(message["request_id"], message["data"])
+    # The bridge hung up mid-turn; nobody is left to read the output.
+    await runner.kill()
+
+
+async def stream_turn(
+    runner: SessionBackend,
+    prompt: str,
+    session_id: str | None,
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+) -> None:
+    """Run one turn, writing its events to ``writer`` and obeying controls from ``reader``."""
+    controls = asyncio.create_task(_pump_controls(reader, runner))
+    completed = False
+    try:
+        async for event in runner.run(prompt, session_id):
+            await send_message(writer, {"type": "event", "event": encode_event(event)})
+        completed = True
+        await send_message(writer, {"type": "done"})
+    finally:
+        controls.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await controls
+        if not completed:
+            await runner.kill()
+
+
+async def run_job(
+    job: Job,
+    queue: JobQueue,
+    socket_path: str,
+    *,
+    build: Callable[..., SessionBackend] = create_backend,
+) -> None:
+    """Run one claimed turn, streaming its events to the bridge."""
+    error: str | None = None
+    writer: asyncio.StreamWriter | None = None
+    try:
+        reader, writer = await asyncio.open_unix_connection(
+            socket_path, limit=DEFAULT_MAX_LINE_BYTES
+        )
+        await send_message(writer, {"type": "attach", "job": job.id})
+        reply = await read_message(reader)
+        if reply is None or reply.get("type") != "start":
+            error = "turn withdrawn by the bridge"
+            return
+        runner = build_runner(job.backend, {**job.spec, **(reply.get("secrets") or {})}, build)
+        await stream_turn(runner, job.prompt, job.session_id, reader, writer)
+    except (ConnectionError, OSError) as exc:
+        error = f"lost the bridge connection: {exc}"
+    except Exception as exc:
+        logger.exception("Worker job %d failed", job.id)
+        error = str(exc) or type(exc).__name__
+        if writer is not None:
+            with contextlib.suppress(ConnectionError, OSError):
+                await send_message(writer, {"type": "done", "error": error})
+    finally:
+        if writer is not None:
+            writer.close()
+        await queue.finish(job.id, error=error)
+
+
+async def run_worker(
+    queue: JobQueue,
+    socket_path: str,
+    *,
+    name: str,
+    max_jobs: int = DEFAULT_MAX_JOBS,
+    poll_seconds: float = DEFAULT_POLL_SECONDS,
+    build: Callable[..., SessionBackend] = create_backend,
+) -> None:
+    """Claim and run turns until the bridge's control connection closes."""
+    reader, writer = await asyncio.open_unix_connection(socket_path)
+    await send_message(writer, {"type": "worker", "name": name})
+    wakeup = asyncio.Event()
+    running: set[asyncio.Task[None]] = set()
+
+    async def listen() -> None:
+        while (message := await read_message(reader)) is not None:
+            if message.get("type") == "wake":
+                wakeup.set()
+
+    listener = asyncio.create_task(listen())
+    try:
+        while not listener.done():
+            wakeup.clear()
+            while len(running) < max_jobs and (job := await queue.claim(name)) is not None:
+                task = asyncio.create_task(run_job(job, queue, socket_path, build=build))
+                running.add(task)
+                task.add_done_callback(running.discard)
+                # A finished turn frees a slot; look at the table again.
+                task.add_done_callback(lambda _task: wakeup.set())
+            waiter = asyncio.create_task(wakeup.wait())
+            await asyncio.wait(
+                {waiter, listener}, timeout=poll_seconds, return_when="FIRST_COMPLETED"
+            )
+            waiter.cancel()
+    finally:
+        listener.cancel()
+        for task in running:
+            task.cancel()
+        await asyncio.gather(listener, *running, return_exceptions=True)
+        writer.close()
+    logger.info("Worker %s: bridge closed the control connection, exiting", name)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Entry point for ``python -m claude_code_core.session_worker``."""
+    parser = argparse.ArgumentParser(description="ccdb session worker")
+    parser.add_argument("--db", required=True, help="job table database")
+    parser.add_argument("--socket", required=True, help="the bridge's worker socket")
+    parser.add_argument("--name", default=f"worker-{os.getpid()}")
+    parser.add_argument("--max-jobs", type=int, default=DEFAULT_MAX_JOBS)
+    args = parser.parse_args(argv)
+    logging.basicConfig(
+        level=logging.INFO, format=f"%(asctime)s [{args.name}] %(levelname)s %(name)s: %(message)s"
+    )
+    asyncio.run(run_worker(JobQueue(args.db), args.socket, name=args.name, max_jobs=args.max_jobs))
+
+
+if __name__ == "__main__":
+    main()
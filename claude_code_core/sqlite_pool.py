@@ -0,0 +1,217 @@
+"""Long-lived SQLite connections shared by every repository on one file.
+
+Every repository method used to open its own connection with
+``aiosqlite.connect``: a new thread, a new file handle, the schema read again
+and a cold statement cache — for what is usually one indexed lookup. With a
+dozen live sessions each turn makes several such calls, and the connection,
+not the query, is most of what they cost.
+
+:class:`SqlitePool` opens the connections once and keeps them for the life of
+the process:
+
+- one **writer**, behind an ``asyncio.Lock`` — SQLite admits a single writer
+  at a time anyway, and queuing here is cheaper than spinning on
+  ``SQLITE_BUSY`` inside a connection thread;
+- up to ``readers`` **reader** connections, opened on demand. The file is put
+  in WAL mode, so readers keep reading the last committed snapshot while the
+  writer works.
+
+Each connection gets a ``busy_timeout`` (another process — a worker, the
+``ccdb`` CLI — may still hold the file), ``synchronous=NORMAL`` (durable across
+a process crash in WAL mode, without an fsync per commit) and a larger
+statement cache, which only pays off on a connection that outlives one call.
+
+A connection handed out by :meth:`SqlitePool.write` or :meth:`SqlitePool.read`
+behaves like a fresh one from ``aiosqlite.connect``: ``row_factory`` is reset,
+and a transaction left open when the block exits is rolled back, as closing a
+connection would have done. Repositories take the pool as an optional
+``pool`` argument and open connections through :func:`connect`; without one,
+or once the pool is closed, they fall back to a connection per call.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+from collections.abc import AsyncIterator
+from contextlib import AbstractAsyncContextManager
+from dataclasses import dataclass
+
+import aiosqlite
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["PoolStats", "SqlitePool", "connect"]
+
+DEFAULT_READERS = 4
+DEFAULT_BUSY_TIMEOUT_MS = 5000
+DEFAULT_CACHED_STATEMENTS = 256
+
+
+@dataclass
+class PoolStats:
+    """How the pool has been used since it opened."""
+
+    writes: int = 0
+    reads: int = 0
+    connections_opened: int = 0
+    write_waits: int = 0
+    read_waits: int = 0
+
+
+class SqlitePool:
+    """One writer connection and a few readers on ``db_path``, opened lazily.
+
+    Usage::
+
+        pool = SqlitePool(path)
+        async with pool.write() as db:
+            await db.execute("INSERT ...")
+            await db.commit()
+        async with pool.read() as db:
+            rows = await db.execute_fetchall("SELECT ...")
+        await pool.close()
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        *,
+        readers: int = DEFAULT_READERS,
+        busy_timeout_ms: int = DEFAULT_BUSY_TIMEOUT_MS,
+        cached_statements: int = DEFAULT_CACHED_STATEMENTS,
+    ) -> None:
+        if readers < 0:
+            raise ValueError("readers must not be negative")
+        self.db_path = db_path
+        # Every connection to ":memory:" is a database of its own, so there a
+        # reader would never see what the writer wrote.
+        self.readers = 0 if db_path == ":memory:" else readers
+        self.busy_timeout_ms = busy_timeout_ms
+        self.cached_statements = cached_statements
+        self.stats = PoolStats()
+        self._writer: aiosqlite.Connection | None = None
+        self._write_lock = asyncio.Lock()
+        self._idle: asyncio.Queue[aiosqlite.Connection] = asyncio.Queue()
+        self._opened_readers = 0
+        self._closed = False
+
+    @property
+    def closed(self) -> bool:
+        """Whether :meth:`close` has been called."""
+        return self._closed
+
+    @contextlib.asynccontextmanager
+    async def write(self) -> AsyncIterator[aiosqlite.Connection]:
+        """The writer connection, held exclusively until the block exits."""
+        self._check_open()
+        if self._write_lock.locked():
+            self.stats.write_waits += 1
+        async with self._write_lock:
+            if self._writer is None:
+                self._writer = await self._open(writer=True)
+            self.stats.writes += 1
+            async with self._lent(self._writer):
+                yield self._writer
+
+    @contextlib.asynccontextmanager
+    async def read(self) -> AsyncIterator[aiosqlite.Connection]:
+        """A reader connection; the writer when the pool has no readers."""
+        if self.readers == 0:
+            async with self.write() as db:
+                yield db
+            return
+        self._check_open()
+        db = await self._acquire_reader()
+        self.stats.reads += 1
+        try:
+            async with self._lent(db):
+                yield db
+        finally:
+            if self._closed:
+                await db.close()
+            else:
+                self._idle.put_nowait(db)
+
+    async def close(self) -> None:
+        """Close every connection. Later callers of :func:`connect` fall back to their own."""
+        if self._closed:
+            return
+        self._closed = True
+        # Readers out on loan are closed as they come back.
+        while not self._idle.empty():
+            with contextlib.suppress(Exception):
+                await self._idle.get_nowait().close()
+        async with self._write_lock:
+            if self._writer is not None:
+                with contextlib.suppress(Exception):
+                    await self._writer.close()
+                self._writer = None
+        logger.debug("SQLite pool for %s closed (%s)", self.db_path, self.stats)
+
+    def _check_open(self) -> None:
+        if self._closed:
+            raise RuntimeError(f"SQLite pool for {self.db_path} is closed")
+
+    async def _acquire_reader(self) -> aiosqlite.Connection:
+        if self._idle.empty() and self._opened_readers < self.readers:
+            self._opened_readers += 1
+            try:
+                return await self._open(writer=False)
+            except BaseException:
+                self._opened_readers -= 1
+                raise
+        if self._idle.empty():
+            self.stats.read_waits += 1
+        return await self._idle.get()
+
+    async def _open(self, *, writer: bool) -> aiosqlite.Connection:
+        db = aiosqlite.connect(self.db_path, cached_statements=self.cached_statements)
+        # A pooled connection lives as long as the process. If its owner never
+        # calls close(), its worker thread must not keep the process alive at
+        # exit; committed WAL transactions survive an unclean close.
+        thread = getattr(db, "_thread", None)
+        if thread is not None:
+            thread.daemon = True
+        await db
+        try:
+            await db.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+            if writer:
+                # Persistent in the file; readers inherit it.
+                await db.execute("PRAGMA journal_mode=WAL")
+            await db.execute("PRAGMA synchronous=NORMAL")
+        except BaseException:
+            await db.close()
+            raise
+        self.stats.connections_opened += 1
+        return db
+
+    @contextlib.asynccontextmanager
+    async def _lent(self, db: aiosqlite.Connection) -> AsyncIterator[None]:
+        # Look like a fresh connection to the borrower, and leave nothing
+        # half-done for the next one.
+        db.row_factory = None
+        try:
+            yield
+        finally:
+            if db.in_transaction:
+                await db.rollback()
+
+
+def connect(
+    db_path: str,
+    pool: SqlitePool | None = None,
+    *,
+    readonly: bool = False,
+) -> AbstractAsyncContextManager[aiosqlite.Connection]:
+    """A connection to ``db_path``: from ``pool`` when there is an open one, else a new one.
+
+    ``readonly`` blocks may run on a reader connection concurrently with a
+    write; anything that writes must leave it unset.
+    """
+    if pool is None or pool.closed:
+        return aiosqlite.connect(db_path)
+    if pool.db_path != db_path:
+        raise ValueError(f"pool is for {pool.db_path}, not {db_path}")
+    return pool.read() if readonly else pool.write()
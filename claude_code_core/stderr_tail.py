@@ -0,0 +1,138 @@
+"""Concurrent stderr draining into a bounded ring buffer.
+
+The subprocess runners used to read stderr only once stdout reached EOF. A CLI
+that writes enough to stderr meanwhile (debug logging, a noisy MCP server,
+repeated retry warnings) fills the OS pipe buffer — 64 KiB on Linux — and then
+blocks on its next write, so the turn hangs with stdout idle and nothing ever
+reaching EOF. And when stderr *was* read, only the first 200 characters were
+kept, which for a long error is usually the least informative part.
+
+:class:`StderrTail` reads stderr for the whole life of the process, so the pipe
+never fills, and keeps only the most recent lines — bounded both by line count
+and by bytes — along with running totals. The tail is what error notices show;
+the counters and :meth:`StderrTail.text` are readable at any time for live
+diagnostics while the turn is still running.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["StderrTail"]
+
+DEFAULT_MAX_LINES = 200
+DEFAULT_MAX_BYTES = 64 * 1024
+_READ_CHUNK = 4096
+
+
+class StderrTail:
+    """The last lines a process wrote to stderr, plus how much it wrote in total.
+
+    Usage from a runner::
+
+        tail = StderrTail()
+        tail.start(process.stderr)
+        ...
+        await tail.wait()        # after the process exits: collect the rest
+        error = f"... {tail.text(max_chars=1000)}"
+        await tail.close()       # in cleanup
+    """
+
+    def __init__(
+        self,
+        *,
+        max_lines: int = DEFAULT_MAX_LINES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
+        self.max_lines = max_lines
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.total_lines = 0
+        self.dropped_lines = 0
+        self._lines: deque[bytes] = deque()
+        self._buffered = 0
+        self._partial = b""
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self, stream: asyncio.StreamReader) -> None:
+        """Begin draining ``stream`` in the background until EOF."""
+        self._task = asyncio.create_task(self._drain(stream))
+
+    def feed(self, chunk: bytes) -> None:
+        """Add raw stderr bytes; complete lines enter the ring buffer."""
+        self.total_bytes += len(chunk)
+        *complete, self._partial = (self._partial + chunk).split(b"\n")
+        for line in complete:
+            self._append(line)
+        # A newline-free flood must not grow without bound either.
+        if len(self._partial) > self.max_bytes:
+            self._partial = self._partial[-self.max_bytes :]
+
+    def text(self, max_chars: int | None = None) -> str:
+        """The buffered tail as text, optionally cut to its last ``max_chars``."""
+        lines = [*self._lines, self._partial] if self._partial else list(self._lines)
+        text = b"\n".join(lines).decode("utf-8", errors="replace").strip()
+        if max_chars is not None and len(text) > max_chars:
+            text = "…" + text[-max_chars:]
+        return text
+
+    async def wait(self, timeout: float = 2.0) -> None:
+        """Wait for the drain to hit EOF, so the tail includes the final writes.
+
+        Called once the process has exited. A grandchild that inherited stderr
+        can keep the pipe open after that, hence the timeout.
+        """
+        if self._task is None or self._task.done():
+            return
+        with contextlib.suppress(TimeoutError):
+            await asyncio.wait_for(asyncio.shield(self._task), timeout=timeout)
+
+    def cancel(self) -> None:
+        """Stop draining without waiting (the stream is being handed to another reader)."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+
+    async def close(self) -> None:
+        """Stop draining and log what the process wrote, if anything."""
+        await self.wait(timeout=0.5)
+        self.cancel()
+        if self._task is not None:
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+        if self.total_bytes:
+            logger.debug(
+                "stderr: %d line(s), %d byte(s), %d line(s) dropped from the tail",
+                self.total_lines,
+                self.total_bytes,
+                self.dropped_lines,
+            )
+
+    def _append(self, line: bytes) -> None:
+        self.total_lines += 1
+        self._lines.append(line)
+        self._buffered += len(line) + 1
+        while len(self._lines) > self.max_lines or self._buffered > self.max_bytes:
+            dropped = self._lines.popleft()
+            self._buffered -= len(dropped) + 1
+            self.dropped_lines += 1
+
+    async def _drain(self, stream: asyncio.StreamReader) -> None:
+        try:
+            while True:
+                chunk = await stream.read(_READ_CHUNK)
+                if not chunk:
+                    break
+                self.feed(chunk)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.debug("stderr drain stopped early", exc_info=True)
+            return
+        if self._partial:
+            self._append(self._partial)
+            self._partial = b""
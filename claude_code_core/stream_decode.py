@@ -0,0 +1,281 @@
+"""Shared framing, decoding and dispatch for every backend's event stream.
+
+Claude and Codex write JSON Lines to stdout and AG-UI peers send JSON in SSE
+frames, but each backend used to frame, decode and dispatch on its own, with
+its own error handling: an over-long stdout line raised out of
+``StreamReader.readline`` and failed the whole turn, a JSON line that was not
+an object crashed the dispatch on ``.get``, and nothing counted either. This
+module is the one layer they all sit on, so a fix or speedup here reaches
+Claude, Codex, local models (which run through the Claude CLI) and AG-UI at
+once:
+
+- framing — :func:`read_line` for a subprocess's ``StreamReader``,
+  :class:`LineFramer` and :class:`SseDecoder` for chunked HTTP bodies, all
+  with a maximum line (or event) size;
+- decoding — :func:`decode_json_object`, one frame to one JSON object;
+- dispatch — :class:`Dispatcher`, a table from an object's ``type`` to the
+  function that maps it;
+- metrics — :class:`DecodeStats`: lines, bytes, lines/sec, and how many were
+  malformed, oversized, of an unknown type or deliberately skipped.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "DEFAULT_MAX_LINE_BYTES",
+    "DecodeStats",
+    "Dispatcher",
+    "FrameTooLargeError",
+    "LineFramer",
+    "MalformedFrameError",
+    "NotAnObjectError",
+    "SseDecoder",
+    "decode_json_object",
+    "read_line",
+]
+
+# Also the ``limit`` the runners give their subprocess StreamReaders, which is
+# what bounds a stdout line in practice.
+DEFAULT_MAX_LINE_BYTES = 10 * 1024 * 1024
+
+
+class MalformedFrameError(ValueError):
+    """A frame that is not valid JSON."""
+
+
+class NotAnObjectError(MalformedFrameError):
+    """A frame that is valid JSON but not the object every protocol here requires."""
+
+
+class FrameTooLargeError(ValueError):
+    """A line or event exceeded the framer's size limit."""
+
+
+@dataclass
+class DecodeStats:
+    """Running counters for one stream. Every field is cumulative."""
+
+    lines: int = 0
+    bytes: int = 0
+    malformed: int = 0
+    oversized: int = 0
+    unknown: int = 0
+    skipped: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def lines_per_second(self) -> float:
+        elapsed = time.monotonic() - self.started_at
+        return self.lines / elapsed if elapsed > 0 else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.lines} line(s), {self.bytes} byte(s), {self.lines_per_second:.0f} lines/s, "
+            f"{self.malformed} malformed, {self.oversized} oversized, "
+            f"{self.unknown} unknown, {self.skipped} skipped"
+        )
+
+
+async def read_line(stream: asyncio.StreamReader, stats: DecodeStats | None = None) -> bytes | None:
+    """Next line from ``stream``, or ``None`` at EOF.
+
+    A line longer than the reader's ``limit`` is dropped and counted instead of
+    raising. ``readline`` discards what it had buffered of such a line; if the
+    rest was still in flight it arrives as a fragment of its own, which then
+    fails to decode and is counted as malformed — either way the turn goes on.
+    """
+    while True:
+        try:
+            line = await stream.readline()
+        except ValueError:
+            if stats is not None:
+                stats.oversized += 1
+            logger.warning("Dropped a stream line longer than the reader's limit")
+            continue
+        if not line:
+            return None
+        if stats is not None:
+            stats.lines += 1
+            stats.bytes += len(line)
+        return line
+
+
+def decode_json_object(
+    payload: bytes | str,
+    stats: DecodeStats | None = None,
+    *,
+    errors: str = "strict",
+) -> dict[str, Any]:
+    """Decode one frame into a JSON object.
+
+    ``errors="replace"`` tolerates invalid UTF-8 the way ``bytes.decode``
+    does; the default rejects it. Raises :class:`MalformedFrameError` (and
+    counts it) for anything that is not a JSON object.
+    """
+    try:
+        try:
+            decoded = json.loads(payload)
+        except UnicodeDecodeError:
+            if errors == "strict" or isinstance(payload, str):
+                raise
+            decoded = json.loads(payload.decode("utf-8", errors=errors))
+    except (UnicodeDecodeError, json.JSONDecodeError) as exc:
+        if stats is not None:
+            stats.malformed += 1
+        raise MalformedFrameError("frame is not valid JSON") from exc
+    if not isinstance(decoded, dict):
+        if stats is not None:
+            stats.malformed += 1
+        raise NotAnObjectError(f"frame is a JSON {type(decoded).__name__}, not an object")
+    return decoded
+
+
+class Dispatcher[T]:
+    """A dispatch table from a decoded object's discriminator to its handler.
+
+    Objects whose discriminator has no handler map to ``None`` and are counted
+    as unknown — a newer CLI adding an event type must never break a turn.
+    """
+
+    def __init__(
+        self,
+        handlers: Mapping[str, Callable[[dict[str, Any]], T | None]],
+        *,
+        key: str = "type",
+    ) -> None:
+        self.handlers = dict(handlers)
+        self.key = key
+
+    def __call__(self, data: dict[str, Any], stats: DecodeStats | None = None) -> T | None:
+        kind = data.get(self.key)
+        handler = self.handlers.get(kind) if isinstance(kind, str) else None
+        if handler is None:
+            if stats is not None:
+                stats.unknown += 1
+            logger.debug("No handler for %s=%r", self.key, kind)
+            return None
+        return handler(data)
+
+
+class LineFramer:
+    """Split a chunked byte stream into lines, none longer than ``max_line_bytes``.
+
+    Chunks without a newline are only collected, so an event spread over many
+    reads is joined once rather than re-copied on every read.
+    """
+
+    def __init__(
+        self,
+        max_line_bytes: int = DEFAULT_MAX_LINE_BYTES,
+        stats: DecodeStats | None = None,
+    ) -> None:
+        self.max_line_bytes = max_line_bytes
+        self.stats = stats
+        self._pending: list[bytes] = []
+        self._pending_bytes = 0
+
+    def feed(self, chunk: bytes) -> list[bytes]:
+        """Add ``chunk``; return the lines it completed, without their line endings."""
+        if self.stats is not None:
+            self.stats.bytes += len(chunk)
+        if b"\n" not in chunk:
+            self._hold(chunk)
+            return []
+        if self._pending:
+            chunk = b"".join(self._pending) + chunk
+            self._pending.clear()
+            self._pending_bytes = 0
+        *lines, rest = chunk.split(b"\n")
+        for line in lines:
+            self._check(len(line))
+        if rest:
+            self._hold(rest)
+        if self.stats is not None:
+            self.stats.lines += len(lines)
+        return [line[:-1] if line.endswith(b"\r") else line for line in lines]
+
+    def finish(self) -> bytes | None:
+        """The unterminated last line at end of stream, if any."""
+        if not self._pending:
+            return None
+        line = b"".join(self._pending)
+        self._pending.clear()
+        self._pending_bytes = 0
+        if self.stats is not None:
+            self.stats.lines += 1
+        return line[:-1] if line.endswith(b"\r") else line
+
+    def _hold(self, piece: bytes) -> None:
+        self._pending.append(piece)
+        self._pending_bytes += len(piece)
+        self._check(self._pending_bytes)
+
+    def _check(self, size: int) -> None:
+        if size > self.max_line_bytes:
+            if self.stats is not None:
+                self.stats.oversized += 1
+            raise FrameTooLargeError(f"line exceeded {self.max_line_bytes} bytes")
+
+
+class SseDecoder:
+    """Incremental Server-Sent Events framing: chunks in, ``data`` payloads out.
+
+    Only ``data`` fields are kept (joined with newlines, per the spec);
+    comments and other fields are skipped. ``max_event_bytes`` bounds one whole
+    event, every line of it counted.
+    """
+
+    def __init__(self, max_event_bytes: int, stats: DecodeStats | None = None) -> None:
+        self.max_event_bytes = max_event_bytes
+        self.stats = stats
+        self._lines = LineFramer(max_line_bytes=max_event_bytes, stats=stats)
+        self._data: list[bytes] = []
+        self._event_bytes = 0
+
+    def feed(self, chunk: bytes) -> list[bytes]:
+        """Add ``chunk``; return the payloads of the events it completed."""
+        payloads = []
+        for line in self._lines.feed(chunk):
+            payload = self._line(line)
+            if payload is not None:
+                payloads.append(payload)
+        return payloads
+
+    def finish(self) -> bytes | None:
+        """Flush an event the stream ended without terminating."""
+        line = self._lines.finish()
+        if line is not None:
+            self._line(line)
+        return self._dispatch()
+
+    def _line(self, line: bytes) -> bytes | None:
+        self._event_bytes += len(line) + 1
+        if self._event_bytes > self.max_event_bytes:
+            if self.stats is not None:
+                self.stats.oversized += 1
+            raise FrameTooLargeError(f"SSE event exceeded {self.max_event_bytes} bytes")
+        if not line:
+            return self._dispatch()
+        if line.startswith(b":"):
+            return None
+        if line == b"data":
+            self._data.append(b"")
+        elif line.startswith(b"data:"):
+            value = line[5:]
+            self._data.append(value[1:] if value.startswith(b" ") else value)
+        return None
+
+    def _dispatch(self) -> bytes | None:
+        data, self._data = self._data, []
+        self._event_bytes = 0
+        return b"\n".join(data) if data else None
@@ -37,7 +37,7 @@ class _SessionSearchRepo(Protocol):
         self, query: str, *, origin: str | None = ..., limit: int = ...
     ) -> list[Any]: ...
 
-    async def get_by_session_id(self, session_id: str) -> Any: ...
+    async def get_by_session_ids(self, session_ids: list[str]) -> dict[str, Any]: ...
 
 
 async def run_thread_search(
@@ -53,8 +53,8 @@ async def run_thread_search(
     """Search thread summaries and (optionally) transcript bodies.
 
     Args:
-        session_repo: Session store (needs ``search`` and ``get_by_session_id``).
-        query: Keyword (case-insensitive substring).
+        session_repo: Session store (needs ``search`` and ``get_by_session_ids``).
+        query: Keywords, each a case-insensitive substring; see ``SessionRepository.search``.
         origin: Filter summary matches by origin ('discord'/'cli').
         limit: Max summary results.
         include_body: When True, also grep local transcripts for the keyword.
@@ -83,8 +83,11 @@ async def run_thread_search(
     if not (include_body and transcripts_root and query):
         return results
 
-    for hit in await search_transcripts(transcripts_root, query, limit=body_limit):
-        record = await session_repo.get_by_session_id(hit.session_id)
+    hits = await search_transcripts(transcripts_root, query, limit=body_limit)
+    # One lookup for every hit, not one per hit.
+    records = await session_repo.get_by_session_ids([hit.session_id for hit in hits])
+    for hit in hits:
+        record = records.get(hit.session_id)
         if record is not None:
             if record.thread_id in seen_threads:
                 continue  # already surfaced via its summary — don't duplicate
@@ -0,0 +1,211 @@
+"""One in-process timer for everything that fires at a time stored in SQLite.
+
+The scheduler and the notification dispatcher each woke on a fixed 30-second
+loop and asked their table whether anything was due. A task therefore
+started up to 30 seconds late — a ``ScheduleWakeup`` asking for 60 seconds
+could resume after 89 — and an idle bot still queried SQLite twice a minute.
+
+:class:`TimerService` inverts that. Each *source* supplies two coroutines:
+``next_due`` (when is the earliest row due, as a Unix time, or ``None``) and
+``fire`` (handle whatever is due now). The service keeps each source's
+deadline in a heap and sleeps until the earliest one, so work starts within
+the event loop's latency of its due time. A source's deadline is re-read:
+
+- when the service starts (resync from the database);
+- after each ``fire``, which normally moves the deadline on;
+- when :meth:`TimerService.wake` is called — the repositories call it on every
+  insert, update or delete, so a row created by ``/api/tasks``,
+  ``/api/schedule`` or ``ScheduleWakeup`` is timed at once;
+- every ``resync_seconds`` as a safety net for rows written behind the
+  repository's back (``sqlite3`` by hand), far less often than the old poll.
+
+Sleeps are capped at ``max_sleep_seconds`` and recomputed from memory — not
+the database — so a wall-clock jump (suspend, NTP step) delays a deadline by
+at most that much.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import heapq
+import itertools
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["TimerService", "TimerStats"]
+
+DEFAULT_MAX_SLEEP_SECONDS = 60.0
+DEFAULT_RESYNC_SECONDS = 600.0
+MIN_REFIRE_SECONDS = 1.0
+
+
+@dataclass
+class TimerStats:
+    """How often sources were re-read and fired."""
+
+    syncs: int = 0
+    fires: int = 0
+    wakes: int = 0
+
+
+@dataclass
+class _Source:
+    next_due: Callable[[], Awaitable[float | None]]
+    fire: Callable[[], Awaitable[None]]
+    due_at: float | None = None
+    synced_at: float = 0.0
+    fired_at: float = float("-inf")
+    dirty: bool = True
+    firing: asyncio.Task[None] | None = field(default=None, repr=False)
+
+
+class TimerService:
+    """Sleeps until the earliest deadline among its sources, then fires that source.
+
+    Call :meth:`start` from a running event loop; a source added later is
+    synced on the next turn of the loop.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_sleep_seconds: float = DEFAULT_MAX_SLEEP_SECONDS,
+        resync_seconds: float = DEFAULT_RESYNC_SECONDS,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if max_sleep_seconds <= 0:
+            raise ValueError("max_sleep_seconds must be positive")
+        if resync_seconds <= 0:
+            raise ValueError("resync_seconds must be positive")
+        self.max_sleep_seconds = max_sleep_seconds
+        self.resync_seconds = resync_seconds
+        self.stats = TimerStats()
+        self._clock = clock
+        self._sources: dict[str, _Source] = {}
+        # (due_at, seq, name); superseded entries are skipped when popped.
+        self._heap: list[tuple[float, int, str]] = []
+        self._seq = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the timer loop is active."""
+        return self._task is not None and not self._task.done()
+
+    def add_source(
+        self,
+        name: str,
+        *,
+        next_due: Callable[[], Awaitable[float | None]],
+        fire: Callable[[], Awaitable[None]],
+    ) -> None:
+        """Register (or replace) a source; its deadline is read on the next turn."""
+        self._sources[name] = _Source(next_due=next_due, fire=fire)
+        self._wakeup.set()
+
+    def remove_source(self, name: str) -> None:
+        """Forget a source. A ``fire`` already in progress is left to finish."""
+        self._sources.pop(name, None)
+
+    def wake(self, name: str | None = None) -> None:
+        """Re-read ``name``'s deadline (every source's without a name) on the next turn.
+
+        Safe to call from any coroutine or callback on the loop, as often as
+        rows change: repeated wakes before the loop runs cost one read.
+        """
+        for source_name, source in self._sources.items():
+            if name is None or source_name == name:
+                source.dirty = True
+        self.stats.wakes += 1
+        self._wakeup.set()
+
+    def start(self) -> None:
+        """Start the timer loop if it is not running."""
+        if not self.running:
+            self._task = asyncio.get_running_loop().create_task(
+                self._run(), name="ccdb-timer-service"
+            )
+
+    def stop(self) -> None:
+        """Cancel the timer loop. Fires in progress are left to finish."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            # Cleared before reading, so a wake that lands mid-read is kept.
+            self._wakeup.clear()
+            try:
+                await self._sync()
+                self._fire_due()
+            except Exception:
+                logger.exception("Timer service turn failed")
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self._sleep_seconds())
+
+    async def _sync(self) -> None:
+        now = self._clock()
+        for name, source in list(self._sources.items()):
+            if source.firing is not None:
+                continue
+            if not source.dirty and now - source.synced_at < self.resync_seconds:
+                continue
+            source.dirty = False
+            source.synced_at = now
+            self.stats.syncs += 1
+            try:
+                source.due_at = await source.next_due()
+            except Exception:
+                logger.exception("Timer source %s: could not read its next deadline", name)
+                source.due_at = now + self.max_sleep_seconds
+            if source.due_at is not None:
+                # A fire that leaves its rows due must not become a hot loop.
+                source.due_at = max(source.due_at, source.fired_at + MIN_REFIRE_SECONDS)
+                heapq.heappush(self._heap, (source.due_at, next(self._seq), name))
+
+    def _fire_due(self) -> None:
+        now = self._clock()
+        while self._heap and self._heap[0][0] <= now:
+            due_at, _, name = heapq.heappop(self._heap)
+            source = self._sources.get(name)
+            if source is None or source.due_at != due_at or source.firing is not None:
+                continue
+            source.due_at = None
+            source.fired_at = now
+            self.stats.fires += 1
+            source.firing = asyncio.get_running_loop().create_task(
+                self._fire(name, source), name=f"ccdb-timer-{name}"
+            )
+
+    async def _fire(self, name: str, source: _Source) -> None:
+        try:
+            await source.fire()
+        except Exception:
+            logger.exception("Timer source %s failed to fire", name)
+        finally:
+            source.firing = None
+            source.dirty = True
+            self._wakeup.set()
+
+    def _sleep_seconds(self) -> float:
+        now = self._clock()
+        while self._heap:
+            due_at, _, name = self._heap[0]
+            source = self._sources.get(name)
+            if source is not None and source.due_at == due_at:
+                break
+            heapq.heappop(self._heap)
+        sleep = self.max_sleep_seconds
+        if self._heap:
+            sleep = min(sleep, self._heap[0][0] - now)
+        idle = [s.synced_at for s in self._sources.values() if s.firing is None]
+        if idle:
+            sleep = min(sleep, min(idle) + self.resync_seconds - now)
+        return max(0.0, sleep)
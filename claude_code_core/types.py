@@ -6,8 +6,11 @@ Frontend-agnostic types shared by any Claude Code integration
 
 from __future__ import annotations
 
+import os
+from collections.abc import Mapping
 from dataclasses import dataclass, field
 from enum import Enum
+from types import MappingProxyType
 from typing import Any
 
 
@@ -199,12 +202,41 @@ class HookEvent:
     exit_code: int | None = None
 
 
-@dataclass
+# The source JSON of a parsed event is only useful when debugging a backend's
+# mapping, yet keeping it pins every dict the decoder built for as long as the
+# event lives. It is retained only when this is set; otherwise ``raw`` is one
+# shared, empty, read-only mapping.
+KEEP_RAW_EVENTS_ENV = "CCDB_KEEP_RAW_EVENTS"
+_keep_raw = os.environ.get(KEEP_RAW_EVENTS_ENV, "").strip().lower() in ("1", "true", "yes", "on")
+_NO_RAW: Mapping[str, Any] = MappingProxyType({})
+
+
+def set_keep_raw(enabled: bool) -> None:
+    """Turn retention of ``StreamEvent.raw`` on or off for events parsed from now on."""
+    global _keep_raw
+    _keep_raw = enabled
+
+
+def keep_raw(data: Mapping[str, Any]) -> Mapping[str, Any]:
+    """What a parser should store as ``StreamEvent.raw`` for ``data``."""
+    return data if _keep_raw else _NO_RAW
+
+
+def _no_raw() -> Mapping[str, Any]:
+    return _NO_RAW
+
+
+@dataclass(slots=True)
 class StreamEvent:
-    """A parsed event from the Claude Code stream-json output."""
+    """A parsed event from the Claude Code stream-json output.
+
+    Slotted: one is allocated per stream line, for every concurrent session, so
+    the per-instance ``__dict__`` was the bulk of its footprint. ``raw`` is empty
+    unless :func:`set_keep_raw` (or ``CCDB_KEEP_RAW_EVENTS``) enables it.
+    """
 
     message_type: MessageType
-    raw: dict = field(default_factory=dict)
+    raw: Mapping[str, Any] = field(default_factory=_no_raw)
     session_id: str | None = None
     text: str | None = None
     tool_use: ToolUseEvent | None = None
@@ -0,0 +1,472 @@
+"""Run sessions in worker processes instead of the bridge's event loop.
+
+Every turn used to run in the process that holds the Discord gateway: the CLI
+subprocess was spawned there, and every line it printed was decoded, parsed,
+privacy-filtered and rendered on the same event loop that answers gateway
+heartbeats. One session streaming a large tool result could hold the loop long
+enough to delay a heartbeat, and the bridge never used more than one core.
+
+Worker mode (``CCDB_WORKER_PROCESSES=N``) splits that in two:
+
+- the bridge wraps each backend in :class:`WorkerBackend`. Its ``run`` records
+  the turn in the durable job table (:class:`~claude_code_core.job_queue.JobQueue`)
+  and yields whatever events come back;
+- :class:`WorkerPool` starts N worker processes
+  (:mod:`claude_code_core.session_worker`), restarts any that exit, and listens
+  on a local Unix socket. A worker claims a turn, attaches to the socket, runs
+  the backend and streams the parsed :class:`~claude_code_core.types.StreamEvent`
+  objects back; the pool routes them to the turn that is waiting for them.
+
+Everything above the backend — admission, rendering, session bookkeeping — is
+unchanged, because the bridge still sees an ordinary ``SessionBackend``.
+Interrupts, kills and tool results travel back down the same connection.
+
+Secrets (the API secret) are not written to the table; the pool hands them to
+the worker over the socket when it attaches. The socket is created ``0600``.
+
+A turn the pool is waiting on is registered before a worker can see its row,
+so an attach always finds it. Until a worker attaches, the pool checks the row
+every ``check_seconds``: a row that has finished without one (abandoned,
+cancelled) or that a worker claimed and never attached for within
+``attach_timeout_seconds`` — the worker died in between — ends the turn with
+an error instead of leaving it, and its scheduler slot, waiting forever.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import hashlib
+import logging
+import os
+import sys
+import tempfile
+import time
+from collections.abc import AsyncGenerator
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from .event_wire import decode_event, encode_images
+from .job_queue import FINISHED, JobQueue
+from .session_worker import DEFAULT_MAX_JOBS, read_message, send_message
+from .stream_decode import DEFAULT_MAX_LINE_BYTES
+from .types import ImageData, MessageType, StreamEvent
+
+if TYPE_CHECKING:
+    from .backend import SessionBackend
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["ProxyBackend", "WorkerBackend", "WorkerPool", "WorkerPoolStats", "socket_path_for"]
+
+RESTART_DELAY_SECONDS = 2.0
+DEFAULT_CHECK_SECONDS = 5.0
+DEFAULT_ATTACH_TIMEOUT_SECONDS = 30.0
+# sockaddr_un.sun_path is 108 bytes on Linux and 104 on macOS.
+_MAX_SOCKET_PATH = 100
+
+# Runner attributes a worker needs to rebuild the backend.
+SPEC_ATTRS = (
+    "command",
+    "model",
+    "permission_mode",
+    "working_dir",
+    "timeout_seconds",
+    "allowed_tools",
+    "dangerously_skip_permissions",
+    "api_port",
+    "thread_id",
+    "append_system_prompt",
+    "fork_session",
+    "effort",
+)
+SECRET_ATTRS = ("api_secret",)
+
+
+def socket_path_for(db_path: str) -> str:
+    """Where the pool listens: beside the job table, or in the temp dir if too long."""
+    path = os.path.join(os.path.dirname(os.path.abspath(db_path)), "workers.sock")
+    if len(path.encode()) <= _MAX_SOCKET_PATH:
+        return path
+    digest = hashlib.sha256(path.encode()).hexdigest()[:12]
+    return os.path.join(tempfile.gettempdir(), f"ccdb-{digest}.sock")
+
+
+@dataclass
+class WorkerPoolStats:
+    """Turns handed out and how they ended."""
+
+    submitted: int = 0
+    attached: int = 0
+    lost: int = 0
+    restarts: int = 0
+
+
+class _Turn:
+    """The bridge's end of one turn: events in, controls out."""
+
+    def __init__(self, job_id: int, secrets: dict[str, Any]) -> None:
+        self.job_id = job_id
+        self.secrets = secrets
+        self.events: asyncio.Queue[StreamEvent | None] = asyncio.Queue()
+        self.writer: asyncio.StreamWriter | None = None
+        self.finished = False
+        self.watchdog: asyncio.Task[None] | None = None
+
+    async def send(self, message: dict[str, Any]) -> bool:
+        """Send a control message; False if no worker has attached yet."""
+        if self.writer is None or self.writer.is_closing():
+            return False
+        with contextlib.suppress(ConnectionError, OSError):
+            await send_message(self.writer, message)
+        return True
+
+
+class WorkerPool:
+    """Owns the worker processes and routes their events to waiting turns."""
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        *,
+        processes: int,
+        socket_path: str | None = None,
+        max_jobs: int = DEFAULT_MAX_JOBS,
+        check_seconds: float = DEFAULT_CHECK_SECONDS,
+        attach_timeout_seconds: float = DEFAULT_ATTACH_TIMEOUT_SECONDS,
+    ) -> None:
+        if processes < 0:
+            raise ValueError("processes must be >= 0")
+        if check_seconds <= 0 or attach_timeout_seconds <= 0:
+            raise ValueError("check_seconds and attach_timeout_seconds must be positive")
+        self.queue = queue
+        self.processes = processes
+        self.socket_path = socket_path or socket_path_for(queue.db_path)
+        self.max_jobs = max_jobs
+        self.check_seconds = check_seconds
+        self.attach_timeout_seconds = attach_timeout_seconds
+        self.stats = WorkerPoolStats()
+        self._turns: dict[int, _Turn] = {}
+        # Held from inserting a row until its turn is registered; see _serve_turn.
+        self._registering = asyncio.Lock()
+        self._workers: set[asyncio.StreamWriter] = set()
+        self._server: asyncio.Server | None = None
+        self._supervisors: list[asyncio.Task[None]] = []
+        self._closing = False
+
+    async def start(self) -> None:
+        """Open the socket, retire turns left by a previous run and start the workers."""
+        await self.queue.init_db()
+        abandoned = await self.queue.abandon()
+        if abandoned:
+            logger.warning("Abandoned %d worker turn(s) left by a previous run", abandoned)
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(self.socket_path)
+        self._server = await asyncio.start_unix_server(
+            self._handle, self.socket_path, limit=DEFAULT_MAX_LINE_BYTES
+        )
+        os.chmod(self.socket_path, 0o600)
+        for index in range(self.processes):
+            self._supervisors.append(
+                asyncio.create_task(self._supervise(f"worker-{index}"), name=f"ccdb-worker-{index}")
+            )
+        logger.info(
+            "Worker pool listening on %s with %d process(es)", self.socket_path, self.processes
+        )
+
+    async def close(self) -> None:
+        """Stop the workers and the socket. Turns in flight end with an error."""
+        self._closing = True
+        for task in self._supervisors:
+            task.cancel()
+        await asyncio.gather(*self._supervisors, return_exceptions=True)
+        for writer in list(self._workers):
+            writer.close()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for turn in list(self._turns.values()):
+            if turn.watchdog is not None:
+                turn.watchdog.cancel()
+            turn.events.put_nowait(None)
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(self.socket_path)
+
+    async def submit(
+        self,
+        *,
+        backend: str,
+        spec: dict[str, Any],
+        prompt: str,
+        session_id: str | None,
+        secrets: dict[str, Any] | None = None,
+    ) -> _Turn:
+        """Record a turn and tell the workers to look for it."""
+        async with self._registering:
+            job_id = await self.queue.enqueue(
+                owner=f"{os.getpid()}@{self.socket_path}",
+                backend=backend,
+                spec=spec,
+                prompt=prompt,
+                session_id=session_id,
+            )
+            turn = _Turn(job_id, secrets or {})
+            self._turns[job_id] = turn
+        turn.watchdog = asyncio.create_task(
+            self._watch_unattached(turn), name=f"ccdb-turn-{job_id}"
+        )
+        self.stats.submitted += 1
+        for writer in list(self._workers):
+            with contextlib.suppress(ConnectionError, OSError):
+                await send_message(writer, {"type": "wake"})
+        return turn
+
+    async def withdraw(self, turn: _Turn) -> None:
+        """Give up on a turn: cancel it if unclaimed, otherwise kill the run."""
+        self._turns.pop(turn.job_id, None)
+        if turn.watchdog is not None:
+            turn.watchdog.cancel()
+        if turn.finished:
+            return
+        turn.finished = True
+        if not await self.queue.cancel(turn.job_id):
+            await turn.send({"type": "kill"})
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            hello = await read_message(reader)
+            if hello is None:
+                return
+            if hello.get("type") == "worker":
+                await self._serve_worker(reader, writer)
+            elif hello.get("type") == "attach":
+                await self._serve_turn(int(hello["job"]), reader, writer)
+        except (ConnectionError, OSError, ValueError) as exc:
+            logger.debug("Worker connection dropped: %s", exc)
+        finally:
+            writer.close()
+
+    async def _serve_worker(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self._workers.add(writer)
+        try:
+            # Nothing is expected on this connection; it ends when the worker does.
+            while await reader.readline():
+                pass
+        finally:
+            self._workers.discard(writer)
+
+    async def _serve_turn(
+        self, job_id: int, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        if job_id not in self._turns:
+            # A worker can see the row before ``submit`` has registered the
+            # turn, but not before ``submit`` has let go of the lock.
+            async with self._registering:
+                pass
+        turn = self._turns.get(job_id)
+        if turn is None or turn.finished:
+            await send_message(writer, {"type": "cancel"})
+            return
+        turn.writer = writer
+        self.stats.attached += 1
+        await send_message(writer, {"type": "start", "secrets": turn.secrets})
+        while (message := await read_message(reader)) is not None:
+            if message.get("type") == "event":
+                turn.events.put_nowait(decode_event(message["event"]))
+            elif message.get("type") == "done":
+                if message.get("error"):
+                    turn.events.put_nowait(_error_event(message["error"]))
+                turn.finished = True
+                break
+        if not turn.finished:
+            turn.finished = True
+            self.stats.lost += 1
+            await self.queue.finish(job_id, error="worker exited mid-turn")
+            turn.events.put_nowait(_error_event("The worker running this turn exited."))
+        turn.events.put_nowait(None)
+
+    async def _watch_unattached(self, turn: _Turn) -> None:
+        """End ``turn`` if its row can no longer bring a worker to it."""
+        while True:
+            await asyncio.sleep(self.check_seconds)
+            if turn.writer is not None or turn.finished:
+                return
+            job = await self.queue.get(turn.job_id)
+            if turn.writer is not None or turn.finished:
+                return
+            if job is None or job.status in FINISHED:
+                status = job.status if job is not None else "missing"
+                reason = f"The turn ended ({status}) before a worker picked it up."
+            elif (
+                job.status == "running"
+                and job.claimed_at is not None
+                and time.time() - job.claimed_at > self.attach_timeout_seconds
+            ):
+                await self.queue.finish(turn.job_id, error="worker never attached")
+                reason = "The worker that claimed this turn never started it."
+            else:
+                continue
+            logger.warning("Worker turn %d lost before it started: %s", turn.job_id, reason)
+            turn.finished = True
+            self.stats.lost += 1
+            self._turns.pop(turn.job_id, None)
+            turn.events.put_nowait(_error_event(reason))
+            turn.events.put_nowait(None)
+            return
+
+    async def _supervise(self, name: str) -> None:
+        while not self._closing:
+            process = await asyncio.create_subprocess_exec(
+                sys.executable,
+                "-m",
+                "claude_code_core.session_worker",
+                "--db",
+                self.queue.db_path,
+                "--socket",
+                self.socket_path,
+                "--name",
+                name,
+                "--max-jobs",
+                str(self.max_jobs),
+            )
+            try:
+                code = await process.wait()
+            except asyncio.CancelledError:
+                if process.returncode is None:
+                    process.terminate()
+                    with contextlib.suppress(TimeoutError):
+                        await asyncio.wait_for(process.wait(), timeout=10)
+                    if process.returncode is None:
+                        process.kill()
+                raise
+            if self._closing:
+                return
+            self.stats.restarts += 1
+            logger.warning("Worker %s exited with %s; restarting", name, code)
+            await asyncio.sleep(RESTART_DELAY_SECONDS)
+
+
+def _error_event(message: str) -> StreamEvent:
+    return StreamEvent(message_type=MessageType.RESULT, is_complete=True, error=message)
+
+
+class ProxyBackend:
+    """Base for backends that run the wrapped backend's turns somewhere else.
+
+    The wrapped backend is never run here; it only carries the configuration.
+    Reads and writes of its attributes are forwarded to it, as with
+    :class:`~claude_code_core.privacy.AnonymizingBackend`, so Cogs that set
+    ``runner.working_dir`` or ``runner.images`` still configure the turn.
+    """
+
+    # Declared, never assigned: forwarded to the wrapped backend.
+    command: str
+    model: str
+    working_dir: str | None
+    permission_mode: str
+    images: list[ImageData] | None
+    api_port: int | None
+    timeout_seconds: int
+    dangerously_skip_permissions: bool
+    allowed_tools: list[str] | None
+
+    #: Attributes that live on the proxy itself rather than the wrapped backend.
+    _own: tuple[str, ...] = ("_inner",)
+
+    def __init__(self, inner: SessionBackend) -> None:
+        object.__setattr__(self, "_inner", inner)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(object.__getattribute__(self, "_inner"), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name in type(self)._own:
+            object.__setattr__(self, name, value)
+        else:
+            setattr(object.__getattribute__(self, "_inner"), name, value)
+
+    @property
+    def inner(self) -> SessionBackend:
+        return object.__getattribute__(self, "_inner")
+
+    def spec(self, attrs: tuple[str, ...] = SPEC_ATTRS) -> dict[str, Any]:
+        """The wrapped backend's configuration, as the other side will rebuild it."""
+        inner = self.inner
+        spec = {attr: getattr(inner, attr) for attr in attrs if hasattr(inner, attr)}
+        spec["images"] = encode_images(getattr(inner, "images", None))
+        return spec
+
+    def secrets(self) -> dict[str, Any]:
+        """Configuration that is sent over the socket but never stored."""
+        return {
+            attr: getattr(self.inner, attr)
+            for attr in SECRET_ATTRS
+            if getattr(self.inner, attr, None)
+        }
+
+    def _build_env(self) -> dict[str, str]:
+        return self.inner._build_env()
+
+    def describe_api(self) -> str:
+        return self.inner.describe_api()
+
+
+class WorkerBackend(ProxyBackend):
+    """Runs the wrapped backend's turns in a worker process of a :class:`WorkerPool`."""
+
+    _own = ("_inner", "_pool", "_backend", "_turn")
+
+    def __init__(self, inner: SessionBackend, pool: WorkerPool, *, backend: str) -> None:
+        super().__init__(inner)
+        object.__setattr__(self, "_pool", pool)
+        object.__setattr__(self, "_backend", backend)
+        object.__setattr__(self, "_turn", None)
+
+    async def run(
+        self,
+        prompt: str,
+        session_id: str | None = None,
+    ) -> AsyncGenerator[StreamEvent, None]:
+        pool: WorkerPool = object.__getattribute__(self, "_pool")
+        turn = await pool.submit(
+            backend=object.__getattribute__(self, "_backend"),
+            spec=self.spec(),
+            prompt=prompt,
+            session_id=session_id,
+            secrets=self.secrets(),
+        )
+        self._turn = turn
+        try:
+            while (event := await turn.events.get()) is not None:
+                yield event
+        finally:
+            self._turn = None
+            await pool.withdraw(turn)
+
+    async def interrupt(self) -> None:
+        turn: _Turn | None = object.__getattribute__(self, "_turn")
+        if turn is not None and not await turn.send({"type": "interrupt"}):
+            # Not claimed yet: there is nothing to interrupt, so drop the turn.
+            await object.__getattribute__(self, "_pool").withdraw(turn)
+            turn.events.put_nowait(None)
+
+    async def kill(self) -> None:
+        turn: _Turn | None = object.__getattribute__(self, "_turn")
+        if turn is not None:
+            await object.__getattribute__(self, "_pool").withdraw(turn)
+            turn.events.put_nowait(None)
+
+    async def inject_tool_result(self, request_id: str, data: dict) -> None:
+        turn: _Turn | None = object.__getattribute__(self, "_turn")
+        if turn is not None:
+            await turn.send({"type": "tool_result", "request_id": request_id, "data": data})
+
+    def clone(self, **kwargs: object) -> WorkerBackend:
+        """Clone the wrapped backend and keep it in worker mode."""
+        return WorkerBackend(
+            self.inner.clone(**kwargs),
+            object.__getattribute__(self, "_pool"),
+            backend=object.__getattribute__(self, "_backend"),
+        )
@@ -0,0 +1,182 @@
+"""Write-behind buffer for hot, overwrite-only database writes.
+
+Some writes are only ever "the latest value": a session's context-window
+usage, rewritten after every turn, and the account's rate-limit state,
+rewritten on every ``rate_limit_event`` the CLI emits — several per turn
+when a quota window is busy. Each one used to be its own connection and its
+own commit, and the commit's sync is most of what a write costs.
+
+:class:`WriteBehindBuffer` takes such writes under a key — the row they
+overwrite — and a later write to the same key replaces the pending one.
+Whatever is pending after ``interval_seconds`` goes to the database in one
+transaction with one commit. So a turn's stream of rate-limit updates and
+its context-stats write become a single small commit, and ten updates to one
+row become one statement.
+
+Only writes whose latest value is all that matters belong here, because a
+replaced write is never executed. A repository that defers writes calls
+:meth:`WriteBehindBuffer.flush` before it reads the same table, so a reader
+never sees an older value than one already written. ``flush`` is also how a
+caller forces pending writes out on demand. :meth:`WriteBehindBuffer.close`
+flushes whatever is left at shutdown; a repository whose buffer is closed
+writes straight through again.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+from collections.abc import Hashable
+from dataclasses import dataclass
+from typing import Any
+
+from .sqlite_pool import SqlitePool, connect
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["WriteBehindBuffer", "WriteBehindStats"]
+
+DEFAULT_INTERVAL_SECONDS = 1.0
+DEFAULT_MAX_PENDING = 256
+RETRY_SECONDS = 5.0
+
+
+@dataclass
+class WriteBehindStats:
+    """How much the buffer has saved."""
+
+    deferred: int = 0
+    coalesced: int = 0
+    flushes: int = 0
+    statements: int = 0
+    failures: int = 0
+
+
+class WriteBehindBuffer:
+    """Coalesces keyed writes to ``db_path`` and commits them together.
+
+    Usage::
+
+        buffer = WriteBehindBuffer(path, pool)
+        buffer.defer(("usage", "five_hour"), "INSERT ... ON CONFLICT ...", params)
+        ...
+        await buffer.close()  # at shutdown
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        pool: SqlitePool | None = None,
+        *,
+        interval_seconds: float = DEFAULT_INTERVAL_SECONDS,
+        max_pending: int = DEFAULT_MAX_PENDING,
+    ) -> None:
+        if interval_seconds <= 0:
+            raise ValueError("interval_seconds must be positive")
+        if max_pending < 1:
+            raise ValueError("max_pending must be at least 1")
+        self.db_path = db_path
+        self.pool = pool
+        self.interval_seconds = interval_seconds
+        self.max_pending = max_pending
+        self.stats = WriteBehindStats()
+        self._pending: dict[Hashable, tuple[str, tuple[Any, ...]]] = {}
+        self._flush_lock = asyncio.Lock()
+        self._timer: asyncio.TimerHandle | None = None
+        self._background: asyncio.Task[None] | None = None
+        self._closed = False
+
+    @property
+    def pending(self) -> int:
+        """Writes accepted but not yet committed."""
+        return len(self._pending)
+
+    @property
+    def closed(self) -> bool:
+        """Whether :meth:`close` has been called."""
+        return self._closed
+
+    def defer(self, key: Hashable, sql: str, params: tuple[Any, ...] = ()) -> None:
+        """Queue ``sql`` as the latest write to ``key``, replacing any pending one."""
+        if self._closed:
+            raise RuntimeError("write-behind buffer is closed")
+        self.stats.deferred += 1
+        if key in self._pending:
+            self.stats.coalesced += 1
+        self._pending[key] = (sql, params)
+        if len(self._pending) >= self.max_pending:
+            self._flush_in(0)
+        else:
+            self._flush_in(self.interval_seconds)
+
+    async def flush(self) -> int:
+        """Commit everything pending now, in one transaction. Returns the statements run."""
+        async with self._flush_lock:
+            self._cancel_timer()
+            batch, self._pending = self._pending, {}
+            if not batch:
+                return 0
+            try:
+                async with connect(self.db_path, self.pool) as db:
+                    for sql, params in batch.values():
+                        await db.execute(sql, params)
+                    await db.commit()
+            except BaseException:
+                self.stats.failures += 1
+                # Keep what was not superseded while the flush ran.
+                for key, write in batch.items():
+                    self._pending.setdefault(key, write)
+                raise
+            self.stats.flushes += 1
+            self.stats.statements += len(batch)
+            return len(batch)
+
+    async def close(self) -> None:
+        """Flush what is pending and stop accepting writes."""
+        if self._closed:
+            return
+        self._closed = True
+        self._cancel_timer()
+        if self._background is not None and not self._background.done():
+            self._background.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._background
+        await self.flush()
+        logger.debug("Write-behind buffer for %s closed (%s)", self.db_path, self.stats)
+
+    def _flush_in(self, delay: float) -> None:
+        if self._timer is not None:
+            if delay > 0:
+                return
+            self._timer.cancel()
+        loop = asyncio.get_running_loop()
+        self._timer = loop.call_later(delay, self._start_flush)
+
+    def _cancel_timer(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _start_flush(self) -> None:
+        self._timer = None
+        if self._background is not None and not self._background.done():
+            # The last flush is still waiting on the database. What was
+            # deferred since is not in its batch, so look again later rather
+            # than leave it for an unrelated write to pick up.
+            self._flush_in(self.interval_seconds)
+            return
+        self._background = asyncio.ensure_future(self._flush_quietly())
+
+    async def _flush_quietly(self) -> None:
+        try:
+            await self.flush()
+        except Exception:
+            logger.warning(
+                "Write-behind flush to %s failed; retrying in %.0fs",
+                self.db_path,
+                RETRY_SECONDS,
+                exc_info=True,
+            )
+            if not self._closed and self._pending:
+                self._flush_in(RETRY_SECONDS)
@@ -25,7 +25,7 @@ from .cogs.scheduler import SchedulerCog
 from .cogs.session_manage import SessionManageCog
 from .cogs.skill_command import SkillCommandCog
 from .cogs.webhook_trigger import WebhookTrigger, WebhookTriggerCog
-from .concurrency import ActiveSession, SessionRegistry
+from .concurrency import ActiveSession, RegistrySnapshot, SessionRegistry
 from .database.notification_repo import NotificationRepository
 from .database.repository import SessionRepository
 from .database.settings_repo import SettingsRepository
@@ -53,6 +53,7 @@ __all__ = [
     "EventProcessor",
     # Concurrency
     "ActiveSession",
+    "RegistrySnapshot",
     "SessionRegistry",
     "SessionManageCog",
     "CollisionWatchCog",
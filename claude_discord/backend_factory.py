@@ -11,10 +11,15 @@ from __future__ import annotations
 import logging
 from typing import TYPE_CHECKING
 
-from claude_code_core.backend import create_backend
+from claude_code_core.backend import apply_privacy_gateway, create_backend
 
 if TYPE_CHECKING:
     from claude_code_core.backend import SessionBackend
+    from claude_code_core.http_pool import SharedHttpSession
+    from claude_code_core.persistent_process import PersistentProcessRegistry
+    from claude_code_core.process_pool import WarmProcessPool
+    from claude_code_core.remote_agent import RemoteEndpoint
+    from claude_code_core.worker_pool import WorkerPool
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +38,8 @@ DEFAULT_MODEL: dict[str, str | None] = {
     "agui": None,
 }
 DEFAULT_COMMAND = {"claude": "claude", "codex": "codex", "local": "codex", "agui": "ag-ui"}
+# Backends that can run in a worker process or on a remote agent.
+_PROXIED_BACKENDS = ("claude", "codex", "local")
 
 
 class BackendFactory:
@@ -54,6 +61,11 @@ class BackendFactory:
         api_secret: str | None = None,
         agui_url: str | None = None,
         agui_token: str | None = None,
+        process_pool: WarmProcessPool | None = None,
+        persistent_processes: PersistentProcessRegistry | None = None,
+        agui_http_session: SharedHttpSession | None = None,
+        worker_pool: WorkerPool | None = None,
+        remote_workers: dict[str, RemoteEndpoint] | None = None,
     ) -> None:
         self.claude_command = claude_command or DEFAULT_COMMAND["claude"]
         self.codex_command = codex_command or DEFAULT_COMMAND["codex"]
@@ -68,6 +80,15 @@ class BackendFactory:
         self.api_secret = api_secret
         self.agui_url = agui_url
         self.agui_token = agui_token
+        # Shared by every Claude runner this factory builds; None disables it.
+        self.process_pool = process_pool
+        self.persistent_processes = persistent_processes
+        # Shared by every AG-UI backend, so turns reuse warm connections.
+        self.agui_http_session = agui_http_session
+        # Worker mode: CLI-backed turns run in worker processes, not here.
+        self.worker_pool = worker_pool
+        # Named remote agents a thread can be placed on (``/worker``).
+        self.remote_workers = remote_workers or {}
 
     def command_for(self, backend: str) -> str:
         if backend == "claude":
@@ -94,8 +115,13 @@ class BackendFactory:
         backend: str,
         model: str | None = None,
         thread_id: int | None = None,
+        worker: str | None = None,
     ) -> SessionBackend:
-        """Construct a fresh SessionBackend for the given backend/model."""
+        """Construct a fresh SessionBackend for the given backend/model.
+
+        ``worker`` names a remote agent to run the session on; ``None`` (or a
+        name that is no longer configured) runs it on this machine.
+        """
         chosen_model = model or self.default_model_for(backend)
         command = self.command_for(backend)
         kwargs: dict[str, object] = {
@@ -112,6 +138,8 @@ class BackendFactory:
             kwargs["endpoint_url"] = self.agui_url
             if self.agui_token:
                 kwargs["auth_token"] = self.agui_token
+            if self.agui_http_session is not None:
+                kwargs["http_session"] = self.agui_http_session
         if thread_id is not None:
             kwargs["thread_id"] = thread_id
         # ``append_system_prompt`` goes to every CLI-backed backend. Codex takes
@@ -127,10 +155,36 @@ class BackendFactory:
         # differ — Claude's "max" is not a Codex level.
         if backend == "claude" and self.effort is not None:
             kwargs["effort"] = self.effort
+        # Only ClaudeRunner knows how to claim a warm process; the pool's argv
+        # keys are Claude CLI command lines.
+        if backend == "claude" and self.process_pool is not None:
+            kwargs["process_pool"] = self.process_pool
+        if backend == "claude" and self.persistent_processes is not None:
+            kwargs["persistent_processes"] = self.persistent_processes
         if self.api_port is not None:
             kwargs["api_port"] = self.api_port
         if self.api_secret is not None:
             kwargs["api_secret"] = self.api_secret
-        runner = create_backend(backend=backend, model=chosen_model, **kwargs)
+        endpoint = self.remote_workers.get(worker) if worker is not None else None
+        if worker is not None and endpoint is None:
+            logger.warning("Unknown remote worker %r; running %s locally", worker, backend)
+        remote = endpoint is not None and backend in _PROXIED_BACKENDS
+        # A remote agent only receives the prompt, so the privacy gateway has
+        # to sit on this side of the hop: Anonymizing(Remote(runner)).
+        runner = create_backend(backend=backend, model=chosen_model, anonymize=not remote, **kwargs)
+        # AG-UI is an HTTP client with nothing to offload; the CLI backends
+        # spawn, parse and privacy-filter, which is what the workers take over.
+        if remote:
+            from claude_code_core.remote_agent import RemoteBackend
+
+            runner = apply_privacy_gateway(
+                RemoteBackend(runner, endpoint, backend=backend),
+                backend=backend,
+                thread_id=thread_id,
+            )
+        elif self.worker_pool is not None and backend in _PROXIED_BACKENDS:
+            from claude_code_core.worker_pool import WorkerBackend
+
+            runner = WorkerBackend(runner, self.worker_pool, backend=backend)
         logger.debug("Built %s runner (model=%s, thread_id=%s)", backend, chosen_model, thread_id)
         return runner
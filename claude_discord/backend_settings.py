@@ -30,6 +30,12 @@ MODEL_THREAD_PREFIX = "model.thread."  # + thread_id + "." + backend
 EFFORT_GLOBAL_PREFIX = "effort.global."  # + backend
 EFFORT_THREAD_PREFIX = "effort.thread."  # + thread_id + "." + backend
 
+# Remote worker placement (2-layer). The value names a CCDB_REMOTE_WORKERS
+# entry; WORKER_LOCAL at thread scope overrides a global placement.
+WORKER_GLOBAL = "worker.global"
+WORKER_THREAD_PREFIX = "worker.thread."  # + thread_id
+WORKER_LOCAL = "local"
+
 # Codex status footer toggle (2-layer: global default + per-thread override).
 #   "auto" — show the Codex status line only when it can actually be fetched
 #            (codex installed + logged in). Invisible for Claude-only users.
@@ -143,6 +149,19 @@ class BackendSettings:
         v = await self.repo.get(f"{EFFORT_GLOBAL_PREFIX}{backend}")
         return v if v else None
 
+    async def current_worker(self, thread_id: int | None = None) -> str | None:
+        """Return the remote worker this thread runs on, or None to run locally.
+
+        Resolution: thread > global > local. Whether the name is a configured
+        worker is the factory's concern; a stale name falls back to local there.
+        """
+        if thread_id is not None:
+            v = await self.repo.get(f"{WORKER_THREAD_PREFIX}{thread_id}")
+            if v:
+                return None if v == WORKER_LOCAL else v
+        v = await self.repo.get(WORKER_GLOBAL)
+        return v if v and v != WORKER_LOCAL else None
+
     async def codex_status_mode(self, thread_id: int | None = None) -> str:
         """Return the Codex status footer mode for this thread (or globally).
 
@@ -169,6 +188,17 @@ class BackendSettings:
             await self.repo.set(CODEX_STATUS_GLOBAL, mode)
             logger.info("codex status set: global -> %s", mode)
 
+    async def set_worker(self, worker: str, *, thread_id: int | None = None) -> None:
+        """Place new sessions on ``worker`` (``WORKER_LOCAL`` for this machine)."""
+        if not worker:
+            raise ValueError("worker must not be empty")
+        if thread_id is not None:
+            await self.repo.set(f"{WORKER_THREAD_PREFIX}{thread_id}", worker)
+            logger.info("worker set: thread=%d -> %s", thread_id, worker)
+        else:
+            await self.repo.set(WORKER_GLOBAL, worker)
+            logger.info("worker set: global -> %s", worker)
+
     async def set_backend(self, backend: str, *, thread_id: int | None = None) -> None:
         if backend not in ALL_BACKENDS:
             raise ValueError(f"unknown backend {backend!r}")
@@ -223,4 +253,6 @@ class BackendSettings:
                 deleted += 1
         if await self.repo.delete(f"{CODEX_STATUS_THREAD_PREFIX}{thread_id}"):
             deleted += 1
+        if await self.repo.delete(f"{WORKER_THREAD_PREFIX}{thread_id}"):
+            deleted += 1
         return deleted
@@ -11,6 +11,7 @@ from claude_code_core.parser import (
     _parse_ask_questions,
     _parse_todo_items,
     parse_line,
+    parse_line_bytes,
 )
 
-__all__ = ["parse_line", "_parse_ask_questions", "_parse_todo_items"]
+__all__ = ["parse_line", "parse_line_bytes", "_parse_ask_questions", "_parse_todo_items"]
@@ -18,40 +18,96 @@ from __future__ import annotations
 import asyncio
 import contextlib
 import logging
+import math
+import os
 import re
+import time
+from collections.abc import Callable
 from dataclasses import replace
+from typing import TYPE_CHECKING
 
 import discord
 
+from claude_code_core.event_queue import CoalescingEventQueue
 from claude_code_core.frontend import Notice, NoticeLevel
+from claude_code_core.rate_limit_pacer import RateLimitPacer
+from claude_code_core.session_scheduler import (
+    SessionPriority,
+    SessionScheduler,
+    SessionTicket,
+    repository_key,
+)
 
 from ..discord_ui.ask_handler import collect_ask_answers
 from ..discord_ui.embeds import error_embed, timeout_embed
 from ..lounge import build_lounge_prompt
 from ..pr_completion_gate import GitHubPrCompletionGate, build_completion_prompt
-from .event_processor import EventProcessor
+from .event_processor import EventProcessor, _backend_name_from_runner
 from .run_config import RunConfig
 
+if TYPE_CHECKING:
+    from claude_code_core.backend import SessionBackend
+    from claude_code_core.types import RateLimitInfo
+
+    from ..concurrency import SessionRegistry
+    from ..database.lounge_repo import LoungeRepository
+
 logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
 # Global session slot limiter
 # ---------------------------------------------------------------------------
-_global_semaphore: asyncio.Semaphore | None = None
+_scheduler: SessionScheduler | None = None
+_pacer: RateLimitPacer | None = None
 _max_concurrent: int = 3
 _pr_completion_gate: GitHubPrCompletionGate | None = None
 
 
-def configure_session_limit(max_concurrent: int) -> None:
+def configure_session_limit(
+    max_concurrent: int,
+    *,
+    max_per_repo: int | None = None,
+    headroom: Callable[[], bool] | None = None,
+    pace_rate_limits: bool = False,
+    preempt_background: bool = False,
+) -> None:
     """Set the process-wide concurrent session limit.
 
     Called once from ``setup_bridge()`` during startup.  All subsequent calls to
     ``run_claude_with_config()`` — regardless of which Cog invokes them — will
-    honour the limit.
+    honour the limit.  Who gets a freed slot is decided by
+    :class:`~claude_code_core.session_scheduler.SessionScheduler`: a person
+    waiting on a reply before scheduled or triggered work, and fairly between
+    users and channels within a class.
+
+    ``max_per_repo`` additionally caps runs per git repository (the runner's
+    working directory resolved by
+    :func:`~claude_code_core.session_scheduler.repository_key`), and
+    ``headroom`` holds new runs while the host is short of CPU or memory.
+    With ``pace_rate_limits`` the limit for Claude runs also follows the
+    account's quota (see :mod:`claude_code_core.rate_limit_pacer`), fed by
+    :func:`observe_rate_limit`.
+    With ``preempt_background`` a triggered or scheduled run gives its slot to a
+    person waiting on a reply: it is interrupted and resumes its session once
+    a slot frees up again.
     """
-    global _global_semaphore, _max_concurrent  # noqa: PLW0603
+    global _scheduler, _max_concurrent, _pacer  # noqa: PLW0603
     _max_concurrent = max_concurrent
-    _global_semaphore = asyncio.Semaphore(max_concurrent)
+    _scheduler = SessionScheduler(
+        max_concurrent,
+        max_per_resource=max_per_repo,
+        headroom=headroom,
+        preempt_from=SessionPriority.TRIGGERED if preempt_background else None,
+    )
+    if _pacer is not None:
+        _pacer.close()
+    _pacer = RateLimitPacer(_scheduler) if pace_rate_limits else None
+
+
+def observe_rate_limit(info: RateLimitInfo) -> None:
+    """Feed a rate-limit event (live or restored from ``usage_stats``) to the pacer."""
+    if _pacer is not None:
+        _pacer.observe(info)
 
 
 def configure_pr_completion_gate(owner: str | None) -> None:
@@ -91,6 +147,12 @@ def configure_wakeup_scheduler(task_repo) -> None:
     _wakeup_task_repo = task_repo
 
 
+# Sent when a background run that gave its slot to an interactive one resumes.
+_YIELD_RESUME_PROMPT = (
+    "You were paused so an interactive session could run. Continue the task "
+    "from where you left off."
+)
+
 # Max characters for tool result display (re-exported for backward compat).
 TOOL_RESULT_MAX_CHARS = 3000
 
@@ -134,38 +196,59 @@ async def _build_system_context(config: RunConfig) -> str | None:
     this ephemeral metadata from accumulating in session history, which would otherwise
     cause "Prompt is too long" errors over long conversations.
     """
+    # Layer 1 + 2: Register session so the others' notices include it.
+    if config.registry is not None:
+        config.registry.register(
+            config.surface.thread_key, config.prompt[:100], config.runner.working_dir
+        )
+    else:
+        logger.debug(
+            "No session registry — concurrency notice skipped for thread %d",
+            config.surface.thread_key,
+        )
+    return await _system_context(
+        thread_key=config.surface.thread_key,
+        working_dir=config.runner.working_dir,
+        lounge_repo=config.lounge_repo,
+        registry=config.registry,
+        post_compact_rerun=config.post_compact_rerun,
+    )
+
+
+async def _system_context(
+    *,
+    thread_key: int,
+    working_dir: str | None,
+    lounge_repo: LoungeRepository | None,
+    registry: SessionRegistry | None,
+    post_compact_rerun: bool = False,
+) -> str | None:
+    """The system context for a turn in ``thread_key``, without registering it.
+
+    A thread's own registration never appears in its own notice, so this is
+    also an exact prediction of what the next turn will be given.
+    """
     parts: list[str] = []
 
     # Layer 3: AI Lounge context (recent messages + invitation).
-    if config.lounge_repo is not None:
+    if lounge_repo is not None:
         try:
-            recent = await config.lounge_repo.get_recent(limit=10)
-            lounge_context = build_lounge_prompt(
-                recent, current_thread_id=config.surface.thread_key
-            )
+            recent = await lounge_repo.get_recent(limit=10)
+            lounge_context = build_lounge_prompt(recent, current_thread_id=thread_key)
             parts.append(lounge_context)
             logger.debug("Lounge context built (%d recent message(s))", len(recent))
         except Exception:
             logger.warning("Failed to fetch lounge context — skipping", exc_info=True)
 
-    # Layer 1 + 2: Register session and build concurrency notice.
-    if config.registry is not None:
-        config.registry.register(
-            config.surface.thread_key, config.prompt[:100], config.runner.working_dir
-        )
-        others = config.registry.list_others(config.surface.thread_key)
-        notice = config.registry.build_concurrency_notice(config.surface.thread_key)
+    if registry is not None:
+        others = registry.list_others(thread_key)
+        notice = registry.build_concurrency_notice(thread_key)
         parts.append(notice)
         logger.info(
             "Concurrency notice built for thread %d (%d other active session(s), dir=%s)",
-            config.surface.thread_key,
+            thread_key,
             len(others),
-            config.runner.working_dir or "(default)",
-        )
-    else:
-        logger.debug(
-            "No session registry — concurrency notice skipped for thread %d",
-            config.surface.thread_key,
+            working_dir or "(default)",
         )
 
     # File delivery marker: always injected so Claude knows the per-thread
@@ -173,8 +256,8 @@ async def _build_system_context(config: RunConfig) -> str | None:
     # or CLAUDE.md rather than from an explicit "send me the file" request.
     from .event_processor import _attachment_marker_name
 
-    wd = config.runner.working_dir or "your current working directory"
-    marker = _attachment_marker_name(config.surface.thread_key)
+    wd = working_dir or "your current working directory"
+    marker = _attachment_marker_name(thread_key)
     parts.append(
         "## File Delivery\n"
         "When you need to send files to Discord, use your Bash tool to append "
@@ -189,13 +272,45 @@ async def _build_system_context(config: RunConfig) -> str | None:
     )
 
     # Post-compact guardrail: prevent auto-execution of "pending tasks" from summary.
-    if config.post_compact_rerun:
+    if post_compact_rerun:
         parts.append(_POST_COMPACT_GUARDRAIL)
-        logger.info("Post-compact guardrail injected for thread %d", config.surface.thread_key)
+        logger.info("Post-compact guardrail injected for thread %d", thread_key)
 
     return "\n\n".join(parts) if parts else None
 
 
+async def prewarm_runner(
+    runner: SessionBackend,
+    *,
+    thread_key: int,
+    session_id: str,
+    lounge_repo: LoungeRepository | None = None,
+    registry: SessionRegistry | None = None,
+    ttl_seconds: float | None = None,
+) -> bool:
+    """Pre-spawn the CLI process the thread's next turn will ask for.
+
+    ``runner`` must be built exactly as the turn will build it; the system
+    context is added here the same way :func:`run_claude_with_config` adds it,
+    so the warm process matches. Returns ``False`` for a backend without a
+    warm pool.
+    """
+    if getattr(runner, "process_pool", None) is None:
+        return False
+    system_context = await _system_context(
+        thread_key=thread_key,
+        working_dir=runner.working_dir,
+        lounge_repo=lounge_repo,
+        registry=registry,
+    )
+    if system_context:
+        runner = runner.clone(append_system_prompt=system_context)
+    prewarm = getattr(runner, "prewarm", None)
+    if prewarm is None:
+        return False
+    return bool(prewarm(session_id, ttl_seconds=ttl_seconds))
+
+
 async def _cleanup_session_worktree(config: RunConfig) -> None:
     """Remove the session worktree for this thread if it is clean.
 
@@ -401,27 +516,103 @@ async def run_claude_with_config(config: RunConfig) -> str | None:
 
     processor = EventProcessor(config)
 
-    # --- Session slot limiter (global semaphore) ---
-    sem = _global_semaphore
-    if sem is not None and sem.locked():
+    # --- Session slot limiter (priority- and fairness-aware scheduler) ---
+    scheduler = _scheduler
+    ticket = None
+    if scheduler is not None:
+        ticket = scheduler.enqueue(
+            priority=config.priority,
+            user_id=config.notify_user_id,
+            channel_id=_fairness_channel(config),
+            resource=_admission_resource(config, scheduler),
+            # Only Claude runs draw on the quota the pacer watches.
+            paced=_backend_name_from_runner(config.runner) == "claude",
+        )
+        if not ticket.admitted:
+            with contextlib.suppress(Exception):
+                await config.surface.send_notice(
+                    Notice(level=NoticeLevel.SUBTLE, body=_waiting_notice(scheduler, ticket))
+                )
+            try:
+                await ticket.wait()
+            except BaseException:
+                scheduler.release(ticket)
+                raise
+
+    if config.yielded_at is not None:
+        yielded = time.monotonic() - config.yielded_at
+        logger.info(
+            "Resuming session %s after yielding its slot for %.0fs",
+            config.session_id,
+            yielded,
+        )
         with contextlib.suppress(Exception):
             await config.surface.send_notice(
                 Notice(
                     level=NoticeLevel.SUBTLE,
-                    body=(
-                        f"\u23f3 Waiting for a free session slot\u2026 "
-                        f"({_max_concurrent} max sessions running)"
-                    ),
+                    body=f"\u25b6\ufe0f Resuming \u2014 yielded the session slot for "
+                    f"{_format_yield(yielded)}",
                 )
             )
-    if sem is not None:
-        await sem.acquire()
+        config = replace(config, yielded_at=None)
+
+    # Reading and rendering run as a pipeline: a slow or rate-limited frontend
+    # must not stop stdout from being read. See claude_code_core.event_queue.
+    events = CoalescingEventQueue()
+    # Set once the turn's RESULT is read. The reader runs on until stdout
+    # closes, so ``reader.done()`` alone cannot tell that the turn is over.
+    completed = False
 
+    async def _read_events() -> None:
+        nonlocal completed
+        try:
+            async for event in runner.run(config.prompt, session_id=config.session_id):
+                if event.is_complete:
+                    completed = True
+                await events.put(event)
+        finally:
+            events.close()
+
+    reader = asyncio.create_task(_read_events())
+    # Set once this run interrupts itself to give its slot to a person.
+    yielding = False
+
+    async def _yield_when_asked(ticket: SessionTicket) -> None:
+        nonlocal yielding
+        await ticket.wait_for_yield()
+        # A finished turn is about to free its slot anyway; interrupting it
+        # would only turn its result into a spurious resume.
+        if not completed and not reader.done():
+            yielding = True
+            await runner.interrupt()
+
+    yield_watch = (
+        asyncio.create_task(_yield_when_asked(ticket))
+        if scheduler is not None and ticket is not None and scheduler.preempt_from is not None
+        else None
+    )
     try:
-        async for event in runner.run(config.prompt, session_id=config.session_id):
-            if processor.should_drain and not event.is_complete:
+        while (event := await events.get()) is not None:
+            if (processor.should_drain or yielding) and not event.is_complete:
+                continue
+            if yielding:
+                # The interrupted turn's RESULT: not an error, not "Done".
+                await processor.close_interrupted(event)
                 continue
             await processor.process(event)
+            # Resumable once the CLI has named the session.
+            if scheduler is not None and ticket is not None and processor.session_id:
+                scheduler.mark_preemptible(ticket)
+        # Surfaces a runner failure to the handler below, after every event
+        # the runner produced before failing has been rendered.
+        await reader
+        if events.coalesced:
+            logger.debug(
+                "Coalesced %d superseded event(s) for thread %s (queue high-water %d)",
+                events.coalesced,
+                config.surface.thread_key,
+                events.high_water,
+            )
     except Exception as exc:
         logger.exception("Error running Claude CLI for thread %d", config.surface.thread_key)
         with contextlib.suppress(Exception):
@@ -439,14 +630,43 @@ async def run_claude_with_config(config: RunConfig) -> str | None:
         await _emit_result_sink(config, None, f"{type(exc).__name__}: {exc}")
         return processor.session_id
     finally:
-        if sem is not None:
-            sem.release()
+        if yield_watch is not None:
+            yield_watch.cancel()
+        if not reader.done():
+            reader.cancel()
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                await reader
+        if scheduler is not None and ticket is not None:
+            scheduler.release(ticket)
         await processor.finalize()
         if config.registry is not None:
             config.registry.unregister(config.surface.thread_key)
         if config.worktree_manager is not None:
             await _cleanup_session_worktree(config)
 
+    # Gave the slot to a person: queue again and resume the same session. A run
+    # that stopped for an AskUserQuestion already waits without holding a slot.
+    if yielding and not processor.pending_ask:
+        session_id = processor.session_id or config.session_id
+        logger.info("Session %s yielded its slot to an interactive session", session_id)
+        with contextlib.suppress(Exception):
+            await config.surface.send_notice(
+                Notice(
+                    level=NoticeLevel.SUBTLE,
+                    body="\u23f8\ufe0f Paused to free a session slot for an interactive "
+                    "reply \u2014 resumes automatically when one is free",
+                )
+            )
+        resume_config = replace(
+            config,
+            prompt=_YIELD_RESUME_PROMPT,
+            session_id=session_id,
+            images=None,
+            post_compact_rerun=config.post_compact_rerun or processor.compact_occurred,
+            yielded_at=time.monotonic(),
+        )
+        return await run_claude_with_config(resume_config)
+
     # After compact_boundary, rerun with a guardrail to prevent Claude from
     # auto-executing "pending tasks" from the compacted context summary.
     if processor.compact_occurred:
@@ -508,6 +728,57 @@ async def run_claude_with_config(config: RunConfig) -> str | None:
     return processor.session_id
 
 
+def _fairness_channel(config: RunConfig) -> int:
+    """The channel a run counts against: a thread's parent, else the surface itself."""
+    parent = getattr(config.thread, "parent_id", None)
+    return parent if isinstance(parent, int) else config.surface.thread_key
+
+
+def _admission_resource(config: RunConfig, scheduler: SessionScheduler) -> str | None:
+    """The repository a run counts against, when a per-repository limit is set."""
+    if scheduler.max_per_resource is None:
+        return None
+    working_dir = config.runner.working_dir
+    if working_dir is None:
+        working_dir = os.getcwd()
+    if not isinstance(working_dir, str):
+        return None
+    return repository_key(working_dir)
+
+
+def _waiting_notice(scheduler: SessionScheduler, ticket: SessionTicket) -> str:
+    position = scheduler.position(ticket)
+    reason = scheduler.wait_reason(ticket)
+    if reason == "resource":
+        return (
+            f"\u23f3 Waiting for a free session slot in this repository\u2026 "
+            f"(#{position} in queue, {scheduler.max_per_resource} max per repository)"
+        )
+    if reason == "headroom":
+        return f"\u23f3 Waiting for the host to free up CPU or memory\u2026 (#{position} in queue)"
+    held_until = _pacer.held_until if _pacer is not None else None
+    if reason == "rate_limit" and held_until is not None:
+        minutes = max(1, math.ceil((held_until - time.time()) / 60))
+        return (
+            f"\u23f3 Usage limit nearly reached \u2014 background work is held until it "
+            f"resets (in about {minutes} min)"
+        )
+    if scheduler.limit < _max_concurrent:
+        return (
+            f"\u23f3 Waiting for a free session slot\u2026 (#{position} in queue, "
+            f"{scheduler.limit} of {_max_concurrent} sessions while the usage limit is high)"
+        )
+    return (
+        f"\u23f3 Waiting for a free session slot\u2026 "
+        f"(#{position} in queue, {_max_concurrent} max sessions running)"
+    )
+
+
+def _format_yield(seconds: float) -> str:
+    minutes, secs = divmod(round(seconds), 60)
+    return f"{minutes}m {secs}s" if minutes else f"{secs}s"
+
+
 async def _emit_result_sink(config: RunConfig, text: str | None, error: str | None) -> None:
     """Invoke config.result_sink once with the run's terminal outcome.
 
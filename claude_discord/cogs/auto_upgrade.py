@@ -17,6 +17,7 @@ import contextlib
 import logging
 from collections.abc import Callable
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
 
 import discord
 from discord import app_commands
@@ -25,6 +26,9 @@ from discord.ext import commands
 from ..protocols import DrainAware
 from ..thread_policy import THREAD_AUTO_ARCHIVE_MINUTES
 
+if TYPE_CHECKING:
+    from ..database.repository import SessionRecord
+
 logger = logging.getLogger(__name__)
 
 # Default timeout for each subprocess step (seconds).
@@ -378,15 +382,18 @@ class AutoUpgradeCog(commands.Cog):
             return
 
         session_repo = getattr(self.bot, "session_repo", None)
+        records: dict[int, SessionRecord] = {}
+        if session_repo is not None:
+            try:
+                records = await session_repo.get_many(thread_ids)
+            except Exception:
+                logger.warning("Failed to look up sessions to resume", exc_info=True)
         marked = 0
 
         for tid in thread_ids:
             try:
-                session_id: str | None = None
-                if session_repo is not None:
-                    record = await session_repo.get(tid)
-                    if record is not None:
-                        session_id = record.session_id
+                record = records.get(tid)
+                session_id = record.session_id if record is not None else None
 
                 await resume_repo.mark(
                     tid,
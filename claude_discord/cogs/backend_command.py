@@ -17,6 +17,7 @@ from ..backend_settings import (
     ALL_BACKENDS,
     CODEX_STATUS_DEFAULT,
     CODEX_STATUS_MODES,
+    WORKER_LOCAL,
     BackendSettings,
 )
 from ..model_catalog import claude_model_choices
@@ -220,6 +221,81 @@ class BackendCommandCog(commands.Cog):
             ephemeral=False,
         )
 
+    # ── /worker ────────────────────────────────────────────────────
+
+    async def _worker_name_autocomplete(
+        self, interaction: discord.Interaction, current: str
+    ) -> list[Choice[str]]:
+        names = [WORKER_LOCAL, *sorted(self._factory.remote_workers)]
+        return [Choice(name=n, value=n) for n in names if current.lower() in n.lower()][:25]
+
+    @app_commands.command(
+        name="worker",
+        description="Show or choose the machine new sessions run on",
+    )
+    @app_commands.autocomplete(name=_worker_name_autocomplete)
+    @app_commands.choices(
+        scope=[
+            Choice(name="thread", value=SCOPE_THREAD),
+            Choice(name="global", value=SCOPE_GLOBAL),
+        ],
+    )
+    @app_commands.describe(
+        name="A worker from CCDB_REMOTE_WORKERS, or local. Omit to show current setting.",
+        scope=(
+            "thread: only this thread; global: server-wide default. "
+            "Default: thread when invoked in a thread, otherwise global."
+        ),
+    )
+    async def worker_command(
+        self,
+        interaction: discord.Interaction,
+        name: str | None = None,
+        scope: str | None = None,
+    ) -> None:
+        thread_id_now = self._thread_id_or_none(interaction)
+        known = sorted(self._factory.remote_workers)
+
+        if name is None:
+            current_global = await self._settings.current_worker(None) or WORKER_LOCAL
+            lines = [f"🖥️ **Global worker**: `{current_global}`"]
+            if thread_id_now is not None:
+                current_thread = await self._settings.current_worker(thread_id_now)
+                current_thread = current_thread or WORKER_LOCAL
+                tag = " (thread override)" if current_thread != current_global else ""
+                lines.append(f"🧵 **This thread**: `{current_thread}`{tag}")
+            available = ", ".join(f"`{n}`" for n in known) or "_(none configured)_"
+            lines.append(f"-# Remote workers: {available}")
+            await interaction.response.send_message("\n".join(lines), ephemeral=True)
+            return
+
+        if name != WORKER_LOCAL and name not in known:
+            choices = ", ".join([WORKER_LOCAL, *known])
+            await interaction.response.send_message(
+                f"Unknown worker `{name}`. Choose: {choices}.",
+                ephemeral=True,
+            )
+            return
+
+        resolved_scope, target_thread_id = self._resolve_scope(interaction, scope)
+        if resolved_scope == SCOPE_THREAD and target_thread_id is None:
+            await interaction.response.send_message(
+                "`scope:thread` requires the command to be run inside a thread.",
+                ephemeral=True,
+            )
+            return
+
+        await self._settings.set_worker(name, thread_id=target_thread_id)
+        scope_label = (
+            f"<#{target_thread_id}>"
+            if resolved_scope == SCOPE_THREAD and target_thread_id is not None
+            else "**globally**"
+        )
+        await interaction.response.send_message(
+            f"🖥️ Worker set to `{name}` {scope_label}. Next session will run there.",
+            ephemeral=False,
+        )
+
     # ── /model show|set|install ────────────────────────────────────
 
     async def _backend_for_autocomplete(self, interaction: discord.Interaction) -> str:
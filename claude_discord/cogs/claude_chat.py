@@ -23,6 +23,8 @@ from discord import app_commands
 from discord.ext import commands
 
 from claude_code_core.backend import SessionBackend
+from claude_code_core.persistent_process import PersistentProcessRegistry
+from claude_code_core.session_scheduler import SessionPriority
 
 from ..backend_factory import BackendFactory
 from ..backend_settings import BackendSettings, session_is_resumable
@@ -44,7 +46,8 @@ from ..discord_ui.thread_dashboard import ThreadState, ThreadStatusDashboard
 from ..discord_ui.thread_renamer import suggest_title
 from ..discord_ui.views import RewindSelectView, StopView
 from ..thread_policy import THREAD_AUTO_ARCHIVE_MINUTES
-from ._run_helper import run_claude_with_config
+from ..typing_prewarm import TypingPrewarmer
+from ._run_helper import prewarm_runner, run_claude_with_config
 from .prompt_builder import build_prompt_and_images, wants_file_attachment
 from .run_config import RunConfig
 
@@ -80,6 +83,7 @@ _HELP_CATEGORY: dict[str, str | None] = {
     "model": "🤖 Model",
     "backend": "🤖 Model",
     "engine-status": "🤖 Model",
+    "worker": "🤖 Model",  # which machine new sessions run on
     "ollama": "🤖 Model",  # manage the runtime behind the `local` backend
     "ask": "🤖 Model",  # one anonymized question to an external model
     "effort": "⚡ Effort",
@@ -123,6 +127,7 @@ class ClaudeChatCog(commands.Cog):
         factory: BackendFactory | None = None,
         backend_settings: BackendSettings | None = None,
         conversation_history: ConversationHistoryReader | None = None,
+        prewarmer: TypingPrewarmer | None = None,
     ) -> None:
         self.bot = bot
         self.repo = repo
@@ -177,6 +182,8 @@ class ClaudeChatCog(commands.Cog):
         self._settings_repo = settings_repo or getattr(bot, "settings_repo", None)
         # When True, rename the thread after creation using a claude -p title suggestion
         self._auto_rename_threads = auto_rename_threads
+        # Optional: pre-spawn a thread's next CLI process while its user types.
+        self._prewarmer = prewarmer
 
     @property
     def active_session_count(self) -> int:
@@ -263,6 +270,59 @@ class ClaudeChatCog(commands.Cog):
         if self._is_summoned(message):
             await self._handle_mention(message)
 
+    @commands.Cog.listener()
+    async def on_typing(
+        self, channel: discord.abc.Messageable, user: discord.abc.User, when: object
+    ) -> None:
+        """Pre-warm the CLI process for the reply a user is typing, if enabled.
+
+        Only threads where every message goes to Claude, that hold a resumable
+        session and have nothing running: anywhere else the message may never
+        reach Claude, or will not resume the session the process was built for.
+        """
+        if self._prewarmer is None or getattr(user, "bot", False):
+            return
+        if not isinstance(channel, discord.Thread) or not self._is_no_mention_scope(channel):
+            return
+        if self._allowed_user_ids is not None and user.id not in self._allowed_user_ids:
+            return
+        if channel.id in self._active_runners:
+            return
+        record = await self.repo.get(channel.id)
+        if record is None or not record.session_id:
+            return
+        if self._backend_settings is not None:
+            current = await self._backend_settings.current_backend(channel.id)
+            if not session_is_resumable(record.backend, current):
+                return
+        if not self._prewarmer.admit(user.id, channel.id):
+            return
+
+        try:
+            runner = await self._build_runner_for_thread(
+                thread_id=channel.id,
+                model_override=await self._get_current_model(),
+                tools_override=await self._get_allowed_tools(),
+                fork_session=False,
+                working_dir_override=record.working_dir,
+                effort_override=await self._get_current_effort(),
+            )
+            started = await prewarm_runner(
+                runner,
+                thread_key=channel.id,
+                session_id=record.session_id,
+                lounge_repo=self._lounge_repo,
+                registry=self._registry,
+                ttl_seconds=self._prewarmer.ttl_seconds,
+            )
+        except Exception:
+            logger.debug("Typing pre-warm failed for thread %d", channel.id, exc_info=True)
+            started = False
+        if started:
+            logger.info("Pre-warming thread %d while user %d types", channel.id, user.id)
+        else:
+            self._prewarmer.release(channel.id)
+
     def _is_no_mention_scope(self, channel: discord.abc.MessageableChannel) -> bool:
         """Return whether *channel* is one ccdb was invited to speak in freely.
 
@@ -353,6 +413,7 @@ class ClaudeChatCog(commands.Cog):
             backend=backend,
             model=model,
             thread_id=thread_id,
+            worker=await self._backend_settings.current_worker(thread_id),
         )
 
         # Apply per-call overrides that the factory does not know about.
@@ -553,6 +614,7 @@ class ClaudeChatCog(commands.Cog):
         if runner:
             await runner.kill()
             del self._active_runners[interaction.channel.id]
+        await self._release_kept_process(interaction.channel.id)
 
         deleted = await self.repo.delete(interaction.channel.id)
         if deleted:
@@ -604,6 +666,7 @@ class ClaudeChatCog(commands.Cog):
             runner = self._active_runners.pop(thread_id, None)
             if runner:
                 await runner.kill()
+            await self._release_kept_process(thread_id)
             await self.repo.delete(thread_id)
             await interaction.response.send_message(
                 "⏪ No conversation history found to rewind. "
@@ -624,6 +687,7 @@ class ClaudeChatCog(commands.Cog):
             jsonl_path=jsonl_path,
             active_runners=self._active_runners,
             thread_id=thread_id,
+            release_kept_process=self._release_kept_process,
         )
         await interaction.response.send_message(
             f"⏪ **Rewind**{ctx_note} — select a turn to go back to before:",
@@ -881,6 +945,7 @@ class ClaudeChatCog(commands.Cog):
                     session_id=session_id,
                     fork=fork,
                     result_sink=result_sink,
+                    priority=SessionPriority.SPAWNED,
                 )
             )
         return thread
@@ -933,6 +998,7 @@ class ClaudeChatCog(commands.Cog):
             chat_only=chat_only,
             interrupt_existing=interrupt,
             interrupt_notice="-# ⚡ Interrupted by another session's message...",
+            priority=SessionPriority.SPAWNED,
         )
 
     async def cog_unload(self) -> None:
@@ -1077,6 +1143,8 @@ class ClaudeChatCog(commands.Cog):
         """
         thread = message.channel
         assert isinstance(thread, discord.Thread)
+        if self._prewarmer is not None:
+            self._prewarmer.release(thread.id)
 
         record = await self.repo.get(thread.id)
         session_id = record.session_id if record else None
@@ -1282,6 +1350,12 @@ class ClaudeChatCog(commands.Cog):
         No deadlock: a task is only in ``_active_tasks`` after it finished its
         own phase 1 and released the lock, so it never blocks on the lock we
         hold here.
+
+        A process parked for keep-alive by an earlier clean turn is not an
+        active run and is left alone: the runner registered next is the one
+        that claims it. An interrupted run never parks (only a clean finish
+        does), so awaiting its cleanup here still guarantees its process is
+        gone.
         """
         existing_runner = self._active_runners.get(thread.id)
         if existing_runner is None:
@@ -1300,6 +1374,22 @@ class ClaudeChatCog(commands.Cog):
             with contextlib.suppress(Exception):
                 await existing_task
 
+    async def _release_kept_process(self, thread_id: int) -> None:
+        """Stop the thread's kept-alive CLI process, if keep-alive is enabled.
+
+        Needed wherever the conversation changes in a way the session ID does
+        not show (``/rewind`` truncates the transcript in place) or where the
+        thread is done with its session (``/clear``); the idle reaper would
+        otherwise hold the process until it times out.
+        """
+        registry = (
+            getattr(self._factory, "persistent_processes", None)
+            if self._factory is not None
+            else getattr(self.runner, "persistent_processes", None)
+        )
+        if isinstance(registry, PersistentProcessRegistry):
+            await registry.release(thread_id)
+
     async def _run_claude(
         self,
         user_message: discord.Message,
@@ -1313,6 +1403,7 @@ class ClaudeChatCog(commands.Cog):
         result_sink: Callable[[str | None, str | None], Awaitable[None]] | None = None,
         interrupt_existing: bool = False,
         interrupt_notice: str = "-# ⚡ Interrupted. Starting with new instruction...",
+        priority: SessionPriority = SessionPriority.INTERACTIVE,
     ) -> None:
         """Execute Claude Code CLI and stream results to the thread.
 
@@ -1387,6 +1478,14 @@ class ClaudeChatCog(commands.Cog):
                 working_dir_override=working_dir_override,
                 effort_override=effort_override,
             )
+            # A runner that cannot claim the thread's kept-alive process (the
+            # thread switched to another backend) would leave it idling until
+            # the reaper fires — and alongside a second live session.
+            if not isinstance(
+                getattr(runner, "persistent_processes", None), PersistentProcessRegistry
+            ):
+                await self._release_kept_process(thread.id)
+
             # Register as the sole active run BEFORE releasing the lock. Track
             # the task too so a later eviction can await our cleanup.
             self._active_runners[thread.id] = runner
@@ -1430,6 +1529,7 @@ class ClaudeChatCog(commands.Cog):
                     codex_command=(
                         self._factory.codex_command if self._factory is not None else "codex"
                     ),
+                    priority=priority,
                 )
             )
         finally:
@@ -304,6 +304,21 @@ class EventProcessor:
         if event.is_complete:
             await self._on_complete(event)
 
+    async def close_interrupted(self, event: StreamEvent) -> None:
+        """Close a turn the caller interrupted on purpose, without reporting it.
+
+        The RESULT of a turn stopped to give up its session slot is neither a
+        failure nor a finished run, so none of :meth:`process`'s completion
+        rendering applies: the streamed text is flushed and the session ID is
+        kept for the resume, nothing more.
+        """
+        if self._streamer.has_content:
+            await self._streamer.finalize()
+            self._assistant_text_sent = True
+            self._streamer = self._config.surface.open_stream()
+        if event.session_id:
+            self._state.session_id = event.session_id
+
     async def wait_for_prompts(self) -> None:
         """Await every outstanding approval or input prompt.
 
@@ -570,8 +585,13 @@ class EventProcessor:
         await self._config.surface.set_status(StatusKind.THINKING)
 
     async def _on_rate_limit_event(self, event: StreamEvent) -> None:
-        """Handle RATE_LIMIT_EVENT — persist latest rate limit info to usage_stats."""
-        if self._config.usage_repo is None or event.rate_limit_info is None:
+        """Handle RATE_LIMIT_EVENT — pace the scheduler and persist to usage_stats."""
+        if event.rate_limit_info is None:
+            return
+        from ._run_helper import observe_rate_limit
+
+        observe_rate_limit(event.rate_limit_info)
+        if self._config.usage_repo is None:
             return
         await self._config.usage_repo.upsert(event.rate_limit_info)
 
@@ -10,24 +10,36 @@ through — never with a path of its own.  A scheduled notification that is
 accepted but never delivered is indistinguishable from a delivered one at the
 API surface (it is listed by ``GET /api/scheduled`` either way), so the only
 safe design is one where a second database cannot come into existence.
+
+Delivery is timed by the shared :class:`~claude_code_core.timer_service.TimerService`
+rather than a 30-second poll: the Cog sleeps until the earliest pending
+``scheduled_at`` and the repository wakes it whenever a row is written, so a
+reminder arrives on time and an idle bot does not query SQLite.
 """
 
 from __future__ import annotations
 
 import logging
+import time
 from datetime import datetime
 from typing import TYPE_CHECKING, Any
 
 import discord
-from discord.ext import commands, tasks
+from discord.ext import commands
+
+from claude_code_core.timer_service import TimerService
 
 if TYPE_CHECKING:
     from ..database.notification_repo import NotificationRepository
 
 logger = logging.getLogger(__name__)
 
-# Matches SchedulerCog's cadence: the worst-case lateness a user can observe.
-DISPATCH_INTERVAL_SECONDS = 30
+# This Cog's name among the timer service's sources.
+TIMER_SOURCE = "scheduled-notifications"
+
+# When the earliest pending row's time cannot be read, look again this often —
+# the old poll's cadence, since that row can only be judged by dispatch_due.
+UNREADABLE_RETRY_SECONDS = 30
 
 DEFAULT_COLOR = 0x00BFFF
 
@@ -56,27 +68,43 @@ class NotificationDispatchCog(commands.Cog):
         repo: NotificationRepository,
         default_channel_id: int | None = None,
         stale_after_seconds: int = DEFAULT_STALE_AFTER_SECONDS,
+        timers: TimerService | None = None,
     ) -> None:
         self.bot = bot
         self.repo = repo
         self.default_channel_id = default_channel_id
         self.stale_after_seconds = stale_after_seconds
+        self._owns_timers = timers is None
+        self.timers = timers or TimerService()
+        repo.add_change_listener(self._wake)
 
     async def cog_load(self) -> None:
-        self._dispatch_loop.start()
-        logger.info("NotificationDispatchCog loaded — dispatch loop started")
+        self.timers.add_source(TIMER_SOURCE, next_due=self._next_due, fire=self._fire)
+        self.timers.start()
+        logger.info("NotificationDispatchCog loaded — timing deliveries from the database")
 
     def cog_unload(self) -> None:
-        self._dispatch_loop.cancel()
-        logger.info("NotificationDispatchCog unloaded — dispatch loop stopped")
+        self.timers.remove_source(TIMER_SOURCE)
+        if self._owns_timers:
+            self.timers.stop()
+        logger.info("NotificationDispatchCog unloaded — delivery timer stopped")
 
-    @tasks.loop(seconds=DISPATCH_INTERVAL_SECONDS)
-    async def _dispatch_loop(self) -> None:
-        await self.dispatch_due()
+    def _wake(self) -> None:
+        self.timers.wake(TIMER_SOURCE)
 
-    @_dispatch_loop.before_loop
-    async def _before_dispatch_loop(self) -> None:
+    async def _next_due(self) -> float | None:
+        scheduled_at = await self.repo.get_next_scheduled_at()
+        if scheduled_at is None:
+            return None
+        try:
+            # Stored as naive local time, which is what .timestamp() assumes.
+            return datetime.fromisoformat(scheduled_at).timestamp()
+        except (ValueError, TypeError):
+            return time.time() + UNREADABLE_RETRY_SECONDS
+
+    async def _fire(self) -> None:
         await self.bot.wait_until_ready()
+        await self.dispatch_due()
 
     async def dispatch_due(self) -> None:
         """Send every pending notification whose time has passed.
@@ -22,6 +22,7 @@ knowing any Ollama syntax.
 from __future__ import annotations
 
 import logging
+import time
 from typing import TYPE_CHECKING, Any
 
 import discord
@@ -33,6 +34,7 @@ from claude_code_core.local_backend import LocalModelConfig, validate_ollama_mod
 from claude_code_core.ollama_client import (
     OllamaError,
     OllamaModel,
+    PullProgress,
     RunningModel,
     delete_model,
     list_models,
@@ -55,6 +57,9 @@ MAX_CHOICES = 25
 # Discord rejects a message body over 2,000 characters. Tables are trimmed to
 # stay under it with room for the surrounding prose and fence.
 MAX_TABLE_CHARS = 1700
+# A pull streams thousands of progress lines; the status message is edited at
+# most this often.
+PULL_PROGRESS_INTERVAL_SECONDS = 15.0
 
 
 def _fence(body: str) -> str:
@@ -382,14 +387,34 @@ class OllamaCommandCog(commands.Cog):
 
         entry = catalog_by_name(name)
         size_note = f" (~{entry.approx_gb:.0f}GB)" if entry else ""
-        await interaction.response.send_message(
+        header = (
             f"📦 Pulling `{name}`{size_note}. Large models take a while; "
-            f"I'll post here when it finishes.\n-# {CATALOG_NOTE}",
+            f"I'll post here when it finishes.\n-# {CATALOG_NOTE}"
         )
+        await interaction.response.send_message(header)
+
+        last_edit = time.monotonic()
+        editable = True
+
+        async def report(progress: PullProgress) -> None:
+            nonlocal last_edit, editable
+            now = time.monotonic()
+            if not editable or now - last_edit < PULL_PROGRESS_INTERVAL_SECONDS:
+                return
+            last_edit = now
+            percent = "" if progress.percent is None else f" {progress.percent}%"
+            try:
+                await interaction.edit_original_response(
+                    content=f"{header}\n⏳ {progress.status}{percent}"
+                )
+            except discord.HTTPException:
+                # The interaction token expires after 15 minutes; the final
+                # result is posted to the channel regardless.
+                editable = False
 
         channel: Any = interaction.channel
         try:
-            await pull_model(self.base_url, name)
+            await pull_model(self.base_url, name, on_progress=report)
         except (OllamaError, ValueError) as exc:
             logger.exception("Ollama pull failed for %s", name)
             detail = str(exc).strip()[:500] or type(exc).__name__
@@ -16,6 +16,7 @@ import discord
 
 from claude_code_core.backend import SessionBackend
 from claude_code_core.frontend import ConversationSurface
+from claude_code_core.session_scheduler import SessionPriority
 
 from ..claude.types import ImageData
 from ..concurrency import SessionRegistry
@@ -122,6 +123,14 @@ class RunConfig:
     # Which frontend created this session mapping. Historical callers remain
     # Discord by default; the Teams host sets this explicitly.
     session_origin: str = "discord"
+    # Admission class for the global session limit: who gets a freed slot
+    # first. Automation (scheduler, webhooks, API spawns) sets its own class so
+    # a burst of it cannot keep a person waiting on a reply.
+    priority: SessionPriority = SessionPriority.INTERACTIVE
+    # Set (to time.monotonic()) on the run that resumes a background session
+    # after it gave its slot to an interactive one, so the resumed run can
+    # report how long it yielded.
+    yielded_at: float | None = None
 
     # Prevent accidental field mutation — RunConfig is a value object.
     # Use dataclasses.replace() to create modified copies.
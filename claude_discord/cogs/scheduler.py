@@ -3,9 +3,15 @@
 Design:
 - Tasks are stored in ``scheduled_tasks`` DB table and registered via REST API
   (Claude Code calls POST /api/tasks from within a chat session).
-- A single 30-second master loop checks for due tasks and spawns them.
-- ``discord.ext.tasks`` is used only for the master loop — individual tasks
-  are not @tasks.loop decorated (they are runtime-dynamic).
+- The Cog is one source of the shared
+  :class:`~claude_code_core.timer_service.TimerService`: it sleeps until the
+  earliest ``next_run_at`` and is re-timed whenever the task table changes
+  (``/api/tasks``, ``ScheduleWakeup``), so a task starts on time rather than
+  up to 30 seconds late, and an idle bot does not query SQLite.
+- Individual tasks are not @tasks.loop decorated (they are runtime-dynamic).
+- With ``stagger_seconds``, tasks due together start that far apart, in due
+  order; the rest are moved to their planned slot rather than run in a burst
+  (see :mod:`claude_discord.schedule_plan`).
 - Claude handles all domain logic (what to check, how to deduplicate).
   ccdb only manages scheduling.
 
@@ -16,13 +22,17 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import time
 from typing import TYPE_CHECKING
 
-from discord.ext import commands, tasks
+from discord.ext import commands
 
 from claude_code_core.frontend import ConversationSurface, Notice, NoticeLevel
+from claude_code_core.session_scheduler import SessionPriority
+from claude_code_core.timer_service import TimerService
 
 from ..frontend import DiscordFrontend
+from ..schedule_plan import stagger
 from ._run_helper import run_claude_with_config
 from .headless_backend import build_headless_runner
 from .run_config import RunConfig
@@ -38,8 +48,8 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
-# How often the master loop wakes up to check for due tasks.
-MASTER_LOOP_INTERVAL_SECONDS = 30
+# This Cog's name among the timer service's sources.
+TIMER_SOURCE = "scheduled-tasks"
 
 
 class SchedulerCog(commands.Cog):
@@ -61,6 +71,8 @@ class SchedulerCog(commands.Cog):
         backend_factory: BackendFactory | None = None,
         backend_settings: BackendSettings | None = None,
         frontend: SessionFrontend | None = None,
+        timers: TimerService | None = None,
+        stagger_seconds: float = 0.0,
     ) -> None:
         self.bot = bot
         self.runner = runner
@@ -74,33 +86,67 @@ class SchedulerCog(commands.Cog):
         self.frontend: SessionFrontend = frontend or DiscordFrontend(bot)
         # Track in-flight tasks to avoid double-running the same task_id.
         self._running: set[int] = set()
+        self.stagger_seconds = stagger_seconds
+        # The earliest time the next scheduled start may happen.
+        self._next_slot = 0.0
+        # Without a shared timer the Cog runs its own, so it still works alone.
+        self._owns_timers = timers is None
+        self.timers = timers or TimerService()
+        repo.add_change_listener(self._wake)
 
     async def cog_load(self) -> None:
-        """Start the master loop when the Cog is loaded."""
-        self._master_loop.start()
-        logger.info("SchedulerCog loaded — master loop started")
+        """Time the next due task once the Cog is loaded."""
+        self.timers.add_source(TIMER_SOURCE, next_due=self._next_due, fire=self._fire)
+        self.timers.start()
+        logger.info("SchedulerCog loaded — timing tasks from the database")
 
     def cog_unload(self) -> None:
-        """Cancel the master loop when the Cog is unloaded."""
-        self._master_loop.cancel()
-        logger.info("SchedulerCog unloaded — master loop stopped")
+        """Stop timing tasks when the Cog is unloaded."""
+        self.timers.remove_source(TIMER_SOURCE)
+        if self._owns_timers:
+            self.timers.stop()
+        logger.info("SchedulerCog unloaded — task timer stopped")
 
-    @tasks.loop(seconds=MASTER_LOOP_INTERVAL_SECONDS)
-    async def _master_loop(self) -> None:
-        """Wake up every 30 s, find due tasks, and spawn them concurrently."""
+    def _wake(self) -> None:
+        self.timers.wake(TIMER_SOURCE)
+
+    async def _next_due(self) -> float | None:
+        # A task still running is re-timed when it finishes (see _run_task).
+        return await self.repo.get_next_run_at(exclude_ids=self._running)
+
+    async def _fire(self) -> None:
+        await self.bot.wait_until_ready()
+        await self.run_due()
+
+    async def run_due(self) -> None:
+        """Find due tasks and spawn them concurrently."""
         due = await self.repo.get_due()
         if not due:
             return
 
         logger.info("SchedulerCog: %d task(s) due", len(due))
+        idle = []
         for task in due:
+            if task["id"] in self._running:
+                logger.debug("Task %d still running — skipping", task["id"])
+            else:
+                idle.append(task)
+        now = time.time()
+        plan, _ = stagger(
+            ((task["next_run_at"], task) for task in idle),
+            stagger_seconds=self.stagger_seconds,
+            next_free=max(self._next_slot, now),
+        )
+        for start, task in plan:
             task_id: int = task["id"]
-            if task_id in self._running:
-                logger.debug("Task %d still running — skipping", task_id)
+            if start > now:
+                # Not its turn yet: park it at its planned slot.
+                await self.repo.set_next_run(task_id, start)
                 continue
+            self._next_slot = now + self.stagger_seconds
 
             # Advance next_run_at *before* spawning to prevent duplicate runs
-            # if the loop fires again before the task finishes.
+            # if the timer fires again before the task finishes.
             await self.repo.update_next_run(task_id, interval_seconds=task["interval_seconds"])
 
             asyncio.create_task(
@@ -108,10 +154,6 @@ class SchedulerCog(commands.Cog):
                 name=f"ccdb-scheduler-{task_id}",
             )
 
-    @_master_loop.before_loop
-    async def _before_master_loop(self) -> None:
-        await self.bot.wait_until_ready()
-
     async def _run_task(self, task: dict) -> None:
         """Execute a single scheduled task in a Discord thread.
 
@@ -176,6 +218,7 @@ class SchedulerCog(commands.Cog):
                     session_id=session_id,
                     registry=registry,
                     backend_settings=self.backend_settings,
+                    priority=SessionPriority.SCHEDULED,
                 )
             )
 
@@ -188,13 +231,14 @@ class SchedulerCog(commands.Cog):
             logger.exception("SchedulerCog: task %d (%s) failed", task_id, task["name"])
         finally:
             self._running.discard(task_id)
+            self._wake()
 
     async def _open_new_conversation(self, task: dict) -> ConversationSurface | None:
         """Start a fresh conversation under the task's parent channel.
 
         A missing or unusable parent is a configuration problem, not a
-        transient one, so it is logged and the task is skipped — the master
-        loop must survive one badly configured task.
+        transient one, so it is logged and the task is skipped — the timer
+        must survive one badly configured task.
         """
         try:
             return await self.frontend.create_surface(
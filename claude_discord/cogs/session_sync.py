@@ -128,11 +128,10 @@ async def sync_cli_sessions(
 
     imported = 0
     skipped = 0
+    tracked = await repo.get_by_session_ids(s.session_id for s in cli_sessions)
 
     for cli_session in cli_sessions:
-        # Check if already tracked
-        existing = await repo.get_by_session_id(cli_session.session_id)
-        if existing:
+        if cli_session.session_id in tracked:
             skipped += 1
             continue
 
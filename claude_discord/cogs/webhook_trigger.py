@@ -7,7 +7,16 @@ Security design:
 - Only processes messages with a webhook_id (ignores regular users and bots)
 - Optional webhook_id allowlist for stricter access control
 - Prompts are defined server-side (webhook payload only selects which trigger)
-- Per-prefix asyncio.Lock prevents concurrent runs of the same trigger
+- At most one run per trigger: hits that arrive while one is running or
+  pending are coalesced into it
+
+A flaky pipeline can post the same failure webhook ten times in a minute. The
+trigger's prompt does not depend on the payload, so ten runs would do the
+same work ten times. Instead, while a trigger has a run pending or active,
+new hits are merged into that run: the run's thread lists them, each gets a
+reply pointing at the run, and all of them get its completion reaction. With
+``debounce_seconds`` the first hit waits that long before starting, so a burst
+collapses into one run before any work begins.
 """
 
 from __future__ import annotations
@@ -21,6 +30,8 @@ import aiohttp
 import discord
 from discord.ext import commands
 
+from claude_code_core.session_scheduler import SessionPriority
+
 from ..cogs._run_helper import run_claude_with_config
 from ..cogs.headless_backend import build_headless_runner
 from ..cogs.run_config import RunConfig
@@ -46,6 +57,8 @@ class WebhookTrigger:
         timeout: Override ClaudeRunner's timeout in seconds.
         allowed_tools: Override ClaudeRunner's allowed tools list.
         dangerously_skip_permissions: Whether to skip Claude Code permission checks.
+        debounce_seconds: Wait this long after the first hit before starting the
+            run; further hits in the window are merged into it.
     """
 
     prompt: str
@@ -54,6 +67,26 @@ class WebhookTrigger:
     allowed_tools: list[str] | None = None
     dangerously_skip_permissions: bool = True
     permission_mode: str | None = None
+    debounce_seconds: float = 0.0
+
+
+@dataclass
+class _TriggerBatch:
+    """The webhook hits one run of a trigger answers."""
+
+    hits: list[discord.Message]
+    thread: discord.Thread | None = None
+    started: bool = False
+    # Hits already listed in the thread; the first is the one it was created from.
+    announced: int = 1
+
+    @property
+    def count(self) -> int:
+        return len(self.hits)
+
+    def references(self, start: int = 0) -> list[str]:
+        """Links to the hits from ``start`` on, in arrival order."""
+        return [hit.jump_url for hit in self.hits[start:]]
 
 
 class WebhookTriggerCog(commands.Cog):
@@ -91,13 +124,14 @@ class WebhookTriggerCog(commands.Cog):
         self._registry = registry or getattr(bot, "session_registry", None)
         self._backend_factory = backend_factory
         self._backend_settings = backend_settings
-        self._locks: dict[str, asyncio.Lock] = {prefix: asyncio.Lock() for prefix in triggers}
+        self._batches: dict[str, _TriggerBatch] = {}
         self._active_count: int = 0
+        self.coalesced_count: int = 0
 
     @property
     def active_count(self) -> int:
-        """Number of currently running webhook-triggered Claude sessions."""
-        return self._active_count
+        """Webhook-triggered Claude sessions running, or waiting out their debounce."""
+        return self._active_count + sum(1 for b in self._batches.values() if not b.started)
 
     @commands.Cog.listener()
     async def on_message(self, message: discord.Message) -> None:
@@ -133,25 +167,43 @@ class WebhookTriggerCog(commands.Cog):
             message.webhook_id,
         )
 
-        lock = self._locks[matched_prefix]
-        if lock.locked():
-            await message.reply(f"⏳ `{matched_prefix}` is already running. Skipping.")
+        batch = self._batches.get(matched_prefix)
+        if batch is not None:
+            batch.hits.append(message)
+            self.coalesced_count += 1
+            logger.info("Webhook trigger %r coalesced (%d hits)", matched_prefix, batch.count)
+            where = f" in {batch.thread.mention}" if batch.thread is not None else ""
+            state = "running" if batch.started else "pending"
+            await message.reply(
+                f"⏳ `{matched_prefix}` is already {state} — merged into that run{where} "
+                f"({batch.count} hits)."
+            )
             return
 
-        async with lock:
-            await self._execute_trigger(message, matched_prefix, matched_trigger)
+        batch = self._batches[matched_prefix] = _TriggerBatch(hits=[message])
+        try:
+            if matched_trigger.debounce_seconds > 0:
+                await asyncio.sleep(matched_trigger.debounce_seconds)
+            await self._execute_trigger(message, matched_prefix, matched_trigger, batch)
+        finally:
+            del self._batches[matched_prefix]
 
     async def _execute_trigger(
         self,
         message: discord.Message,
         prefix: str,
         trigger: WebhookTrigger,
+        batch: _TriggerBatch | None = None,
     ) -> None:
-        """Execute a matched trigger via Claude Code."""
+        """Execute a matched trigger via Claude Code, answering every hit in ``batch``."""
+        if batch is None:
+            batch = _TriggerBatch(hits=[message])
         thread = await message.create_thread(
             name=prefix[:100],
             auto_archive_duration=THREAD_AUTO_ARCHIVE_MINUTES,
         )
+        batch.thread = thread
+        await self._announce_hits(batch)
 
         runner = await build_headless_runner(
             self.runner,
@@ -165,6 +217,7 @@ class WebhookTriggerCog(commands.Cog):
             dangerously_skip_permissions=trigger.dangerously_skip_permissions,
         )
 
+        batch.started = True
         self._active_count += 1
         try:
             session_id = await run_claude_with_config(
@@ -177,17 +230,39 @@ class WebhookTriggerCog(commands.Cog):
                     status=None,
                     registry=self._registry,
                     backend_settings=self._backend_settings,
+                    priority=SessionPriority.TRIGGERED,
                 )
             )
 
+            await self._announce_hits(batch)
             reaction = "✅" if session_id else "❌"
-            try:
-                await message.add_reaction(reaction)
-            except (discord.HTTPException, aiohttp.ClientError):
-                logger.debug("Discord client closed before completion reaction", exc_info=True)
-            except RuntimeError as exc:
-                if str(exc) != "Session is closed":
-                    raise
-                logger.debug("Discord session closed before completion reaction", exc_info=True)
+            for hit in batch.hits:
+                await _react(hit, reaction)
         finally:
             self._active_count -= 1
+
+    async def _announce_hits(self, batch: _TriggerBatch) -> None:
+        """List, in the run's thread, the hits merged since the last announcement."""
+        if batch.thread is None or batch.count <= batch.announced:
+            return
+        new = batch.references(batch.announced)
+        batch.announced = batch.count
+        lines = "\n".join(f"- {url}" for url in new)
+        try:
+            await batch.thread.send(
+                f"🔁 {len(new)} more webhook hit(s) merged into this run "
+                f"({batch.count} in total):\n{lines}"[:2000]
+            )
+        except discord.HTTPException:
+            logger.debug("Could not list coalesced webhook hits", exc_info=True)
+
+
+async def _react(message: discord.Message, reaction: str) -> None:
+    try:
+        await message.add_reaction(reaction)
+    except (discord.HTTPException, aiohttp.ClientError):
+        logger.debug("Discord client closed before completion reaction", exc_info=True)
+    except RuntimeError as exc:
+        if str(exc) != "Session is closed":
+            raise
+        logger.debug("Discord session closed before completion reaction", exc_info=True)
@@ -10,7 +10,7 @@ See: https://github.com/ebibibi/ebi-agent-chat-relay/issues/52
 from __future__ import annotations
 
 import threading
-from dataclasses import dataclass
+from dataclasses import dataclass, field, replace
 
 # ---------------------------------------------------------------------------
 # Layer 2: Active Session Registry
@@ -62,16 +62,59 @@ _OTHER_SESSIONS_HEADER = """
 ⚠️ ACTIVE SESSIONS RIGHT NOW (you MUST avoid conflicts with these):
 """
 
+_OTHER_SESSIONS_FOOTER = (
+    "\nIf your work targets the same repository as any session above, "
+    "you MUST use a git worktree. Do NOT proceed without isolation.\n"
+)
+
+
+@dataclass(frozen=True)
+class RegistrySnapshot:
+    """The registry's sessions as of one version. Never changes once taken."""
+
+    version: int
+    sessions: tuple[ActiveSession, ...] = ()
+
+    def others(self, thread_id: int) -> list[ActiveSession]:
+        """Every session in the snapshot except ``thread_id``."""
+        return [s for s in self.sessions if s.thread_id != thread_id]
+
+
+@dataclass
+class _NoticeCache:
+    """Rendered session lines for one registry version, and the blocks built from them."""
+
+    version: int
+    lines: dict[int, str]
+    blocks: dict[int, str] = field(default_factory=dict)
+
 
 class SessionRegistry:
     """Thread-safe registry of active Claude Code sessions.
 
     Designed to be shared across all Cogs in a single bot instance.
+
+    Writers copy the session table under a lock and publish it as an
+    immutable :class:`RegistrySnapshot` with the next version number, so
+    readers — every turn's notice, the dashboard, the API — just take the
+    current snapshot and never wait on the lock. A published session is never
+    modified; :meth:`update` replaces it.
+
+    The "other sessions" block of the concurrency notice is rendered once per
+    session per version and cached, so turns that start while nothing changes
+    share one render instead of each rebuilding it.
     """
 
     def __init__(self) -> None:
         self._sessions: dict[int, ActiveSession] = {}
         self._lock = threading.Lock()
+        self._snapshot = RegistrySnapshot(version=0)
+        self._notice_cache = _NoticeCache(version=0, lines={})
+
+    @property
+    def version(self) -> int:
+        """Incremented on every change to the set of sessions or their fields."""
+        return self._snapshot.version
 
     def register(
         self,
@@ -80,17 +123,22 @@ class SessionRegistry:
         working_dir: str | None = None,
     ) -> None:
         """Register or replace an active session."""
+        session = ActiveSession(
+            thread_id=thread_id,
+            description=description,
+            working_dir=working_dir,
+        )
         with self._lock:
-            self._sessions[thread_id] = ActiveSession(
-                thread_id=thread_id,
-                description=description,
-                working_dir=working_dir,
-            )
+            if self._sessions.get(thread_id) == session:
+                return
+            self._sessions[thread_id] = session
+            self._publish()
 
     def unregister(self, thread_id: int) -> None:
         """Remove a session from the registry."""
         with self._lock:
-            self._sessions.pop(thread_id, None)
+            if self._sessions.pop(thread_id, None) is not None:
+                self._publish()
 
     def update(
         self,
@@ -104,20 +152,26 @@ class SessionRegistry:
             session = self._sessions.get(thread_id)
             if session is None:
                 return
-            if description is not None:
-                session.description = description
-            if working_dir is not None:
-                session.working_dir = working_dir
+            updated = replace(
+                session,
+                description=session.description if description is None else description,
+                working_dir=session.working_dir if working_dir is None else working_dir,
+            )
+            if updated != session:
+                self._sessions[thread_id] = updated
+                self._publish()
+
+    def snapshot(self) -> RegistrySnapshot:
+        """The current sessions and version, without taking the lock."""
+        return self._snapshot
 
     def list_active(self) -> list[ActiveSession]:
         """Return all active sessions."""
-        with self._lock:
-            return list(self._sessions.values())
+        return list(self._snapshot.sessions)
 
     def list_others(self, thread_id: int) -> list[ActiveSession]:
         """Return all active sessions except the given thread."""
-        with self._lock:
-            return [s for s in self._sessions.values() if s.thread_id != thread_id]
+        return self._snapshot.others(thread_id)
 
     def build_concurrency_notice(self, thread_id: int) -> str:
         """Build the full concurrency notice for a session.
@@ -125,17 +179,36 @@ class SessionRegistry:
         Combines the base Layer 1 warning with Layer 2 context about
         other active sessions.
         """
-        notice = _BASE_CONCURRENCY_NOTICE.format(thread_id=thread_id)
-        others = self.list_others(thread_id)
-        if others:
-            notice += _OTHER_SESSIONS_HEADER
-            for s in others:
-                line = f"- {s.description}"
-                if s.working_dir:
-                    line += f" (working in {s.working_dir})"
-                notice += line + "\n"
-            notice += (
-                "\nIf your work targets the same repository as any session above, "
-                "you MUST use a git worktree. Do NOT proceed without isolation.\n"
+        return _BASE_CONCURRENCY_NOTICE.format(thread_id=thread_id) + self._others_block(thread_id)
+
+    def _publish(self) -> None:
+        # Caller holds the lock.
+        self._snapshot = RegistrySnapshot(
+            version=self._snapshot.version + 1, sessions=tuple(self._sessions.values())
+        )
+
+    def _others_block(self, thread_id: int) -> str:
+        snapshot = self._snapshot
+        cache = self._notice_cache
+        if cache.version != snapshot.version:
+            cache = _NoticeCache(
+                version=snapshot.version,
+                lines={s.thread_id: _session_line(s) for s in snapshot.sessions},
+            )
+            # A reader racing on an older snapshot may overwrite this with a
+            # stale cache; the version check makes the next reader rebuild it.
+            self._notice_cache = cache
+        block = cache.blocks.get(thread_id)
+        if block is None:
+            lines = [line for key, line in cache.lines.items() if key != thread_id]
+            block = (
+                "".join([_OTHER_SESSIONS_HEADER, *lines, _OTHER_SESSIONS_FOOTER]) if lines else ""
             )
-        return notice
+            cache.blocks[thread_id] = block
+        return block
+
+
+def _session_line(session: ActiveSession) -> str:
+    if session.working_dir:
+        return f"- {session.description} (working in {session.working_dir})\n"
+    return f"- {session.description}\n"
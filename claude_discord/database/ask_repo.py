@@ -14,7 +14,7 @@ import logging
 from dataclasses import dataclass
 from typing import Any
 
-import aiosqlite
+from claude_code_core.sqlite_pool import SqlitePool, connect
 
 logger = logging.getLogger(__name__)
 
@@ -34,8 +34,9 @@ class PendingAskRecord:
 class PendingAskRepository:
     """Async SQLite repository for pending_asks rows."""
 
-    def __init__(self, db_path: str) -> None:
+    def __init__(self, db_path: str, *, pool: SqlitePool | None = None) -> None:
         self._db_path = db_path
+        self._pool = pool
 
     async def save(
         self,
@@ -45,7 +46,7 @@ class PendingAskRepository:
         question_idx: int = 0,
     ) -> None:
         """Insert or replace the pending ask for *thread_id*."""
-        async with aiosqlite.connect(self._db_path) as db:
+        async with connect(self._db_path, self._pool) as db:
             await db.execute(
                 """
                 INSERT OR REPLACE INTO pending_asks
@@ -64,7 +65,7 @@ class PendingAskRepository:
     async def get(self, thread_id: int) -> PendingAskRecord | None:
         """Return the pending ask for *thread_id*, or None."""
         async with (
-            aiosqlite.connect(self._db_path) as db,
+            connect(self._db_path, self._pool, readonly=True) as db,
             db.execute(
                 "SELECT thread_id, session_id, questions_json, question_idx, created_at "
                 "FROM pending_asks WHERE thread_id = ?",
@@ -84,7 +85,7 @@ class PendingAskRepository:
 
     async def delete(self, thread_id: int) -> None:
         """Remove the pending ask for *thread_id* (called after answer received)."""
-        async with aiosqlite.connect(self._db_path) as db:
+        async with connect(self._db_path, self._pool) as db:
             await db.execute("DELETE FROM pending_asks WHERE thread_id = ?", (thread_id,))
             await db.commit()
         logger.debug("PendingAskRepository: deleted pending ask for thread %d", thread_id)
@@ -92,7 +93,7 @@ class PendingAskRepository:
     async def list_all(self) -> list[PendingAskRecord]:
         """Return all pending asks (used on bot startup for view recovery)."""
         async with (
-            aiosqlite.connect(self._db_path) as db,
+            connect(self._db_path, self._pool, readonly=True) as db,
             db.execute(
                 "SELECT thread_id, session_id, questions_json, question_idx, created_at "
                 "FROM pending_asks ORDER BY created_at"
@@ -112,7 +113,7 @@ class PendingAskRepository:
 
     async def cleanup_old(self, hours: int = 48) -> int:
         """Delete pending asks older than *hours* hours. Returns count deleted."""
-        async with aiosqlite.connect(self._db_path) as db:
+        async with connect(self._db_path, self._pool) as db:
             cursor = await db.execute(
                 "DELETE FROM pending_asks "
                 "WHERE created_at < datetime('now', 'localtime', ? || ' hours')",
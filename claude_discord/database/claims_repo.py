@@ -17,6 +17,8 @@ from dataclasses import dataclass
 
 import aiosqlite
 
+from claude_code_core.sqlite_pool import SqlitePool, connect
+
 logger = logging.getLogger(__name__)
 
 # A claim is a hint for the next few hours of work, not a lease on a resource.
@@ -57,8 +59,9 @@ class ClaimRepository:
     repositories in this package.
     """
 
-    def __init__(self, db_path: str) -> None:
+    def __init__(self, db_path: str, *, pool: SqlitePool | None = None) -> None:
         self._db_path = db_path
+        self._pool = pool
 
     async def acquire(
         self,
@@ -79,7 +82,7 @@ class ClaimRepository:
             when another live thread holds it.
         """
         ttl = max(1, min(MAX_TTL_SECONDS, ttl_seconds))
-        async with aiosqlite.connect(self._db_path) as db:
+        async with connect(self._db_path, self._pool) as db:
             db.row_factory = aiosqlite.Row
             # IMMEDIATE takes the write lock up front so two sessions racing for
             # the same resource cannot both read "unclaimed" and both insert.
@@ -119,7 +122,7 @@ class ClaimRepository:
 
     async def list_active(self, resource: str | None = None) -> list[Claim]:
         """Return unexpired claims, most recently created first."""
-        async with aiosqlite.connect(self._db_path) as db:
+        async with connect(self._db_path, self._pool) as db:
             db.row_factory = aiosqlite.Row
             await self._delete_expired(db)
             await db.commit()
@@ -143,7 +146,7 @@ class ClaimRepository:
         Returns:
             True when a row was removed.
         """
-        async with aiosqlite.connect(self._db_path) as db:
+        async with connect(self._db_path, self._pool) as db:
             if force:
                 cursor = await db.execute(
                     "DELETE FROM resource_claims WHERE resource = ?",
@@ -159,7 +162,7 @@ class ClaimRepository:
 
     async def release_all_for_thread(self, thread_id: int) -> int:
         """Drop every claim held by a thread.  Returns the number removed."""
-        async with aiosqlite.connect(self._db_path) as db:
+        async with connect(self._db_path, self._pool) as db:
             cursor = await db.execute(
                 "DELETE FROM resource_claims WHERE thread_id = ?",
                 (thread_id,),
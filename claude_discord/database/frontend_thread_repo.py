@@ -22,6 +22,7 @@ from dataclasses import dataclass
 import aiosqlite
 
 from claude_code_core.frontend import DISCORD_FRONTEND, ThreadKey, issue_thread_key
+from claude_code_core.sqlite_pool import SqlitePool, connect
 
 logger = logging.getLogger(__name__)
 
@@ -45,8 +46,9 @@ class FrontendThreadRepository:
     repositories in this package.
     """
 
-    def __init__(self, db_path: str) -> None:
+    def __init__(self, db_path: str, *, pool: SqlitePool | None = None) -> None:
         self.db_path = db_path
+        self._pool = pool
 
     async def register(
         self,
@@ -63,7 +65,7 @@ class FrontendThreadRepository:
         through — that is the address, not the identity, and a conversation can
         legitimately be seen from a channel we had not recorded before.
         """
-        async with aiosqlite.connect(self.db_path) as conn:
+        async with connect(self.db_path, self._pool) as conn:
             conn.row_factory = aiosqlite.Row
             cursor = await conn.execute(
                 "SELECT thread_key FROM frontend_threads WHERE frontend = ? AND external_id = ?",
@@ -93,7 +95,7 @@ class FrontendThreadRepository:
 
     async def resolve(self, thread_key: ThreadKey) -> FrontendThread | None:
         """Find where to post, given the key ccdb stores. None if unknown."""
-        async with aiosqlite.connect(self.db_path) as conn:
+        async with connect(self.db_path, self._pool, readonly=True) as conn:
             conn.row_factory = aiosqlite.Row
             cursor = await conn.execute(
                 "SELECT thread_key, frontend, external_id, parent_external_id "
@@ -105,7 +107,7 @@ class FrontendThreadRepository:
 
     async def key_for(self, frontend: str, external_id: str) -> ThreadKey | None:
         """The reverse lookup: what key did this conversation get, if any."""
-        async with aiosqlite.connect(self.db_path) as conn:
+        async with connect(self.db_path, self._pool, readonly=True) as conn:
             cursor = await conn.execute(
                 "SELECT thread_key FROM frontend_threads WHERE frontend = ? AND external_id = ?",
                 (frontend, external_id),
@@ -126,7 +128,7 @@ class FrontendThreadRepository:
             How many rows were added this time — zero on every run after the
             first, which is what makes it safe to call unconditionally.
         """
-        async with aiosqlite.connect(self.db_path) as conn:
+        async with connect(self.db_path, self._pool) as conn:
             cursor = await conn.execute(
                 "INSERT OR IGNORE INTO frontend_threads (thread_key, frontend, external_id) "
                 "SELECT thread_id, ?, CAST(thread_id AS TEXT) FROM sessions",
@@ -8,6 +8,8 @@ from typing import Literal
 
 import aiosqlite
 
+from claude_code_core.sqlite_pool import SqlitePool, connect
+
 logger = logging.getLogger(__name__)
 
 InboxStatus = Literal["waiting", "ambiguous"]
@@ -30,8 +32,9 @@ class ThreadInboxRepository:
     used by the other repositories in this package.
     """
 
-    def __init__(self, db_path: str) -> None:
+    def __init__(self, db_path: str, *, pool: SqlitePool | None = None) -> None:
         self._db_path = db_path
+        self._pool = pool
 
     async def upsert(
         self,
@@ -41,7 +44,7 @@ class ThreadInboxRepository:
         last_message_url: str | None = None,
     ) -> None:
         """Insert or replace an inbox entry."""
-        async with aiosqlite.connect(self._db_path) as db:
+        async with connect(self._db_path, self._pool) as db:
             await db.execute(
                 """
                 INSERT INTO thread_inbox (thread_id, status, confidence, last_message_url,
@@ -60,7 +63,7 @@ class ThreadInboxRepository:
 
     async def remove(self, thread_id: int) -> bool:
         """Delete an inbox entry. Returns True if a row was deleted."""
-        async with aiosqlite.connect(self._db_path) as db:
+        async with connect(self._db_path, self._pool) as db:
             cursor = await db.execute("DELETE FROM thread_inbox WHERE thread_id = ?", (thread_id,))
             await db.commit()
             deleted = cursor.rowcount > 0
@@ -70,7 +73,7 @@ class ThreadInboxRepository:
 
     async def list_all(self) -> list[InboxEntry]:
         """Return all inbox entries ordered by most-recently updated."""
-        async with aiosqlite.connect(self._db_path) as db:
+        async with connect(self._db_path, self._pool, readonly=True) as db:
             db.row_factory = aiosqlite.Row
             cursor = await db.execute(
                 "SELECT thread_id, status, confidence, last_message_url, updated_at"
@@ -20,6 +20,8 @@ import logging
 
 import aiosqlite
 
+from claude_code_core.sqlite_pool import SqlitePool, connect
+
 logger = logging.getLogger(__name__)
 
 INGEST_RESULT_SCHEMA = """
@@ -53,12 +55,13 @@ class IngestResultRepository:
     # Keep at most this many recent results to prevent unbounded growth.
     MAX_STORED_RESULTS = 200
 
-    def __init__(self, db_path: str) -> None:
+    def __init__(self, db_path: str, *, pool: SqlitePool | None = None) -> None:
         self.db_path = db_path
+        self._pool = pool
 
     async def init_db(self) -> None:
         """Create the ingest_results schema if it does not exist."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with connect(self.db_path, self._pool) as db:
             await db.executescript(INGEST_RESULT_SCHEMA)
             # Backfill columns added after the initial release on existing DBs.
             cursor = await db.execute("PRAGMA table_info(ingest_results)")
@@ -87,7 +90,7 @@ class IngestResultRepository:
         updated summary via ``POST /api/ingest/summary`` referencing this
         ``result_id``, ccdb advances the summary's marker to ``pending_marker``.
         """
-        async with aiosqlite.connect(self.db_path) as db:
+        async with connect(self.db_path, self._pool) as db:
             await db.execute(
                 "INSERT INTO ingest_results "
                 "(result_id, status, thread_id, thread_name, summary_key, pending_marker) "
@@ -110,7 +113,7 @@ class IngestResultRepository:
 
     async def get(self, result_id: str) -> dict | None:
         """Return a single ingest result by id, or None if not found."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with connect(self.db_path, self._pool, readonly=True) as db:
             db.row_factory = aiosqlite.Row
             cursor = await db.execute(
                 "SELECT * FROM ingest_results WHERE result_id = ?", (result_id,)
@@ -122,7 +125,7 @@ class IngestResultRepository:
         self, result_id: str, thread_id: str, thread_name: str | None = None
     ) -> None:
         """Attach the spawned Discord thread info to an existing result row."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with connect(self.db_path, self._pool) as db:
             await db.execute(
                 "UPDATE ingest_results SET thread_id = ?, thread_name = ?, "
                 "updated_at = datetime('now', 'localtime') WHERE result_id = ?",
@@ -132,7 +135,7 @@ class IngestResultRepository:
 
     async def set_result(self, result_id: str, result: str) -> None:
         """Mark a result done and store the session's final assistant reply."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with connect(self.db_path, self._pool) as db:
             await db.execute(
                 "UPDATE ingest_results SET status = 'done', result = ?, "
                 "updated_at = datetime('now', 'localtime') WHERE result_id = ?",
@@ -143,7 +146,7 @@ class IngestResultRepository:
 
     async def set_error(self, result_id: str, error: str) -> None:
         """Mark a result failed and store the error message."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with connect(self.db_path, self._pool) as db:
             await db.execute(
                 "UPDATE ingest_results SET status = 'error', error = ?, "
                 "updated_at = datetime('now', 'localtime') WHERE result_id = ?",
@@ -154,7 +157,7 @@ class IngestResultRepository:
 
     async def count(self) -> int:
         """Return the number of stored ingest results."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with connect(self.db_path, self._pool, readonly=True) as db:
             cursor = await db.execute("SELECT COUNT(*) FROM ingest_results")
             row = await cursor.fetchone()
         return int(row[0]) if row else 0
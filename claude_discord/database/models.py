@@ -183,6 +183,53 @@ _MIGRATIONS = [
 ]
 
 
+# Full-text index over the searchable session columns, kept in step with the
+# table by triggers. ``trigram`` indexes every three-character run rather than
+# words, so it needs no word boundaries (Japanese has none) and a match is a
+# case-insensitive substring match, as the LIKE search it replaces was.
+# It needs SQLite 3.34+ built with FTS5; without them search keeps using LIKE.
+_SESSION_FTS = [
+    (
+        "CREATE VIRTUAL TABLE IF NOT EXISTS sessions_fts USING fts5("
+        "summary, working_dir, content='sessions', content_rowid='thread_id', "
+        "tokenize='trigram')"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS sessions_fts_insert AFTER INSERT ON sessions BEGIN "
+        "INSERT INTO sessions_fts(rowid, summary, working_dir) "
+        "VALUES (new.thread_id, new.summary, new.working_dir); END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS sessions_fts_delete AFTER DELETE ON sessions BEGIN "
+        "INSERT INTO sessions_fts(sessions_fts, rowid, summary, working_dir) "
+        "VALUES ('delete', old.thread_id, old.summary, old.working_dir); END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS sessions_fts_update "
+        "AFTER UPDATE OF thread_id, summary, working_dir ON sessions BEGIN "
+        "INSERT INTO sessions_fts(sessions_fts, rowid, summary, working_dir) "
+        "VALUES ('delete', old.thread_id, old.summary, old.working_dir); "
+        "INSERT INTO sessions_fts(rowid, summary, working_dir) "
+        "VALUES (new.thread_id, new.summary, new.working_dir); END"
+    ),
+]
+
+
+async def _init_session_fts(db: aiosqlite.Connection) -> None:
+    """Create the session search index, filling it from existing rows the first time."""
+    cursor = await db.execute("SELECT 1 FROM sqlite_master WHERE name = 'sessions_fts'")
+    existed = await cursor.fetchone() is not None
+    try:
+        for stmt in _SESSION_FTS:
+            await db.execute(stmt)
+    except aiosqlite.OperationalError as exc:
+        logger.warning("Session full-text index unavailable, search will scan: %s", exc)
+        await db.rollback()
+        return
+    if not existed:
+        await db.execute("INSERT INTO sessions_fts(sessions_fts) VALUES ('rebuild')")
+
+
 async def init_db(db_path: str) -> None:
     """Initialize the database with the schema.
 
@@ -198,4 +245,6 @@ async def init_db(db_path: str) -> None:
             with contextlib.suppress(Exception):
                 await db.execute(stmt)
         await db.commit()
+        await _init_session_fts(db)
+        await db.commit()
     logger.info("Database initialized at %s", db_path)
@@ -1,15 +1,19 @@
 """Notification repository for scheduled notifications (aiosqlite).
 
 Provides async CRUD for the scheduled_notifications table.
-Used by the REST API extension for push notifications to Discord.
+Used by the REST API extension for push notifications to Discord. Every write
+notifies the change listeners, so the dispatcher re-times its next delivery.
 """
 
 from __future__ import annotations
 
 import logging
+from collections.abc import Callable
 
 import aiosqlite
 
+from claude_code_core.sqlite_pool import SqlitePool, connect
+
 logger = logging.getLogger(__name__)
 
 NOTIFICATION_SCHEMA = """
@@ -35,12 +39,22 @@ CREATE INDEX IF NOT EXISTS idx_notif_status_scheduled
 class NotificationRepository:
     """Async CRUD for scheduled_notifications table."""
 
-    def __init__(self, db_path: str) -> None:
+    def __init__(self, db_path: str, *, pool: SqlitePool | None = None) -> None:
         self.db_path = db_path
+        self._pool = pool
+        self._change_listeners: list[Callable[[], None]] = []
+
+    def add_change_listener(self, callback: Callable[[], None]) -> None:
+        """Call ``callback`` after every write to the table (e.g. to re-time delivery)."""
+        self._change_listeners.append(callback)
+
+    def _changed(self) -> None:
+        for callback in self._change_listeners:
+            callback()
 
     async def init_db(self) -> None:
         """Initialize the notification schema."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with connect(self.db_path, self._pool) as db:
             await db.executescript(NOTIFICATION_SCHEMA)
             await db.commit()
         logger.info("Notification DB initialized at %s", self.db_path)
@@ -56,7 +70,7 @@ class NotificationRepository:
         channel_id: int | None = None,
     ) -> int:
         """Schedule a notification. Returns the created ID."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with connect(self.db_path, self._pool) as db:
             cursor = await db.execute(
                 """INSERT INTO scheduled_notifications
                     (message, title, color, scheduled_at, source, channel_id)
@@ -66,12 +80,13 @@ class NotificationRepository:
             await db.commit()
             row_id = cursor.lastrowid
         assert row_id is not None, "INSERT should always return a lastrowid"
+        self._changed()
         logger.info("Notification scheduled: id=%d, at=%s", row_id, scheduled_at)
         return row_id
 
     async def get_pending(self, before: str | None = None) -> list[dict]:
         """Get pending notifications, optionally filtered by time."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with connect(self.db_path, self._pool, readonly=True) as db:
             db.row_factory = aiosqlite.Row
             if before:
                 cursor = await db.execute(
@@ -89,9 +104,18 @@ class NotificationRepository:
             rows = await cursor.fetchall()
             return [dict(row) for row in rows]
 
+    async def get_next_scheduled_at(self) -> str | None:
+        """The earliest ``scheduled_at`` among pending notifications."""
+        async with connect(self.db_path, self._pool, readonly=True) as db:
+            cursor = await db.execute(
+                "SELECT MIN(scheduled_at) FROM scheduled_notifications WHERE status = 'pending'"
+            )
+            row = await cursor.fetchone()
+        return None if row is None else row[0]
+
     async def mark_sent(self, notification_id: int) -> None:
         """Mark a notification as sent."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with connect(self.db_path, self._pool) as db:
             await db.execute(
                 """UPDATE scheduled_notifications
                    SET status = 'sent', sent_at = datetime('now', 'localtime')
@@ -99,10 +123,11 @@ class NotificationRepository:
                 (notification_id,),
             )
             await db.commit()
+        self._changed()
 
     async def mark_failed(self, notification_id: int, error: str) -> None:
         """Mark a notification as failed."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with connect(self.db_path, self._pool) as db:
             await db.execute(
                 """UPDATE scheduled_notifications
                    SET status = 'failed', error_message = ?
@@ -110,10 +135,11 @@ class NotificationRepository:
                 (error, notification_id),
             )
             await db.commit()
+        self._changed()
 
     async def cancel(self, notification_id: int) -> bool:
         """Cancel a pending notification. Returns True if cancelled."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with connect(self.db_path, self._pool) as db:
             cursor = await db.execute(
                 """UPDATE scheduled_notifications
                    SET status = 'cancelled'
@@ -121,4 +147,5 @@ class NotificationRepository:
                 (notification_id,),
             )
             await db.commit()
-            return cursor.rowcount > 0
+        self._changed()
+        return cursor.rowcount > 0
@@ -23,6 +23,8 @@ from dataclasses import dataclass
 
 import aiosqlite
 
+from claude_code_core.sqlite_pool import SqlitePool, connect
+
 logger = logging.getLogger(__name__)
 
 DEFAULT_TTL_MINUTES = 5
@@ -43,8 +45,15 @@ class PendingResume:
 class PendingResumeRepository:
     """Async CRUD for the ``pending_resumes`` table."""
 
-    def __init__(self, db_path: str, ttl_minutes: int = DEFAULT_TTL_MINUTES) -> None:
+    def __init__(
+        self,
+        db_path: str,
+        ttl_minutes: int = DEFAULT_TTL_MINUTES,
+        *,
+        pool: SqlitePool | None = None,
+    ) -> None:
         self._db_path = db_path
+        self._pool = pool
         self._ttl_minutes = ttl_minutes
 
     async def mark(
@@ -60,7 +69,7 @@ class PendingResumeRepository:
         Returns the row id of the inserted/replaced row.
         The UNIQUE constraint on thread_id means only the latest mark survives.
         """
-        async with aiosqlite.connect(self._db_path) as db:
+        async with connect(self._db_path, self._pool) as db:
             cursor = await db.execute(
                 """
                 INSERT OR REPLACE INTO pending_resumes
@@ -86,7 +95,7 @@ class PendingResumeRepository:
         Rows outside the TTL are pruned in the same call so they don't
         accumulate indefinitely.
         """
-        async with aiosqlite.connect(self._db_path) as db:
+        async with connect(self._db_path, self._pool) as db:
             db.row_factory = aiosqlite.Row
 
             # Prune expired rows first
@@ -122,12 +131,12 @@ class PendingResumeRepository:
 
     async def delete(self, row_id: int) -> None:
         """Delete a pending resume by its row id (call after processing)."""
-        async with aiosqlite.connect(self._db_path) as db:
+        async with connect(self._db_path, self._pool) as db:
             await db.execute("DELETE FROM pending_resumes WHERE id = ?", (row_id,))
             await db.commit()
 
     async def delete_by_thread(self, thread_id: int) -> None:
         """Delete a pending resume by thread id (alternative cleanup path)."""
-        async with aiosqlite.connect(self._db_path) as db:
+        async with connect(self._db_path, self._pool) as db:
             await db.execute("DELETE FROM pending_resumes WHERE thread_id = ?", (thread_id,))
             await db.commit()
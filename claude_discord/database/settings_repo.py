@@ -1,10 +1,17 @@
-"""Key-value settings repository for bot configuration."""
+"""Key-value settings repository for bot configuration.
+
+Given a :class:`~claude_code_core.read_cache.ReadCache`, the repository answers
+repeated :meth:`SettingsRepository.get` calls from memory — including "no such
+key", the usual answer for a thread override — and updates the cache on every
+``set`` and ``delete``.
+"""
 
 from __future__ import annotations
 
 import logging
 
-import aiosqlite
+from claude_code_core.read_cache import MISSING, ReadCache
+from claude_code_core.sqlite_pool import SqlitePool, connect
 
 logger = logging.getLogger(__name__)
 
@@ -12,39 +19,61 @@ logger = logging.getLogger(__name__)
 class SettingsRepository:
     """Simple key-value store for bot settings, persisted in SQLite."""
 
-    def __init__(self, db_path: str) -> None:
+    def __init__(
+        self,
+        db_path: str,
+        *,
+        pool: SqlitePool | None = None,
+        cache: ReadCache[str, str | None] | None = None,
+    ) -> None:
         self.db_path = db_path
+        self._pool = pool
+        #: Values read by :meth:`get` (``None`` for absent keys).
+        self.cache = cache
 
     async def get(self, key: str, *, default: str | None = None) -> str | None:
         """Get a setting value by key. Returns default if not found."""
-        async with aiosqlite.connect(self.db_path) as db:
+        version = 0
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not MISSING:
+                return default if cached is None else cached
+            version = self.cache.version
+        async with connect(self.db_path, self._pool, readonly=True) as db:
             cursor = await db.execute(
                 "SELECT value FROM settings WHERE key = ?",
                 (key,),
             )
             row = await cursor.fetchone()
-            return row[0] if row else default
+        value = row[0] if row else None
+        if self.cache is not None:
+            self.cache.fill(key, value, version)
+        return default if value is None else value
 
     async def set(self, key: str, value: str) -> None:
         """Set a setting value. Creates or overwrites."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with connect(self.db_path, self._pool) as db:
             await db.execute(
                 "INSERT INTO settings (key, value) VALUES (?, ?)"
                 " ON CONFLICT(key) DO UPDATE SET value = excluded.value",
                 (key, value),
             )
             await db.commit()
+        if self.cache is not None:
+            self.cache.put(key, value)
 
     async def delete(self, key: str) -> bool:
         """Delete a setting. Returns True if a row was deleted."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with connect(self.db_path, self._pool) as db:
             cursor = await db.execute("DELETE FROM settings WHERE key = ?", (key,))
             await db.commit()
-            return cursor.rowcount > 0
+        if self.cache is not None:
+            self.cache.put(key, None)
+        return cursor.rowcount > 0
 
     async def get_all(self) -> dict[str, str]:
         """Get all settings as a dict."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with connect(self.db_path, self._pool, readonly=True) as db:
             cursor = await db.execute("SELECT key, value FROM settings ORDER BY key")
             rows = await cursor.fetchall()
             return {row[0]: row[1] for row in rows}
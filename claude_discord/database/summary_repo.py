@@ -29,6 +29,8 @@ import logging
 
 import aiosqlite
 
+from claude_code_core.sqlite_pool import SqlitePool, connect
+
 logger = logging.getLogger(__name__)
 
 THREAD_SUMMARY_SCHEMA = """
@@ -50,19 +52,20 @@ class ThreadSummaryRepository:
     # Keep at most this many recent summaries to prevent unbounded growth.
     MAX_STORED_SUMMARIES = 1000
 
-    def __init__(self, db_path: str) -> None:
+    def __init__(self, db_path: str, *, pool: SqlitePool | None = None) -> None:
         self.db_path = db_path
+        self._pool = pool
 
     async def init_db(self) -> None:
         """Create the thread_summaries schema if it does not exist."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with connect(self.db_path, self._pool) as db:
             await db.executescript(THREAD_SUMMARY_SCHEMA)
             await db.commit()
         logger.info("Thread summary DB initialized at %s", self.db_path)
 
     async def get(self, summary_key: str) -> dict | None:
         """Return the stored summary for a key, or None if unknown."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with connect(self.db_path, self._pool, readonly=True) as db:
             db.row_factory = aiosqlite.Row
             cursor = await db.execute(
                 "SELECT * FROM thread_summaries WHERE summary_key = ?", (summary_key,)
@@ -78,7 +81,7 @@ class ThreadSummaryRepository:
         not blank out a known marker). On first insert a ``None`` marker is stored
         as ``NULL``.
         """
-        async with aiosqlite.connect(self.db_path) as db:
+        async with connect(self.db_path, self._pool) as db:
             # COALESCE(excluded.marker, thread_summaries.marker): only advance the
             # marker when the caller supplies one; otherwise keep the old value.
             await db.execute(
@@ -115,7 +118,7 @@ class ThreadSummaryRepository:
 
     async def delete(self, summary_key: str) -> bool:
         """Delete a summary. Returns True if a row was removed."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with connect(self.db_path, self._pool) as db:
             cursor = await db.execute(
                 "DELETE FROM thread_summaries WHERE summary_key = ?", (summary_key,)
             )
@@ -128,7 +131,7 @@ class ThreadSummaryRepository:
 
     async def count(self) -> int:
         """Return the number of stored summaries."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with connect(self.db_path, self._pool, readonly=True) as db:
             cursor = await db.execute("SELECT COUNT(*) FROM thread_summaries")
             row = await cursor.fetchone()
         return int(row[0]) if row else 0
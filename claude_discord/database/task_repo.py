@@ -1,17 +1,23 @@
 """TaskRepository — CRUD for scheduled_tasks table.
 
 Stores periodic Claude Code tasks registered via REST API or chat.
-The scheduler Cog polls this table every 30 seconds and runs due tasks.
+The scheduler Cog times the earliest ``next_run_at`` with the shared
+:class:`~claude_code_core.timer_service.TimerService`; every write notifies the
+change listeners so a new or edited task is re-timed at once.
 """
 
 from __future__ import annotations
 
 import logging
 import time
-from datetime import datetime, timedelta, timezone
+from collections.abc import Callable, Collection
 
 import aiosqlite
 
+from claude_code_core.sqlite_pool import SqlitePool, connect
+
+from ..schedule_plan import jitter_offset, next_anchor
+
 logger = logging.getLogger(__name__)
 
 TASK_SCHEMA = """
@@ -44,16 +50,31 @@ ALTER TABLE scheduled_tasks ADD COLUMN thread_id INTEGER;
 ALTER TABLE scheduled_tasks ADD COLUMN one_shot INTEGER DEFAULT 0;
 """
 
+# Migration: per-task jitter window after an anchored start (0 = none)
+_MIGRATION_JITTER = """
+ALTER TABLE scheduled_tasks ADD COLUMN jitter_seconds INTEGER DEFAULT 0;
+"""
+
 
 class TaskRepository:
     """Async CRUD for scheduled_tasks table."""
 
-    def __init__(self, db_path: str) -> None:
+    def __init__(self, db_path: str, *, pool: SqlitePool | None = None) -> None:
         self.db_path = db_path
+        self._pool = pool
+        self._change_listeners: list[Callable[[], None]] = []
+
+    def add_change_listener(self, callback: Callable[[], None]) -> None:
+        """Call ``callback`` after every write to the table (e.g. to re-time the scheduler)."""
+        self._change_listeners.append(callback)
+
+    def _changed(self) -> None:
+        for callback in self._change_listeners:
+            callback()
 
     async def init_db(self) -> None:
         """Initialize the task schema and run migrations."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with connect(self.db_path, self._pool) as db:
             await db.executescript(TASK_SCHEMA)
             # Migration: add anchor columns if they don't exist yet
             cursor = await db.execute("PRAGMA table_info(scheduled_tasks)")
@@ -70,6 +91,9 @@ class TaskRepository:
                     if stmt:
                         await db.execute(stmt)
                 logger.info("Migrated scheduled_tasks: added thread_id, one_shot")
+            if "jitter_seconds" not in columns:
+                await db.execute(_MIGRATION_JITTER.strip().rstrip(";"))
+                logger.info("Migrated scheduled_tasks: added jitter_seconds")
             await db.commit()
         logger.info("Task DB initialized at %s", self.db_path)
 
@@ -78,26 +102,24 @@ class TaskRepository:
     # ------------------------------------------------------------------
 
     @staticmethod
-    def _next_anchor(anchor_hour: int, anchor_minute: int, interval_seconds: int) -> float:
+    def _next_anchor(
+        anchor_hour: int, anchor_minute: int, interval_seconds: int, offset: float = 0.0
+    ) -> float:
         """Calculate the next future wall-clock occurrence of anchor_hour:anchor_minute.
 
         Advances by ``interval_seconds`` from the anchor time until the result
         is strictly in the future.  This prevents drift — the schedule always
         snaps to the anchor regardless of how long the previous run took.
+        ``offset`` is the task's jitter (see :mod:`claude_discord.schedule_plan`).
         """
-        local_tz = datetime.now(timezone.utc).astimezone().tzinfo  # noqa: UP017
-        now = datetime.now(local_tz)
-        candidate = now.replace(hour=anchor_hour, minute=anchor_minute, second=0, microsecond=0)
-        interval = timedelta(seconds=interval_seconds)
-        while candidate <= now:
-            candidate += interval
-        return candidate.timestamp()
+        return next_anchor(anchor_hour, anchor_minute, interval_seconds, offset=offset)
 
     async def _db_execute(self, sql: str, params: tuple = ()) -> None:
         """Execute a DML statement (for tests and internal use)."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with connect(self.db_path, self._pool) as db:
             await db.execute(sql, params)
             await db.commit()
+        self._changed()
 
     # ------------------------------------------------------------------
     # Queries
@@ -105,7 +127,7 @@ class TaskRepository:
 
     async def get(self, task_id: int) -> dict | None:
         """Return a single task by ID, or None if not found."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with connect(self.db_path, self._pool, readonly=True) as db:
             db.row_factory = aiosqlite.Row
             cursor = await db.execute("SELECT * FROM scheduled_tasks WHERE id = ?", (task_id,))
             row = await cursor.fetchone()
@@ -118,7 +140,7 @@ class TaskRepository:
 
     async def get_all(self) -> list[dict]:
         """Return all tasks (enabled and disabled)."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with connect(self.db_path, self._pool, readonly=True) as db:
             db.row_factory = aiosqlite.Row
             cursor = await db.execute("SELECT * FROM scheduled_tasks ORDER BY created_at")
             rows = await cursor.fetchall()
@@ -133,7 +155,7 @@ class TaskRepository:
     async def get_due(self, now: float | None = None) -> list[dict]:
         """Return enabled tasks whose next_run_at is in the past."""
         ts = now if now is not None else time.time()
-        async with aiosqlite.connect(self.db_path) as db:
+        async with connect(self.db_path, self._pool, readonly=True) as db:
             db.row_factory = aiosqlite.Row
             cursor = await db.execute(
                 """SELECT * FROM scheduled_tasks
@@ -150,6 +172,18 @@ class TaskRepository:
             result.append(d)
         return result
 
+    async def get_next_run_at(self, *, exclude_ids: Collection[int] = ()) -> float | None:
+        """Earliest ``next_run_at`` among enabled tasks, skipping ``exclude_ids``."""
+        placeholders = ", ".join("?" * len(exclude_ids))
+        where = f" AND id NOT IN ({placeholders})" if exclude_ids else ""
+        async with connect(self.db_path, self._pool, readonly=True) as db:
+            cursor = await db.execute(
+                f"SELECT MIN(next_run_at) FROM scheduled_tasks WHERE enabled = 1{where}",  # noqa: S608
+                tuple(exclude_ids),
+            )
+            row = await cursor.fetchone()
+        return None if row is None or row[0] is None else float(row[0])
+
     # ------------------------------------------------------------------
     # Mutations
     # ------------------------------------------------------------------
@@ -167,6 +201,7 @@ class TaskRepository:
         anchor_minute: int | None = None,
         thread_id: int | None = None,
         one_shot: bool = False,
+        jitter_seconds: int = 0,
     ) -> int:
         """Create a new scheduled task. Returns the created ID.
 
@@ -183,21 +218,29 @@ class TaskRepository:
                 the scheduler posts to this existing thread instead of
                 creating a new one (follow-up mode).
             one_shot: If True, the task auto-disables after a single execution.
+            jitter_seconds: For an anchored task, a window after the anchor
+                within which it starts — at the same, name-derived point
+                every time — so tasks anchored to the same minute spread out.
         """
         now = time.time()
         if anchor_hour is not None and not run_immediately:
-            next_run = self._next_anchor(anchor_hour, anchor_minute or 0, interval_seconds)
+            next_run = self._next_anchor(
+                anchor_hour,
+                anchor_minute or 0,
+                interval_seconds,
+                jitter_offset(name, jitter_seconds),
+            )
         elif run_immediately:
             next_run = now
         else:
             next_run = now + interval_seconds
-        async with aiosqlite.connect(self.db_path) as db:
+        async with connect(self.db_path, self._pool) as db:
             cursor = await db.execute(
                 """INSERT INTO scheduled_tasks
                    (name, prompt, interval_seconds, channel_id, working_dir,
                     enabled, next_run_at, created_at, anchor_hour, anchor_minute,
-                    thread_id, one_shot)
-                   VALUES (?, ?, ?, ?, ?, 1, ?, ?, ?, ?, ?, ?)""",
+                    thread_id, one_shot, jitter_seconds)
+                   VALUES (?, ?, ?, ?, ?, 1, ?, ?, ?, ?, ?, ?, ?)""",
                 (
                     name,
                     prompt,
@@ -210,11 +253,13 @@ class TaskRepository:
                     anchor_minute,
                     thread_id,
                     1 if one_shot else 0,
+                    max(0, jitter_seconds),
                 ),
             )
             await db.commit()
             row_id = cursor.lastrowid
         assert row_id is not None
+        self._changed()
         logger.info(
             "Scheduled task created: id=%d, name=%s, interval=%ds", row_id, name, interval_seconds
         )
@@ -228,16 +273,20 @@ class TaskRepository:
         """
         now = time.time()
         # Check if this task has an anchor
-        async with aiosqlite.connect(self.db_path) as db:
+        async with connect(self.db_path, self._pool) as db:
             db.row_factory = aiosqlite.Row
             cursor = await db.execute(
-                "SELECT anchor_hour, anchor_minute FROM scheduled_tasks WHERE id = ?",
+                """SELECT name, anchor_hour, anchor_minute, jitter_seconds
+                   FROM scheduled_tasks WHERE id = ?""",
                 (task_id,),
             )
             row = await cursor.fetchone()
             if row is not None and row["anchor_hour"] is not None:
                 next_run = self._next_anchor(
-                    row["anchor_hour"], row["anchor_minute"] or 0, interval_seconds
+                    row["anchor_hour"],
+                    row["anchor_minute"] or 0,
+                    interval_seconds,
+                    jitter_offset(row["name"], row["jitter_seconds"]),
                 )
             else:
                 next_run = now + interval_seconds
@@ -248,30 +297,45 @@ class TaskRepository:
                 (next_run, now, task_id),
             )
             await db.commit()
+        self._changed()
+
+    async def set_next_run(self, task_id: int, next_run_at: float) -> bool:
+        """Override when a task next runs. Returns True if updated."""
+        async with connect(self.db_path, self._pool) as db:
+            cursor = await db.execute(
+                "UPDATE scheduled_tasks SET next_run_at = ? WHERE id = ?",
+                (next_run_at, task_id),
+            )
+            await db.commit()
+        self._changed()
+        return cursor.rowcount > 0
 
     async def delete_by_name(self, name: str) -> bool:
         """Delete a task by its unique name. Returns True if a row was deleted."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with connect(self.db_path, self._pool) as db:
             cursor = await db.execute("DELETE FROM scheduled_tasks WHERE name = ?", (name,))
             await db.commit()
-            return cursor.rowcount > 0
+        self._changed()
+        return cursor.rowcount > 0
 
     async def delete(self, task_id: int) -> bool:
         """Delete a task. Returns True if a row was deleted."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with connect(self.db_path, self._pool) as db:
             cursor = await db.execute("DELETE FROM scheduled_tasks WHERE id = ?", (task_id,))
             await db.commit()
-            return cursor.rowcount > 0
+        self._changed()
+        return cursor.rowcount > 0
 
     async def set_enabled(self, task_id: int, *, enabled: bool) -> bool:
         """Enable or disable a task. Returns True if updated."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with connect(self.db_path, self._pool) as db:
             cursor = await db.execute(
                 "UPDATE scheduled_tasks SET enabled = ? WHERE id = ?",
                 (1 if enabled else 0, task_id),
             )
             await db.commit()
-            return cursor.rowcount > 0
+        self._changed()
+        return cursor.rowcount > 0
 
     async def update(
         self,
@@ -283,6 +347,7 @@ class TaskRepository:
         anchor_hour: int | None = None,
         anchor_minute: int | None = None,
         thread_id: int | None = None,
+        jitter_seconds: int | None = None,
     ) -> bool:
         """Partially update a task. Returns True if updated.
 
@@ -319,11 +384,15 @@ class TaskRepository:
             else:
                 fields.append("thread_id = ?")
                 values.append(thread_id)
+        if jitter_seconds is not None:
+            fields.append("jitter_seconds = ?")
+            values.append(max(0, jitter_seconds))
         if not fields:
             return False
         values.append(task_id)
         sql = f"UPDATE scheduled_tasks SET {', '.join(fields)} WHERE id = ?"  # noqa: S608
-        async with aiosqlite.connect(self.db_path) as db:
+        async with connect(self.db_path, self._pool) as db:
             cursor = await db.execute(sql, tuple(values))
             await db.commit()
-            return cursor.rowcount > 0
+        self._changed()
+        return cursor.rowcount > 0
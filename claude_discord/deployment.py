@@ -58,6 +58,7 @@ class DataLayout:
     sessions_db: str
     tasks_db: str
     notifications_db: str
+    jobs_db: str
     worktrees_dir: str
     teams_vault_dir: str
     log_file: str
@@ -70,6 +71,7 @@ class DataLayout:
         sessions_db: str | None = None,
         tasks_db: str | None = None,
         notifications_db: str | None = None,
+        jobs_db: str | None = None,
         worktrees_dir: str | None = None,
         teams_vault_dir: str | None = None,
         log_file: str | None = None,
@@ -85,6 +87,7 @@ class DataLayout:
             sessions_db=sessions_db or under("sessions.db"),
             tasks_db=tasks_db or under("tasks.db"),
             notifications_db=notifications_db or under("notifications.db"),
+            jobs_db=jobs_db or under("jobs.db"),
             worktrees_dir=worktrees_dir or under("worktrees"),
             teams_vault_dir=teams_vault_dir or under("teams"),
             log_file=log_file or under("ccdb.log"),
@@ -102,6 +105,7 @@ class DataLayout:
             "sessions_db": self.sessions_db,
             "tasks_db": self.tasks_db,
             "notifications_db": self.notifications_db,
+            "jobs_db": self.jobs_db,
             "worktrees_dir": self.worktrees_dir,
             "teams_vault_dir": self.teams_vault_dir,
             "log_file": self.log_file,
@@ -15,6 +15,8 @@ from ..claude.rewind import TurnEntry, truncate_jsonl_at_line
 from .embeds import COLOR_SUCCESS, stopped_embed, tool_result_embed, tool_result_preview_embed
 
 if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
     from ..database.repository import SessionRecord
     from ..database.settings_repo import SettingsRepository
 
@@ -213,12 +215,16 @@ class RewindSelectView(discord.ui.View):
         jsonl_path: Path,
         active_runners: dict,
         thread_id: int,
+        release_kept_process: Callable[[int], Awaitable[None]] | None = None,
     ) -> None:
         super().__init__(timeout=60)
         self._turns = turns
         self._jsonl_path = jsonl_path
         self._active_runners = active_runners
         self._thread_id = thread_id
+        # A kept-alive CLI process still holds the untruncated conversation in
+        # memory; it must go too or the next turn would continue from there.
+        self._release_kept_process = release_kept_process
 
         options = [
             discord.SelectOption(
@@ -250,6 +256,9 @@ class RewindSelectView(discord.ui.View):
         if runner is not None:
             with contextlib.suppress(Exception):
                 await runner.kill()
+        if self._release_kept_process is not None:
+            with contextlib.suppress(Exception):
+                await self._release_kept_process(self._thread_id)
 
         success = truncate_jsonl_at_line(self._jsonl_path, turn.line_index)
 
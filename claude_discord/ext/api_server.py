@@ -20,6 +20,7 @@ import contextlib
 import hmac
 import json
 import logging
+import math
 import os
 import re
 import time
@@ -37,6 +38,7 @@ from claude_code_core.transcript_search import default_transcripts_root
 
 from ..discord_ui.file_sender import send_file_blobs
 from ..relay import MODE_INTERRUPT, MODE_QUEUE, VALID_MODES, RelayGuard, build_relay_prompt
+from ..schedule_plan import DEFAULT_PROJECTION_HOURS, project_load, stagger_seconds_from_env
 from ..session_view import STATE_HISTORY, STATE_RUNNING, build_session_views
 from ..thread_policy import THREAD_AUTO_ARCHIVE_MINUTES
 from . import ingest_manifest, teams_sync
@@ -56,6 +58,9 @@ if TYPE_CHECKING:
     from ..database.summary_repo import ThreadSummaryRepository
     from ..database.task_repo import TaskRepository
 
+# The dry-run projection replays every task's schedule; a week is plenty.
+_MAX_PROJECTION_HOURS = 168
+
 # /api/ingest — authenticated spawn for untrusted external clients (browser
 # extensions, mobile shortcuts, webhooks) that may carry file attachments.
 _MAX_INGEST_ATTACHMENTS = 20
@@ -314,6 +319,7 @@ class ApiServer:
         # Scheduled task routes (requires task_repo)
         self.app.router.add_post("/api/tasks", self.create_task)
         self.app.router.add_get("/api/tasks", self.list_tasks)
+        self.app.router.add_get("/api/tasks/projection", self.project_tasks)
         self.app.router.add_delete("/api/tasks/{id}", self.delete_task)
         self.app.router.add_patch("/api/tasks/{id}", self.patch_task)
         # AI Lounge routes (requires lounge_repo)
@@ -649,6 +655,10 @@ class ApiServer:
                 instead of creating a new one.
             one_shot: (optional, default false) If true, auto-disable after
                 a single execution.
+            jitter_seconds: (optional, default 0) With ``anchor_time``, a
+                window after the anchor within which the task starts, at a
+                fixed point derived from its name — spreads tasks anchored to
+                the same minute.
         """
         if err := self._require_task_repo():
             return err
@@ -674,6 +684,10 @@ class ApiServer:
                 thread_id = int(raw_thread_id)
 
         one_shot = bool(data.get("one_shot", False))
+        try:
+            jitter_seconds = int(data.get("jitter_seconds") or 0)
+        except (ValueError, TypeError):
+            return web.json_response({"error": "jitter_seconds must be an integer"}, status=400)
 
         try:
             task_id = await self.task_repo.create(  # type: ignore[union-attr]
@@ -687,6 +701,7 @@ class ApiServer:
                 anchor_minute=anchor_minute,
                 thread_id=thread_id,
                 one_shot=one_shot,
+                jitter_seconds=jitter_seconds,
             )
         except Exception as exc:
             # Most likely a UNIQUE constraint violation on name
@@ -703,6 +718,53 @@ class ApiServer:
         tasks = await self.task_repo.get_all()  # type: ignore[union-attr]
         return web.json_response({"tasks": tasks})
 
+    async def project_tasks(self, request: web.Request) -> web.Response:
+        """GET /api/tasks/projection — dry-run the scheduler over the coming hours.
+
+        Query: ``hours`` (default 24, max 168) and ``bucket_minutes`` (default
+        60). Returns the scheduled starts per bucket after jitter and the
+        scheduler's stagger, so a burst at one anchor time is visible before it
+        happens. Nothing is run or changed.
+        """
+        if err := self._require_task_repo():
+            return err
+        try:
+            hours = float(request.query.get("hours", DEFAULT_PROJECTION_HOURS))
+            bucket_minutes = float(request.query.get("bucket_minutes", 60))
+        except ValueError:
+            return web.json_response(
+                {"error": "hours and bucket_minutes must be numbers"}, status=400
+            )
+        # float() accepts "nan" and "inf", which slip past the range check.
+        if (
+            not (math.isfinite(hours) and math.isfinite(bucket_minutes))
+            or not (0 < hours <= _MAX_PROJECTION_HOURS)
+            or bucket_minutes < 1
+        ):
+            return web.json_response(
+                {"error": f"hours must be in (0, {_MAX_PROJECTION_HOURS}], bucket_minutes >= 1"},
+                status=400,
+            )
+        tasks = await self.task_repo.get_all()  # type: ignore[union-attr]
+        stagger_seconds = stagger_seconds_from_env()
+        buckets = project_load(
+            tasks,
+            now=time.time(),
+            stagger_seconds=stagger_seconds,
+            horizon_seconds=hours * 3600,
+            bucket_seconds=bucket_minutes * 60,
+        )
+        return web.json_response(
+            {
+                "stagger_seconds": stagger_seconds,
+                "total_starts": sum(b.starts for b in buckets),
+                "peak_starts": max(b.starts for b in buckets),
+                "buckets": [
+                    {"start": b.start, "starts": b.starts, "tasks": b.tasks} for b in buckets
+                ],
+            }
+        )
+
     async def delete_task(self, request: web.Request) -> web.Response:
         """DELETE /api/tasks/{id} — remove a scheduled task."""
         if err := self._require_task_repo():
@@ -726,6 +788,7 @@ class ApiServer:
             interval_seconds: int
             working_dir: str
             anchor_time: ``"HH:MM"`` to set, or ``null`` to clear
+            jitter_seconds: int — jitter window after the anchor (0 = none)
             next_run_at: float (epoch) — manual schedule reset
         """
         if err := self._require_task_repo():
@@ -752,6 +815,11 @@ class ApiServer:
             patch_kwargs["interval_seconds"] = int(data["interval_seconds"])
         if "working_dir" in data:
             patch_kwargs["working_dir"] = str(data["working_dir"])
+        if "jitter_seconds" in data:
+            try:
+                patch_kwargs["jitter_seconds"] = int(data["jitter_seconds"] or 0)
+            except (ValueError, TypeError):
+                return web.json_response({"error": "jitter_seconds must be an integer"}, status=400)
 
         # anchor_time: "HH:MM" to set, null to clear
         if "anchor_time" in data:
@@ -772,10 +840,7 @@ class ApiServer:
 
         # Manual next_run_at override
         if "next_run_at" in data:
-            await self.task_repo._db_execute(  # type: ignore[union-attr]
-                "UPDATE scheduled_tasks SET next_run_at = ? WHERE id = ?",
-                (float(data["next_run_at"]), task_id),
-            )
+            await self.task_repo.set_next_run(task_id, float(data["next_run_at"]))  # type: ignore[union-attr]
             updated = True
 
         if updated:
@@ -1218,7 +1283,14 @@ class ApiServer:
         )
 
         active = self._active_sessions()
-        thread_ids = {r.thread_id for r in records} | {s.thread_id for s in active}
+        # A live session older than the ``limit`` most recent rows still gets
+        # its persisted details: one lookup for all of them.
+        listed = {r.thread_id for r in records}
+        unlisted = {s.thread_id for s in active} - listed
+        if unlisted:
+            extra = await self.session_repo.get_many(unlisted)  # type: ignore[union-attr]
+            records = [*records, *extra.values()]
+        thread_ids = listed | {s.thread_id for s in active}
         views = build_session_views(
             records=records,
             active=active,
@@ -1241,12 +1313,12 @@ class ApiServer:
         their titles are often vague.  This searches the persistent per-thread
         ``summary`` (the opening prompt, already stored for every session) plus
         the working directory, and returns a Discord deep-link so an archived
-        thread can be reopened with one click.  No AI tokens, no new storage —
-        just a ``LIKE`` query over data ccdb already keeps.
+        thread can be reopened with one click.  No AI tokens — just a full-text
+        index (``sessions_fts``) over data ccdb already keeps.
 
         Query params:
-            q: Keyword (required, non-blank). Matched against summary and
-               working_dir (case-insensitive substring).
+            q: Keywords (required, non-blank). Each must appear in summary or
+               working_dir (case-insensitive substring); best matches first.
             origin: ``discord`` or ``cli`` to filter by session origin.
             limit: Max summary results (default 15, max 50).
             body: ``1`` to also grep local Claude transcripts for the keyword
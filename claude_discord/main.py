@@ -84,6 +84,15 @@ def load_config() -> dict[str, str]:
         "custom_cogs_dir": os.getenv("CUSTOM_COGS_DIR", ""),
         "cli_sessions_path": os.getenv("CLI_SESSIONS_PATH", ""),
         "thread_inbox_enabled": os.getenv("THREAD_INBOX_ENABLED", "false"),
+        "warm_pool_size": os.getenv("CCDB_WARM_POOL_SIZE", "0"),
+        "warm_pool_ttl": os.getenv("CCDB_WARM_POOL_TTL_SECONDS", ""),
+        "keep_alive_seconds": os.getenv("CCDB_KEEP_ALIVE_SECONDS", "0"),
+        "keep_alive_max": os.getenv("CCDB_KEEP_ALIVE_MAX_PROCESSES", ""),
+        "worker_processes": os.getenv("CCDB_WORKER_PROCESSES", "0"),
+        "worker_max_jobs": os.getenv("CCDB_WORKER_MAX_JOBS", ""),
+        "remote_workers": os.getenv("CCDB_REMOTE_WORKERS", ""),
+        "remote_agent_token": os.getenv("CCDB_REMOTE_AGENT_TOKEN", ""),
+        "remote_worker_ca": os.getenv("CCDB_REMOTE_WORKER_CA", ""),
     }
 
 
@@ -113,6 +122,89 @@ async def main() -> None:
     # runners on demand (e.g. when the user switches via /backend).
     from .backend_factory import BackendFactory
 
+    # Opt-in: run CLI turns in worker processes, off the gateway's event loop
+    # (0 = off). Needs Unix sockets, so it is not available on Windows.
+    worker_pool = None
+    if config["worker_processes"].isdigit() and int(config["worker_processes"]) > 0:
+        if sys.platform == "win32":
+            logger.warning("CCDB_WORKER_PROCESSES is not supported on Windows; ignoring it")
+        else:
+            from claude_code_core.job_queue import JobQueue
+            from claude_code_core.session_worker import DEFAULT_MAX_JOBS
+            from claude_code_core.worker_pool import WorkerPool
+
+            layout = DataLayout.from_env()
+            layout.ensure_dirs()
+            worker_pool = WorkerPool(
+                JobQueue(layout.jobs_db),
+                processes=int(config["worker_processes"]),
+                max_jobs=int(config["worker_max_jobs"] or DEFAULT_MAX_JOBS),
+            )
+            await worker_pool.start()
+
+    # Opt-in: remote agents a thread can be placed on with /worker.
+    remote_workers = None
+    if config["remote_workers"]:
+        if not config["remote_agent_token"]:
+            logger.error(
+                "CCDB_REMOTE_WORKERS is set but CCDB_REMOTE_AGENT_TOKEN is not; ignoring it"
+            )
+        else:
+            from claude_code_core.remote_agent import parse_endpoints
+
+            remote_workers = parse_endpoints(
+                config["remote_workers"],
+                token=config["remote_agent_token"],
+                ca_file=config["remote_worker_ca"] or None,
+            )
+            logger.info("Remote workers: %s", ", ".join(sorted(remote_workers)))
+
+    # Opt-in warm pool of pre-spawned Claude CLI processes (0 = off). The pool
+    # and kept-alive processes live in the process that runs the CLI, so they
+    # do nothing in worker mode.
+    process_pool = None
+    if (
+        worker_pool is None
+        and config["warm_pool_size"].isdigit()
+        and int(config["warm_pool_size"]) > 0
+    ):
+        from claude_code_core.process_pool import DEFAULT_TTL_SECONDS, WarmProcessPool
+
+        process_pool = WarmProcessPool(
+            max_size=int(config["warm_pool_size"]),
+            ttl_seconds=float(config["warm_pool_ttl"] or DEFAULT_TTL_SECONDS),
+        )
+        logger.info(
+            "Warm CLI process pool enabled (size=%d, ttl=%.0fs)",
+            process_pool.max_size,
+            process_pool.ttl_seconds,
+        )
+
+    # Opt-in: keep a thread's CLI process alive between turns (0 = off).
+    persistent_processes = None
+    if worker_pool is None and float(config["keep_alive_seconds"] or 0) > 0:
+        from claude_code_core.persistent_process import (
+            DEFAULT_MAX_PROCESSES,
+            PersistentProcessRegistry,
+        )
+
+        persistent_processes = PersistentProcessRegistry(
+            idle_seconds=float(config["keep_alive_seconds"]),
+            max_processes=int(config["keep_alive_max"] or DEFAULT_MAX_PROCESSES),
+        )
+        logger.info(
+            "Kept-alive CLI processes enabled (idle=%.0fs, max=%d)",
+            persistent_processes.idle_seconds,
+            persistent_processes.max_processes,
+        )
+
+    # One keep-alive HTTP session for every AG-UI turn, instead of one per turn.
+    agui_http_session = None
+    if config["agui_url"]:
+        from claude_code_core.http_pool import SharedHttpSession
+
+        agui_http_session = SharedHttpSession()
+
     factory = BackendFactory(
         claude_command=config["claude_command"]
         or (config["command"] if backend_name == "claude" else "")
@@ -130,6 +222,11 @@ async def main() -> None:
         effort=config["effort"] or None,
         agui_url=config["agui_url"] or None,
         agui_token=config["agui_token"] or None,
+        process_pool=process_pool,
+        persistent_processes=persistent_processes,
+        agui_http_session=agui_http_session,
+        worker_pool=worker_pool,
+        remote_workers=remote_workers,
     )
 
     runner = factory.build(backend=backend_name, model=config["model"] or None)
@@ -231,6 +328,19 @@ async def main() -> None:
             if teams_runtime is not None:
                 await teams_runtime.close()
                 logger.info("Teams activity puller stopped")
+            await components.close()
+            if worker_pool is not None:
+                await worker_pool.close()
+            if process_pool is not None:
+                await process_pool.close()
+            if persistent_processes is not None:
+                await persistent_processes.close()
+            if agui_http_session is not None:
+                await agui_http_session.close()
+            # Only has connections if /ollama or a privacy guard used it.
+            from claude_code_core.ollama_client import close_shared_client
+
+            await close_shared_client()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,166 @@
+"""Start planning for scheduled tasks: jitter, staggering and a 24 h projection.
+
+Anchored tasks (``anchor_time`` ``"09:00"``) all come due at the same
+wall-clock instant, so a handful of daily tasks set for nine o'clock started
+together, took every session slot and spent the quota in one burst. Two knobs
+spread them out:
+
+- **jitter** — per task, ``jitter_seconds`` moves an anchored task's start to a
+  fixed point inside the window after its anchor. The offset is derived from
+  the task's name, so it is the same every day (the schedule stays
+  predictable) but differs between tasks.
+- **stagger** — for the scheduler as a whole, consecutive starts are at least
+  ``CCDB_SCHEDULER_STAGGER_SECONDS`` apart. When several tasks are due at
+  once the scheduler runs the earliest-due one and moves the rest to the next
+  free slots, in due order (:func:`stagger`).
+
+:func:`project_load` replays the same rules over the enabled tasks without
+running anything, so ``GET /api/tasks/projection`` can show how many starts
+each hour of the next day will see.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import random
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+
+__all__ = [
+    "LoadBucket",
+    "jitter_offset",
+    "next_anchor",
+    "project_load",
+    "stagger",
+    "stagger_seconds_from_env",
+]
+
+DEFAULT_PROJECTION_HOURS = 24
+DEFAULT_BUCKET_SECONDS = 3600
+# Bounds the replay of a very short interval over the projection window.
+_MAX_FIRES_PER_TASK = 10_000
+
+
+def stagger_seconds_from_env() -> float:
+    """The minimum gap between scheduled starts (``CCDB_SCHEDULER_STAGGER_SECONDS``, default 0)."""
+    raw = os.getenv("CCDB_SCHEDULER_STAGGER_SECONDS", "")
+    try:
+        return max(0.0, float(raw)) if raw else 0.0
+    except ValueError:
+        return 0.0
+
+
+def jitter_offset(name: str, jitter_seconds: int | None) -> float:
+    """Where in its jitter window a task starts: stable per task name."""
+    if not jitter_seconds or jitter_seconds <= 0:
+        return 0.0
+    return random.Random(name).uniform(0, jitter_seconds)  # noqa: S311 — spreading, not security
+
+
+def next_anchor(
+    anchor_hour: int,
+    anchor_minute: int,
+    interval_seconds: int,
+    *,
+    after: float | None = None,
+    offset: float = 0.0,
+) -> float:
+    """The first anchor occurrence (plus ``offset``) strictly after ``after`` (default now).
+
+    Advances from the day's anchor by ``interval_seconds``, so the schedule
+    snaps to the anchor however long the previous run took.
+    """
+    local_tz = datetime.now(timezone.utc).astimezone().tzinfo  # noqa: UP017
+    now = datetime.now(local_tz) if after is None else datetime.fromtimestamp(after, local_tz)
+    candidate = now.replace(hour=anchor_hour, minute=anchor_minute, second=0, microsecond=0)
+    interval = timedelta(seconds=interval_seconds)
+    shift = timedelta(seconds=offset)
+    # A jittered start can carry past midnight; yesterday's may still be ahead.
+    if offset and candidate - interval + shift > now:
+        candidate -= interval
+    while candidate + shift <= now:
+        candidate += interval
+    return (candidate + shift).timestamp()
+
+
+def stagger[T](
+    due: Iterable[tuple[float, T]], *, stagger_seconds: float, next_free: float
+) -> tuple[list[tuple[float, T]], float]:
+    """Assign start times at least ``stagger_seconds`` apart, in due order.
+
+    Returns the ``(start, item)`` plan and the next free slot after it.
+    """
+    plan: list[tuple[float, T]] = []
+    for due_at, item in sorted(due, key=lambda pair: pair[0]):
+        start = max(due_at, next_free)
+        plan.append((start, item))
+        next_free = start + stagger_seconds
+    return plan, next_free
+
+
+@dataclass
+class LoadBucket:
+    """Projected scheduled starts within one bucket of the projection."""
+
+    start: float
+    starts: int = 0
+    tasks: list[str] = field(default_factory=list)
+
+
+def _fires(task: dict, *, now: float, until: float) -> list[float]:
+    fires: list[float] = []
+    at = max(float(task["next_run_at"]), now)
+    interval = int(task["interval_seconds"])
+    offset = jitter_offset(task["name"], task.get("jitter_seconds"))
+    while at < until and len(fires) < _MAX_FIRES_PER_TASK:
+        fires.append(at)
+        if task.get("one_shot") or interval <= 0:
+            break
+        if task.get("anchor_hour") is not None:
+            at = next_anchor(
+                task["anchor_hour"],
+                task.get("anchor_minute") or 0,
+                interval,
+                after=at,
+                offset=offset,
+            )
+        else:
+            at += interval
+    return fires
+
+
+def project_load(
+    tasks: Iterable[dict],
+    *,
+    now: float,
+    stagger_seconds: float = 0.0,
+    horizon_seconds: float = DEFAULT_PROJECTION_HOURS * 3600,
+    bucket_seconds: float = DEFAULT_BUCKET_SECONDS,
+) -> list[LoadBucket]:
+    """Project scheduled starts over the next ``horizon_seconds``, bucketed.
+
+    Task durations are unknown, so this counts *starts*, after jitter and
+    staggering — the burst the session limit and the quota would see.
+    """
+    if bucket_seconds <= 0:
+        raise ValueError("bucket_seconds must be positive")
+    until = now + horizon_seconds
+    due = [
+        (at, task["name"])
+        for task in tasks
+        if task.get("enabled", True)
+        for at in _fires(task, now=now, until=until)
+    ]
+    plan, _ = stagger(due, stagger_seconds=stagger_seconds, next_free=now)
+    buckets = [
+        LoadBucket(start=now + i * bucket_seconds)
+        for i in range(max(1, math.ceil(horizon_seconds / bucket_seconds)))
+    ]
+    for start, name in plan:
+        index = int((start - now) // bucket_seconds)
+        if 0 <= index < len(buckets):
+            buckets[index].starts += 1
+            buckets[index].tasks.append(name)
+    return buckets
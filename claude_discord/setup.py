@@ -7,8 +7,9 @@ New Cogs added to ccdb are automatically included — no consumer code changes n
 from __future__ import annotations
 
 import logging
+import math
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -16,6 +17,8 @@ if TYPE_CHECKING:
 
     from claude_code_core.backend import SessionBackend
     from claude_code_core.frontend import SessionFrontend
+    from claude_code_core.sqlite_pool import SqlitePool
+    from claude_code_core.write_behind import WriteBehindBuffer
 
     from .backend_factory import BackendFactory
     from .backend_settings import BackendSettings
@@ -33,6 +36,9 @@ if TYPE_CHECKING:
     from .ext.api_server import ApiServer
 
 from .deployment import DEFAULT_DATA_ROOT, DataLayout
+from .typing_prewarm import DEFAULT_MAX_PER_USER as PREWARM_MAX_PER_USER
+from .typing_prewarm import DEFAULT_TTL_SECONDS as PREWARM_TTL_SECONDS
+from .typing_prewarm import TypingPrewarmer
 
 logger = logging.getLogger(__name__)
 
@@ -73,6 +79,20 @@ class BridgeComponents:
     #: so a custom Cog scheduling a reminder lands in the same database the
     #: dispatcher reads.  A Cog that opens its own file writes into a void.
     notification_repo: NotificationRepository | None = None
+    #: The shared connections behind the repositories above; see :meth:`close`.
+    database_pools: list[SqlitePool] = field(default_factory=list)
+    #: Deferred writes to those databases, flushed by :meth:`close` first.
+    write_buffers: list[WriteBehindBuffer] = field(default_factory=list)
+
+    async def close(self) -> None:
+        """Flush deferred writes and close the shared database connections.
+
+        Call once the bot has stopped.
+        """
+        for buffer in self.write_buffers:
+            await buffer.close()
+        for pool in self.database_pools:
+            await pool.close()
 
     def apply_to_api_server(self, api_server: ApiServer) -> None:
         """Wire all optional repos to an ApiServer instance.
@@ -124,6 +144,7 @@ async def setup_bridge(
     thread_context_days: int | None = None,
     context_links_config: str | None = None,
     backend_factory: BackendFactory | None = None,
+    prewarm_on_typing: bool | None = None,
 ) -> BridgeComponents:
     """Initialize and register all ccdb Cogs in one call.
 
@@ -198,6 +219,12 @@ async def setup_bridge(
                               external resource links (Obsidian notes, GitHub repos,
                               etc.).  Defaults to CONTEXT_LINKS_CONFIG env var, or
                               ``context_links.json`` in the working directory.
+        prewarm_on_typing: When True, start a thread's next CLI process from the
+                           warm pool as soon as its user starts typing.  Needs the
+                           runner to have a warm pool.  Defaults to the
+                           CCDB_PREWARM_ON_TYPING env var (off by default); the
+                           TTL and per-user cap come from CCDB_PREWARM_TTL_SECONDS
+                           and CCDB_PREWARM_MAX_PER_USER.
 
     Returns:
         BridgeComponents with references to initialized repositories.
@@ -286,6 +313,38 @@ async def setup_bridge(
     if thread_context_days != DEFAULT_DAYS:
         logger.info("Thread context window: %d day(s)", thread_context_days)
 
+    # Typing pre-warm — fall back to CCDB_PREWARM_ON_TYPING env var (off by default)
+    if prewarm_on_typing is None:
+        prewarm_on_typing = os.getenv("CCDB_PREWARM_ON_TYPING", "").lower() in (
+            "true",
+            "1",
+            "yes",
+        )
+    prewarmer: TypingPrewarmer | None = None
+    if prewarm_on_typing:
+        _env_ttl = os.getenv("CCDB_PREWARM_TTL_SECONDS", "").strip()
+        _env_cap = os.getenv("CCDB_PREWARM_MAX_PER_USER", "")
+        prewarm_ttl = PREWARM_TTL_SECONDS
+        if _env_ttl:
+            try:
+                prewarm_ttl = float(_env_ttl)
+            except ValueError:
+                prewarm_ttl = math.nan
+            if not (math.isfinite(prewarm_ttl) and prewarm_ttl > 0):
+                logger.warning("Ignoring invalid CCDB_PREWARM_TTL_SECONDS=%r", _env_ttl)
+                prewarm_ttl = PREWARM_TTL_SECONDS
+        prewarmer = TypingPrewarmer(
+            ttl_seconds=prewarm_ttl,
+            max_per_user=(
+                int(_env_cap) if _env_cap.isdigit() and int(_env_cap) else PREWARM_MAX_PER_USER
+            ),
+        )
+        logger.info(
+            "Typing pre-warm enabled (ttl=%.0fs, max %d per user)",
+            prewarmer.ttl_seconds,
+            prewarmer.max_per_user,
+        )
+
     # Max concurrent sessions — fall back to MAX_CONCURRENT_SESSIONS env var, then 3
     if max_concurrent is None:
         _env_max = os.getenv("MAX_CONCURRENT_SESSIONS", "")
@@ -293,9 +352,45 @@ async def setup_bridge(
     if max_concurrent != 3:
         logger.info("Max concurrent sessions: %d", max_concurrent)
 
+    from claude_code_core.session_scheduler import HostHeadroom
+
     from .cogs._run_helper import configure_pr_completion_gate, configure_session_limit
 
-    configure_session_limit(max_concurrent)
+    _env_per_repo = os.getenv("CCDB_MAX_SESSIONS_PER_REPO", "")
+    max_per_repo = int(_env_per_repo) if _env_per_repo.isdigit() and int(_env_per_repo) else None
+    _env_load = os.getenv("CCDB_MAX_LOAD_PER_CPU", "").strip()
+    max_load_per_cpu: float | None = None
+    if _env_load:
+        try:
+            max_load_per_cpu = float(_env_load)
+        except ValueError:
+            logger.warning("Ignoring invalid CCDB_MAX_LOAD_PER_CPU=%r", _env_load)
+    _env_memory = os.getenv("CCDB_MIN_FREE_MEMORY_MB", "")
+    headroom: HostHeadroom | None = None
+    if max_load_per_cpu is not None or _env_memory.isdigit():
+        headroom = HostHeadroom(
+            max_load_per_cpu=max_load_per_cpu,
+            min_free_memory_mb=int(_env_memory) if _env_memory.isdigit() else None,
+        )
+    if max_per_repo is not None or headroom is not None:
+        logger.info(
+            "Session admission: max %s per repository, headroom %s",
+            max_per_repo if max_per_repo is not None else "unlimited",
+            headroom,
+        )
+    # Pace sessions by the account's rate-limit windows.
+    pace_rate_limits = os.getenv("CCDB_RATE_LIMIT_PACING", "").lower() in ("true", "1", "yes")
+    # Let a person's reply take a slot from a triggered or scheduled run.
+    preempt_background = os.getenv("CCDB_PREEMPT_BACKGROUND", "").lower() in ("true", "1", "yes")
+    if preempt_background:
+        logger.info("Background sessions yield their slot to interactive ones")
+    configure_session_limit(
+        max_concurrent,
+        max_per_repo=max_per_repo,
+        headroom=headroom,
+        pace_rate_limits=pace_rate_limits,
+        preempt_background=preempt_background,
+    )
     pr_completion_owner = os.getenv("CCDB_PR_COMPLETION_OWNER", "").strip()
     configure_pr_completion_gate(pr_completion_owner or None)
     if pr_completion_owner:
@@ -339,6 +434,7 @@ async def setup_bridge(
     from .teams_integration import FrontendRouter
 
     stores = await build_session_stores(session_db_path)
+    database_pools = [stores.pool]
 
     # The frontend seam. Built once and handed to everything that needs to
     # reach a conversation, so a Cog never has to call bot.get_channel itself.
@@ -353,6 +449,16 @@ async def setup_bridge(
     ingest_repo = stores.ingest
     summary_repo = stores.summaries
 
+    # A restart mid-window must not forget how close the quota already is.
+    if pace_rate_limits and usage_repo is not None:
+        from .cogs._run_helper import observe_rate_limit
+
+        try:
+            for info in await usage_repo.get_latest():
+                observe_rate_limit(info)
+        except Exception:
+            logger.warning("Could not restore rate-limit state for pacing", exc_info=True)
+
     # Attach repos to bot so generic cogs (e.g. AutoUpgradeCog) can discover them
     # without a hard import dependency on ccdb internals.
     bot.session_repo = session_repo  # type: ignore[attr-defined]
@@ -360,7 +466,7 @@ async def setup_bridge(
 
     # --- Thread inbox (optional — THREAD_INBOX_ENABLED=true) ---
     if enable_thread_inbox:
-        inbox_repo = ThreadInboxRepository(session_db_path)
+        inbox_repo = ThreadInboxRepository(session_db_path, pool=stores.pool)
         bot.inbox_repo = inbox_repo  # type: ignore[attr-defined]
         logger.info("Thread inbox enabled")
 
@@ -402,6 +508,7 @@ async def setup_bridge(
         monitor_all_channels=monitor_all_channels,
         mention_anywhere=mention_anywhere,
         thread_context_days=thread_context_days,
+        prewarmer=prewarmer,
     )
     await bot.add_cog(chat_cog)
     logger.info("Registered ClaudeChatCog")
@@ -442,11 +549,24 @@ async def setup_bridge(
         await bot.add_cog(skill_cog)
         logger.info("Registered SkillCommandCog")
 
+    # One timer for everything that fires at a stored time (scheduled tasks,
+    # scheduled notifications): it sleeps until the earliest and is woken by
+    # their repositories on every write, instead of each Cog polling SQLite.
+    from claude_code_core.timer_service import TimerService
+
+    from .schedule_plan import stagger_seconds_from_env
+
+    timers = TimerService()
+
     # --- SchedulerCog (optional) ---
     task_repo: TaskRepository | None = None
     if enable_scheduler:
         os.makedirs(os.path.dirname(task_db_path) or ".", exist_ok=True)
-        task_repo = TaskRepository(task_db_path)
+        from claude_code_core.sqlite_pool import SqlitePool
+
+        task_pool = SqlitePool(task_db_path)
+        database_pools.append(task_pool)
+        task_repo = TaskRepository(task_db_path, pool=task_pool)
         await task_repo.init_db()
         # Honour ScheduleWakeup tool calls (harness /loop self-pacing) by
         # registering one-shot resume tasks in this scheduler.
@@ -461,6 +581,8 @@ async def setup_bridge(
             backend_factory=backend_factory,
             backend_settings=backend_settings,
             frontend=frontend,
+            timers=timers,
+            stagger_seconds=stagger_seconds_from_env(),
         )
         await bot.add_cog(scheduler_cog)
         logger.info("Registered SchedulerCog")
@@ -537,6 +659,8 @@ async def setup_bridge(
         settings_repo=settings_repo,
         ask_repo=ask_repo,
         usage_repo=usage_repo,
+        database_pools=database_pools,
+        write_buffers=[stores.write_behind],
     )
 
     # Auto-wire repos to ApiServer and set runner.api_port if provided
@@ -552,6 +676,7 @@ async def setup_bridge(
                 bot,
                 repo=api_server.repo,
                 default_channel_id=claude_channel_id,
+                timers=timers,
             )
         )
         logger.info("Registered NotificationDispatchCog")
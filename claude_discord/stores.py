@@ -9,6 +9,15 @@ Separating them also makes the deployment-isolation story checkable in one
 place. Every repository below shares a single SQLite file, so that path is
 where two deployments would silently start sharing sessions, claims and
 lounge history — the thing ``DataLayout`` exists to prevent.
+
+Sharing one file also means sharing its connections: every repository is
+handed the same :class:`~claude_code_core.sqlite_pool.SqlitePool`, so a turn's
+lookups reuse open connections instead of opening one per call. The hot,
+overwrite-only writes — context stats and rate-limit state — go through one
+:class:`~claude_code_core.write_behind.WriteBehindBuffer` on that pool, and
+are committed together about once a second. Session records and settings are
+read through a :class:`~claude_code_core.read_cache.ReadCache` each, so a turn
+setup that finds nothing changed since the last one does not query at all.
 """
 
 from __future__ import annotations
@@ -17,6 +26,10 @@ import logging
 import os
 from dataclasses import dataclass
 
+from claude_code_core.read_cache import ReadCache
+from claude_code_core.sqlite_pool import SqlitePool
+from claude_code_core.write_behind import WriteBehindBuffer
+
 from .database.ask_repo import PendingAskRepository
 from .database.claims_repo import ClaimRepository
 from .database.frontend_thread_repo import FrontendThreadRepository
@@ -38,6 +51,8 @@ class SessionStores:
     """The repositories that back a running deployment, frontend-agnostic."""
 
     db_path: str
+    pool: SqlitePool
+    write_behind: WriteBehindBuffer
     sessions: SessionRepository
     settings: SettingsRepository
     asks: PendingAskRepository
@@ -49,6 +64,15 @@ class SessionStores:
     summaries: ThreadSummaryRepository
     frontend_threads: FrontendThreadRepository
 
+    async def close(self) -> None:
+        """Flush deferred writes and close the shared connections.
+
+        The repositories keep working afterwards, writing straight through on
+        connections of their own.
+        """
+        await self.write_behind.close()
+        await self.pool.close()
+
 
 async def build_session_stores(session_db_path: str) -> SessionStores:
     """Open (creating if needed) the session database and build every repository.
@@ -62,28 +86,34 @@ async def build_session_stores(session_db_path: str) -> SessionStores:
     """
     os.makedirs(os.path.dirname(session_db_path) or ".", exist_ok=True)
     await init_db(session_db_path)
+    pool = SqlitePool(session_db_path)
+    write_behind = WriteBehindBuffer(session_db_path, pool)
 
-    ingest = IngestResultRepository(session_db_path)
+    ingest = IngestResultRepository(session_db_path, pool=pool)
     await ingest.init_db()
-    summaries = ThreadSummaryRepository(session_db_path)
+    summaries = ThreadSummaryRepository(session_db_path, pool=pool)
     await summaries.init_db()
 
     # Adopt every thread this deployment already has, so the ledger answers for
     # all of its conversations rather than only the ones opened from now on.
     # Idempotent: a no-op on every run after the first.
-    frontend_threads = FrontendThreadRepository(session_db_path)
+    frontend_threads = FrontendThreadRepository(session_db_path, pool=pool)
     await frontend_threads.backfill_discord()
 
     logger.info("Session DB initialized: %s", session_db_path)
     return SessionStores(
         db_path=session_db_path,
-        sessions=SessionRepository(session_db_path),
-        settings=SettingsRepository(session_db_path),
-        asks=PendingAskRepository(session_db_path),
-        lounge=LoungeRepository(session_db_path),
-        claims=ClaimRepository(session_db_path),
-        resumes=PendingResumeRepository(session_db_path),
-        usage=UsageStatsRepository(session_db_path),
+        pool=pool,
+        write_behind=write_behind,
+        sessions=SessionRepository(
+            session_db_path, pool=pool, write_behind=write_behind, cache=ReadCache()
+        ),
+        settings=SettingsRepository(session_db_path, pool=pool, cache=ReadCache()),
+        asks=PendingAskRepository(session_db_path, pool=pool),
+        lounge=LoungeRepository(session_db_path, pool=pool),
+        claims=ClaimRepository(session_db_path, pool=pool),
+        resumes=PendingResumeRepository(session_db_path, pool=pool),
+        usage=UsageStatsRepository(session_db_path, pool=pool, write_behind=write_behind),
         ingest=ingest,
         summaries=summaries,
         frontend_threads=frontend_threads,
@@ -0,0 +1,88 @@
+"""Speculative pre-warm of a thread's next CLI process while its user types.
+
+A reply to a thread with a stored session already determines everything the
+CLI is launched with — backend, model, working directory, ``--resume`` ID and
+system context. Only the prompt is missing, and that goes to stdin. So when
+Discord reports someone typing in such a thread, the process the reply will
+ask for can be started from the warm pool (:mod:`claude_code_core.process_pool`)
+while the message is still being written, hiding most of the CLI's cold start
+in a quick back-and-forth.
+
+Typing is a weak signal — people start a reply and abandon it — so every
+pre-warm is bounded:
+
+- it lives for ``ttl_seconds`` (much shorter than the pool's own TTL) and is
+  reaped unused after that;
+- Discord repeats the typing event every few seconds, so a thread that was
+  pre-warmed within the TTL is not pre-warmed again;
+- one user holds at most ``max_per_user`` live pre-warms at a time, so typing
+  across many threads cannot fill the machine with idle CLIs.
+
+This module is only the gate; ``ClaudeChatCog.on_typing`` builds the runner.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["PrewarmStats", "TypingPrewarmer"]
+
+DEFAULT_TTL_SECONDS = 30.0
+DEFAULT_MAX_PER_USER = 2
+
+
+@dataclass
+class PrewarmStats:
+    """How many typing events led to a pre-warm, and why the rest did not."""
+
+    admitted: int = 0
+    recent: int = 0
+    capped: int = 0
+
+
+class TypingPrewarmer:
+    """Decides which typing events may pre-warm a process."""
+
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_per_user: int = DEFAULT_MAX_PER_USER,
+    ) -> None:
+        if ttl_seconds <= 0:
+            raise ValueError("ttl_seconds must be positive")
+        if max_per_user < 1:
+            raise ValueError("max_per_user must be at least 1")
+        self.ttl_seconds = ttl_seconds
+        self.max_per_user = max_per_user
+        self.stats = PrewarmStats()
+        # thread_id -> (user_id, expires_at) of each live pre-warm.
+        self._live: dict[int, tuple[int, float]] = {}
+
+    def admit(self, user_id: int, thread_id: int, *, now: float | None = None) -> bool:
+        """Reserve a pre-warm for ``user_id`` typing in ``thread_id``, if allowed."""
+        now = time.monotonic() if now is None else now
+        self._prune(now)
+        if thread_id in self._live:
+            self.stats.recent += 1
+            return False
+        held = sum(1 for owner, _ in self._live.values() if owner == user_id)
+        if held >= self.max_per_user:
+            self.stats.capped += 1
+            logger.debug("Typing pre-warm skipped: user %d already holds %d", user_id, held)
+            return False
+        self._live[thread_id] = (user_id, now + self.ttl_seconds)
+        self.stats.admitted += 1
+        return True
+
+    def release(self, thread_id: int) -> None:
+        """The thread's message arrived (or the pre-warm failed); free its slot."""
+        self._live.pop(thread_id, None)
+
+    def _prune(self, now: float) -> None:
+        for thread_id in [t for t, (_, expires) in self._live.items() if expires <= now]:
+            del self._live[thread_id]
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""Benchmark stream-json parsing: the old str path vs ``parse_line_bytes``.
+
+Usage:
+    python scripts/bench_stream_parse.py [TRANSCRIPT.jsonl ...] [--repeat N]
+
+A transcript is a recorded CLI stdout, e.g.:
+
+    claude -p --output-format stream-json --verbose --include-partial-messages \\
+        "think hard about ..." > turn.jsonl
+
+With no transcript, a synthetic thinking-heavy turn is generated: thousands of
+``thinking_delta``/``text_delta`` partials around a handful of complete
+assistant blocks, which is the shape that made parsing show up in event-loop
+CPU profiles.
+
+For each input it reports lines/sec for both paths and the speedup, and checks
+that the fast path produced exactly the events anything consumes.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from claude_code_core.parser import parse_line, parse_line_bytes  # noqa: E402
+from claude_code_core.types import MessageType  # noqa: E402
+
+
+def synthetic_turn(thinking_deltas: int = 6000, text_deltas: int = 800) -> list[bytes]:
+    """A turn shaped like a long extended-thinking answer, as compact CLI JSON."""
+
+    def dump(obj: object) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode() + b"\n"
+
+    def partial(inner: dict) -> bytes:
+        return dump(
+            {
+                "type": "stream_event",
+                "event": inner,
+                "session_id": "0123abcd-0000-4000-8000-000000000001",
+                "parent_tool_use_id": None,
+                "uuid": "9f3c1f0e-5a7b-4c1d-9e2f-1234567890ab",
+            }
+        )
+
+    lines = [dump({"type": "system", "subtype": "init", "session_id": "0123abcd"})]
+    lines.append(partial({"type": "message_start", "message": {"usage": {"input_tokens": 4}}}))
+    lines.append(partial({"type": "content_block_start", "index": 0}))
+    for i in range(thinking_deltas):
+        delta = {"type": "thinking_delta", "thinking": f"step {i}: weigh the options. "}
+        lines.append(partial({"type": "content_block_delta", "index": 0, "delta": delta}))
+    lines.append(partial({"type": "content_block_stop", "index": 0}))
+    lines.append(
+        dump(
+            {
+                "type": "assistant",
+                "message": {"content": [{"type": "thinking", "thinking": "…" * 2000}]},
+            }
+        )
+    )
+    for i in range(text_deltas):
+        delta = {"type": "text_delta", "text": f"word{i} "}
+        lines.append(partial({"type": "content_block_delta", "index": 1, "delta": delta}))
+    lines.append(
+        dump({"type": "assistant", "message": {"content": [{"type": "text", "text": "answer"}]}})
+    )
+    lines.append(
+        partial(
+            {
+                "type": "message_delta",
+                "delta": {"stop_reason": "end_turn"},
+                "usage": {"input_tokens": 4, "output_tokens": 7200},
+            }
+        )
+    )
+    lines.append(partial({"type": "message_stop"}))
+    lines.append(dump({"type": "result", "subtype": "success", "result": "answer"}))
+    return lines
+
+
+def _consumed(event: object) -> bool:
+    """Whether an event from the old path carries anything a consumer reads."""
+    return not (
+        getattr(event, "message_type", None) == MessageType.STREAM_EVENT
+        and getattr(event, "input_tokens", None) is None
+    )
+
+
+def _time(fn, lines: list[bytes], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for line in lines:
+            fn(line)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench(name: str, lines: list[bytes], repeat: int) -> None:
+    old = [parse_line(line.decode("utf-8", errors="replace")) for line in lines]
+    new = [parse_line_bytes(line) for line in lines]
+    expected = [e for e in old if e is not None and _consumed(e)]
+    actual = [e for e in new if e is not None]
+    if expected != actual:
+        raise SystemExit(f"{name}: fast path changed the consumed events")
+
+    old_s = _time(lambda b: parse_line(b.decode("utf-8", errors="replace")), lines, repeat)
+    new_s = _time(parse_line_bytes, lines, repeat)
+    print(
+        f"{name}: {len(lines)} lines, {len(actual)} consumed events\n"
+        f"  str path:   {len(lines) / old_s:>12,.0f} lines/s\n"
+        f"  bytes path: {len(lines) / new_s:>12,.0f} lines/s  ({old_s / new_s:.1f}x)"
+    )
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("transcripts", nargs="*", type=Path)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    if not args.transcripts:
+        bench("synthetic thinking-heavy turn", synthetic_turn(), args.repeat)
+    for path in args.transcripts:
+        bench(str(path), path.read_bytes().splitlines(keepends=True), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 import os
 from unittest.mock import patch
@@ -16,6 +17,7 @@ from claude_code_core.agui_backend import (
     _iter_sse_events,
 )
 from claude_code_core.codex_runner import CodexRunner
+from claude_code_core.http_pool import SharedHttpSession
 from claude_code_core.privacy.backend import AnonymizingBackend
 from claude_code_core.runner import ClaudeRunner
 from claude_code_core.types import ImageData, MessageType, ToolCategory
@@ -488,6 +490,142 @@ class TestAgUiBackendHttp:
         assert backend._interrupted is True
 
 
+def _run_frames(thread_id: str, text_deltas: list[str]) -> list[dict[str, object]]:
+    return [
+        {"type": "RUN_STARTED", "threadId": thread_id, "runId": "r"},
+        {"type": "TEXT_MESSAGE_START", "messageId": "m", "role": "assistant"},
+        *(
+            {"type": "TEXT_MESSAGE_CONTENT", "messageId": "m", "delta": delta}
+            for delta in text_deltas
+        ),
+        {"type": "TEXT_MESSAGE_END", "messageId": "m"},
+        {"type": "RUN_FINISHED", "threadId": thread_id, "runId": "r"},
+    ]
+
+
+class _StandInAgent:
+    """A local AG-UI server that records which client connection each run used."""
+
+    def __init__(self, text_deltas: list[str], write_size: int = 4096) -> None:
+        self.text_deltas = text_deltas
+        self.write_size = write_size
+        self.client_ports: list[int] = []
+
+    async def handler(self, request: web.Request) -> web.StreamResponse:
+        assert request.transport is not None
+        self.client_ports.append(request.transport.get_extra_info("peername")[1])
+        thread_id = (await request.json())["threadId"]
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        body = b"".join(
+            f"data: {json.dumps(frame)}\n\n".encode()
+            for frame in _run_frames(thread_id, self.text_deltas)
+        )
+        # Arbitrary write sizes, so frames straddle the client's reads.
+        for start in range(0, len(body), self.write_size):
+            await response.write(body[start : start + self.write_size])
+        await response.write_eof()
+        return response
+
+
+class TestSharedHttpSession:
+    async def test_turns_and_clones_reuse_one_connection(self) -> None:
+        agent = _StandInAgent(["hi"])
+        server, url = await _serve(agent.handler)
+        shared = SharedHttpSession()
+        try:
+            backend = AgUiBackend(endpoint_url=url, thread_id=1, http_session=shared)
+            for turn in range(4):
+                runner = backend if turn % 2 == 0 else backend.clone(thread_id=2)
+                events = [event async for event in runner.run("Hello")]
+                assert events[-1].is_complete is True
+                assert events[-1].error is None
+        finally:
+            await shared.close()
+            await server.cleanup()
+
+        assert len(agent.client_ports) == 4
+        assert len(set(agent.client_ports)) == 1
+        assert shared.stats.sessions_opened == 1
+
+    async def test_without_a_shared_session_each_turn_reconnects(self) -> None:
+        agent = _StandInAgent(["hi"])
+        server, url = await _serve(agent.handler)
+        try:
+            backend = AgUiBackend(endpoint_url=url)
+            for _ in range(3):
+                _ = [event async for event in backend.run("Hello")]
+        finally:
+            await server.cleanup()
+
+        assert len(set(agent.client_ports)) == 3
+
+    @pytest.mark.parametrize("write_size", [7, 4096, 1 << 20])
+    async def test_streams_thousands_of_frames_intact(self, write_size: int) -> None:
+        deltas = [f"{i:05d} " for i in range(5000)]
+        agent = _StandInAgent(deltas, write_size=write_size)
+        server, url = await _serve(agent.handler)
+        shared = SharedHttpSession()
+        try:
+            backend = AgUiBackend(endpoint_url=url, http_session=shared)
+            events = [event async for event in backend.run("Go")]
+        finally:
+            await shared.close()
+            await server.cleanup()
+
+        assert backend.decode_stats is not None
+        assert backend.decode_stats.malformed == 0
+        partials = [event for event in events if event.is_partial]
+        assert len(partials) == len(deltas)
+        assert partials[-1].text == "".join(deltas)
+        assert events[-1].is_complete is True
+
+    async def test_cookies_are_not_carried_between_requests(self) -> None:
+        seen: list[str | None] = []
+
+        async def handler(request: web.Request) -> web.Response:
+            seen.append(request.headers.get("Cookie"))
+            response = web.Response(text="ok")
+            response.set_cookie("sid", "thread-1")
+            return response
+
+        server, url = await _serve(handler)
+        # A host name, not an IP: aiohttp's default jar ignores cookies from IPs.
+        url = url.replace("127.0.0.1", "localhost")
+        shared = SharedHttpSession()
+        try:
+            for _ in range(2):
+                async with shared.session().post(url) as response:
+                    assert "sid" in response.cookies
+        finally:
+            await shared.close()
+            await server.cleanup()
+
+        assert seen == [None, None]
+
+    async def test_a_turn_timeout_does_not_close_the_shared_session(self) -> None:
+        release = asyncio.Event()
+
+        async def slow(request: web.Request) -> web.StreamResponse:
+            response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+            await response.prepare(request)
+            await release.wait()
+            return response
+
+        server, url = await _serve(slow)
+        shared = SharedHttpSession()
+        try:
+            backend = AgUiBackend(endpoint_url=url, timeout_seconds=1, http_session=shared)
+            events = [event async for event in backend.run("Hello")]
+            assert events[-1].error is not None
+            assert "timed out" in events[-1].error
+            assert not shared.session().closed
+        finally:
+            release.set()
+            await shared.close()
+            await server.cleanup()
+
+
 class _ChunkedContent:
     def __init__(self, chunks: list[bytes]) -> None:
         self._chunks = chunks
@@ -569,6 +707,29 @@ class TestAgUiBackendWiring:
         assert backend.thread_id == 42
         assert _backend_name_from_runner(backend) == "agui"
 
+    def test_factory_shares_one_http_session_across_agui_backends(self) -> None:
+        shared = SharedHttpSession()
+        factory = BackendFactory(
+            claude_command="claude",
+            codex_command="codex",
+            agui_url="https://agent.example/run",
+            permission_mode="acceptEdits",
+            working_dir=None,
+            timeout_seconds=300,
+            dangerously_skip_permissions=False,
+            allowed_tools=None,
+            append_system_prompt=None,
+            effort=None,
+            agui_http_session=shared,
+        )
+        first = factory.build(backend="agui", thread_id=1)
+        second = factory.build(backend="agui", thread_id=2)
+        assert isinstance(first, AgUiBackend)
+        assert isinstance(second, AgUiBackend)
+        assert first.http_session is shared
+        assert second.http_session is shared
+        assert first.clone().http_session is shared
+
     def test_backend_name_survives_privacy_wrapper(self) -> None:
         backend = AgUiBackend(endpoint_url="https://agent.example/run")
         wrapped = AnonymizingBackend(backend, gateway=object())  # type: ignore[arg-type]
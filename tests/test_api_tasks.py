@@ -285,3 +285,43 @@ class TestTasksFollowUp:
         task = data["tasks"][0]
         assert task["thread_id"] == 7777
         assert task["one_shot"] is True
+
+
+class TestTasksProjection:
+    async def test_projection_counts_starts_after_jitter(self, client: TestClient) -> None:
+        for name in ("a", "b"):
+            resp = await client.post(
+                "/api/tasks",
+                json={
+                    "name": name,
+                    "prompt": "p",
+                    "interval_seconds": 86400,
+                    "channel_id": 1,
+                    "anchor_time": "09:00",
+                    "run_immediately": False,
+                    "jitter_seconds": 1800,
+                },
+            )
+            assert resp.status == 201
+
+        resp = await client.get("/api/tasks/projection?hours=24&bucket_minutes=60")
+        assert resp.status == 200
+        data = await resp.json()
+        assert len(data["buckets"]) == 24
+        assert data["total_starts"] == 2
+
+    @pytest.mark.parametrize(
+        "query",
+        ["hours=1000", "hours=nan", "bucket_minutes=nan", "bucket_minutes=inf", "hours=-inf"],
+    )
+    async def test_projection_rejects_a_bad_horizon(self, client: TestClient, query: str) -> None:
+        resp = await client.get(f"/api/tasks/projection?{query}")
+        assert resp.status == 400
+
+    async def test_patch_sets_jitter(self, client: TestClient, task_repo: TaskRepository) -> None:
+        task_id = await task_repo.create(name="j", prompt="p", interval_seconds=60, channel_id=1)
+
+        resp = await client.patch(f"/api/tasks/{task_id}", json={"jitter_seconds": 300})
+
+        assert resp.status == 200
+        assert (await task_repo.get(task_id))["jitter_seconds"] == 300
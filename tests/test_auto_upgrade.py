@@ -825,7 +825,7 @@ class TestMarkSessionsForResume:
         session_record = MagicMock()
         session_record.session_id = "abc-123"
         session_repo = MagicMock()
-        session_repo.get = AsyncMock(return_value=session_record)
+        session_repo.get_many = AsyncMock(return_value={111: session_record})
         bot.session_repo = session_repo
 
         cog = self._make_cog_with_restart(bot)
@@ -834,7 +834,7 @@ class TestMarkSessionsForResume:
 
         await cog._mark_sessions_for_resume(frozenset({111}), thread)
 
-        session_repo.get.assert_awaited_once_with(111)
+        session_repo.get_many.assert_awaited_once_with(frozenset({111}))
         resume_repo.mark.assert_awaited_once()
         call_kwargs = resume_repo.mark.call_args.kwargs
         assert call_kwargs["session_id"] == "abc-123"
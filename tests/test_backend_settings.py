@@ -227,3 +227,30 @@ class TestEffort:
         s = await self._settings()
         with pytest.raises(ValueError):
             await s.set_effort("gpt4", "high")  # type: ignore[arg-type]
+
+
+class TestWorkerPlacement:
+    async def _settings(self) -> BackendSettings:
+        repo, _ = await _new_repo()
+        return BackendSettings(
+            repo, env_backend="claude", env_model_for_claude="", env_model_for_codex=""
+        )
+
+    async def test_defaults_to_local(self) -> None:
+        s = await self._settings()
+        assert await s.current_worker() is None
+        assert await s.current_worker(thread_id=7) is None
+
+    async def test_thread_local_overrides_global_placement(self) -> None:
+        s = await self._settings()
+        await s.set_worker("build1")
+        await s.set_worker("local", thread_id=7)
+        assert await s.current_worker() == "build1"
+        assert await s.current_worker(thread_id=7) is None
+        assert await s.current_worker(thread_id=8) == "build1"
+
+    async def test_clear_thread_overrides_includes_worker(self) -> None:
+        s = await self._settings()
+        await s.set_worker("build2", thread_id=7)
+        assert await s.clear_thread_overrides(7) == 1
+        assert await s.current_worker(thread_id=7) is None
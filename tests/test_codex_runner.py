@@ -36,8 +36,9 @@ class _FakeStream:
             return self._lines.pop(0)
         return b""
 
-    async def read(self) -> bytes:
-        return self._read_data
+    async def read(self, n: int = -1) -> bytes:
+        data, self._read_data = self._read_data, b""
+        return data
 
 
 class _FakeProcess:
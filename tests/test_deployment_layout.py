@@ -44,6 +44,7 @@ class TestEverythingHangsOffTheRoot:
             "sessions_db",
             "tasks_db",
             "notifications_db",
+            "jobs_db",
             "worktrees_dir",
             "teams_vault_dir",
             "log_file",
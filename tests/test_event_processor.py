@@ -1421,6 +1421,33 @@ class TestRateLimitEventProcessing:
         )
         await p.process(event)  # should not raise
 
+    @pytest.mark.asyncio
+    async def test_rate_limit_event_paces_the_scheduler(
+        self, thread: MagicMock, runner: MagicMock
+    ) -> None:
+        from claude_discord.claude.types import RateLimitInfo
+        from claude_discord.cogs import _run_helper
+
+        _run_helper.configure_session_limit(4, pace_rate_limits=True)
+        try:
+            p = EventProcessor(_make_config(thread, runner))
+            await p.process(
+                StreamEvent(
+                    message_type=MessageType.RATE_LIMIT_EVENT,
+                    rate_limit_info=RateLimitInfo(
+                        rate_limit_type="five_hour",
+                        status="allowed_warning",
+                        utilization=0.95,
+                        resets_at=int(time.time()) + 3600,
+                    ),
+                )
+            )
+
+            assert _run_helper._scheduler.limit == 1
+            assert _run_helper._scheduler.background_held
+        finally:
+            _run_helper.configure_session_limit(3)
+
 
 class TestChatOnlyMode:
     """chat_only mode hides tool embeds, thinking, session chrome but keeps text."""
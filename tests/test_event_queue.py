@@ -0,0 +1,204 @@
+"""Tests for the reader/renderer hand-off (claude_code_core.event_queue)."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from claude_code_core.event_queue import CoalescingEventQueue, coalesce_key
+from claude_code_core.frontend import StatusKind
+from claude_code_core.memory_surface import MemorySurface
+from claude_code_core.types import (
+    MessageType,
+    RateLimitInfo,
+    StreamEvent,
+    ToolCategory,
+    ToolUseEvent,
+)
+from claude_discord.cogs._run_helper import run_claude_with_config
+from claude_discord.cogs.run_config import RunConfig
+
+
+def _progress() -> StreamEvent:
+    return StreamEvent(message_type=MessageType.PROGRESS)
+
+
+def _usage(tokens: int) -> StreamEvent:
+    return StreamEvent(message_type=MessageType.STREAM_EVENT, input_tokens=tokens)
+
+
+def _text(text: str, *, partial: bool = False) -> StreamEvent:
+    return StreamEvent(message_type=MessageType.ASSISTANT, text=text, is_partial=partial)
+
+
+def _tool(tool_id: str) -> StreamEvent:
+    return StreamEvent(
+        message_type=MessageType.ASSISTANT,
+        tool_use=ToolUseEvent(
+            tool_id=tool_id, tool_name="Read", tool_input={}, category=ToolCategory.READ
+        ),
+    )
+
+
+def _result() -> StreamEvent:
+    return StreamEvent(message_type=MessageType.RESULT, is_complete=True, text="done")
+
+
+async def _drain(queue: CoalescingEventQueue) -> list[StreamEvent]:
+    queue.close()
+    out = []
+    while (event := await queue.get()) is not None:
+        out.append(event)
+    return out
+
+
+class TestCoalesceKey:
+    def test_kept_events_have_no_key(self) -> None:
+        for event in (_text("hi"), _tool("t1"), _result()):
+            assert coalesce_key(event) is None
+
+    def test_partial_text_carrying_a_tool_is_kept(self) -> None:
+        event = _tool("t1")
+        event.text = "also text"
+        event.is_partial = True
+        assert coalesce_key(event) is None
+
+    def test_rate_limits_coalesce_per_window(self) -> None:
+        def limit(kind: str) -> StreamEvent:
+            info = RateLimitInfo(
+                rate_limit_type=kind, status="allowed", utilization=0.1, resets_at=0
+            )
+            return StreamEvent(message_type=MessageType.RATE_LIMIT_EVENT, rate_limit_info=info)
+
+        assert coalesce_key(limit("five_hour")) != coalesce_key(limit("seven_day"))
+
+
+class TestQueue:
+    async def test_superseded_states_collapse_to_the_latest(self) -> None:
+        queue = CoalescingEventQueue()
+        for event in (_progress(), _usage(1), _progress(), _usage(2), _progress()):
+            await queue.put(event)
+
+        events = await _drain(queue)
+
+        assert [e.message_type for e in events] == [MessageType.STREAM_EVENT, MessageType.PROGRESS]
+        assert events[0].input_tokens == 2
+        assert queue.coalesced == 3
+
+    async def test_a_kept_event_is_never_jumped(self) -> None:
+        queue = CoalescingEventQueue()
+        await queue.put(_usage(1))
+        await queue.put(_text("block"))
+        await queue.put(_usage(2))
+
+        events = await _drain(queue)
+
+        assert [e.input_tokens for e in events] == [1, None, 2]
+
+    async def test_partial_text_snapshots_collapse(self) -> None:
+        queue = CoalescingEventQueue()
+        for text in ("H", "He", "Hel", "Hello"):
+            await queue.put(_text(text, partial=True))
+        await queue.put(_text("Hello"))
+
+        events = await _drain(queue)
+
+        assert [(e.text, e.is_partial) for e in events] == [("Hello", True), ("Hello", False)]
+
+    async def test_put_waits_when_full_of_kept_events(self) -> None:
+        queue = CoalescingEventQueue(maxsize=2)
+        await queue.put(_tool("a"))
+        await queue.put(_tool("b"))
+        blocked = asyncio.create_task(queue.put(_tool("c")))
+        await asyncio.sleep(0)
+        assert not blocked.done()
+
+        await queue.get()
+        await asyncio.wait_for(blocked, timeout=1)
+        assert len(queue) == 2
+
+    async def test_coalescing_needs_no_room(self) -> None:
+        queue = CoalescingEventQueue(maxsize=1)
+        await queue.put(_progress())
+        await asyncio.wait_for(queue.put(_progress()), timeout=1)
+        assert len(queue) == 1
+
+    async def test_get_returns_none_once_closed_and_drained(self) -> None:
+        queue = CoalescingEventQueue()
+        await queue.put(_result())
+        queue.close()
+        assert (await queue.get()) is not None
+        assert (await queue.get()) is None
+        with pytest.raises(RuntimeError):
+            await queue.put(_result())
+
+
+class _ThrottledSurface(MemorySurface):
+    """A surface whose first text post hangs until released, like a 429 backoff."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.release = asyncio.Event()
+
+    async def send_text(self, text: str) -> str | None:
+        await self.release.wait()
+        return await super().send_text(text)
+
+
+class TestRunHelperPipeline:
+    async def test_stdout_keeps_being_read_while_the_frontend_is_throttled(self) -> None:
+        surface = _ThrottledSurface()
+        produced: list[int] = []
+        all_read = asyncio.Event()
+
+        class _Runner:
+            model = "sonnet"
+            working_dir = None
+
+            async def run(self, prompt: str, session_id: str | None = None):
+                yield _text("first block")
+                for i in range(500):
+                    produced.append(i)
+                    yield _progress()
+                yield _text("second block")
+                all_read.set()
+                yield _result()
+
+            async def interrupt(self) -> None:
+                pass
+
+            def clone(self, **_kwargs: object) -> _Runner:
+                return self
+
+        run = asyncio.create_task(
+            run_claude_with_config(RunConfig(surface=surface, runner=_Runner(), prompt="go"))
+        )
+        # The renderer is stuck on the first post; the reader must not be.
+        await asyncio.wait_for(all_read.wait(), timeout=5)
+        assert len(produced) == 500
+
+        surface.release.set()
+        await asyncio.wait_for(run, timeout=5)
+
+        assert surface.conformance_sent_text[:2] == ["first block", "second block"]
+        assert surface.statuses.count(StatusKind.THINKING) < 500
+
+    async def test_runner_failure_still_reaches_the_error_path(self) -> None:
+        surface = MemorySurface()
+
+        class _Runner:
+            model = "sonnet"
+            working_dir = None
+
+            async def run(self, prompt: str, session_id: str | None = None):
+                yield _text("partial answer")
+                raise RuntimeError("boom")
+
+            async def interrupt(self) -> None:
+                pass
+
+        await run_claude_with_config(RunConfig(surface=surface, runner=_Runner(), prompt="go"))
+
+        assert surface.conformance_sent_text == ["partial answer"]
+        assert any("RuntimeError: boom" in (n.body or "") for n in surface.notices)
@@ -17,6 +17,7 @@ the properties that make that class of bug impossible:
 
 from __future__ import annotations
 
+import asyncio
 import os
 import tempfile
 from datetime import datetime, timedelta
@@ -231,3 +232,36 @@ async def _all_rows(repo: NotificationRepository) -> list[dict]:
         db.row_factory = aiosqlite.Row
         cursor = await db.execute("SELECT * FROM scheduled_notifications ORDER BY id")
         return [dict(row) for row in await cursor.fetchall()]
+
+
+class TestTiming:
+    async def test_next_due_is_the_earliest_pending_row(self, repo: NotificationRepository) -> None:
+        cog = NotificationDispatchCog(MagicMock(), repo=repo, default_channel_id=1)
+        assert await cog._next_due() is None
+
+        due = _ahead(minutes=5)
+        await repo.create("later", _ahead(hours=1))
+        await repo.create("sooner", due)
+
+        assert await cog._next_due() == datetime.fromisoformat(due).timestamp()
+
+    async def test_a_scheduled_row_is_delivered_when_due_not_on_a_poll(
+        self, repo: NotificationRepository
+    ) -> None:
+        channel = _messageable()
+        bot = _bot_with_channel(channel)
+        bot.wait_until_ready = AsyncMock()
+        cog = NotificationDispatchCog(bot, repo=repo, default_channel_id=1)
+        await cog.cog_load()
+        try:
+            await asyncio.sleep(0.01)
+            await repo.create("now", _ago(seconds=1))
+            for _ in range(200):
+                if channel.send.await_count:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            cog.cog_unload()
+
+        channel.send.assert_awaited_once()
+        assert (await repo.get_pending()) == []
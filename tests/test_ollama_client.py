@@ -10,13 +10,19 @@ exists to make visible.
 
 from __future__ import annotations
 
+import asyncio
+import json
+
 import pytest
+from aiohttp import web
 
 from claude_code_core import ollama_client
 from claude_code_core.ollama_client import (
     ModelDetail,
+    OllamaClient,
     OllamaError,
     OllamaModel,
+    PullProgress,
     RunningModel,
     _extract_max_context,
     delete_model,
@@ -32,11 +38,11 @@ from claude_code_core.ollama_client import (
 
 @pytest.fixture
 def capture_requests(monkeypatch):
-    """Replace the blocking transport, recording calls and replaying answers."""
+    """Replace the transport, recording calls and replaying answers."""
     calls: list[dict] = []
     replies: dict[str, object] = {}
 
-    def fake(url, *, method="GET", payload=None, timeout_seconds=0.0):
+    async def fake(url, *, method="GET", payload=None, timeout_seconds=0.0):
         calls.append({"url": url, "method": method, "payload": payload, "timeout": timeout_seconds})
         for suffix, reply in replies.items():
             if url.endswith(suffix):
@@ -45,7 +51,7 @@ def capture_requests(monkeypatch):
                 return reply
         raise AssertionError(f"no stubbed reply for {url}")
 
-    monkeypatch.setattr(ollama_client, "_request_sync", fake)
+    monkeypatch.setattr(ollama_client, "_send", fake)
     return calls, replies
 
 
@@ -263,3 +269,165 @@ class TestRecords:
     def test_model_payload_falls_back_to_the_model_key(self):
         parsed = OllamaModel.from_payload({"model": "x:1b", "size": 10})
         assert parsed.name == "x:1b"
+
+
+async def _serve(routes: dict[str, object]) -> tuple[web.AppRunner, str]:
+    app = web.Application()
+    for path, handler in routes.items():
+        app.router.add_route("*", path, handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]  # type: ignore[union-attr]
+    return runner, f"http://127.0.0.1:{port}/v1"
+
+
+@pytest.fixture
+async def client():
+    shared = OllamaClient(max_per_endpoint=2)
+    yield shared
+    await shared.close()
+
+
+class TestOllamaClient:
+    async def test_consecutive_requests_reuse_one_connection(self, client):
+        ports: list[int] = []
+
+        async def tags(request: web.Request) -> web.Response:
+            ports.append(request.transport.get_extra_info("peername")[1])
+            return web.json_response({"models": []})
+
+        server, base = await _serve({"/api/tags": tags})
+        try:
+            for _ in range(3):
+                await client.request(ollama_api_url(base, "/api/tags"))
+        finally:
+            await server.cleanup()
+
+        assert len(ports) == 3
+        assert len(set(ports)) == 1
+        assert client.http.stats.sessions_opened == 1
+
+    async def test_in_flight_requests_are_bounded_per_endpoint(self, client):
+        active = peak = 0
+
+        async def show(_request: web.Request) -> web.Response:
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.02)
+            active -= 1
+            return web.json_response({})
+
+        server, base = await _serve({"/api/show": show})
+        try:
+            url = ollama_api_url(base, "/api/show")
+            await asyncio.gather(
+                *(client.request(url, method="POST", payload={}) for _ in range(6))
+            )
+        finally:
+            await server.cleanup()
+
+        assert peak == 2
+
+    async def test_http_errors_and_unreachable_servers_are_ollama_errors(self, client):
+        async def missing(_request: web.Request) -> web.Response:
+            return web.Response(status=404, text="model 'x' not found")
+
+        server, base = await _serve({"/api/show": missing})
+        try:
+            with pytest.raises(OllamaError, match="HTTP 404: model 'x' not found"):
+                await client.request(ollama_api_url(base, "/api/show"), method="POST")
+        finally:
+            await server.cleanup()
+
+        with pytest.raises(OllamaError, match="Could not reach"):
+            await client.request(ollama_api_url(base, "/api/tags"), timeout_seconds=2)
+
+    async def test_an_error_in_the_callers_block_is_not_a_transport_error(self, client):
+        async def tags(_request: web.Request) -> web.Response:
+            return web.json_response({"models": []})
+
+        server, base = await _serve({"/api/tags": tags})
+        try:
+            with pytest.raises(OSError, match="disk full"):
+                async with client._open(
+                    ollama_api_url(base, "/api/tags"),
+                    method="GET",
+                    payload=None,
+                    timeout_seconds=2,
+                ):
+                    raise OSError("disk full")
+        finally:
+            await server.cleanup()
+
+    async def test_streamed_pull_reports_progress(self, client, monkeypatch):
+        lines = [
+            {"status": "pulling manifest"},
+            {"status": "downloading", "completed": 50, "total": 200},
+            {"status": "downloading", "completed": 200, "total": 200},
+            {"status": "success"},
+        ]
+        body = b"".join(json.dumps(line).encode() + b"\n" for line in lines)
+        requests: list[dict] = []
+
+        async def pull(request: web.Request) -> web.StreamResponse:
+            requests.append(await request.json())
+            response = web.StreamResponse()
+            await response.prepare(request)
+            for i in range(0, len(body), 7):  # frames split mid-line
+                await response.write(body[i : i + 7])
+            return response
+
+        monkeypatch.setattr(ollama_client, "_shared", client)
+        seen: list[PullProgress] = []
+        server, base = await _serve({"/api/pull": pull})
+        try:
+            await pull_model(base, "gpt-oss:20b", on_progress=seen.append)
+        finally:
+            await server.cleanup()
+
+        assert requests == [{"model": "gpt-oss:20b", "stream": True}]
+        assert [p.percent for p in seen] == [None, 25, 100, None]
+        assert seen[-1].status == "success"
+
+    async def test_an_error_line_mid_stream_fails_the_pull(self, client, monkeypatch):
+        async def pull(request: web.Request) -> web.StreamResponse:
+            response = web.StreamResponse()
+            await response.prepare(request)
+            await response.write(b'{"status": "pulling manifest"}\n')
+            await response.write(b'{"error": "pull model manifest: file does not exist"}\n')
+            return response
+
+        monkeypatch.setattr(ollama_client, "_shared", client)
+        server, base = await _serve({"/api/pull": pull})
+        try:
+            with pytest.raises(OllamaError, match="file does not exist"):
+                await pull_model(base, "nope:1b", on_progress=lambda _p: None)
+        finally:
+            await server.cleanup()
+
+    async def test_privacy_chat_goes_through_the_shared_client(self, client, monkeypatch):
+        from claude_code_core.privacy.local_llm import chat_json
+
+        bodies: list[dict] = []
+
+        async def chat(request: web.Request) -> web.Response:
+            bodies.append(await request.json())
+            return web.json_response({"message": {"role": "assistant", "content": '{"ok": 1}'}})
+
+        monkeypatch.setattr(ollama_client, "_shared", client)
+        server, base = await _serve({"/api/chat": chat})
+        origin = base.removesuffix("/v1")
+        try:
+            for _ in range(2):
+                raw = await chat_json(
+                    base_url=origin, model="m", system="s", user="u", timeout_seconds=5
+                )
+        finally:
+            await server.cleanup()
+
+        assert raw == '{"ok": 1}'
+        assert bodies[0]["think"] is False
+        assert client.http.stats.sessions_opened == 1
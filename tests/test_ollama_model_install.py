@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import json
 import tempfile
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock
@@ -25,20 +24,6 @@ from claude_discord.database.settings_repo import SettingsRepository
 MODEL = "qwen3.6:35b-a3b-mtp-q4_K_M"
 
 
-class _FakeResponse:
-    def __init__(self, body: dict[str, object]) -> None:
-        self._body = json.dumps(body).encode("utf-8")
-
-    def __enter__(self) -> _FakeResponse:
-        return self
-
-    def __exit__(self, *args: object) -> None:
-        return None
-
-    def read(self) -> bytes:
-        return self._body
-
-
 @pytest.fixture
 def local_config(tmp_path: Path) -> LocalModelConfig:
     return LocalModelConfig(
@@ -69,14 +54,14 @@ class TestOllamaPull:
     ) -> None:
         captured: dict[str, object] = {}
 
-        def _urlopen(request, *, timeout: float):
-            captured["url"] = request.full_url
-            captured["method"] = request.get_method()
-            captured["body"] = json.loads(request.data.decode("utf-8"))
-            captured["timeout"] = timeout
-            return _FakeResponse({"status": "success"})
+        async def _send(url: str, *, method: str, payload: dict, timeout_seconds: float):
+            captured["url"] = url
+            captured["method"] = method
+            captured["body"] = payload
+            captured["timeout"] = timeout_seconds
+            return {"status": "success"}
 
-        monkeypatch.setattr("claude_code_core.ollama_client.urllib_request.urlopen", _urlopen)
+        monkeypatch.setattr("claude_code_core.ollama_client._send", _send)
 
         await pull_ollama_model(MODEL, config=local_config)
 
@@ -89,10 +74,10 @@ class TestOllamaPull:
         local_config: LocalModelConfig,
         monkeypatch: pytest.MonkeyPatch,
     ) -> None:
-        def _urlopen(request, *, timeout: float):
-            return _FakeResponse({"status": "pulling manifest"})
+        async def _send(url: str, *, method: str, payload: dict, timeout_seconds: float):
+            return {"status": "pulling manifest"}
 
-        monkeypatch.setattr("claude_code_core.ollama_client.urllib_request.urlopen", _urlopen)
+        monkeypatch.setattr("claude_code_core.ollama_client._send", _send)
 
         with pytest.raises(RuntimeError, match="did not complete successfully"):
             await pull_ollama_model(MODEL, config=local_config)
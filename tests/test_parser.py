@@ -4,7 +4,7 @@ import json
 
 import pytest
 
-from claude_discord.claude.parser import parse_line
+from claude_discord.claude.parser import parse_line, parse_line_bytes
 from claude_discord.claude.types import MessageType, ToolCategory
 
 
@@ -446,6 +446,96 @@ class TestMessageDeltaUsage:
         assert event.output_tokens is None
 
 
+def _compact(obj: object) -> bytes:
+    """Serialise the way the CLI does (Node's JSON.stringify: no spaces)."""
+    return json.dumps(obj, separators=(",", ":")).encode() + b"\n"
+
+
+class TestParseLineBytes:
+    """The bytes fast path must drop only partials nobody consumes."""
+
+    def test_content_block_delta_is_skipped(self):
+        line = _compact(
+            {
+                "type": "stream_event",
+                "event": {
+                    "type": "content_block_delta",
+                    "delta": {"type": "thinking_delta", "thinking": "hmm"},
+                },
+            }
+        )
+        assert parse_line_bytes(line) is None
+
+    def test_message_delta_still_carries_usage(self):
+        line = _compact(
+            {
+                "type": "stream_event",
+                "event": {
+                    "type": "message_delta",
+                    "usage": {"input_tokens": 2, "output_tokens": 9},
+                },
+            }
+        )
+        event = parse_line_bytes(line)
+        assert event is not None
+        assert event.message_type == MessageType.STREAM_EVENT
+        assert event.output_tokens == 9
+
+    def test_marker_inside_text_does_not_defeat_the_skip(self):
+        """Quotes inside JSON strings are escaped, so quoted text never looks like the marker."""
+        line = _compact(
+            {
+                "type": "stream_event",
+                "event": {
+                    "type": "content_block_delta",
+                    "delta": {"type": "text_delta", "text": '"message_delta"'},
+                },
+            }
+        )
+        assert parse_line_bytes(line) is None
+
+    def test_marker_anywhere_else_falls_back_to_a_full_parse(self):
+        """An unexpected unescaped occurrence costs a parse, never an event."""
+        line = _compact(
+            {
+                "type": "stream_event",
+                "event": {"type": "content_block_delta", "message_delta": True},
+            }
+        )
+        event = parse_line_bytes(line)
+        assert event is not None
+        assert event.input_tokens is None
+
+    @pytest.mark.parametrize(
+        "obj",
+        [
+            {"type": "system", "subtype": "init", "session_id": "abc"},
+            {"type": "assistant", "message": {"content": [{"type": "text", "text": "héllo"}]}},
+            {"type": "result", "subtype": "success", "result": "done", "session_id": "abc"},
+            {"type": "stream_event", "event": {"type": "message_delta", "usage": {}}},
+        ],
+    )
+    def test_matches_str_path_for_everything_else(self, obj: dict):
+        line = _compact(obj)
+        assert parse_line_bytes(line) == parse_line(line.decode())
+
+    def test_spaced_json_is_parsed_in_full(self):
+        """Key order or spacing the prefix does not expect just loses the shortcut."""
+        line = json.dumps({"type": "stream_event", "event": {"type": "message_stop"}}).encode()
+        event = parse_line_bytes(line)
+        assert event is not None
+        assert event.message_type == MessageType.STREAM_EVENT
+
+    def test_invalid_utf8_is_tolerated(self):
+        event = parse_line_bytes(b'{"type":"result","subtype":"success","result":"\xff"}')
+        assert event is not None
+        assert event.is_complete
+
+    def test_blank_and_garbage_lines(self):
+        assert parse_line_bytes(b"  \n") is None
+        assert parse_line_bytes(b"not json\n") is None
+
+
 class TestRedactedThinking:
     def test_redacted_thinking_sets_flag(self):
         line = (
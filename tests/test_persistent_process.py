@@ -0,0 +1,198 @@
+"""Tests for keeping a thread's CLI process alive between turns.
+
+The runner tests drive a tiny stand-in CLI: a Python script that, like
+``claude -p --input-format stream-json``, answers every stdin line with an init
+event and a ``result`` and then waits for the next line. That is the behaviour
+keep-alive relies on, so it is what the tests reproduce — with real processes,
+because "the second turn ran in the same pid" is the whole point.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import stat
+import sys
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import discord
+import pytest
+
+from claude_code_core.persistent_process import PersistentProcessRegistry, process_signature
+from claude_code_core.types import MessageType
+from claude_discord.claude.runner import ClaudeRunner
+from claude_discord.cogs.claude_chat import ClaudeChatCog
+
+_SESSION = "0123abcd-0000-4000-8000-000000000001"
+
+_FAKE_CLI = f"""#!{sys.executable}
+import json, os, sys
+for turn, line in enumerate(sys.stdin, start=1):
+    text = json.loads(line)["message"]["content"][-1]["text"]
+    for event in (
+        {{"type": "system", "subtype": "init", "session_id": "{_SESSION}"}},
+        {{
+            "type": "result",
+            "subtype": "success",
+            "session_id": "{_SESSION}",
+            "result": f"{{os.getpid()}}:{{turn}}:{{text}}",
+        }},
+    ):
+        print(json.dumps(event), flush=True)
+"""
+
+
+@pytest.fixture
+def fake_cli(tmp_path: Path) -> str:
+    script = tmp_path / "fake-claude"
+    script.write_text(_FAKE_CLI)
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    return str(script)
+
+
+async def _result(runner: ClaudeRunner, prompt: str, session_id: str | None) -> str:
+    results = [
+        event.text
+        async for event in runner.run(prompt, session_id=session_id)
+        if event.message_type == MessageType.RESULT
+    ]
+    assert len(results) == 1
+    return results[0] or ""
+
+
+def _runner(command: str, registry: PersistentProcessRegistry, **kwargs: object) -> ClaudeRunner:
+    return ClaudeRunner(command=command, thread_id=42, persistent_processes=registry, **kwargs)  # type: ignore[arg-type]
+
+
+class TestRunnerKeepAlive:
+    async def test_second_turn_reuses_the_same_process(self, fake_cli: str) -> None:
+        registry = PersistentProcessRegistry()
+        try:
+            first = await _result(_runner(fake_cli, registry), "hello", None)
+            assert registry.is_parked(42)
+
+            second = await _result(_runner(fake_cli, registry), "again", _SESSION)
+            pid1, turn1, _ = first.split(":")
+            pid2, turn2, text = second.split(":")
+            assert pid2 == pid1
+            assert (turn1, turn2, text) == ("1", "2", "again")
+            assert registry.stats.reused == 1
+        finally:
+            await registry.close()
+
+    async def test_changed_model_spawns_fresh_and_stops_the_parked_one(self, fake_cli: str) -> None:
+        registry = PersistentProcessRegistry()
+        try:
+            first = await _result(_runner(fake_cli, registry), "hello", None)
+            parked = registry._parked[42].process
+
+            second = await _result(_runner(fake_cli, registry, model="opus"), "hi", _SESSION)
+            assert second.split(":")[0] != first.split(":")[0]
+            assert registry.stats.mismatched == 1
+            await asyncio.wait_for(parked.wait(), timeout=5)
+        finally:
+            await registry.close()
+
+    async def test_fork_never_claims(self, fake_cli: str) -> None:
+        registry = PersistentProcessRegistry()
+        try:
+            first = await _result(_runner(fake_cli, registry), "hello", None)
+            forked = await _result(
+                _runner(fake_cli, registry, fork_session=True), "branch", _SESSION
+            )
+            assert forked.split(":")[0] != first.split(":")[0]
+        finally:
+            await registry.close()
+
+    async def test_parked_runner_lets_go_of_its_process(self, fake_cli: str) -> None:
+        """A stale Stop button on the finished turn must not kill the next turn's process."""
+        registry = PersistentProcessRegistry()
+        runner = _runner(fake_cli, registry)
+        try:
+            await _result(runner, "hello", None)
+            await runner.interrupt()
+            assert registry._parked[42].process.returncode is None
+        finally:
+            await registry.close()
+
+    async def test_without_registry_process_is_killed(self, fake_cli: str) -> None:
+        runner = ClaudeRunner(command=fake_cli, thread_id=42)
+        await _result(runner, "hello", None)
+        assert runner._process is not None
+        assert runner._process.returncode is not None
+
+
+class TestRegistry:
+    async def _spawn(self) -> asyncio.subprocess.Process:
+        return await asyncio.create_subprocess_exec(
+            sys.executable,
+            "-c",
+            "import sys; sys.stdin.read()",
+            stdin=asyncio.subprocess.PIPE,
+        )
+
+    async def test_idle_process_is_reaped(self) -> None:
+        registry = PersistentProcessRegistry(idle_seconds=0.05)
+        process = await self._spawn()
+        sig = process_signature(["claude"], os.getcwd(), {})
+        assert registry.park(1, process, session_id=_SESSION, signature=sig)
+
+        await asyncio.wait_for(process.wait(), timeout=5)
+        assert not registry.is_parked(1)
+        assert registry.stats.reaped == 1
+        await registry.close()
+
+    async def test_cap_evicts_the_longest_idle(self) -> None:
+        registry = PersistentProcessRegistry(max_processes=1)
+        sig = process_signature(["claude"], os.getcwd(), {})
+        older, newer = await self._spawn(), await self._spawn()
+        registry.park(1, older, session_id=_SESSION, signature=sig)
+        registry.park(2, newer, session_id=_SESSION, signature=sig)
+
+        await asyncio.wait_for(older.wait(), timeout=5)
+        assert not registry.is_parked(1)
+        assert registry.is_parked(2)
+        await registry.close()
+        assert newer.returncode is not None
+
+    async def test_other_session_is_a_mismatch(self) -> None:
+        registry = PersistentProcessRegistry()
+        sig = process_signature(["claude"], os.getcwd(), {})
+        process = await self._spawn()
+        registry.park(1, process, session_id=_SESSION, signature=sig)
+
+        assert registry.claim(1, session_id="ffff", signature=sig) is None
+        await asyncio.wait_for(process.wait(), timeout=5)
+        await registry.close()
+
+    async def test_closed_registry_refuses_to_park(self) -> None:
+        registry = PersistentProcessRegistry()
+        await registry.close()
+        process = await self._spawn()
+        sig = process_signature(["claude"], os.getcwd(), {})
+        assert not registry.park(1, process, session_id=_SESSION, signature=sig)
+        process.kill()
+        await process.wait()
+
+
+class TestCogRelease:
+    async def test_clear_releases_the_kept_process(self) -> None:
+        registry = PersistentProcessRegistry()
+        registry.release = AsyncMock()  # type: ignore[method-assign]
+        factory = MagicMock()
+        factory.persistent_processes = registry
+        cog = ClaudeChatCog(
+            bot=MagicMock(),
+            repo=MagicMock(delete=AsyncMock(return_value=True)),
+            runner=MagicMock(),
+            factory=factory,
+        )
+        interaction = MagicMock()
+        interaction.channel = MagicMock(spec=discord.Thread)
+        interaction.channel.id = 7
+        interaction.response.send_message = AsyncMock()
+
+        await ClaudeChatCog.clear_session.callback(cog, interaction)
+
+        registry.release.assert_awaited_once_with(7)
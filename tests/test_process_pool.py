@@ -0,0 +1,212 @@
+"""Tests for the warm pool of pre-spawned CLI processes.
+
+The pool is exercised against real subprocesses — a Python child that blocks on
+stdin stands in for a CLI waiting for its first stream-json message — because
+the things worth checking (a dead process is not handed out, a reaped process
+really exits) are about process lifecycles a mock would only pretend to have.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from claude_code_core.process_pool import WarmProcessPool
+from claude_discord.backend_factory import BackendFactory
+from claude_discord.claude.runner import ClaudeRunner
+
+_WAIT_FOR_STDIN = [sys.executable, "-c", "import sys; sys.stdin.readline()"]
+
+
+async def _wait_for_idle(pool: WarmProcessPool, count: int) -> None:
+    for _ in range(200):
+        if pool.idle_count == count and not pool._pending:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"pool never reached {count} idle process(es)")
+
+
+class TestAcquire:
+    async def test_miss_when_nothing_is_warm(self) -> None:
+        pool = WarmProcessPool()
+        assert await pool.acquire(_WAIT_FOR_STDIN, cwd=os.getcwd(), env={}) is None
+        assert pool.stats.misses == 1
+        assert pool.stats.hit_rate == 0.0
+
+    async def test_replenished_process_is_handed_out_once(self) -> None:
+        pool = WarmProcessPool()
+        env = dict(os.environ)
+        pool.replenish(_WAIT_FOR_STDIN, cwd=os.getcwd(), env=env)
+        await _wait_for_idle(pool, 1)
+
+        process = await pool.acquire(_WAIT_FOR_STDIN, cwd=os.getcwd(), env=env)
+        try:
+            assert process is not None
+            assert process.returncode is None
+            assert pool.stats.hits == 1
+            assert await pool.acquire(_WAIT_FOR_STDIN, cwd=os.getcwd(), env=env) is None
+        finally:
+            assert process is not None
+            process.kill()
+            await process.wait()
+            await pool.close()
+
+    async def test_different_env_is_a_miss(self) -> None:
+        """Another thread's warm process must never serve this one."""
+        pool = WarmProcessPool()
+        env = dict(os.environ, DISCORD_THREAD_ID="1")
+        pool.replenish(_WAIT_FOR_STDIN, cwd=os.getcwd(), env=env)
+        await _wait_for_idle(pool, 1)
+        try:
+            other = dict(os.environ, DISCORD_THREAD_ID="2")
+            assert await pool.acquire(_WAIT_FOR_STDIN, cwd=os.getcwd(), env=other) is None
+            assert pool.idle_count == 1
+        finally:
+            await pool.close()
+
+    async def test_dead_process_is_not_handed_out(self) -> None:
+        pool = WarmProcessPool()
+        args = [sys.executable, "-c", "pass"]
+        env = dict(os.environ)
+        pool.replenish(args, cwd=os.getcwd(), env=env)
+        await _wait_for_idle(pool, 1)
+        await next(iter(pool._idle.values())).process.wait()
+
+        assert await pool.acquire(args, cwd=os.getcwd(), env=env) is None
+        assert pool.stats.expired == 1
+        assert pool.stats.misses == 1
+
+
+class TestLimits:
+    async def test_oldest_is_evicted_at_capacity(self) -> None:
+        pool = WarmProcessPool(max_size=1)
+        env = dict(os.environ)
+        first = [*_WAIT_FOR_STDIN, "first"]
+        second = [*_WAIT_FOR_STDIN, "second"]
+        pool.replenish(first, cwd=os.getcwd(), env=env)
+        await _wait_for_idle(pool, 1)
+        evicted = next(iter(pool._idle.values())).process
+
+        pool.replenish(second, cwd=os.getcwd(), env=env)
+        for _ in range(200):
+            if pool.stats.spawned == 2:
+                break
+            await asyncio.sleep(0.01)
+        try:
+            assert pool.idle_count == 1
+            assert pool.stats.evicted == 1
+            assert evicted.returncode is not None
+            assert await pool.acquire(first, cwd=os.getcwd(), env=env) is None
+        finally:
+            await pool.close()
+
+    async def test_idle_process_is_reaped_after_ttl(self) -> None:
+        pool = WarmProcessPool(ttl_seconds=0.05)
+        env = dict(os.environ)
+        pool.replenish(_WAIT_FOR_STDIN, cwd=os.getcwd(), env=env)
+        await _wait_for_idle(pool, 1)
+        process = next(iter(pool._idle.values())).process
+
+        await asyncio.wait_for(process.wait(), timeout=5)
+        assert pool.idle_count == 0
+        assert pool.stats.expired == 1
+        await pool.close()
+
+    async def test_a_per_process_ttl_overrides_the_pools(self) -> None:
+        pool = WarmProcessPool(ttl_seconds=600)
+        env = dict(os.environ)
+        assert pool.replenish(_WAIT_FOR_STDIN, cwd=os.getcwd(), env=env, ttl_seconds=0.05)
+        await _wait_for_idle(pool, 1)
+        process = next(iter(pool._idle.values())).process
+
+        await asyncio.wait_for(process.wait(), timeout=5)
+        assert pool.stats.expired == 1
+        await pool.close()
+
+    async def test_replenish_does_not_duplicate_a_key(self) -> None:
+        pool = WarmProcessPool(max_size=4)
+        env = dict(os.environ)
+        pool.replenish(_WAIT_FOR_STDIN, cwd=os.getcwd(), env=env)
+        pool.replenish(_WAIT_FOR_STDIN, cwd=os.getcwd(), env=env)
+        await _wait_for_idle(pool, 1)
+        assert pool.stats.spawned == 1
+        await pool.close()
+
+    def test_rejects_nonsense_limits(self) -> None:
+        with pytest.raises(ValueError):
+            WarmProcessPool(max_size=0)
+        with pytest.raises(ValueError):
+            WarmProcessPool(ttl_seconds=0)
+
+
+class TestRunnerIntegration:
+    async def test_runner_uses_a_warm_process_instead_of_spawning(self) -> None:
+        pool = MagicMock(spec=WarmProcessPool)
+        warm = MagicMock()
+        warm.pid = 4242
+        warm.returncode = 0
+        warm.stdin = None
+        pool.acquire = AsyncMock(return_value=warm)
+        runner = ClaudeRunner(process_pool=pool)
+
+        async def _no_events():
+            return
+            yield
+
+        with (
+            patch("asyncio.create_subprocess_exec") as spawn,
+            patch.object(runner, "_read_stream", _no_events),
+            patch.object(runner, "_cleanup", new_callable=AsyncMock),
+        ):
+            _ = [event async for event in runner.run("hi")]
+
+        spawn.assert_not_called()
+        assert runner._process is warm
+
+    async def test_next_turn_is_prewarmed_as_a_resume_of_the_seen_session(self) -> None:
+        pool = MagicMock(spec=WarmProcessPool)
+        pool.acquire = AsyncMock(return_value=None)
+        runner = ClaudeRunner(process_pool=pool, fork_session=True)
+        process = MagicMock()
+        process.stdin = None
+
+        async def _one_event():
+            from claude_code_core.types import MessageType, StreamEvent
+
+            yield StreamEvent(message_type=MessageType.SYSTEM, session_id="abc-123")
+
+        with (
+            patch("asyncio.create_subprocess_exec", AsyncMock(return_value=process)),
+            patch.object(runner, "_read_stream", _one_event),
+            patch.object(runner, "_cleanup", new_callable=AsyncMock),
+        ):
+            _ = [event async for event in runner.run("hi")]
+
+        args = pool.replenish.call_args.args[0]
+        assert args[args.index("--resume") + 1] == "abc-123"
+        assert "--fork-session" not in args
+
+    def test_clone_shares_the_pool(self) -> None:
+        pool = WarmProcessPool()
+        assert ClaudeRunner(process_pool=pool).clone().process_pool is pool
+
+    def test_factory_passes_the_pool_to_claude_only(self) -> None:
+        pool = WarmProcessPool()
+        factory = BackendFactory(
+            claude_command="claude",
+            codex_command="codex",
+            permission_mode="default",
+            working_dir=None,
+            timeout_seconds=60,
+            dangerously_skip_permissions=False,
+            allowed_tools=None,
+            append_system_prompt=None,
+            effort=None,
+            process_pool=pool,
+        )
+        assert factory.build(backend="claude").process_pool is pool  # type: ignore[attr-defined]
+        assert not hasattr(factory.build(backend="codex"), "process_pool")
@@ -0,0 +1,119 @@
+"""Tests for rate-limit-driven pacing (claude_code_core.rate_limit_pacer)."""
+
+from __future__ import annotations
+
+import pytest
+
+from claude_code_core.rate_limit_pacer import RateLimitPacer
+from claude_code_core.session_scheduler import SessionPriority, SessionScheduler
+from claude_code_core.types import RateLimitInfo
+
+NOW = 1_000_000.0
+
+
+def _info(
+    utilization: float,
+    *,
+    status: str = "allowed",
+    kind: str = "five_hour",
+    resets_in: float = 3600,
+    overage: bool = False,
+) -> RateLimitInfo:
+    return RateLimitInfo(
+        rate_limit_type=kind,
+        status=status,
+        utilization=utilization,
+        resets_at=int(NOW + resets_in),
+        is_using_overage=overage,
+    )
+
+
+def _pacer(max_concurrent: int = 4, clock=lambda: NOW) -> tuple[RateLimitPacer, SessionScheduler]:
+    scheduler = SessionScheduler(max_concurrent)
+    return RateLimitPacer(scheduler, clock=clock), scheduler
+
+
+class TestPacing:
+    def test_the_limit_narrows_as_utilization_rises(self) -> None:
+        pacer, scheduler = _pacer()
+
+        pacer.observe(_info(0.5))
+        assert (scheduler.limit, scheduler.background_held) == (4, False)
+        pacer.observe(_info(0.8))
+        assert (scheduler.limit, scheduler.background_held) == (2, False)
+        pacer.observe(_info(0.92))
+        assert (scheduler.limit, scheduler.background_held) == (1, True)
+        assert pacer.held_until == int(NOW + 3600)
+
+    def test_the_most_used_live_window_decides(self) -> None:
+        pacer, scheduler = _pacer()
+
+        pacer.observe(_info(0.2, kind="five_hour"))
+        pacer.observe(_info(0.0, status="rejected", kind="seven_day"))
+        assert scheduler.background_held
+        pacer.observe(_info(0.95, kind="seven_day_opus", resets_in=-10))
+        assert pacer.held_until == int(NOW + 3600)
+
+    def test_a_warning_status_slows_without_a_utilization(self) -> None:
+        pacer, scheduler = _pacer()
+        pacer.observe(_info(0.0, status="allowed_warning"))
+        assert scheduler.limit == 2
+
+    def test_background_is_held_but_a_reply_still_runs(self) -> None:
+        pacer, scheduler = _pacer()
+        pacer.observe(_info(0.95))
+
+        job = scheduler.enqueue(priority=SessionPriority.SCHEDULED)
+        reply = scheduler.enqueue(priority=SessionPriority.INTERACTIVE)
+
+        assert (job.admitted, reply.admitted) == (False, True)
+        assert pacer.stats.held == 1
+
+    def test_model_and_overage_windows_do_not_pace(self) -> None:
+        pacer, scheduler = _pacer()
+
+        pacer.observe(_info(0.99, kind="seven_day_sonnet"))
+        pacer.observe(_info(1.0, status="rejected", overage=True))
+
+        assert (scheduler.limit, scheduler.background_held) == (4, False)
+
+    def test_a_window_resetting_days_out_slows_but_never_holds(self) -> None:
+        pacer, scheduler = _pacer()
+        pacer.observe(_info(0.0, status="rejected", kind="seven_day", resets_in=3 * 86400))
+
+        job = scheduler.enqueue(priority=SessionPriority.SCHEDULED)
+
+        assert (scheduler.limit, scheduler.background_held) == (2, False)
+        assert job.admitted and pacer.held_until is None
+
+    def test_runs_off_the_quota_are_not_throttled(self) -> None:
+        pacer, scheduler = _pacer(max_concurrent=2)
+        pacer.observe(_info(0.95))
+        reply = scheduler.enqueue(priority=SessionPriority.INTERACTIVE)
+
+        job = scheduler.enqueue(priority=SessionPriority.SCHEDULED, paced=False)
+        paced = scheduler.enqueue(priority=SessionPriority.INTERACTIVE)
+
+        assert (reply.admitted, job.admitted, paced.admitted) == (True, True, False)
+        assert scheduler.wait_reason(paced) == "slots"
+
+    def test_rejects_inverted_thresholds(self) -> None:
+        with pytest.raises(ValueError):
+            RateLimitPacer(SessionScheduler(1), slow_at=0.9, hold_at=0.5)
+
+
+class TestRestore:
+    async def test_capacity_returns_when_the_window_resets(self) -> None:
+        now = [NOW]
+        pacer, scheduler = _pacer(clock=lambda: now[0])
+        pacer.observe(_info(0.95, resets_in=1))
+        job = scheduler.enqueue(priority=SessionPriority.TRIGGERED)
+
+        now[0] = NOW + 2
+        pacer.refresh()
+
+        assert (scheduler.limit, scheduler.background_held) == (4, False)
+        assert pacer.held_until is None
+        assert job.admitted
+        assert pacer.stats.restored == 1
+        pacer.close()
@@ -0,0 +1,107 @@
+"""Tests for the read-through cache (claude_code_core.read_cache) and its repositories."""
+
+from __future__ import annotations
+
+import pytest
+
+from claude_code_core.read_cache import MISSING, ReadCache
+from claude_code_core.sqlite_pool import SqlitePool
+from claude_discord.backend_settings import BackendSettings
+from claude_discord.database.models import init_db
+from claude_discord.database.repository import SessionRepository
+from claude_discord.database.settings_repo import SettingsRepository
+
+
+@pytest.fixture
+async def pool(tmp_path):
+    path = str(tmp_path / "sessions.db")
+    await init_db(path)
+    shared = SqlitePool(path, readers=2)
+    yield shared
+    await shared.close()
+
+
+class TestReadCache:
+    def test_least_recently_used_entry_is_evicted(self) -> None:
+        cache: ReadCache[str, int] = ReadCache(max_entries=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        assert cache.get("a") == 1  # "b" is now the oldest
+        cache.put("c", 3)
+
+        assert cache.get("b") is MISSING
+        assert (cache.get("a"), cache.get("c")) == (1, 3)
+        assert len(cache) == 2
+        assert cache.stats.evictions == 1
+        assert (cache.stats.hits, cache.stats.misses) == (3, 1)
+
+    def test_a_read_older_than_a_write_is_not_cached(self) -> None:
+        cache: ReadCache[str, str | None] = ReadCache()
+        version = cache.version
+        cache.invalidate("k")  # a write lands while the read is in flight
+
+        cache.fill("k", "stale", version)
+
+        assert cache.get("k") is MISSING
+
+    def test_absence_is_cached_distinctly_from_a_miss(self) -> None:
+        cache: ReadCache[str, str | None] = ReadCache()
+        cache.fill("k", None, cache.version)
+        assert cache.get("k") is None
+        assert cache.get("other") is MISSING
+
+
+class TestSettingsCache:
+    async def test_turn_setup_queries_only_once(self, pool: SqlitePool) -> None:
+        repo = SettingsRepository(pool.db_path, pool=pool, cache=ReadCache())
+        settings = BackendSettings(
+            repo, env_backend="claude", env_model_for_claude="sonnet", env_model_for_codex=""
+        )
+        await settings.set_backend("codex")
+
+        for _ in range(5):
+            assert await settings.current_backend(thread_id=42) == "codex"
+
+        # The global value was cached by the write; only the (absent) thread
+        # override is ever queried, and only once.
+        assert pool.stats.reads == 1
+        assert repo.cache is not None and repo.cache.stats.hits == 9
+
+    async def test_writes_update_the_cache(self, pool: SqlitePool) -> None:
+        repo = SettingsRepository(pool.db_path, pool=pool, cache=ReadCache())
+        assert await repo.get("mode", default="x") == "x"
+
+        await repo.set("mode", "fast")
+        assert await repo.get("mode") == "fast"
+        await repo.delete("mode")
+        assert await repo.get("mode", default="x") == "x"
+
+        assert pool.stats.reads == 1
+        assert await SettingsRepository(pool.db_path).get("mode") is None
+
+
+class TestSessionCache:
+    async def test_get_is_served_from_memory_until_a_write(self, pool: SqlitePool) -> None:
+        repo = SessionRepository(pool.db_path, pool=pool, cache=ReadCache())
+        await repo.save(thread_id=1, session_id="s-1")
+        reads = pool.stats.reads
+
+        first = await repo.get(1)
+        await repo.update_context_stats(1, context_window=200_000, context_used=1_000)
+        second = await repo.get(1)
+
+        assert pool.stats.reads == reads
+        assert first is not None and first.session_id == "s-1"
+        assert second is not None and second.context_used == 1_000
+        assert await SessionRepository(pool.db_path).get(1) == second
+
+    async def test_delete_and_cleanup_drop_cached_records(self, pool: SqlitePool) -> None:
+        repo = SessionRepository(pool.db_path, pool=pool, cache=ReadCache())
+        await repo.save(thread_id=1, session_id="s-1")
+        await repo.save(thread_id=2, session_id="s-2")
+
+        await repo.delete(1)
+        assert await repo.get(1) is None
+
+        await repo.cleanup_old(days=0)
+        assert await repo.get(2) is None
@@ -0,0 +1,246 @@
+"""Tests for the remote execution agent, against a loopback agent on 127.0.0.1."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from collections.abc import AsyncGenerator
+
+import pytest
+
+from claude_code_core.privacy import reset_gateway_cache
+from claude_code_core.privacy.backend import AnonymizingBackend
+from claude_code_core.remote_agent import (
+    RemoteAgent,
+    RemoteBackend,
+    RemoteEndpoint,
+    parse_endpoints,
+)
+from claude_code_core.types import MessageType, StreamEvent
+from claude_discord.backend_factory import BackendFactory
+
+TOKEN = "t0ken"
+
+
+class FakeRunner:
+    """A backend that echoes the prompt; ``wait`` blocks until interrupted."""
+
+    built: list[FakeRunner] = []
+    prompts: list[str] = []
+
+    def __init__(self, **spec: object) -> None:
+        self.spec = spec
+        self.command = "claude"
+        self.model = spec.get("model", "sonnet")
+        self.working_dir = spec.get("working_dir")
+        self.permission_mode = "acceptEdits"
+        self.images = None
+        self.api_port = spec.get("api_port")
+        self.timeout_seconds = 300
+        self.dangerously_skip_permissions = False
+        self.allowed_tools = None
+        self.stop = asyncio.Event()
+        self.tool_results: list[tuple[str, dict]] = []
+        FakeRunner.built.append(self)
+
+    async def run(
+        self, prompt: str, session_id: str | None = None
+    ) -> AsyncGenerator[StreamEvent, None]:
+        FakeRunner.prompts.append(prompt)
+        yield StreamEvent(message_type=MessageType.ASSISTANT, text=f"echo: {prompt}")
+        if prompt == "wait":
+            await self.stop.wait()
+        yield StreamEvent(message_type=MessageType.RESULT, is_complete=True, session_id="s-9")
+
+    def clone(self, **kwargs: object) -> FakeRunner:
+        return FakeRunner(**{**self.spec, **kwargs})
+
+    async def interrupt(self) -> None:
+        self.stop.set()
+
+    async def kill(self) -> None:
+        self.stop.set()
+
+    async def inject_tool_result(self, request_id: str, data: dict) -> None:
+        self.tool_results.append((request_id, data))
+
+    def _build_env(self) -> dict[str, str]:
+        return {}
+
+    def describe_api(self) -> str:
+        return ""
+
+
+def _build(*, backend: str, **spec: object) -> FakeRunner:
+    return FakeRunner(backend=backend, **spec)
+
+
+@pytest.fixture
+async def agent():
+    FakeRunner.built.clear()
+    FakeRunner.prompts.clear()
+    remote = RemoteAgent(TOKEN, max_turns=1, build=_build)
+    server = await remote.serve("tcp://127.0.0.1:0")
+    port = server.sockets[0].getsockname()[1]
+    remote.address = f"tcp://127.0.0.1:{port}"  # type: ignore[attr-defined]
+    yield remote
+    server.close()
+    await server.wait_closed()
+
+
+def _backend(agent: RemoteAgent, *, token: str = TOKEN) -> RemoteBackend:
+    endpoint = RemoteEndpoint("build1", agent.address, token)  # type: ignore[attr-defined]
+    return RemoteBackend(FakeRunner(api_port=8099), endpoint, backend="claude")
+
+
+async def _collect(gen: AsyncGenerator[StreamEvent, None]) -> list[StreamEvent]:
+    return [event async for event in gen]
+
+
+class TestParseEndpoints:
+    def test_parses_named_addresses(self) -> None:
+        endpoints = parse_endpoints(
+            "build1=tls://10.0.0.5:8765, build2=unix:///run/ccdb.sock", token="x"
+        )
+        assert endpoints["build1"].address == "tls://10.0.0.5:8765"
+        assert endpoints["build2"].address == "unix:///run/ccdb.sock"
+        assert endpoints["build2"].token == "x"
+
+    @pytest.mark.parametrize("raw", ["build1", "build1=http://host:1", "=tcp://h:1"])
+    def test_rejects_malformed_entries(self, raw: str) -> None:
+        with pytest.raises(ValueError):
+            parse_endpoints(raw, token="x")
+
+
+class TestRemoteTurns:
+    async def test_turn_runs_on_the_agent(self, agent: RemoteAgent) -> None:
+        backend = _backend(agent)
+        backend.working_dir = "/srv/repo"
+
+        events = await _collect(backend.run("hello", "sess-1"))
+
+        assert [e.text for e in events if e.text] == ["echo: hello"]
+        assert events[-1].is_complete and events[-1].session_id == "s-9"
+        remote = FakeRunner.built[-1]
+        assert remote.working_dir == "/srv/repo"
+        # The bot's loopback API is not reachable from another host.
+        assert "api_port" not in remote.spec
+        assert agent.stats.accepted == 1 and agent.stats.turns == 1
+
+    async def test_the_agent_chooses_what_runs_on_its_host(self, agent: RemoteAgent) -> None:
+        agent.commands["claude"] = "/opt/claude/bin/claude"
+        backend = _backend(agent)
+        backend.command = "/tmp/evil"
+        backend.permission_mode = "bypassPermissions"
+        backend.dangerously_skip_permissions = True
+
+        await _collect(backend.run("hello"))
+
+        spec = FakeRunner.built[-1].spec
+        assert spec["command"] == "/opt/claude/bin/claude"
+        assert spec["dangerously_skip_permissions"] is False
+        assert "permission_mode" not in spec
+
+    async def test_a_backend_the_agent_does_not_offer_is_refused(self, agent: RemoteAgent) -> None:
+        del agent.commands["codex"]
+        endpoint = RemoteEndpoint("build1", agent.address, TOKEN)  # type: ignore[attr-defined]
+
+        events = await _collect(RemoteBackend(FakeRunner(), endpoint, backend="codex").run("hi"))
+
+        assert events[-1].error and "does not offer" in events[-1].error
+
+    async def test_bad_token_is_refused(self, agent: RemoteAgent) -> None:
+        events = await _collect(_backend(agent, token="wrong").run("hello"))
+
+        assert len(events) == 1
+        assert events[0].error and "unauthorized" in events[0].error
+        assert agent.stats.rejected == 1
+        assert len(FakeRunner.built) == 1  # only the local config carrier
+
+    async def test_controls_reach_the_remote_runner(self, agent: RemoteAgent) -> None:
+        backend = _backend(agent)
+        gen = backend.run("wait")
+        assert (await anext(gen)).text == "echo: wait"
+
+        await backend.inject_tool_result("req-1", {"answer": 42})
+        await backend.interrupt()
+        rest = await _collect(gen)
+
+        assert rest[-1].is_complete
+        assert FakeRunner.built[-1].tool_results == [("req-1", {"answer": 42})]
+
+    async def test_agent_at_capacity_refuses_more_turns(self, agent: RemoteAgent) -> None:
+        first = _backend(agent).run("wait")
+        await anext(first)
+
+        events = await _collect(_backend(agent).run("hello"))
+
+        assert events[-1].error and "capacity" in events[-1].error
+        await FakeRunner.built[1].interrupt()
+        await _collect(first)
+
+    async def test_plain_tcp_is_refused_off_loopback(self) -> None:
+        with pytest.raises(ValueError, match="tls://"):
+            await RemoteAgent(TOKEN).serve("tcp://0.0.0.0:0")
+
+    async def test_unreachable_worker_is_an_error_event(self) -> None:
+        endpoint = RemoteEndpoint("gone", "tcp://127.0.0.1:1", TOKEN)
+        backend = RemoteBackend(FakeRunner(), endpoint, backend="claude")
+
+        events = await _collect(backend.run("hello"))
+
+        assert events[0].error and "gone" in events[0].error
+
+
+class TestFactoryPlacement:
+    def _factory(self) -> BackendFactory:
+        return BackendFactory(
+            claude_command="claude",
+            codex_command="codex",
+            permission_mode="acceptEdits",
+            working_dir=None,
+            timeout_seconds=300,
+            dangerously_skip_permissions=False,
+            allowed_tools=None,
+            append_system_prompt=None,
+            effort=None,
+            remote_workers=parse_endpoints("build1=tcp://10.0.0.5:8765", token="x"),
+        )
+
+    def test_named_worker_wraps_the_runner(self) -> None:
+        runner = self._factory().build(backend="claude", worker="build1")
+        assert isinstance(runner, RemoteBackend)
+        assert runner.endpoint.name == "build1"
+
+    async def test_the_prompt_leaves_the_bot_anonymized(
+        self, agent: RemoteAgent, tmp_path, monkeypatch
+    ) -> None:
+        rules = tmp_path / "rules.json"
+        rules.write_text(json.dumps({"terms": [{"value": "Contoso", "category": "org"}]}))
+        monkeypatch.setenv("CCDB_ANONYMIZE_RULES", str(rules))
+        monkeypatch.setenv("CCDB_ANONYMIZE_MAPPING", str(tmp_path / "map.json"))
+        monkeypatch.setenv("CCDB_ANONYMIZE_SCOPE", "all")
+        monkeypatch.setenv("CCDB_ANONYMIZE_POLICY", "off")
+        reset_gateway_cache()
+        factory = self._factory()
+        factory.remote_workers = {
+            "build1": RemoteEndpoint("build1", agent.address, TOKEN)  # type: ignore[attr-defined]
+        }
+        try:
+            runner = factory.build(backend="claude", worker="build1")
+            events = await _collect(runner.run("Ask Contoso"))
+        finally:
+            reset_gateway_cache()
+
+        assert isinstance(runner, AnonymizingBackend)
+        assert isinstance(runner.inner, RemoteBackend)
+        [sent] = FakeRunner.prompts
+        assert "Contoso" not in sent
+        assert FakeRunner.built[-1].spec["anonymize"] is False
+        # ...and the reply is restored on the way back.
+        assert [e.text for e in events if e.text] == ["echo: Ask Contoso"]
+
+    def test_unknown_or_no_worker_runs_locally(self) -> None:
+        factory = self._factory()
+        assert not isinstance(factory.build(backend="claude"), RemoteBackend)
+        assert not isinstance(factory.build(backend="claude", worker="gone"), RemoteBackend)
@@ -94,6 +94,44 @@ async def usage_repo(tmp_path):
     return UsageStatsRepository(db_path)
 
 
+class TestBatchLookups:
+    async def test_save_returns_the_stored_row(self, repo):
+        await repo.save(thread_id=7, session_id="s-1", working_dir="/a", summary="first")
+        record = await repo.save(thread_id=7, session_id="s-2")
+
+        # COALESCE kept the old values; the returned row shows them.
+        assert record.session_id == "s-2"
+        assert record.working_dir == "/a" and record.summary == "first"
+        assert record == await repo.get(7)
+
+    async def test_get_many_returns_only_existing_threads(self, repo):
+        for tid in (1, 2, 3):
+            await repo.save(thread_id=tid, session_id=f"s-{tid}")
+
+        records = await repo.get_many([3, 1, 99, 1])
+
+        assert sorted(records) == [1, 3]
+        assert records[3].session_id == "s-3"
+        assert await repo.get_many([]) == {}
+
+    async def test_get_by_session_ids_maps_each_id(self, repo):
+        await repo.save(thread_id=10, session_id="shared")
+        await repo.save(thread_id=5, session_id="shared")
+        await repo.save(thread_id=6, session_id="own")
+
+        records = await repo.get_by_session_ids(["shared", "own", "missing"])
+
+        assert set(records) == {"shared", "own"}
+        assert records["shared"].thread_id == (await repo.get_by_session_id("shared")).thread_id
+        assert records["own"].thread_id == 6
+
+    async def test_lookups_larger_than_one_statement(self, repo):
+        for tid in range(1, 1201):
+            await repo.save(thread_id=tid, session_id=f"s-{tid}")
+
+        assert len(await repo.get_many(range(1, 1301))) == 1200
+
+
 class TestUsageStatsRepository:
     async def test_upsert_and_get_latest(self, usage_repo):
         """Saving a RateLimitInfo and fetching it back returns the same values."""
@@ -9,6 +9,7 @@ from unittest.mock import AsyncMock, MagicMock
 import discord
 import pytest
 
+from claude_code_core.session_scheduler import SessionPriority, SessionScheduler
 from claude_discord.claude.types import (
     AskOption,
     AskQuestion,
@@ -1473,10 +1474,10 @@ class TestGlobalSessionSemaphore:
     @pytest.fixture(autouse=True)
     def _reset_semaphore(self):
         """Save and restore module-level semaphore state around each test."""
-        orig_sem = _rh_module._global_semaphore
+        orig_scheduler = _rh_module._scheduler
         orig_max = _rh_module._max_concurrent
         yield
-        _rh_module._global_semaphore = orig_sem
+        _rh_module._scheduler = orig_scheduler
         _rh_module._max_concurrent = orig_max
 
     @pytest.fixture
@@ -1505,10 +1506,11 @@ class TestGlobalSessionSemaphore:
 
         return gen
 
-    def test_configure_session_limit_sets_semaphore(self) -> None:
+    def test_configure_session_limit_sets_scheduler(self) -> None:
         configure_session_limit(5)
         assert _rh_module._max_concurrent == 5
-        assert isinstance(_rh_module._global_semaphore, asyncio.Semaphore)
+        assert isinstance(_rh_module._scheduler, SessionScheduler)
+        assert _rh_module._scheduler.max_concurrent == 5
 
     @pytest.mark.asyncio
     async def test_semaphore_limits_concurrent_sessions(self, thread: MagicMock) -> None:
@@ -1589,6 +1591,225 @@ class TestGlobalSessionSemaphore:
         ]
         assert len(waiting_msgs) >= 1
 
+    @pytest.mark.asyncio
+    async def test_a_reply_overtakes_queued_scheduled_runs(self, thread: MagicMock) -> None:
+        """A burst of scheduled tasks must not keep a person waiting on a reply."""
+        configure_session_limit(1)
+
+        gate = asyncio.Event()
+        started: list[str] = []
+
+        def _runner(name: str) -> MagicMock:
+            async def gen(*args, **kwargs):
+                started.append(name)
+                await gate.wait()
+                for e in self._simple_events():
+                    yield e
+
+            runner = MagicMock()
+            runner.working_dir = None
+            runner.images = None
+            runner.run = gen
+            return runner
+
+        def _config(name: str, priority: SessionPriority) -> RunConfig:
+            return RunConfig(thread=thread, runner=_runner(name), prompt=name, priority=priority)
+
+        first = asyncio.create_task(
+            run_claude_with_config(_config("first", SessionPriority.SCHEDULED))
+        )
+        await asyncio.sleep(0.01)
+        burst = [
+            asyncio.create_task(
+                run_claude_with_config(_config(f"job{i}", SessionPriority.SCHEDULED))
+            )
+            for i in range(3)
+        ]
+        await asyncio.sleep(0.01)
+        reply = asyncio.create_task(
+            run_claude_with_config(_config("reply", SessionPriority.INTERACTIVE))
+        )
+        await asyncio.sleep(0.01)
+
+        gate.set()
+        await asyncio.gather(first, *burst, reply)
+
+        assert started == ["first", "reply", "job0", "job1", "job2"]
+        notices = [
+            str(c.kwargs["embed"].description)
+            for c in thread.send.call_args_list
+            if "\u23f3" in str(getattr(c.kwargs.get("embed"), "description", ""))
+        ]
+        # Three jobs queued before the reply, yet the reply is told it is next.
+        assert ["#3 in queue" in notices[-2], "#1 in queue" in notices[-1]] == [True, True]
+
+    @pytest.mark.asyncio
+    async def test_per_repo_limit_queues_only_the_same_repository(
+        self, thread: MagicMock, tmp_path
+    ) -> None:
+        configure_session_limit(3, max_per_repo=1)
+        (tmp_path / "mono" / ".git").mkdir(parents=True)
+        (tmp_path / "mono" / "pkg").mkdir()
+        (tmp_path / "small").mkdir()
+
+        gate = asyncio.Event()
+        started: list[str] = []
+
+        def _config(name: str, working_dir: str) -> RunConfig:
+            async def gen(*args, **kwargs):
+                started.append(name)
+                await gate.wait()
+                for e in self._simple_events():
+                    yield e
+
+            runner = MagicMock()
+            runner.working_dir = working_dir
+            runner.images = None
+            runner.run = gen
+            return RunConfig(thread=thread, runner=runner, prompt=name)
+
+        tasks = [
+            asyncio.create_task(run_claude_with_config(_config(name, str(tmp_path / path))))
+            for name, path in (("a", "mono"), ("b", "mono/pkg"), ("c", "small"))
+        ]
+        await asyncio.sleep(0.05)
+        assert started == ["a", "c"]
+
+        gate.set()
+        await asyncio.gather(*tasks)
+        assert started == ["a", "c", "b"]
+        notices = [
+            str(c.kwargs["embed"].description)
+            for c in thread.send.call_args_list
+            if "\u23f3" in str(getattr(c.kwargs.get("embed"), "description", ""))
+        ]
+        assert notices and "in this repository" in notices[0]
+
+    @pytest.mark.asyncio
+    async def test_a_reply_preempts_a_scheduled_run_which_then_resumes(
+        self, thread: MagicMock
+    ) -> None:
+        configure_session_limit(1, preempt_background=True)
+
+        stopped = asyncio.Event()
+        job_calls: list[tuple[str, str | None]] = []
+        order: list[str] = []
+
+        async def job_gen(prompt, session_id=None):
+            job_calls.append((prompt, session_id))
+            order.append(f"job{len(job_calls)}")
+            yield StreamEvent(message_type=MessageType.SYSTEM, session_id="sess-job")
+            if len(job_calls) == 1:
+                await stopped.wait()
+                # What the CLI reports for the turn it was told to stop.
+                yield StreamEvent(
+                    message_type=MessageType.RESULT, is_complete=True, error="interrupted"
+                )
+                return
+            yield StreamEvent(message_type=MessageType.RESULT, is_complete=True)
+
+        async def stop() -> None:
+            stopped.set()
+
+        job = MagicMock()
+        job.working_dir = None
+        job.images = None
+        job.run = job_gen
+        job.interrupt = AsyncMock(side_effect=stop)
+
+        async def reply_gen(*args, **kwargs):
+            order.append("reply")
+            for e in self._simple_events("sess-reply"):
+                yield e
+
+        reply = MagicMock()
+        reply.working_dir = None
+        reply.images = None
+        reply.run = reply_gen
+
+        scheduled = asyncio.create_task(
+            run_claude_with_config(
+                RunConfig(
+                    thread=thread, runner=job, prompt="nightly", priority=SessionPriority.SCHEDULED
+                )
+            )
+        )
+        await asyncio.sleep(0.02)
+        await asyncio.wait_for(
+            run_claude_with_config(RunConfig(thread=thread, runner=reply, prompt="hi")),
+            timeout=5,
+        )
+        assert await asyncio.wait_for(scheduled, timeout=5) == "sess-job"
+
+        assert order == ["job1", "reply", "job2"]
+        assert job_calls[1] == (_rh_module._YIELD_RESUME_PROMPT, "sess-job")
+        assert _rh_module._scheduler.stats.preempted == 1
+        notices = [
+            str(getattr(c.kwargs.get("embed"), "description", ""))
+            for c in thread.send.call_args_list
+        ]
+        assert any("Paused to free a session slot" in n for n in notices)
+        assert any("yielded the session slot for" in n for n in notices)
+        # The interrupted turn is neither an error nor a finished run.
+        assert not any("interrupted" in n for n in notices)
+        titles = [
+            str(getattr(c.kwargs.get("embed"), "title", "")) for c in thread.send.call_args_list
+        ]
+        assert sum("Done" in t for t in titles) == 2  # the reply and the resumed job
+
+    @pytest.mark.asyncio
+    async def test_a_yield_asked_after_the_result_does_not_interrupt(
+        self, thread: MagicMock
+    ) -> None:
+        configure_session_limit(1, preempt_background=True)
+        stdout_open = asyncio.Event()
+        job_calls: list[str] = []
+
+        async def job_gen(prompt, session_id=None):
+            job_calls.append(prompt)
+            yield StreamEvent(message_type=MessageType.SYSTEM, session_id="sess-job")
+            yield StreamEvent(message_type=MessageType.RESULT, is_complete=True)
+            await stdout_open.wait()  # the CLI has not closed stdout yet
+
+        job = MagicMock()
+        job.working_dir = None
+        job.images = None
+        job.run = job_gen
+        job.interrupt = AsyncMock()
+
+        async def reply_gen(*args, **kwargs):
+            for e in self._simple_events("sess-reply"):
+                yield e
+
+        reply = MagicMock()
+        reply.working_dir = None
+        reply.images = None
+        reply.run = reply_gen
+
+        scheduled = asyncio.create_task(
+            run_claude_with_config(
+                RunConfig(
+                    thread=thread, runner=job, prompt="nightly", priority=SessionPriority.SCHEDULED
+                )
+            )
+        )
+        await asyncio.sleep(0.02)
+        replying = asyncio.create_task(
+            run_claude_with_config(RunConfig(thread=thread, runner=reply, prompt="hi"))
+        )
+        await asyncio.sleep(0.02)
+        stdout_open.set()
+        await asyncio.wait_for(asyncio.gather(scheduled, replying), timeout=5)
+
+        assert _rh_module._scheduler.stats.preempted == 1  # asked...
+        job.interrupt.assert_not_awaited()  # ...but the turn had already finished
+        assert job_calls == ["nightly"]
+        notices = [
+            str(getattr(c.kwargs.get("embed"), "description", ""))
+            for c in thread.send.call_args_list
+        ]
+        assert not any("Paused to free a session slot" in n for n in notices)
+
     @pytest.mark.asyncio
     async def test_semaphore_released_on_error(self, thread: MagicMock) -> None:
         """Semaphore must be released even when runner.run() raises."""
@@ -1606,13 +1827,13 @@ class TestGlobalSessionSemaphore:
         config = RunConfig(thread=thread, runner=runner, prompt="test")
         await run_claude_with_config(config)
 
-        sem = _rh_module._global_semaphore
-        assert not sem.locked(), "Semaphore should be released after error"
+        scheduler = _rh_module._scheduler
+        assert scheduler.running == 0, "Slot should be released after error"
 
     @pytest.mark.asyncio
     async def test_no_semaphore_when_not_configured(self, thread: MagicMock) -> None:
         """When configure_session_limit was never called, no limiting occurs."""
-        _rh_module._global_semaphore = None
+        _rh_module._scheduler = None
 
         runner = MagicMock()
         runner.working_dir = None
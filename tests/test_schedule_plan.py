@@ -0,0 +1,98 @@
+"""Tests for scheduled-task start planning (claude_discord.schedule_plan)."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+import pytest
+
+from claude_discord.schedule_plan import (
+    jitter_offset,
+    next_anchor,
+    project_load,
+    stagger,
+    stagger_seconds_from_env,
+)
+
+
+def _local(hour: int, minute: int = 0) -> float:
+    return datetime(2026, 10, 17, hour, minute).timestamp()
+
+
+class TestJitter:
+    def test_offset_is_stable_per_name_and_within_the_window(self) -> None:
+        offsets = {name: jitter_offset(name, 600) for name in ("digest", "triage", "backup")}
+
+        assert offsets == {name: jitter_offset(name, 600) for name in offsets}
+        assert all(0 <= o <= 600 for o in offsets.values())
+        assert len(set(offsets.values())) == 3
+        assert jitter_offset("digest", 0) == 0.0
+
+    def test_next_anchor_adds_the_offset(self) -> None:
+        after = _local(8)
+        assert next_anchor(9, 0, 86400, after=after) == _local(9)
+        assert next_anchor(9, 0, 86400, after=after, offset=300) == _local(9, 5)
+        # Past today's jittered start, the next one is tomorrow's.
+        assert next_anchor(9, 0, 86400, after=_local(9, 6), offset=300) == _local(9, 5) + 86400
+
+    def test_a_jittered_start_past_midnight_is_not_skipped(self) -> None:
+        # Anchored 23:50 with a 20-minute offset: yesterday's run is at 00:10 today.
+        after = _local(0, 5)
+        assert next_anchor(23, 50, 86400, after=after, offset=1200) == _local(0, 10)
+
+
+class TestStagger:
+    def test_starts_are_spaced_in_due_order(self) -> None:
+        plan, next_free = stagger(
+            [(100.0, "b"), (90.0, "a"), (100.0, "c")], stagger_seconds=60, next_free=100.0
+        )
+
+        assert plan == [(100.0, "a"), (160.0, "b"), (220.0, "c")]
+        assert next_free == 280.0
+
+    def test_zero_stagger_runs_everything_at_once(self) -> None:
+        plan, _ = stagger([(5.0, "a"), (5.0, "b")], stagger_seconds=0, next_free=10.0)
+        assert [start for start, _ in plan] == [10.0, 10.0]
+
+    def test_env_setting(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("CCDB_SCHEDULER_STAGGER_SECONDS", "45")
+        assert stagger_seconds_from_env() == 45.0
+        monkeypatch.setenv("CCDB_SCHEDULER_STAGGER_SECONDS", "soon")
+        assert stagger_seconds_from_env() == 0.0
+
+
+class TestProjection:
+    def _task(self, name: str, next_run_at: float, **extra) -> dict:
+        return {
+            "name": name,
+            "next_run_at": next_run_at,
+            "interval_seconds": 86400,
+            "enabled": True,
+            "anchor_hour": 9,
+            "anchor_minute": 0,
+            **extra,
+        }
+
+    def test_a_nine_o_clock_burst_shows_up_and_stagger_spreads_it(self) -> None:
+        now = _local(0)
+        tasks = [self._task(f"daily-{i}", _local(9)) for i in range(4)]
+
+        burst = project_load(tasks, now=now, bucket_seconds=3600)
+        assert burst[9].starts == 4
+        assert sum(b.starts for b in burst) == 4
+
+        spread = project_load(tasks, now=now, stagger_seconds=1200, bucket_seconds=3600)
+        assert [b.starts for b in spread[9:11]] == [3, 1]
+
+    def test_interval_tasks_repeat_and_disabled_ones_are_ignored(self) -> None:
+        now = _local(0)
+        hourly = {
+            "name": "hourly",
+            "next_run_at": now,
+            "interval_seconds": 3600,
+            "enabled": True,
+        }
+        off = self._task("off", _local(9), enabled=False)
+
+        buckets = project_load([hourly, off], now=now, bucket_seconds=6 * 3600)
+        assert [b.starts for b in buckets] == [6, 6, 6, 6]
@@ -42,10 +42,53 @@ class TestSchedulerCogInit:
         cog = SchedulerCog(_make_bot(), _make_runner(), repo=repo)
         assert cog is not None
 
-    def test_master_loop_not_running_at_init(self, repo: TaskRepository) -> None:
+    def test_timer_not_running_at_init(self, repo: TaskRepository) -> None:
         cog = SchedulerCog(_make_bot(), _make_runner(), repo=repo)
-        # loop should not be running before cog_load is called
-        assert not cog._master_loop.is_running()
+        # The timer should not be running before cog_load is called
+        assert not cog.timers.running
+
+
+class TestSchedulerCogTimer:
+    async def test_a_new_task_runs_without_waiting_for_a_poll(self, repo: TaskRepository) -> None:
+        bot = _make_bot()
+        bot.wait_until_ready = AsyncMock()
+        cog = SchedulerCog(bot, _make_runner(), repo=repo)
+        ran = asyncio.Event()
+        cog._run_task = AsyncMock(side_effect=lambda task: ran.set())
+        await cog.cog_load()
+        try:
+            await asyncio.sleep(0.01)
+            await repo.create(name="now", prompt="p", interval_seconds=3600, channel_id=1)
+            await asyncio.wait_for(ran.wait(), timeout=2)
+        finally:
+            cog.cog_unload()
+
+        assert cog._run_task.call_args[0][0]["name"] == "now"
+
+    async def test_tasks_due_together_are_staggered(self, repo: TaskRepository) -> None:
+        cog = SchedulerCog(_make_bot(), _make_runner(), repo=repo, stagger_seconds=120)
+        cog._run_task = AsyncMock()
+        ids = [
+            await repo.create(name=f"daily-{i}", prompt="p", interval_seconds=86400, channel_id=1)
+            for i in range(3)
+        ]
+        before = time.time()
+
+        await cog.run_due()
+        await asyncio.sleep(0)
+
+        assert cog._run_task.call_count == 1
+        parked = sorted([(await repo.get(i))["next_run_at"] for i in ids[1:]])
+        assert parked == pytest.approx([before + 120, before + 240], abs=5)
+
+    async def test_next_due_skips_running_tasks(self, cog: SchedulerCog, repo) -> None:
+        busy = await repo.create(name="busy", prompt="p", interval_seconds=60, channel_id=1)
+        await repo.create(
+            name="later", prompt="p", interval_seconds=60, channel_id=1, run_immediately=False
+        )
+        cog._running.add(busy)
+
+        assert await cog._next_due() == pytest.approx(time.time() + 60, abs=5)
 
 
 class TestSchedulerCogMasterLoop:
@@ -54,7 +97,7 @@ class TestSchedulerCogMasterLoop:
         with patch(
             "claude_discord.cogs.scheduler.run_claude_with_config", new_callable=AsyncMock
         ) as mock_run:
-            await cog._master_loop()
+            await cog.run_due()
         mock_run.assert_not_called()
 
     async def test_future_task_not_run(self, cog: SchedulerCog, repo: TaskRepository) -> None:
@@ -67,7 +110,7 @@ class TestSchedulerCogMasterLoop:
         with patch(
             "claude_discord.cogs.scheduler.run_claude_with_config", new_callable=AsyncMock
         ) as mock_run:
-            await cog._master_loop()
+            await cog.run_due()
         mock_run.assert_not_called()
 
     async def test_due_task_triggers_run(self, cog: SchedulerCog, repo: TaskRepository) -> None:
@@ -83,7 +126,7 @@ class TestSchedulerCogMasterLoop:
         # to intercept at this level (not run_claude_in_thread) and then yield
         # control so the event loop can execute the spawned task.
         cog._run_task = AsyncMock()
-        await cog._master_loop()
+        await cog.run_due()
         await asyncio.sleep(0)  # yield to let create_task execute
 
         cog._run_task.assert_called_once()
@@ -99,7 +142,7 @@ class TestSchedulerCogMasterLoop:
             (time.time() - 1, task_id),
         )
         cog._run_task = AsyncMock()
-        await cog._master_loop()
+        await cog.run_due()
 
         task = await repo.get(task_id)
         assert task is not None
@@ -271,7 +314,7 @@ class TestSchedulerCogMasterLoop:
         with patch(
             "claude_discord.cogs.scheduler.run_claude_with_config", new_callable=AsyncMock
         ) as mock_run:
-            await cog._master_loop()
+            await cog.run_due()
         mock_run.assert_not_called()
 
 
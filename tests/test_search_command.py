@@ -78,7 +78,7 @@ def _make_cog() -> SessionManageCog:
     bot = MagicMock()
     repo = MagicMock()
     repo.search = AsyncMock(return_value=[])
-    repo.get_by_session_id = AsyncMock(return_value=None)
+    repo.get_by_session_ids = AsyncMock(return_value={})
     return SessionManageCog(bot=bot, repo=repo)
 
 
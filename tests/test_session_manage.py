@@ -59,7 +59,7 @@ def _make_cog():
     repo = MagicMock()
     repo.get = AsyncMock(return_value=None)
     repo.list_all = AsyncMock(return_value=[])
-    repo.get_by_session_id = AsyncMock(return_value=None)
+    repo.get_by_session_ids = AsyncMock(return_value={})
     return SessionManageCog(bot=bot, repo=repo)
 
 
@@ -13,6 +13,7 @@ import tempfile
 from datetime import UTC, datetime
 from unittest.mock import AsyncMock, MagicMock
 
+import aiosqlite
 import pytest
 from aiohttp.test_utils import TestClient, TestServer
 
@@ -238,6 +239,25 @@ async def test_get_sessions_filters_by_state_and_excludes_caller(
     assert [s["thread_id"] for s in (await resp.json())["sessions"]] == [222]
 
 
+async def test_live_session_beyond_the_limit_keeps_its_stored_details(
+    api_client: TestClient, db_path: str, bot: MagicMock
+) -> None:
+    repo = SessionRepository(db_path)
+    await repo.save(thread_id=111, session_id="s-111", backend="codex")
+    await repo.save(thread_id=444, session_id="s-444")  # the newer row fills limit=1
+    async with aiosqlite.connect(db_path) as db:
+        await db.execute("UPDATE sessions SET last_used_at = '2000-01-01' WHERE thread_id = 111")
+        await db.commit()
+    bot.session_registry.register(111, "still going", None)
+
+    resp = await api_client.get("/api/sessions?limit=1")
+    by_id = {s["thread_id"]: s for s in (await resp.json())["sessions"]}
+
+    assert by_id[111]["session_id"] == "s-111"
+    assert by_id[111]["backend"] == "codex"
+    assert by_id[111]["state"] == "running"
+
+
 async def test_get_sessions_rejects_bad_limit(api_client: TestClient) -> None:
     resp = await api_client.get("/api/sessions?limit=abc")
     assert resp.status == 400
@@ -169,3 +169,44 @@ class TestConcurrencyNotice:
         # Warns that cwd / working directory is not preserved between messages
         assert "cwd" in notice or "working directory" in notice
         assert "absolute path" in notice
+
+
+class TestSnapshotsAndVersions:
+    """Copy-on-write snapshots and the per-version notice cache."""
+
+    def test_only_real_changes_bump_the_version(self) -> None:
+        registry = SessionRegistry()
+        registry.register(1, "task", "/repo")
+        version = registry.version
+        registry.register(1, "task", "/repo")
+        registry.update(1, description="task")
+        registry.unregister(99)
+        assert registry.version == version
+        registry.update(1, working_dir="/other")
+        assert registry.version == version + 1
+
+    def test_a_snapshot_is_unaffected_by_later_changes(self) -> None:
+        registry = SessionRegistry()
+        registry.register(1, "before", "/repo")
+        snapshot = registry.snapshot()
+
+        registry.update(1, description="after")
+        registry.register(2, "second")
+
+        assert [s.description for s in snapshot.sessions] == ["before"]
+        assert [s.description for s in registry.snapshot().sessions] == ["after", "second"]
+        assert snapshot.others(1) == []
+
+    def test_notice_blocks_are_cached_per_version(self) -> None:
+        registry = SessionRegistry()
+        registry.register(1, "task A", "/repo-a")
+        registry.register(2, "task B")
+
+        first = registry.build_concurrency_notice(1)
+        assert registry.build_concurrency_notice(1) == first
+        assert registry._notice_cache.blocks[1] in first
+        assert "task A" in registry.build_concurrency_notice(2)
+
+        registry.update(2, description="task B2")
+        notice = registry.build_concurrency_notice(1)
+        assert "task B2" in notice and "task B\n" not in notice
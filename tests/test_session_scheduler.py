@@ -0,0 +1,266 @@
+"""Tests for the session admission scheduler (claude_code_core.session_scheduler)."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from claude_code_core.session_scheduler import (
+    HostHeadroom,
+    SessionPriority,
+    SessionScheduler,
+    repository_key,
+)
+
+
+def _admitted(scheduler: SessionScheduler, *tickets) -> list[bool]:
+    return [t.admitted for t in tickets]
+
+
+class TestAdmission:
+    def test_free_slots_admit_immediately(self) -> None:
+        scheduler = SessionScheduler(2)
+        a, b, c = (scheduler.enqueue() for _ in range(3))
+
+        assert _admitted(scheduler, a, b, c) == [True, True, False]
+        assert (scheduler.running, scheduler.waiting) == (2, 1)
+        assert scheduler.stats.queued == 1
+
+    def test_priority_class_beats_arrival_order(self) -> None:
+        scheduler = SessionScheduler(1)
+        running = scheduler.enqueue(priority=SessionPriority.SCHEDULED)
+        jobs = [scheduler.enqueue(priority=SessionPriority.SCHEDULED) for _ in range(3)]
+        hook = scheduler.enqueue(priority=SessionPriority.TRIGGERED)
+        reply = scheduler.enqueue(priority=SessionPriority.INTERACTIVE)
+
+        assert [scheduler.position(t) for t in (reply, hook, *jobs)] == [1, 2, 3, 4, 5]
+        scheduler.release(running)
+        assert reply.admitted
+        scheduler.release(reply)
+        assert hook.admitted
+
+    def test_the_user_with_fewer_running_sessions_goes_first(self) -> None:
+        scheduler = SessionScheduler(2)
+        scheduler.enqueue(user_id=1)
+        held = scheduler.enqueue(user_id=2)
+        busy_user_again = scheduler.enqueue(user_id=1)
+        other_user = scheduler.enqueue(user_id=3)
+
+        scheduler.release(held)
+
+        assert other_user.admitted
+        assert not busy_user_again.admitted
+
+    def test_channel_fairness_breaks_ties_between_users(self) -> None:
+        scheduler = SessionScheduler(2)
+        scheduler.enqueue(channel_id=10)
+        held = scheduler.enqueue(channel_id=20)
+        same_channel = scheduler.enqueue(user_id=1, channel_id=10)
+        quiet_channel = scheduler.enqueue(user_id=2, channel_id=30)
+
+        scheduler.release(held)
+
+        assert quiet_channel.admitted
+        assert not same_channel.admitted
+
+    def test_a_long_wait_promotes_background_work(self) -> None:
+        scheduler = SessionScheduler(1, aging_seconds=60)
+        with patch("claude_code_core.session_scheduler.time.monotonic", return_value=0.0):
+            running = scheduler.enqueue()
+            old_job = scheduler.enqueue(priority=SessionPriority.SCHEDULED)
+        with patch("claude_code_core.session_scheduler.time.monotonic", return_value=1000.0):
+            reply = scheduler.enqueue(priority=SessionPriority.INTERACTIVE)
+            scheduler.release(running)
+
+        # Both rank as interactive now; the job has been waiting longer.
+        assert old_job.admitted
+        assert not reply.admitted
+
+
+class TestRelease:
+    async def test_waiters_are_woken_in_turn(self) -> None:
+        scheduler = SessionScheduler(1)
+        first = scheduler.enqueue()
+        second = scheduler.enqueue()
+        waiter = asyncio.create_task(second.wait())
+        await asyncio.sleep(0)
+        assert not waiter.done()
+
+        scheduler.release(first)
+
+        await asyncio.wait_for(waiter, timeout=1)
+        assert scheduler.position(second) == 0
+
+    def test_release_withdraws_a_waiter_and_is_idempotent(self) -> None:
+        scheduler = SessionScheduler(1)
+        running = scheduler.enqueue()
+        gave_up = scheduler.enqueue()
+
+        scheduler.release(gave_up)
+        scheduler.release(gave_up)
+        scheduler.release(running)
+        scheduler.release(running)
+
+        assert (scheduler.running, scheduler.waiting) == (0, 0)
+        assert not gave_up.admitted
+
+    def test_rejects_nonsense_limits(self) -> None:
+        with pytest.raises(ValueError):
+            SessionScheduler(0)
+        with pytest.raises(ValueError):
+            SessionScheduler(1, aging_seconds=0)
+        with pytest.raises(ValueError):
+            SessionScheduler(1, max_per_resource=0)
+
+
+class TestThrottle:
+    def test_a_lower_ceiling_delays_admissions_and_raising_it_admits(self) -> None:
+        scheduler = SessionScheduler(3)
+        scheduler.throttle(1)
+        first, second = scheduler.enqueue(), scheduler.enqueue()
+
+        assert _admitted(scheduler, first, second) == [True, False]
+        assert scheduler.limit == 1
+
+        scheduler.throttle(None)
+        assert second.admitted
+
+    def test_held_background_waits_even_after_aging(self) -> None:
+        scheduler = SessionScheduler(3, aging_seconds=60)
+        scheduler.throttle(2, hold_background=True)
+        with patch("claude_code_core.session_scheduler.time.monotonic", return_value=0.0):
+            job = scheduler.enqueue(priority=SessionPriority.SCHEDULED)
+        with patch("claude_code_core.session_scheduler.time.monotonic", return_value=1000.0):
+            reply = scheduler.enqueue(priority=SessionPriority.INTERACTIVE)
+            assert scheduler.wait_reason(job) == "rate_limit"
+
+        assert _admitted(scheduler, job, reply) == [False, True]
+        scheduler.throttle(None)
+        assert job.admitted
+
+
+class TestResourceLimits:
+    def test_a_full_repository_does_not_hold_up_other_work(self) -> None:
+        scheduler = SessionScheduler(3, max_per_resource=1)
+        scheduler.enqueue(resource="/mono")
+        same_repo = scheduler.enqueue(resource="/mono")
+        other_repo = scheduler.enqueue(priority=SessionPriority.SCHEDULED, resource="/small")
+
+        assert _admitted(scheduler, same_repo, other_repo) == [False, True]
+        assert scheduler.wait_reason(same_repo) == "resource"
+
+    def test_a_freed_repository_slot_goes_to_its_own_queue(self) -> None:
+        scheduler = SessionScheduler(2, max_per_resource=1)
+        mono = scheduler.enqueue(resource="/mono")
+        scheduler.enqueue(resource="/small")
+        mono_next = scheduler.enqueue(resource="/mono")
+        small_next = scheduler.enqueue(resource="/small")
+
+        scheduler.release(mono)
+
+        assert _admitted(scheduler, mono_next, small_next) == [True, False]
+        assert scheduler.wait_reason(small_next) == "slots"
+
+    async def test_headroom_holds_all_but_the_first_run_and_is_rechecked(self) -> None:
+        free = False
+        scheduler = SessionScheduler(3, headroom=lambda: free, recheck_seconds=0.01)
+        first = scheduler.enqueue()
+        second = scheduler.enqueue()
+
+        assert _admitted(scheduler, first, second) == [True, False]
+        assert scheduler.wait_reason(second) == "headroom"
+
+        free = True
+        await asyncio.wait_for(second.wait(), timeout=1)
+        assert scheduler.stats.held_by_headroom >= 1
+
+
+class TestPreemption:
+    def test_a_waiting_reply_asks_the_least_urgent_newest_run_to_yield(self) -> None:
+        scheduler = SessionScheduler(3, preempt_from=SessionPriority.TRIGGERED)
+        tickets = []
+        for at, priority in enumerate(
+            (SessionPriority.SCHEDULED, SessionPriority.SCHEDULED, SessionPriority.TRIGGERED)
+        ):
+            with patch("claude_code_core.session_scheduler.time.monotonic", return_value=at):
+                tickets.append(scheduler.enqueue(priority=priority))
+        old_job, new_job, hook = tickets
+        for ticket in (old_job, new_job, hook):
+            scheduler.mark_preemptible(ticket)
+
+        reply = scheduler.enqueue(priority=SessionPriority.INTERACTIVE)
+
+        assert [t.yield_requested for t in (old_job, new_job, hook)] == [False, True, False]
+        assert scheduler.stats.preempted == 1
+        scheduler.release(new_job)
+        assert reply.admitted
+        # The yielded run queues again and resumes when a slot frees up.
+        resumed = scheduler.enqueue(priority=SessionPriority.SCHEDULED)
+        scheduler.release(hook)
+        assert resumed.admitted
+
+    def test_only_resumable_background_runs_are_asked(self) -> None:
+        scheduler = SessionScheduler(2, preempt_from=SessionPriority.TRIGGERED)
+        spawned = scheduler.enqueue(priority=SessionPriority.SPAWNED)
+        job = scheduler.enqueue(priority=SessionPriority.SCHEDULED)
+        scheduler.mark_preemptible(spawned)
+
+        reply = scheduler.enqueue(priority=SessionPriority.INTERACTIVE)
+        assert not job.yield_requested and not spawned.preemptible
+
+        # Marked once its session can be resumed, it is asked straight away.
+        scheduler.mark_preemptible(job)
+        assert job.yield_requested
+        scheduler.release(job)
+        assert reply.admitted
+
+    def test_background_waiters_and_disabled_preemption_ask_nothing(self) -> None:
+        off = SessionScheduler(1)
+        job = off.enqueue(priority=SessionPriority.SCHEDULED)
+        off.mark_preemptible(job)
+        off.enqueue(priority=SessionPriority.INTERACTIVE)
+        assert not job.yield_requested
+
+        on = SessionScheduler(1, preempt_from=SessionPriority.TRIGGERED)
+        job = on.enqueue(priority=SessionPriority.SCHEDULED)
+        on.mark_preemptible(job)
+        on.enqueue(priority=SessionPriority.TRIGGERED)
+        assert not job.yield_requested
+        with pytest.raises(ValueError):
+            SessionScheduler(1, preempt_from=SessionPriority.INTERACTIVE)
+
+
+class TestHostHeadroom:
+    def test_load_and_memory_thresholds(self) -> None:
+        with (
+            patch("claude_code_core.session_scheduler.os.getloadavg", return_value=(8.0, 0, 0)),
+            patch("claude_code_core.session_scheduler.os.cpu_count", return_value=4),
+            patch("claude_code_core.session_scheduler._available_memory_mb", return_value=512),
+        ):
+            assert not HostHeadroom(max_load_per_cpu=1.5)()
+            assert HostHeadroom(max_load_per_cpu=2.5)()
+            assert not HostHeadroom(min_free_memory_mb=1024)()
+            assert HostHeadroom()()
+
+    def test_unreadable_memory_passes(self) -> None:
+        with patch("claude_code_core.session_scheduler._available_memory_mb", return_value=None):
+            assert HostHeadroom(min_free_memory_mb=1024)()
+
+
+class TestRepositoryKey:
+    def test_subdirectories_and_worktrees_share_the_main_repository(self, tmp_path) -> None:
+        main = tmp_path / "mono"
+        (main / ".git" / "worktrees" / "feature").mkdir(parents=True)
+        (main / "pkg" / "sub").mkdir(parents=True)
+        worktree = tmp_path / "wt"
+        (worktree / "src").mkdir(parents=True)
+        gitdir = main / ".git" / "worktrees" / "feature"
+        (worktree / ".git").write_text(f"gitdir: {gitdir}\n")
+
+        assert repository_key(str(main / "pkg" / "sub")) == str(main.resolve())
+        assert repository_key(str(worktree / "src")) == str(main.resolve())
+
+    def test_outside_git_the_directory_is_its_own_resource(self, tmp_path) -> None:
+        assert repository_key(str(tmp_path)) == str(tmp_path.resolve())
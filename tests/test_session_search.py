@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import aiosqlite
 import pytest
 
 from claude_discord.database.models import init_db
@@ -148,3 +149,67 @@ class TestSearchByThreadIds:
         results = await repo.search(query="webapp", exclude_thread_ids=[1])
         assert len(results) == 1
         assert results[0].thread_id == 2
+
+
+class TestFullTextIndex:
+    """Keyword search through the sessions_fts index."""
+
+    async def test_japanese_text_matches_without_word_boundaries(self, repo):
+        await repo.save(thread_id=10, session_id="s-10", summary="ログイン画面のバグを修正する")
+        await repo.save(thread_id=11, session_id="s-11", summary="ダークモードを追加")
+
+        results = await repo.search(query="バグを修正")
+
+        assert [r.thread_id for r in results] == [10]
+
+    async def test_every_term_must_match_in_any_order(self, repo):
+        await _seed(repo)
+        results = await repo.search(query="mode webapp")
+        assert [r.thread_id for r in results] == [2]
+
+    async def test_trailing_star_is_a_prefix_query(self, repo):
+        await _seed(repo)
+        results = await repo.search(query="Refac*")
+        assert [r.thread_id for r in results] == [4]
+
+    async def test_summary_hits_rank_above_path_hits(self, repo):
+        await repo.save(thread_id=20, session_id="s-20", summary="x", working_dir="/src/billing")
+        await repo.save(thread_id=21, session_id="s-21", summary="Fix billing export")
+
+        results = await repo.search(query="billing")
+
+        assert [r.thread_id for r in results] == [21, 20]
+
+    async def test_index_follows_updates_and_deletes(self, repo):
+        await repo.save(thread_id=30, session_id="s-30", summary="first draft")
+        await repo.save(thread_id=30, session_id="s-30", summary="second draft")
+        assert await repo.search(query="first") == []
+        assert [r.thread_id for r in await repo.search(query="second")] == [30]
+
+        await repo.delete(30)
+        assert await repo.search(query="draft") == []
+
+    async def test_query_syntax_is_taken_literally(self, repo):
+        await repo.save(thread_id=40, session_id="s-40", summary='Handle "quoted" AND NOT text')
+        assert [r.thread_id for r in await repo.search(query='"quoted"')] == [40]
+        assert await repo.search(query="NEAR(") == []
+
+    async def test_short_terms_fall_back_to_a_scan(self, repo):
+        await repo.save(thread_id=50, session_id="s-50", summary="東京の天気")
+        assert [r.thread_id for r in await repo.search(query="東京")] == [50]
+
+    async def test_existing_sessions_are_indexed_on_upgrade(self, tmp_path):
+        db_path = str(tmp_path / "old.db")
+        await init_db(db_path)
+        async with aiosqlite.connect(db_path) as db:
+            for name in ("insert", "delete", "update"):
+                await db.execute(f"DROP TRIGGER sessions_fts_{name}")
+            await db.execute("DROP TABLE sessions_fts")
+            await db.execute(
+                "INSERT INTO sessions (thread_id, session_id, summary) VALUES (1, 's', 'legacy')"
+            )
+            await db.commit()
+
+        await init_db(db_path)
+
+        assert [r.thread_id for r in await SessionRepository(db_path).search("legacy")] == [1]
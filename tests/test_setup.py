@@ -581,6 +581,65 @@ async def test_setup_bridge_defaults_max_concurrent_to_3(tmp_path: object) -> No
     assert chat_cog._max_concurrent == 3
 
 
+@pytest.mark.asyncio
+async def test_setup_bridge_ignores_malformed_load_limit(tmp_path: object) -> None:
+    """A bad CCDB_MAX_LOAD_PER_CPU is logged and ignored, not fatal at startup."""
+    from unittest.mock import patch
+
+    bot = _make_bot()
+    runner = _make_runner()
+
+    with (
+        patch.dict("os.environ", {"CCDB_MAX_LOAD_PER_CPU": "1.5x"}),
+        patch("claude_discord.cogs._run_helper.configure_session_limit") as configure,
+    ):
+        await setup_bridge(
+            bot,
+            runner,
+            session_db_path=str(tmp_path / "sessions.db"),  # type: ignore[operator]
+            claude_channel_id=111,
+            enable_scheduler=False,
+        )
+
+    headroom = configure.call_args.kwargs["headroom"]
+    assert headroom is None or headroom.max_load_per_cpu is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("ttl", ["90s", "0", "-5", "nan"])
+async def test_setup_bridge_ignores_malformed_prewarm_ttl(tmp_path: object, ttl: str) -> None:
+    """A bad CCDB_PREWARM_TTL_SECONDS falls back to the default instead of failing startup."""
+    from unittest.mock import patch
+
+    from claude_discord.cogs.claude_chat import ClaudeChatCog
+    from claude_discord.typing_prewarm import DEFAULT_TTL_SECONDS
+
+    bot = _make_bot()
+    runner = _make_runner()
+
+    with patch.dict(
+        "os.environ",
+        {
+            "CCDB_PREWARM_ON_TYPING": "true",
+            "CCDB_PREWARM_TTL_SECONDS": ttl,
+            "CCDB_PREWARM_MAX_PER_USER": "0",
+        },
+    ):
+        await setup_bridge(
+            bot,
+            runner,
+            session_db_path=str(tmp_path / "sessions.db"),  # type: ignore[operator]
+            claude_channel_id=111,
+            enable_scheduler=False,
+        )
+
+    chat_cog = next(
+        c.args[0] for c in bot.add_cog.call_args_list if isinstance(c.args[0], ClaudeChatCog)
+    )
+    assert chat_cog._prewarmer is not None
+    assert chat_cog._prewarmer.ttl_seconds == DEFAULT_TTL_SECONDS
+
+
 @pytest.mark.asyncio
 async def test_setup_bridge_accepts_codex_runner(tmp_path: object) -> None:
     """setup_bridge should accept any SessionBackend, not just ClaudeRunner."""
@@ -0,0 +1,89 @@
+"""Tests for the shared SQLite connection pool (claude_code_core.sqlite_pool)."""
+
+from __future__ import annotations
+
+import asyncio
+
+import aiosqlite
+import pytest
+
+from claude_code_core.sqlite_pool import SqlitePool, connect
+from claude_discord.database.models import init_db
+from claude_discord.database.settings_repo import SettingsRepository
+
+
+@pytest.fixture
+async def pool(tmp_path):
+    path = str(tmp_path / "sessions.db")
+    await init_db(path)
+    shared = SqlitePool(path, readers=2)
+    yield shared
+    await shared.close()
+
+
+class TestSqlitePool:
+    async def test_repository_calls_reuse_the_same_connections(self, pool: SqlitePool) -> None:
+        repo = SettingsRepository(pool.db_path, pool=pool)
+
+        for i in range(20):
+            await repo.set(f"k{i}", str(i))
+        values = await asyncio.gather(*(repo.get(f"k{i}") for i in range(20)))
+
+        assert values == [str(i) for i in range(20)]
+        assert pool.stats.writes == 20 and pool.stats.reads == 20
+        # One writer and at most the configured readers, however many calls.
+        assert pool.stats.connections_opened <= 3
+
+    async def test_readers_see_the_last_commit_while_a_write_is_open(
+        self, pool: SqlitePool
+    ) -> None:
+        repo = SettingsRepository(pool.db_path, pool=pool)
+        await repo.set("mode", "old")
+
+        async with pool.write() as db:
+            await db.execute("UPDATE settings SET value = 'new' WHERE key = 'mode'")
+            # WAL: the reader is not blocked and does not see the uncommitted row.
+            assert await asyncio.wait_for(repo.get("mode"), timeout=2) == "old"
+            await db.commit()
+
+        assert await repo.get("mode") == "new"
+
+    async def test_a_lent_connection_looks_fresh_to_the_next_borrower(
+        self, pool: SqlitePool
+    ) -> None:
+        async with pool.write() as db:
+            db.row_factory = aiosqlite.Row
+            await db.execute("INSERT INTO settings (key, value) VALUES ('left', 'open')")
+            # No commit: closing a per-call connection would have discarded it.
+
+        async with pool.write() as db:
+            assert db.row_factory is None
+            rows = await db.execute_fetchall("SELECT value FROM settings WHERE key = 'left'")
+        assert list(rows) == []
+
+    async def test_closed_pool_falls_back_to_a_connection_per_call(self, pool: SqlitePool) -> None:
+        repo = SettingsRepository(pool.db_path, pool=pool)
+        await pool.close()
+
+        await repo.set("after", "close")
+
+        assert await repo.get("after") == "close"
+        with pytest.raises(RuntimeError):
+            async with pool.write():
+                pass
+
+    def test_a_pool_for_another_file_is_refused(self, pool: SqlitePool) -> None:
+        with pytest.raises(ValueError):
+            connect("/elsewhere.db", pool)
+
+    async def test_memory_database_reads_on_the_writer(self) -> None:
+        memory = SqlitePool(":memory:", readers=4)
+        try:
+            async with memory.write() as db:
+                await db.execute("CREATE TABLE t (x INTEGER)")
+                await db.execute("INSERT INTO t VALUES (1)")
+                await db.commit()
+            async with memory.read() as db:
+                assert list(await db.execute_fetchall("SELECT x FROM t")) == [(1,)]
+        finally:
+            await memory.close()
@@ -0,0 +1,101 @@
+"""Tests for concurrent stderr draining (claude_code_core.stderr_tail)."""
+
+from __future__ import annotations
+
+import asyncio
+import stat
+import sys
+from pathlib import Path
+
+import pytest
+
+from claude_code_core.codex_runner import CodexRunner
+from claude_code_core.stderr_tail import StderrTail
+from claude_code_core.types import MessageType
+from claude_discord.claude.runner import ClaudeRunner
+
+
+class TestRingBuffer:
+    def test_keeps_only_the_last_lines(self) -> None:
+        tail = StderrTail(max_lines=3)
+        tail.feed(b"".join(f"line {i}\n".encode() for i in range(10)))
+
+        assert tail.text() == "line 7\nline 8\nline 9"
+        assert tail.total_lines == 10
+        assert tail.dropped_lines == 7
+
+    def test_byte_bound_applies_before_the_line_bound(self) -> None:
+        tail = StderrTail(max_lines=100, max_bytes=20)
+        tail.feed(b"aaaaaaaaa\nbbbbbbbbb\nccccccccc\n")
+
+        assert tail.text() == "bbbbbbbbb\nccccccccc"
+        assert tail.total_bytes == 30
+
+    def test_lines_split_across_chunks_are_joined(self) -> None:
+        tail = StderrTail()
+        tail.feed(b"hel")
+        tail.feed(b"lo\nwor")
+
+        assert tail.total_lines == 1
+        assert tail.text() == "hello\nwor"
+
+    def test_newline_free_flood_stays_bounded(self) -> None:
+        tail = StderrTail(max_bytes=16)
+        tail.feed(b"x" * 1000)
+
+        assert len(tail.text()) == 16
+
+    def test_text_is_cut_from_the_front(self) -> None:
+        tail = StderrTail()
+        tail.feed(b"noise\n" * 50 + b"Error: the actual cause\n")
+
+        text = tail.text(max_chars=30)
+        assert text.startswith("…")
+        assert text.endswith("Error: the actual cause")
+
+
+@pytest.fixture
+def noisy_cli(tmp_path: Path) -> str:
+    """A CLI that writes far more stderr than a pipe holds before answering."""
+    script = tmp_path / "noisy-cli"
+    script.write_text(
+        f"#!{sys.executable}\n"
+        "import sys\n"
+        "sys.stdin.readline()\n"
+        "for i in range(4000):\n"
+        "    sys.stderr.write(f'debug {i:04d} ' + 'x' * 64 + '\\n')\n"
+        "sys.stderr.write('fatal: the real reason\\n')\n"
+        "sys.stderr.flush()\n"
+        "sys.exit(3)\n"
+    )
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    return str(script)
+
+
+class TestRunnersDrainConcurrently:
+    async def test_claude_turn_does_not_hang_and_reports_the_tail(self, noisy_cli: str) -> None:
+        runner = ClaudeRunner(command=noisy_cli)
+
+        events = await asyncio.wait_for(_collect(runner), timeout=20)
+
+        results = [e for e in events if e.message_type == MessageType.RESULT]
+        assert len(results) == 1
+        assert results[0].error is not None
+        assert results[0].error.startswith("CLI exited with code 3: …")
+        assert results[0].error.endswith("fatal: the real reason")
+        assert runner.stderr_tail is not None
+        assert runner.stderr_tail.total_lines == 4001
+        assert runner.stderr_tail.total_bytes > 256 * 1024
+
+    async def test_codex_turn_does_not_hang_and_reports_the_tail(self, noisy_cli: str) -> None:
+        runner = CodexRunner(command=noisy_cli)
+
+        events = await asyncio.wait_for(_collect(runner), timeout=20)
+
+        assert len(events) == 1
+        assert events[0].error is not None
+        assert events[0].error.endswith("fatal: the real reason")
+
+
+async def _collect(runner: ClaudeRunner | CodexRunner) -> list:
+    return [event async for event in runner.run("hello")]
@@ -0,0 +1,161 @@
+"""Tests for the shared stream decoding layer (claude_code_core.stream_decode)."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+
+from claude_code_core.codex_runner import parse_codex_line
+from claude_code_core.parser import parse_line, parse_line_bytes
+from claude_code_core.stream_decode import (
+    DecodeStats,
+    Dispatcher,
+    FrameTooLargeError,
+    LineFramer,
+    MalformedFrameError,
+    NotAnObjectError,
+    SseDecoder,
+    decode_json_object,
+    read_line,
+)
+from claude_code_core.types import MessageType
+
+
+def _reader(data: bytes, limit: int = 2**16) -> asyncio.StreamReader:
+    reader = asyncio.StreamReader(limit=limit)
+    reader.feed_data(data)
+    reader.feed_eof()
+    return reader
+
+
+class TestReadLine:
+    async def test_counts_lines_and_bytes(self) -> None:
+        stats = DecodeStats()
+        reader = _reader(b"one\ntwo\n")
+
+        assert await read_line(reader, stats) == b"one\n"
+        assert await read_line(reader, stats) == b"two\n"
+        assert await read_line(reader, stats) is None
+        assert (stats.lines, stats.bytes) == (2, 8)
+
+    async def test_an_over_long_line_is_dropped_not_raised(self) -> None:
+        stats = DecodeStats()
+        reader = _reader(b"x" * 100 + b"\n" + b'{"type":"result"}\n', limit=32)
+
+        assert await read_line(reader, stats) == b'{"type":"result"}\n'
+        assert stats.oversized == 1
+
+
+class TestDecodeJsonObject:
+    def test_rejects_json_that_is_not_an_object(self) -> None:
+        stats = DecodeStats()
+        with pytest.raises(NotAnObjectError):
+            decode_json_object(b"[1, 2]", stats)
+        assert stats.malformed == 1
+
+    def test_invalid_utf8_is_strict_by_default(self) -> None:
+        with pytest.raises(MalformedFrameError):
+            decode_json_object(b'{"text": "\xff"}')
+        assert decode_json_object(b'{"text": "\xff"}', errors="replace") == {"text": "�"}
+
+
+class TestDispatcher:
+    def test_unknown_and_non_string_types_are_counted(self) -> None:
+        stats = DecodeStats()
+        dispatch = Dispatcher({"a": lambda data: data["n"]})
+
+        assert dispatch({"type": "a", "n": 1}, stats) == 1
+        assert dispatch({"type": "b"}, stats) is None
+        assert dispatch({"type": ["a"]}, stats) is None
+        assert stats.unknown == 2
+
+
+class TestLineFramer:
+    def test_lines_split_across_chunks_and_crlf(self) -> None:
+        framer = LineFramer()
+
+        assert framer.feed(b"hel") == []
+        assert framer.feed(b"lo\r\nwor") == [b"hello"]
+        assert framer.feed(b"ld\n\n") == [b"world", b""]
+        assert framer.finish() is None
+
+    def test_unterminated_tail_is_returned_at_the_end(self) -> None:
+        framer = LineFramer()
+        framer.feed(b"a\nb")
+        assert framer.finish() == b"b"
+
+    def test_a_line_that_never_ends_is_bounded(self) -> None:
+        framer = LineFramer(max_line_bytes=10)
+        framer.feed(b"x" * 6)
+        with pytest.raises(FrameTooLargeError):
+            framer.feed(b"x" * 6)
+
+
+class TestSseDecoder:
+    STREAM = (
+        b": keep-alive\n"
+        b"event: message\n"
+        b'data: {"type": "A",\n'
+        b'data:  "n": 1}\n'
+        b"\n"
+        b"id: 2\r\n"
+        b'data: {"type": "B"}\r\n'
+        b"\r\n"
+    )
+
+    def test_any_chunking_yields_the_same_payloads(self) -> None:
+        whole = SseDecoder(max_event_bytes=1024).feed(self.STREAM)
+        assert [json.loads(p) for p in whole] == [{"type": "A", "n": 1}, {"type": "B"}]
+
+        for size in (1, 2, 7):
+            decoder = SseDecoder(max_event_bytes=1024)
+            payloads = []
+            for i in range(0, len(self.STREAM), size):
+                payloads.extend(decoder.feed(self.STREAM[i : i + size]))
+            assert payloads == whole
+
+    def test_unterminated_event_is_flushed(self) -> None:
+        decoder = SseDecoder(max_event_bytes=1024)
+        assert decoder.feed(b'data: {"type": "A"}') == []
+        assert decoder.finish() == b'{"type": "A"}'
+
+    def test_an_event_is_bounded_across_its_lines(self) -> None:
+        decoder = SseDecoder(max_event_bytes=32)
+        with pytest.raises(FrameTooLargeError):
+            decoder.feed(b"data: 0123456789\n" * 3)
+
+
+class TestBackendParsersShareTheLayer:
+    def test_claude_parser_survives_a_non_object_line(self) -> None:
+        stats = DecodeStats()
+
+        assert parse_line("[]") is None
+        assert parse_line_bytes(b'"just a string"\n', stats) is None
+        assert stats.malformed == 1
+
+    def test_claude_parser_counts_skips_and_unknown_types(self) -> None:
+        stats = DecodeStats()
+        parse_line_bytes(b'{"type":"stream_event","event":{"type":"content_block_delta"}}', stats)
+        parse_line_bytes(b'{"type":"brand_new_event"}', stats)
+
+        assert (stats.skipped, stats.unknown) == (1, 1)
+
+    def test_claude_dispatch_builds_typed_events(self) -> None:
+        event = parse_line_bytes(b'{"type":"result","session_id":"s1","result":"ok"}')
+
+        assert event is not None
+        assert event.message_type == MessageType.RESULT
+        assert event.is_complete
+
+    def test_codex_parser_accepts_bytes_and_counts(self) -> None:
+        stats = DecodeStats()
+
+        event = parse_codex_line(b'{"type":"thread.started","thread_id":"t1"}\n', stats)
+        assert event is not None
+        assert event.session_id == "t1"
+        assert parse_codex_line(b"not json", stats) is None
+        assert parse_codex_line(b'{"type":"turn.paused"}', stats) is None
+        assert parse_codex_line(b'{"type":"item.completed","item":"oops"}', stats) is None
+        assert (stats.malformed, stats.unknown) == (1, 1)
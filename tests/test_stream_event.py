@@ -0,0 +1,83 @@
+"""Footprint of StreamEvent — one is allocated per stream line, per session."""
+
+from __future__ import annotations
+
+import json
+import sys
+import tracemalloc
+from collections.abc import Iterator
+
+import pytest
+
+from claude_code_core.codex_runner import parse_codex_line
+from claude_code_core.types import MessageType, StreamEvent, set_keep_raw
+
+# A slotted StreamEvent is its fields' pointers plus the object and GC headers.
+# Adding a field costs 8 bytes; anything over this bound means per-instance
+# state crept back in (a __dict__, a per-event raw dict, ...).
+MAX_BYTES_PER_EVENT = 320
+
+_AGENT_MESSAGE = json.dumps(
+    {
+        "type": "item.completed",
+        "item": {"id": "item_1", "type": "agent_message", "text": "Done."},
+    }
+)
+
+
+@pytest.fixture
+def keep_raw() -> Iterator[None]:
+    set_keep_raw(True)
+    yield
+    set_keep_raw(False)
+
+
+class TestLayout:
+    def test_has_no_instance_dict(self) -> None:
+        event = StreamEvent(message_type=MessageType.ASSISTANT, text="hi")
+
+        assert not hasattr(event, "__dict__")
+        with pytest.raises(AttributeError):
+            event.not_a_field = 1  # type: ignore[attr-defined]
+
+    def test_object_size_is_pinned(self) -> None:
+        assert sys.getsizeof(StreamEvent(message_type=MessageType.PROGRESS)) <= MAX_BYTES_PER_EVENT
+
+    def test_bytes_per_event_including_allocations(self) -> None:
+        count = 10_000
+        tracemalloc.start()
+        try:
+            before = tracemalloc.take_snapshot()
+            events = [StreamEvent(message_type=MessageType.PROGRESS) for _ in range(count)]
+            after = tracemalloc.take_snapshot()
+        finally:
+            tracemalloc.stop()
+
+        allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+        # The list holding them is 8 bytes per event on top.
+        assert allocated / count <= MAX_BYTES_PER_EVENT + 8
+        assert len(events) == count
+
+
+class TestRawRetention:
+    def test_parsed_events_drop_raw_by_default(self) -> None:
+        event = parse_codex_line(_AGENT_MESSAGE)
+
+        assert event is not None
+        assert event.text == "Done."
+        assert event.raw == {}
+
+    def test_default_raw_is_shared_and_read_only(self) -> None:
+        a = StreamEvent(message_type=MessageType.SYSTEM)
+        b = StreamEvent(message_type=MessageType.SYSTEM)
+
+        assert a.raw is b.raw
+        with pytest.raises(TypeError):
+            a.raw["key"] = "value"  # type: ignore[index]
+
+    @pytest.mark.usefixtures("keep_raw")
+    def test_debug_mode_keeps_the_source_json(self) -> None:
+        event = parse_codex_line(_AGENT_MESSAGE)
+
+        assert event is not None
+        assert event.raw["item"]["type"] == "agent_message"
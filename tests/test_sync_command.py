@@ -68,7 +68,7 @@ def _make_cog(
     repo.get = AsyncMock(return_value=None)
     repo.save = AsyncMock(return_value=_make_record())
     repo.list_all = AsyncMock(return_value=[])
-    repo.get_by_session_id = AsyncMock(return_value=None)
+    repo.get_by_session_ids = AsyncMock(return_value={})
     return SessionManageCog(bot=bot, repo=repo, cli_sessions_path=cli_sessions_path)
 
 
@@ -117,7 +117,7 @@ class TestSyncSessions:
 
         cog = _make_cog(cli_sessions_path=str(tmp_path))
         # Session not yet in DB
-        cog.repo.get_by_session_id = AsyncMock(return_value=None)
+        cog.repo.get_by_session_ids = AsyncMock(return_value={})
         interaction = _make_channel_interaction()
         await cog.sync_sessions.callback(cog, interaction)
 
@@ -152,8 +152,8 @@ class TestSyncSessions:
 
         cog = _make_cog(cli_sessions_path=str(tmp_path))
         # Session already in DB
-        cog.repo.get_by_session_id = AsyncMock(
-            return_value=_make_record(session_id=session_id, origin="cli")
+        cog.repo.get_by_session_ids = AsyncMock(
+            return_value={session_id: _make_record(session_id=session_id, origin="cli")}
         )
         interaction = _make_channel_interaction()
         await cog.sync_sessions.callback(cog, interaction)
@@ -188,7 +188,7 @@ class TestSyncSessionsEmbed:
                 )
 
         cog = _make_cog(cli_sessions_path=str(tmp_path))
-        cog.repo.get_by_session_id = AsyncMock(return_value=None)
+        cog.repo.get_by_session_ids = AsyncMock(return_value={})
         interaction = _make_channel_interaction()
         await cog.sync_sessions.callback(cog, interaction)
 
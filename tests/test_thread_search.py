@@ -93,3 +93,27 @@ async def test_body_does_not_duplicate_existing_summary_thread(
     )
     thread_ids = [r.thread_id for r in results if r.thread_id == 1]
     assert len(thread_ids) == 1  # not duplicated
+
+
+async def test_body_hits_are_resolved_in_one_lookup(repo: SessionRepository, tmp_path) -> None:
+    other = "dddddddd-dddd-dddd-dddd-dddddddddddd"
+    for sid in (_SID_MAPPED, _SID_ORPHAN, other):
+        _write_transcript(tmp_path / f"{sid}.jsonl", "the firewall rule changed")
+    calls: list[list[str]] = []
+    lookup = repo.get_by_session_ids
+
+    async def counting(session_ids):
+        calls.append(list(session_ids))
+        return await lookup(session_ids)
+
+    repo.get_by_session_ids = counting  # type: ignore[method-assign]
+    results = await run_thread_search(
+        session_repo=repo,
+        query="firewall",
+        include_body=True,
+        transcripts_root=str(tmp_path),
+    )
+
+    assert len(calls) == 1 and sorted(calls[0]) == sorted([_SID_MAPPED, _SID_ORPHAN, other])
+    assert [r.thread_id for r in results].count(None) == 2
+    assert 2 in {r.thread_id for r in results}
@@ -0,0 +1,97 @@
+"""Tests for the shared deadline timer (claude_code_core.timer_service)."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from claude_code_core.timer_service import TimerService
+
+
+class _Source:
+    def __init__(self, due_at: float | None = None) -> None:
+        self.due_at = due_at
+        self.reads = 0
+        self.fired = asyncio.Event()
+        self.fires = 0
+
+    async def next_due(self) -> float | None:
+        self.reads += 1
+        return self.due_at
+
+    async def fire(self) -> None:
+        self.fires += 1
+        self.due_at = None
+        self.fired.set()
+
+
+@pytest.fixture
+async def timers():
+    service = TimerService()
+    yield service
+    service.stop()
+
+
+class TestTimerService:
+    async def test_fires_at_the_deadline(self, timers: TimerService) -> None:
+        source = _Source(time.time() + 0.05)
+        timers.add_source("a", next_due=source.next_due, fire=source.fire)
+        timers.start()
+
+        await asyncio.wait_for(source.fired.wait(), timeout=1)
+        assert source.fires == 1
+
+    async def test_wake_re_reads_a_changed_deadline(self, timers: TimerService) -> None:
+        source = _Source(time.time() + 3600)
+        timers.add_source("a", next_due=source.next_due, fire=source.fire)
+        timers.start()
+        await asyncio.sleep(0.01)
+        assert source.fires == 0
+
+        source.due_at = time.time()
+        timers.wake("a")
+
+        await asyncio.wait_for(source.fired.wait(), timeout=1)
+
+    async def test_idle_sources_are_not_re_read(self, timers: TimerService) -> None:
+        source = _Source(None)
+        timers.add_source("a", next_due=source.next_due, fire=source.fire)
+        timers.start()
+        await asyncio.sleep(0.05)
+
+        assert source.reads == 1
+
+    async def test_a_fire_that_leaves_rows_due_is_not_a_hot_loop(
+        self, timers: TimerService
+    ) -> None:
+        fires = 0
+
+        async def next_due() -> float:
+            return 0.0
+
+        async def fire() -> None:
+            nonlocal fires
+            fires += 1
+
+        timers.add_source("stuck", next_due=next_due, fire=fire)
+        timers.start()
+        await asyncio.sleep(0.2)
+
+        assert fires == 1
+
+    async def test_one_failing_source_does_not_stop_the_others(self, timers: TimerService) -> None:
+        async def broken() -> float:
+            raise RuntimeError("database is locked")
+
+        good = _Source(time.time())
+        timers.add_source("broken", next_due=broken, fire=good.fire)
+        timers.add_source("good", next_due=good.next_due, fire=good.fire)
+        timers.start()
+
+        await asyncio.wait_for(good.fired.wait(), timeout=1)
+
+    def test_rejects_nonsense_intervals(self) -> None:
+        with pytest.raises(ValueError):
+            TimerService(max_sleep_seconds=0)
@@ -0,0 +1,167 @@
+"""Tests for pre-warming a thread's next CLI process while its user types."""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock
+
+import discord
+import pytest
+
+from claude_code_core.persistent_process import PersistentProcessRegistry
+from claude_code_core.process_pool import WarmProcessPool
+from claude_discord.claude.runner import ClaudeRunner
+from claude_discord.cogs.claude_chat import ClaudeChatCog
+from claude_discord.concurrency import SessionRegistry
+from claude_discord.database.repository import SessionRecord
+from claude_discord.typing_prewarm import TypingPrewarmer
+
+CHANNEL_ID = 999
+THREAD_ID = 4242
+USER_ID = 7
+
+
+class TestTypingPrewarmer:
+    def test_a_thread_is_prewarmed_once_per_ttl(self) -> None:
+        gate = TypingPrewarmer(ttl_seconds=30)
+
+        assert gate.admit(USER_ID, THREAD_ID, now=0.0)
+        # Discord repeats the typing event every few seconds.
+        assert not gate.admit(USER_ID, THREAD_ID, now=8.0)
+        assert gate.admit(USER_ID, THREAD_ID, now=31.0)
+        assert (gate.stats.admitted, gate.stats.recent) == (2, 1)
+
+    def test_a_user_holds_at_most_max_per_user(self) -> None:
+        gate = TypingPrewarmer(ttl_seconds=30, max_per_user=2)
+
+        assert gate.admit(USER_ID, 1, now=0.0)
+        assert gate.admit(USER_ID, 2, now=0.0)
+        assert not gate.admit(USER_ID, 3, now=0.0)
+        assert gate.admit(USER_ID + 1, 3, now=0.0)
+        assert gate.stats.capped == 1
+
+    def test_release_frees_the_slot(self) -> None:
+        gate = TypingPrewarmer(max_per_user=1)
+        gate.admit(USER_ID, 1, now=0.0)
+
+        gate.release(1)
+
+        assert gate.admit(USER_ID, 2, now=1.0)
+
+    def test_rejects_nonsense_limits(self) -> None:
+        with pytest.raises(ValueError):
+            TypingPrewarmer(ttl_seconds=0)
+        with pytest.raises(ValueError):
+            TypingPrewarmer(max_per_user=0)
+
+
+class TestRunnerPrewarm:
+    def test_builds_a_resume_of_the_session_with_the_given_ttl(self) -> None:
+        pool = MagicMock(spec=WarmProcessPool)
+        runner = ClaudeRunner(process_pool=pool, thread_id=THREAD_ID)
+
+        assert runner.prewarm("abc-123", ttl_seconds=15)
+
+        args = pool.replenish.call_args.args[0]
+        assert args[args.index("--resume") + 1] == "abc-123"
+        assert pool.replenish.call_args.kwargs["ttl_seconds"] == 15
+
+    def test_a_kept_alive_process_makes_it_a_no_op(self) -> None:
+        pool = MagicMock(spec=WarmProcessPool)
+        kept = MagicMock(spec=PersistentProcessRegistry)
+        kept.is_parked.return_value = True
+        runner = ClaudeRunner(process_pool=pool, persistent_processes=kept, thread_id=THREAD_ID)
+
+        assert not runner.prewarm("abc-123")
+        pool.replenish.assert_not_called()
+
+    def test_without_a_pool_nothing_happens(self) -> None:
+        assert not ClaudeRunner().prewarm("abc-123")
+
+
+def _thread() -> MagicMock:
+    thread = MagicMock(spec=discord.Thread)
+    thread.id = THREAD_ID
+    thread.parent_id = CHANNEL_ID
+    return thread
+
+
+def _user() -> MagicMock:
+    user = MagicMock()
+    user.id = USER_ID
+    user.bot = False
+    return user
+
+
+def _cog(
+    *, prewarmer: TypingPrewarmer | None, record: SessionRecord | None
+) -> tuple[ClaudeChatCog, MagicMock]:
+    pool = MagicMock(spec=WarmProcessPool)
+    repo = MagicMock()
+    repo.get = AsyncMock(return_value=record)
+    cog = ClaudeChatCog(
+        bot=MagicMock(spec=[]),
+        repo=repo,
+        runner=ClaudeRunner(process_pool=pool),
+        channel_ids={CHANNEL_ID},
+        registry=SessionRegistry(),
+        prewarmer=prewarmer,
+    )
+    return cog, pool
+
+
+def _record() -> SessionRecord:
+    return SessionRecord(
+        thread_id=THREAD_ID,
+        session_id="abc-123",
+        working_dir="/tmp",
+        model=None,
+        origin="discord",
+        summary=None,
+        created_at="",
+        last_used_at="",
+    )
+
+
+class TestOnTyping:
+    async def test_typing_prewarms_the_threads_next_turn(self) -> None:
+        cog, pool = _cog(prewarmer=TypingPrewarmer(ttl_seconds=20), record=_record())
+
+        await cog.on_typing(_thread(), _user(), None)
+
+        args = pool.replenish.call_args.args[0]
+        assert args[args.index("--resume") + 1] == "abc-123"
+        # The same system context the turn will append, or the process never matches.
+        assert str(THREAD_ID) in args[args.index("--append-system-prompt") + 1]
+        assert pool.replenish.call_args.kwargs["cwd"] == "/tmp"
+        assert pool.replenish.call_args.kwargs["ttl_seconds"] == 20
+
+    async def test_repeated_typing_prewarms_once(self) -> None:
+        cog, pool = _cog(prewarmer=TypingPrewarmer(), record=_record())
+
+        await cog.on_typing(_thread(), _user(), None)
+        await cog.on_typing(_thread(), _user(), None)
+
+        assert pool.replenish.call_count == 1
+
+    async def test_nothing_to_resume_means_nothing_to_prewarm(self) -> None:
+        cog, pool = _cog(prewarmer=TypingPrewarmer(), record=None)
+
+        await cog.on_typing(_thread(), _user(), None)
+
+        pool.replenish.assert_not_called()
+
+    async def test_disabled_by_default(self) -> None:
+        cog, pool = _cog(prewarmer=None, record=_record())
+
+        await cog.on_typing(_thread(), _user(), None)
+
+        pool.replenish.assert_not_called()
+        cog.repo.get.assert_not_called()
+
+    async def test_a_running_thread_is_left_alone(self) -> None:
+        cog, pool = _cog(prewarmer=TypingPrewarmer(), record=_record())
+        cog._active_runners[THREAD_ID] = MagicMock()
+
+        await cog.on_typing(_thread(), _user(), None)
+
+        pool.replenish.assert_not_called()
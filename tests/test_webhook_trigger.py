@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import aiohttp
@@ -330,47 +331,99 @@ class TestTriggerExecution:
 
 
 class TestConcurrency:
-    """Test concurrent execution prevention."""
+    """Test coalescing of hits while a trigger's run is pending or active."""
 
     @pytest.mark.asyncio
-    async def test_concurrent_same_prefix_blocked(
+    async def test_hits_during_a_run_are_merged_into_it(
         self,
         cog: WebhookTriggerCog,
     ) -> None:
-        """Concurrent runs of same prefix should be blocked."""
-        lock = cog._locks["🔄 docs-sync"]
-        msg = _make_message(content="🔄 docs-sync")
+        """A CI storm of identical hits costs one run, and every hit gets its outcome."""
+        first = _make_message(content="🔄 docs-sync")
+        first.jump_url = "https://discord.com/first"
+        thread = first.create_thread.return_value
+        thread.mention = "<#1>"
+        started = asyncio.Event()
+        finish = asyncio.Event()
+
+        async def fake_run(config: object) -> str:
+            started.set()
+            await finish.wait()
+            return "session-abc"
+
+        with patch(_PATCH_RUN, side_effect=fake_run) as mock_run:
+            task = asyncio.create_task(cog.on_message(first))
+            await started.wait()
+            storm = [_make_message(content="🔄 docs-sync") for _ in range(3)]
+            for i, msg in enumerate(storm):
+                msg.jump_url = f"https://discord.com/hit{i}"
+                await cog.on_message(msg)
+            finish.set()
+            await task
+
+        assert mock_run.call_count == 1
+        assert "already running" in storm[0].reply.call_args[0][0]
+        assert "(4 hits)" in storm[-1].reply.call_args[0][0]
+        for msg in (first, *storm):
+            msg.add_reaction.assert_called_with("✅")
+        summary = thread.send.call_args[0][0]
+        assert "3 more webhook hit(s)" in summary and "https://discord.com/hit2" in summary
+        assert cog.coalesced_count == 3
+
+        # The trigger is free again once the run is over.
+        with patch(_PATCH_RUN, new_callable=AsyncMock) as mock_run:
+            await cog.on_message(_make_message(content="🔄 docs-sync"))
+            mock_run.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_debounce_collapses_a_burst_before_the_run_starts(
+        self,
+        bot: MagicMock,
+        runner: MagicMock,
+    ) -> None:
+        cog = WebhookTriggerCog(
+            bot=bot,
+            runner=runner,
+            triggers={"🔄 ci": WebhookTrigger(prompt="Triage", debounce_seconds=0.05)},
+        )
+        burst = [_make_message(content="🔄 ci") for _ in range(3)]
 
-        await lock.acquire()
-        try:
-            with patch(_PATCH_RUN) as mock_run:
+        with patch(_PATCH_RUN, new_callable=AsyncMock) as mock_run:
+            mock_run.return_value = "session-abc"
+            first = asyncio.create_task(cog.on_message(burst[0]))
+            await asyncio.sleep(0)
+            assert cog.active_count == 1
+            for msg in burst[1:]:
                 await cog.on_message(msg)
-                mock_run.assert_not_called()
-                msg.reply.assert_called_once()
-                assert "already running" in msg.reply.call_args[0][0]
-        finally:
-            lock.release()
+            await first
+
+        mock_run.assert_called_once()
+        assert "already pending" in burst[1].reply.call_args[0][0]
+        burst[0].create_thread.return_value.send.assert_called_once()
+        assert cog.active_count == 0
 
     @pytest.mark.asyncio
     async def test_different_prefix_not_blocked(
         self,
         cog: WebhookTriggerCog,
     ) -> None:
-        """Different prefixes should have independent locks."""
-        lock = cog._locks["🔄 docs-sync"]
-        msg = _make_message(content="🔄 deploy")
-
-        await lock.acquire()
-        try:
-            with patch(
-                _PATCH_RUN,
-                new_callable=AsyncMock,
-            ) as mock_run:
-                mock_run.return_value = "session-abc"
-                await cog.on_message(msg)
-                mock_run.assert_called_once()
-        finally:
-            lock.release()
+        """Different prefixes coalesce independently."""
+        started = asyncio.Event()
+        finish = asyncio.Event()
+
+        async def fake_run(config: object) -> str:
+            if config.prompt == "Sync docs":
+                started.set()
+                await finish.wait()
+            return "session-abc"
+
+        with patch(_PATCH_RUN, side_effect=fake_run) as mock_run:
+            task = asyncio.create_task(cog.on_message(_make_message(content="🔄 docs-sync")))
+            await started.wait()
+            await cog.on_message(_make_message(content="🔄 deploy"))
+            assert mock_run.call_count == 2
+            finish.set()
+            await task
 
 
 class TestActiveCount:
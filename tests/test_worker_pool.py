@@ -0,0 +1,317 @@
+"""Tests for worker mode: the job table, the event wire format and the socket hand-off.
+
+The end-to-end tests run the worker loop in-process (``run_worker`` with a fake
+backend builder) against a real :class:`WorkerPool` socket, so everything but
+the subprocess spawn is exercised.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from collections.abc import AsyncGenerator
+
+import pytest
+
+from claude_code_core.event_wire import decode_event, encode_event
+from claude_code_core.job_queue import JobQueue
+from claude_code_core.session_worker import run_job, run_worker
+from claude_code_core.types import (
+    AskOption,
+    AskQuestion,
+    HookEvent,
+    ImageData,
+    MessageType,
+    RateLimitInfo,
+    StreamEvent,
+    TodoItem,
+    ToolCategory,
+    ToolUseEvent,
+)
+from claude_code_core.worker_pool import WorkerBackend, WorkerPool
+from claude_discord.backend_factory import BackendFactory
+
+
+class FakeRunner:
+    """Stands in for ClaudeRunner on both sides of the socket."""
+
+    built: list[FakeRunner] = []
+
+    def __init__(self, **spec: object) -> None:
+        self.spec = spec
+        self.command = spec.get("command", "claude")
+        self.model = spec.get("model", "sonnet")
+        self.working_dir = spec.get("working_dir")
+        self.permission_mode = "acceptEdits"
+        self.images = spec.get("images")
+        self.api_port = None
+        self.api_secret = spec.get("api_secret")
+        self.timeout_seconds = 300
+        self.dangerously_skip_permissions = False
+        self.allowed_tools = None
+        self.interrupted = asyncio.Event()
+        self.tool_results: list[tuple[str, dict]] = []
+        FakeRunner.built.append(self)
+
+    async def run(
+        self, prompt: str, session_id: str | None = None
+    ) -> AsyncGenerator[StreamEvent, None]:
+        yield StreamEvent(message_type=MessageType.SYSTEM, session_id=session_id or "new")
+        yield StreamEvent(message_type=MessageType.ASSISTANT, text=f"echo: {prompt}")
+        if prompt == "wait":
+            await self.interrupted.wait()
+        yield StreamEvent(message_type=MessageType.RESULT, is_complete=True, cost_usd=0.01)
+
+    def clone(self, **kwargs: object) -> FakeRunner:
+        return FakeRunner(**{**self.spec, **kwargs})
+
+    async def interrupt(self) -> None:
+        self.interrupted.set()
+
+    async def kill(self) -> None:
+        self.interrupted.set()
+
+    async def inject_tool_result(self, request_id: str, data: dict) -> None:
+        self.tool_results.append((request_id, data))
+
+    def _build_env(self) -> dict[str, str]:
+        return {}
+
+    def describe_api(self) -> str:
+        return ""
+
+
+def _build(*, backend: str, **spec: object) -> FakeRunner:
+    return FakeRunner(backend=backend, **spec)
+
+
+@pytest.fixture
+async def pool(tmp_path):
+    FakeRunner.built.clear()
+    worker_pool = WorkerPool(JobQueue(str(tmp_path / "jobs.db")), processes=0)
+    await worker_pool.start()
+    yield worker_pool
+    await worker_pool.close()
+
+
+@contextlib.asynccontextmanager
+async def _worker(pool: WorkerPool):
+    task = asyncio.create_task(
+        run_worker(pool.queue, pool.socket_path, name="w0", poll_seconds=0.05, build=_build)
+    )
+    try:
+        yield task
+    finally:
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+
+
+async def _final_status(queue: JobQueue, job_id: int) -> str:
+    """The job's status once its worker has recorded the outcome."""
+    for _ in range(100):
+        job = await queue.get(job_id)
+        if job is not None and job.status != "running":
+            return job.status
+        await asyncio.sleep(0.01)
+    return "running"
+
+
+async def _collect(gen: AsyncGenerator[StreamEvent, None]) -> list[StreamEvent]:
+    return [event async for event in gen]
+
+
+class TestEventWire:
+    def test_round_trips_every_nested_type(self) -> None:
+        event = StreamEvent(
+            message_type=MessageType.ASSISTANT,
+            session_id="s1",
+            tool_use=ToolUseEvent("t1", "Bash", {"command": "ls"}, ToolCategory.COMMAND),
+            ask_questions=[AskQuestion("Which?", options=[AskOption("a", "first")])],
+            todo_list=[TodoItem("write tests", "in_progress", "Writing tests")],
+            rate_limit_info=RateLimitInfo("five_hour", "allowed", 0.5, 1_700_000_000),
+            hook_event=HookEvent("Stop", exit_code=1),
+            input_tokens=12,
+        )
+        assert decode_event(encode_event(event)) == event
+
+    def test_default_fields_are_not_written(self) -> None:
+        data = encode_event(StreamEvent(message_type=MessageType.ASSISTANT, text="hi"))
+        assert data == {"message_type": "assistant", "text": "hi"}
+
+
+class TestJobQueue:
+    async def test_claims_oldest_first_and_never_twice(self, tmp_path) -> None:
+        queue = JobQueue(str(tmp_path / "jobs.db"))
+        await queue.init_db()
+        first = await queue.enqueue(owner="o", backend="claude", spec={}, prompt="one")
+        await queue.enqueue(owner="o", backend="claude", spec={}, prompt="two")
+
+        claims = await asyncio.gather(queue.claim("a"), queue.claim("b"), queue.claim("c"))
+
+        claimed = sorted(job.prompt for job in claims if job is not None)
+        assert claimed == ["one", "two"]
+        job = await queue.get(first)
+        assert job is not None and job.status == "running" and job.worker in ("a", "b", "c")
+
+    async def test_finish_cancel_and_abandon(self, tmp_path) -> None:
+        queue = JobQueue(str(tmp_path / "jobs.db"))
+        await queue.init_db()
+        done = await queue.enqueue(owner="o", backend="claude", spec={"model": "x"}, prompt="p")
+        assert (await queue.claim("w")).spec == {"model": "x"}
+        await queue.finish(done, error="boom")
+        assert await queue.cancel(done) is False
+
+        queued = await queue.enqueue(owner="o", backend="claude", spec={}, prompt="p")
+        assert await queue.cancel(queued) is True
+        left = await queue.enqueue(owner="o", backend="claude", spec={}, prompt="p")
+
+        assert await queue.abandon() == 1
+        assert (await queue.get(done)).status == "failed"
+        assert (await queue.get(queued)).status == "cancelled"
+        assert (await queue.get(left)).status == "abandoned"
+
+
+class TestWorkerBackend:
+    async def test_turn_runs_in_the_worker_and_streams_back(self, pool: WorkerPool) -> None:
+        backend = WorkerBackend(FakeRunner(api_secret="s3cret"), pool, backend="claude")
+        backend.working_dir = "/repo"
+        backend.images = [ImageData(data="AAAA", media_type="image/png")]
+
+        async with _worker(pool):
+            events = await _collect(backend.run("hello", "sess-1"))
+            assert await _final_status(pool.queue, 1) == "done"
+
+        assert [e.text for e in events if e.text] == ["echo: hello"]
+        assert events[0].session_id == "sess-1"
+        assert events[-1].is_complete and events[-1].cost_usd == 0.01
+        worker_side = FakeRunner.built[-1]
+        assert worker_side.spec["backend"] == "claude"
+        assert worker_side.working_dir == "/repo"
+        assert worker_side.images == [ImageData(data="AAAA", media_type="image/png")]
+        assert worker_side.api_secret == "s3cret"
+        job = await pool.queue.get(1)
+        assert job is not None and "api_secret" not in job.spec
+
+    async def test_interrupt_and_tool_results_reach_the_worker(self, pool: WorkerPool) -> None:
+        backend = WorkerBackend(FakeRunner(), pool, backend="claude")
+
+        async with _worker(pool):
+            gen = backend.run("wait")
+            seen = [await anext(gen), await anext(gen)]
+            await backend.inject_tool_result("req-1", {"ok": True})
+            await backend.interrupt()
+            seen += await _collect(gen)
+
+        assert seen[-1].is_complete
+        assert FakeRunner.built[-1].tool_results == [("req-1", {"ok": True})]
+
+    async def test_a_lost_worker_ends_the_turn_with_an_error(self, pool: WorkerPool) -> None:
+        backend = WorkerBackend(FakeRunner(), pool, backend="claude")
+
+        async with _worker(pool) as worker:
+            gen = backend.run("wait")
+            await anext(gen)
+            await anext(gen)
+            worker.cancel()
+            rest = await _collect(gen)
+
+        assert rest[-1].error and "worker" in rest[-1].error
+        assert pool.stats.lost == 1
+
+    async def test_kill_before_any_worker_claims_cancels_the_job(self, pool: WorkerPool) -> None:
+        backend = WorkerBackend(FakeRunner(), pool, backend="claude")
+        gen = backend.run("never")
+        pending = asyncio.ensure_future(anext(gen))
+        await asyncio.sleep(0.05)
+
+        await backend.kill()
+
+        with pytest.raises(StopAsyncIteration):
+            await pending
+        job = await pool.queue.get(1)
+        assert job is not None and job.status == "cancelled"
+
+    async def test_a_worker_that_attaches_before_submit_returns_runs_the_turn(
+        self, pool: WorkerPool
+    ) -> None:
+        enqueue = pool.queue.enqueue
+        attached: list[asyncio.Task[None]] = []
+
+        async def enqueue_then_stall(**kwargs: object) -> int:
+            job_id = await enqueue(**kwargs)  # type: ignore[arg-type]
+            job = await pool.queue.claim("w0")
+            assert job is not None
+            attached.append(
+                asyncio.create_task(run_job(job, pool.queue, pool.socket_path, build=_build))
+            )
+            await asyncio.sleep(0.05)  # the worker attaches while this is still running
+            return job_id
+
+        pool.queue.enqueue = enqueue_then_stall  # type: ignore[method-assign]
+        backend = WorkerBackend(FakeRunner(), pool, backend="claude")
+        events = await asyncio.wait_for(_collect(backend.run("hello")), timeout=5)
+        await attached[0]
+
+        assert [e.text for e in events if e.text] == ["echo: hello"]
+        assert await _final_status(pool.queue, 1) == "done"
+
+    async def test_a_worker_lost_between_claim_and_attach_fails_the_turn(
+        self, pool: WorkerPool
+    ) -> None:
+        pool.check_seconds, pool.attach_timeout_seconds = 0.02, 0.1
+        backend = WorkerBackend(FakeRunner(), pool, backend="claude")
+        gen = backend.run("hello")
+        pending = asyncio.ensure_future(anext(gen))
+        await asyncio.sleep(0.01)
+        assert await pool.queue.claim("w0") is not None  # ...and the worker dies
+
+        event = await asyncio.wait_for(pending, timeout=5)
+
+        assert event.error and "never started" in event.error
+        assert await _collect(gen) == []
+        assert await _final_status(pool.queue, 1) == "failed"
+        assert pool.stats.lost == 1
+
+    async def test_a_row_finished_without_a_worker_fails_the_turn(self, pool: WorkerPool) -> None:
+        pool.check_seconds = 0.02
+        backend = WorkerBackend(FakeRunner(), pool, backend="claude")
+        gen = backend.run("hello")
+        pending = asyncio.ensure_future(anext(gen))
+        await asyncio.sleep(0.01)
+        await pool.queue.abandon()
+
+        event = await asyncio.wait_for(pending, timeout=5)
+
+        assert event.error and "abandoned" in event.error
+
+    def test_clone_stays_in_worker_mode(self, pool: WorkerPool) -> None:
+        backend = WorkerBackend(FakeRunner(), pool, backend="codex")
+        clone = backend.clone(model="opus")
+        assert isinstance(clone, WorkerBackend)
+        assert clone.model == "opus"
+
+
+class TestFactoryWiring:
+    def _factory(self, pool: WorkerPool) -> BackendFactory:
+        return BackendFactory(
+            claude_command="claude",
+            codex_command="codex",
+            permission_mode="acceptEdits",
+            working_dir=None,
+            timeout_seconds=300,
+            dangerously_skip_permissions=False,
+            allowed_tools=None,
+            append_system_prompt=None,
+            effort=None,
+            agui_url="http://localhost:9",
+            worker_pool=pool,
+        )
+
+    def test_cli_backends_are_wrapped(self, pool: WorkerPool) -> None:
+        factory = self._factory(pool)
+        assert isinstance(factory.build(backend="claude"), WorkerBackend)
+        assert isinstance(factory.build(backend="codex"), WorkerBackend)
+
+    def test_agui_is_not_wrapped(self, pool: WorkerPool) -> None:
+        assert not isinstance(self._factory(pool).build(backend="agui"), WorkerBackend)
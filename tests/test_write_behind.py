@@ -0,0 +1,129 @@
+"""Tests for the write-behind buffer (claude_code_core.write_behind)."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from claude_code_core.session_repo import SessionRepository, UsageStatsRepository
+from claude_code_core.sqlite_pool import SqlitePool
+from claude_code_core.types import RateLimitInfo
+from claude_code_core.write_behind import WriteBehindBuffer
+from claude_discord.database.models import init_db
+
+
+@pytest.fixture
+async def pool(tmp_path):
+    path = str(tmp_path / "sessions.db")
+    await init_db(path)
+    shared = SqlitePool(path, readers=2)
+    yield shared
+    await shared.close()
+
+
+def _info(utilization: float, kind: str = "five_hour") -> RateLimitInfo:
+    return RateLimitInfo(
+        rate_limit_type=kind,
+        status="allowed",
+        utilization=utilization,
+        resets_at=1_760_000_000,
+        is_using_overage=False,
+    )
+
+
+async def _rows(pool: SqlitePool) -> list[tuple]:
+    async with pool.read() as db:
+        return list(
+            await db.execute_fetchall(
+                "SELECT rate_limit_type, utilization FROM usage_stats ORDER BY rate_limit_type"
+            )
+        )
+
+
+class TestWriteBehindBuffer:
+    async def test_writes_to_one_key_collapse_into_the_last(self, pool: SqlitePool) -> None:
+        buffer = WriteBehindBuffer(pool.db_path, pool, interval_seconds=60)
+        usage = UsageStatsRepository(pool.db_path, pool=pool, write_behind=buffer)
+
+        for i in range(10):
+            await usage.upsert(_info(i / 10))
+        await usage.upsert(_info(0.5, "seven_day"))
+
+        assert buffer.pending == 2
+        assert await _rows(pool) == []  # nothing written yet
+        assert await buffer.flush() == 2
+        assert await _rows(pool) == [("five_hour", 0.9), ("seven_day", 0.5)]
+        assert buffer.stats.coalesced == 9 and buffer.stats.flushes == 1
+        await buffer.close()
+
+    async def test_pending_writes_commit_once_per_interval(self, pool: SqlitePool) -> None:
+        buffer = WriteBehindBuffer(pool.db_path, pool, interval_seconds=0.05)
+        usage = UsageStatsRepository(pool.db_path, pool=pool, write_behind=buffer)
+
+        await usage.upsert(_info(0.1))
+        await usage.upsert(_info(0.2, "seven_day"))
+        await asyncio.sleep(0.2)
+
+        assert buffer.pending == 0
+        assert buffer.stats.flushes == 1 and buffer.stats.statements == 2
+        assert len(await _rows(pool)) == 2
+        await buffer.close()
+
+    async def test_writes_deferred_during_a_slow_flush_are_flushed_after_it(
+        self, pool: SqlitePool
+    ) -> None:
+        buffer = WriteBehindBuffer(pool.db_path, pool, interval_seconds=0.05)
+        usage = UsageStatsRepository(pool.db_path, pool=pool, write_behind=buffer)
+
+        async with pool.write():  # the writer is busy; the flush will wait for it
+            await usage.upsert(_info(0.1))
+            await asyncio.sleep(0.1)  # the flush has taken its batch and is waiting
+            await usage.upsert(_info(0.2, "seven_day"))
+            await asyncio.sleep(0.2)  # its timer fires while that flush still waits
+        await asyncio.sleep(0.3)
+
+        assert buffer.pending == 0
+        assert await _rows(pool) == [("five_hour", 0.1), ("seven_day", 0.2)]
+        await buffer.close()
+
+    async def test_reads_through_the_repository_see_deferred_writes(self, pool: SqlitePool) -> None:
+        buffer = WriteBehindBuffer(pool.db_path, pool, interval_seconds=60)
+        sessions = SessionRepository(pool.db_path, pool=pool, write_behind=buffer)
+        await sessions.save(thread_id=1, session_id="s-1")
+
+        await sessions.update_context_stats(1, context_window=200_000, context_used=50_000)
+        await sessions.update_context_stats(1, context_window=200_000, context_used=80_000)
+
+        record = await sessions.get(1)
+        assert record is not None and record.context_used == 80_000
+        assert buffer.pending == 0
+        await buffer.close()
+
+    async def test_close_flushes_and_later_writes_go_straight_through(
+        self, pool: SqlitePool
+    ) -> None:
+        buffer = WriteBehindBuffer(pool.db_path, pool, interval_seconds=60)
+        usage = UsageStatsRepository(pool.db_path, pool=pool, write_behind=buffer)
+        await usage.upsert(_info(0.3))
+
+        await buffer.close()
+        assert await _rows(pool) == [("five_hour", 0.3)]
+
+        await usage.upsert(_info(0.4))
+        assert buffer.pending == 0
+        assert await _rows(pool) == [("five_hour", 0.4)]
+        with pytest.raises(RuntimeError):
+            buffer.defer("k", "SELECT 1")
+
+    async def test_failed_flush_keeps_the_writes(self, pool: SqlitePool) -> None:
+        buffer = WriteBehindBuffer(pool.db_path, pool, interval_seconds=60)
+        buffer.defer("bad", "INSERT INTO no_such_table VALUES (1)")
+
+        with pytest.raises(Exception, match="no_such_table"):
+            await buffer.flush()
+
+        assert buffer.pending == 1 and buffer.stats.failures == 1
+        buffer.defer("bad", "SELECT 1")  # the caller replaces the bad write
+        assert await buffer.flush() == 1
+        await buffer.close()